@@ -1,25 +1,120 @@
 """
 Animation registry - maps button names to animation modules.
+
+Animation modules are imported on first use (the first press of their button)
+rather than at boot, so the toy is ready sooner and the heap stays small. Some
+are costly to import — flower pre-computes every bloom stage — so main.py can
+warm them up one at a time while the toy sits idle, costliest first. The boot
+animation is unloaded as soon as it has played. Loaded modules are kept in
+a small LRU and the least recently played are unloaded when there are too many
+or the heap runs low.
 """
 
-from animations import boot, heart, star, rocket, butterfly, boat, flower
+import gc
+import sys
 
-# Map button names to animation modules
+# Map button names to animation module names (imported lazily)
 ANIMATIONS = {
-    'heart':     heart,
-    'star':      star,
-    'rocket':    rocket,
-    'butterfly': flower,       # pink button → flower bloom animation
-    'boat':      boat,
-    'black':     butterfly,    # black button → butterfly animation
+    'heart':     'heart',
+    'star':      'star',
+    'rocket':    'rocket',
+    'butterfly': 'flower',     # pink button → flower bloom animation
+    'boat':      'boat',
+    'black':     'butterfly',  # black button → butterfly animation
 }
 
+# Warm-up order: costliest import first (measured on the stand-ins, with the
+# lib modules they share already loaded: flower ~10 ms, boat ~0.8 ms, the
+# rest under 0.5 ms), so the slots go to the imports a first press would feel.
+WARM_UP_ORDER = ('flower', 'boat', 'rocket', 'butterfly', 'star', 'heart')
+
+MAX_LOADED = 4            # animation modules kept imported at once
+LOW_MEMORY = 24 * 1024    # unload LRU modules while free heap is below this
+
+_loaded = []   # imported module names, least recently used first
+
+
+def _free_heap():
+    """Free heap in bytes, or None where the port can't tell (desktop CPython)."""
+    mem_free = getattr(gc, 'mem_free', None)
+    return mem_free() if mem_free else None
+
+
+def _memory_low():
+    free = _free_heap()
+    return free is not None and free < LOW_MEMORY
+
+
+def _load(modname):
+    """Import (or fetch) animations.<modname> and mark it most recently used."""
+    full = 'animations.' + modname
+    module = sys.modules.get(full)
+    if module is None:
+        __import__(full)
+        module = sys.modules[full]
+    if modname in _loaded:
+        _loaded.remove(modname)
+    _loaded.append(modname)
+    trim()
+    return module
+
+
+def unload(modname):
+    """Drop an animation module so its code and tables can be collected."""
+    if modname in _loaded:
+        _loaded.remove(modname)
+    sys.modules.pop('animations.' + modname, None)
+    globals().pop(modname, None)   # the package attribute set by the import
+    gc.collect()
+
+
+def trim():
+    """
+    Unload least recently used modules while over MAX_LOADED or low on heap.
+
+    The most recently used module is always kept — it is the one about to play.
+    """
+    while len(_loaded) > 1 and (len(_loaded) > MAX_LOADED or _memory_low()):
+        unload(_loaded[0])
+
+
+def loaded():
+    """Names of the currently imported animation modules, LRU first."""
+    return list(_loaded)
+
 
 def get_animation(name):
-    """Get the animation module for a button name."""
-    return ANIMATIONS.get(name)
+    """Get the animation module for a button name, importing it on first use."""
+    modname = ANIMATIONS.get(name)
+    if modname is None:
+        return None
+    return _load(modname)
+
+
+def warm_up():
+    """
+    Import one not-yet-loaded animation ahead of its first press.
+
+    Call repeatedly while idle; each call does at most one import so button
+    response stays quick. Returns False once there is nothing left to load or
+    no room (MAX_LOADED reached or heap low).
+    """
+    if len(_loaded) >= MAX_LOADED or _memory_low():
+        return False
+    for modname in WARM_UP_ORDER:
+        if modname not in _loaded:
+            full = 'animations.' + modname
+            if full not in sys.modules:
+                __import__(full)
+            # Warmed modules go to the LRU end, so a real press outranks them.
+            _loaded.insert(0, modname)
+            return True
+    return False
 
 
 def play_boot(su, graphics, check_interrupt=None):
-    """Play the boot animation."""
-    return boot.play(su, graphics, check_interrupt)
+    """Play the boot animation, then unload it: it does not play again."""
+    try:
+        return _load('boot').play(su, graphics, check_interrupt)
+    finally:
+        unload('boot')
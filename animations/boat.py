@@ -24,18 +24,17 @@ bob: x-offset for vertical bob.
   +1 = up (cresting wave), -1 = down (keel dips into water surface), 0 = rest.
 """
 
-import time
 import math
 import random
-from lib import display, sound
+from lib import clock, coro, display, framestore, sound
 
 SOUND_FILE = "sounds/boat.wav"
 
-_HULL_A = (190,  55,  15)   # orange hull
-_HULL_B = (140,  35,   8)   # dark orange lower hull / keel
-_CABIN  = (245, 245, 245)   # white wheelhouse
-_WINDOW = ( 30,  50,  90)   # dark blue windows
-_DETAIL = (220, 180,  90)   # gold antenna
+# Hull, wheelhouse, windows and antenna are compiled from
+# generate_images/sprite_sources.py (palette lives there too) into the shared
+# frame store, which pages them in when the boat is selected.
+SPRITE_NAME = "boat"
+
 _W_SURF = (  0, 255, 200)   # near-cyan water surface (x=1)
 _W_DEEP = (  0, 200, 255)   # aqua water depth        (x=0)
 
@@ -62,30 +61,12 @@ def _draw_water(graphics, phase):
 
 def _draw_boat(graphics, drift, bob):
     """Draw the boat at the given horizontal drift and vertical bob offsets."""
-    # Hull (bottom to top)
-    for y in range(3 + drift, 13 + drift): _px(graphics, 2 + bob, y, _HULL_B)  # keel
-    for y in range(2 + drift, 14 + drift): _px(graphics, 3 + bob, y, _HULL_B)  # lower hull
-    for y in range(1 + drift, 15 + drift): _px(graphics, 4 + bob, y, _HULL_A)  # upper hull
-    for y in range(2 + drift, 14 + drift): _px(graphics, 5 + bob, y, _HULL_A)  # deck
-
-    # Wheelhouse (stern, low-y side of boat — enters screen last)
-    for x in range(6 + bob, 10 + bob):
-        for y in range(2 + drift, 7 + drift):
-            _px(graphics, x, y, _CABIN)
-
-    # Windows
-    for x in (7 + bob, 8 + bob):
-        for y in (3 + drift, 4 + drift):
-            _px(graphics, x, y, _WINDOW)
+    framestore.shared().draw(graphics, 0, dx=bob, dy=drift)
 
-    # Antenna
-    for x in range(10 + bob, 13 + bob):
-        _px(graphics, x, 4 + drift, _DETAIL)
 
-
-def play(su, graphics, check_interrupt=None):
+def frames(su, graphics, check_interrupt=None):
     """
-    Play the boat animation.
+    Frames of the boat animation.
     Returns None on completion, or the button name if interrupted.
     """
     _sound_started = False
@@ -95,6 +76,8 @@ def play(su, graphics, check_interrupt=None):
     except OSError:
         pass
 
+    framestore.shared().select(SPRITE_NAME)
+
     bob_period = 1.8 + random.uniform(-0.3, 0.3)    # bob cycle in seconds
     wave_speed = 0.15 + random.uniform(-0.03, 0.03)  # wave phase step per frame
 
@@ -103,7 +86,7 @@ def play(su, graphics, check_interrupt=None):
     anim_ms     = 5000
     hold_ms     = 5000
 
-    start      = time.ticks_ms()
+    start      = clock.ticks_ms()
     wave_phase = 0.0
 
     # ── animation phase ───────────────────────────────────────────────────────
@@ -114,7 +97,7 @@ def play(su, graphics, check_interrupt=None):
                 sound.stop(su)
             return interrupted
 
-        elapsed = time.ticks_diff(time.ticks_ms(), start)
+        elapsed = clock.ticks_diff(clock.ticks_ms(), start)
         if elapsed >= anim_ms:
             break
 
@@ -129,10 +112,10 @@ def play(su, graphics, check_interrupt=None):
         _draw_water(graphics, wave_phase)
         _draw_boat(graphics, drift, bob)
         su.update(graphics)
-        time.sleep_ms(33)
+        yield 33
 
     # ── hold phase ────────────────────────────────────────────────────────────
-    hold_start = time.ticks_ms()
+    hold_start = clock.ticks_ms()
     while True:
         interrupted = check_interrupt() if check_interrupt else None
         if interrupted:
@@ -140,7 +123,7 @@ def play(su, graphics, check_interrupt=None):
                 sound.stop(su)
             return interrupted
 
-        elapsed = time.ticks_diff(time.ticks_ms(), hold_start)
+        elapsed = clock.ticks_diff(clock.ticks_ms(), hold_start)
         if elapsed >= hold_ms:
             break
 
@@ -154,8 +137,13 @@ def play(su, graphics, check_interrupt=None):
         _draw_water(graphics, wave_phase)
         _draw_boat(graphics, drift_end, bob)
         su.update(graphics)
-        time.sleep_ms(33)
+        yield 33
 
     if _sound_started:
         sound.stop(su)
     return None
+
+
+def play(su, graphics, check_interrupt=None):
+    """Play the boat animation, blocking until it ends; see frames()."""
+    return coro.run(frames(su, graphics, check_interrupt), clock.sleep_ms)
@@ -3,16 +3,15 @@ Boot splash animation - colorful display on power-on.
 Plays for 1-2 seconds to indicate successful power-up.
 """
 
-import time
 import math
-from lib import display, sound
+from lib import clock, coro, display, sound
 
 SOUND_FILE = "sounds/startup.wav"
 
 
-def play(su, graphics, check_interrupt=None, hold_ms=0):
+def frames(su, graphics, check_interrupt=None, hold_ms=0):
     """
-    Play the boot splash animation.
+    Frames of the boot splash animation.
 
     Args:
         su: Stellar Unicorn instance
@@ -26,11 +25,11 @@ def play(su, graphics, check_interrupt=None, hold_ms=0):
     sound.play(su, SOUND_FILE)
 
     # Rainbow wave animation - colorful and engaging
-    start_time = time.ticks_ms()
+    start_time = clock.ticks_ms()
     duration_ms = 1500  # 1.5 seconds
 
     frame = 0
-    while time.ticks_diff(time.ticks_ms(), start_time) < duration_ms:
+    while clock.ticks_diff(clock.ticks_ms(), start_time) < duration_ms:
         # Check for interrupt
         interrupted_by = check_interrupt() if check_interrupt else None
         if interrupted_by:
@@ -63,26 +62,31 @@ def play(su, graphics, check_interrupt=None, hold_ms=0):
 
         su.update(graphics)
         frame += 1
-        time.sleep_ms(33)  # ~30 fps
+        yield 33  # ~30 fps
 
     # Brief pause on final frame
-    time.sleep_ms(200)
+    yield 200
 
     if hold_ms > 0:
         # Hold the final frame for the requested duration
-        hold_start = time.ticks_ms()
-        while time.ticks_diff(time.ticks_ms(), hold_start) < hold_ms:
+        hold_start = clock.ticks_ms()
+        while clock.ticks_diff(clock.ticks_ms(), hold_start) < hold_ms:
             interrupted_by = check_interrupt() if check_interrupt else None
             if interrupted_by:
                 sound.stop(su)
                 return interrupted_by
-            time.sleep_ms(50)
+            yield coro.hold(hold_ms - clock.ticks_diff(clock.ticks_ms(), hold_start))
     else:
         display.clear(graphics, su)
 
     return None  # Completed normally
 
 
+def play(su, graphics, check_interrupt=None, hold_ms=0):
+    """Play the boot splash, blocking until it ends; see frames()."""
+    return coro.run(frames(su, graphics, check_interrupt, hold_ms=hold_ms), clock.sleep_ms)
+
+
 def hsv_to_rgb(h, s, v):
     """Convert HSV (hue 0-360, sat 0-1, val 0-1) to RGB (0-255)."""
     h = h % 360
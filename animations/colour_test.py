@@ -4,8 +4,7 @@ Shows 16 colour blocks (4x4 pixels each) across the 16x16 matrix
 so you can judge which colours are visible on the physical display.
 """
 
-import time
-from lib import display
+from lib import clock, coro, display
 
 DURATION_MS = 20000  # 20 seconds on screen
 
@@ -35,8 +34,8 @@ COLOURS = [
 ]
 
 
-def play(su, graphics, check_interrupt=None):
-    """Display the colour test grid for 20 seconds."""
+def frames(su, graphics, check_interrupt=None):
+    """Frames showing the colour test grid for 20 seconds."""
     graphics.set_pen(graphics.create_pen(0, 0, 0))
     graphics.clear()
 
@@ -50,11 +49,16 @@ def play(su, graphics, check_interrupt=None):
 
     su.update(graphics)
 
-    start_time = time.ticks_ms()
-    while time.ticks_diff(time.ticks_ms(), start_time) < DURATION_MS:
+    start_time = clock.ticks_ms()
+    while clock.ticks_diff(clock.ticks_ms(), start_time) < DURATION_MS:
         interrupted_by = check_interrupt() if check_interrupt else None
         if interrupted_by:
             return interrupted_by
-        time.sleep_ms(50)
+        yield coro.hold(DURATION_MS - clock.ticks_diff(clock.ticks_ms(), start_time))
 
     return None
+
+
+def play(su, graphics, check_interrupt=None):
+    """Play the colour test grid, blocking until it ends; see frames()."""
+    return coro.run(frames(su, graphics, check_interrupt), clock.sleep_ms)
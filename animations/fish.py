@@ -9,9 +9,8 @@ Coordinate note: display.pixel(x, y) applies 90° rotation internally:
 So to swim horizontally the fish must vary CY, not CX.
 """
 
-import time
 import math
-from lib import display, sound
+from lib import clock, coro, display, sound
 
 SOUND_FILE = "sounds/fish.wav"
 
@@ -54,9 +53,9 @@ def _draw_fish(graphics, cx, cy):
             display.pixel(graphics, x, y)
 
 
-def play(su, graphics, check_interrupt=None):
+def frames(su, graphics, check_interrupt=None):
     """
-    Play the fish animation.
+    Frames of the fish animation.
 
     Returns None if completed normally, button name (str) if interrupted.
     """
@@ -67,17 +66,17 @@ def play(su, graphics, check_interrupt=None):
     except OSError:
         pass
 
-    start_time = time.ticks_ms()
+    start_time = clock.ticks_ms()
     animation_duration_ms = 5000
 
-    while time.ticks_diff(time.ticks_ms(), start_time) < animation_duration_ms:
+    while clock.ticks_diff(clock.ticks_ms(), start_time) < animation_duration_ms:
         interrupted_by = check_interrupt() if check_interrupt else None
         if interrupted_by:
             if _sound_started:
                 sound.stop(su)
             return interrupted_by
 
-        t = time.ticks_diff(time.ticks_ms(), start_time) / 1000.0
+        t = clock.ticks_diff(clock.ticks_ms(), start_time) / 1000.0
         # Ease-out: decelerates as fish reaches stop position
         ease = 1.0 - (1.0 - t / 5.0) * (1.0 - t / 5.0)
         cy = _START_CY + (_STOP_CY - _START_CY) * ease
@@ -86,7 +85,7 @@ def play(su, graphics, check_interrupt=None):
         graphics.clear()
         _draw_fish(graphics, _CX, cy)
         su.update(graphics)
-        time.sleep_ms(33)
+        yield 33
 
     # Hold phase — fish at rest position
     graphics.set_pen(graphics.create_pen(0, 0, 0))
@@ -94,13 +93,18 @@ def play(su, graphics, check_interrupt=None):
     _draw_fish(graphics, _CX, _STOP_CY)
     su.update(graphics)
 
-    hold_start = time.ticks_ms()
+    hold_start = clock.ticks_ms()
     hold_duration_ms = 5000
 
-    while time.ticks_diff(time.ticks_ms(), hold_start) < hold_duration_ms:
+    while clock.ticks_diff(clock.ticks_ms(), hold_start) < hold_duration_ms:
         interrupted_by = check_interrupt() if check_interrupt else None
         if interrupted_by:
             return interrupted_by
-        time.sleep_ms(50)
+        yield coro.hold(hold_duration_ms - clock.ticks_diff(clock.ticks_ms(), hold_start))
 
     return None
+
+
+def play(su, graphics, check_interrupt=None):
+    """Play the fish animation, blocking until it ends; see frames()."""
+    return coro.run(frames(su, graphics, check_interrupt), clock.sleep_ms)
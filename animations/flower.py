@@ -7,8 +7,7 @@ does simple integer pixel draws with 4 set_pen calls per frame.
 """
 
 import math
-import time
-from lib import display, sound
+from lib import clock, coro, display, sound
 
 SOUND_FILE = "sounds/flower.wav"
 
@@ -129,41 +128,46 @@ def _draw_frame(graphics, frame_idx):
         display.pixel(graphics, ring_b[i], ring_b[i + 1])
 
 
-def play(su, graphics, check_interrupt=None):
+def frames(su, graphics, check_interrupt=None):
     """
-    Play the blooming flower animation.
+    Frames of the blooming flower animation.
 
     Returns None if completed normally, button name (str) if interrupted.
     """
     sound.play(su, SOUND_FILE)
 
-    start_time = time.ticks_ms()
+    start_time = clock.ticks_ms()
     animation_duration_ms = 5000
 
-    while time.ticks_diff(time.ticks_ms(), start_time) < animation_duration_ms:
+    while clock.ticks_diff(clock.ticks_ms(), start_time) < animation_duration_ms:
         interrupted_by = check_interrupt() if check_interrupt else None
         if interrupted_by:
             sound.stop(su)
             return interrupted_by
 
-        t         = time.ticks_diff(time.ticks_ms(), start_time) / 1000.0
+        t         = clock.ticks_diff(clock.ticks_ms(), start_time) / 1000.0
         progress  = min(1.0, t / 5.0)
         frame_idx = min(_N_FRAMES, int(progress * _N_FRAMES))
         _draw_frame(graphics, frame_idx)
         su.update(graphics)
-        time.sleep_ms(33)
+        yield 33
 
     # Hold phase — full bloom for 5 seconds
     _draw_frame(graphics, _N_FRAMES)
     su.update(graphics)
 
-    hold_start = time.ticks_ms()
+    hold_start = clock.ticks_ms()
     hold_duration_ms = 5000
 
-    while time.ticks_diff(time.ticks_ms(), hold_start) < hold_duration_ms:
+    while clock.ticks_diff(clock.ticks_ms(), hold_start) < hold_duration_ms:
         interrupted_by = check_interrupt() if check_interrupt else None
         if interrupted_by:
             return interrupted_by
-        time.sleep_ms(50)
+        yield coro.hold(hold_duration_ms - clock.ticks_diff(clock.ticks_ms(), hold_start))
 
     return None
+
+
+def play(su, graphics, check_interrupt=None):
+    """Play the flower animation, blocking until it ends; see frames()."""
+    return coro.run(frames(su, graphics, check_interrupt), clock.sleep_ms)
@@ -3,8 +3,7 @@ Green & greeny-blue colour test — static palette for hardware comparison.
 Triggered by the black button (GPB4). Stays on screen for 20 seconds.
 """
 
-import time
-from lib import display
+from lib import clock, coro, display
 
 DURATION_MS = 20_000
 
@@ -34,8 +33,8 @@ COLOURS = [
 ]
 
 
-def play(su, graphics, check_interrupt=None):
-    """Display the green/blue-green test grid for 20 seconds."""
+def frames(su, graphics, check_interrupt=None):
+    """Frames showing the green/blue-green test grid for 20 seconds."""
     graphics.set_pen(graphics.create_pen(0, 0, 0))
     graphics.clear()
 
@@ -49,11 +48,16 @@ def play(su, graphics, check_interrupt=None):
 
     su.update(graphics)
 
-    start_time = time.ticks_ms()
-    while time.ticks_diff(time.ticks_ms(), start_time) < DURATION_MS:
+    start_time = clock.ticks_ms()
+    while clock.ticks_diff(clock.ticks_ms(), start_time) < DURATION_MS:
         interrupted_by = check_interrupt() if check_interrupt else None
         if interrupted_by:
             return interrupted_by
-        time.sleep_ms(50)
+        yield coro.hold(DURATION_MS - clock.ticks_diff(clock.ticks_ms(), start_time))
 
     return None
+
+
+def play(su, graphics, check_interrupt=None):
+    """Play the green test grid, blocking until it ends; see frames()."""
+    return coro.run(frames(su, graphics, check_interrupt), clock.sleep_ms)
@@ -4,10 +4,9 @@ Plays for ~5 seconds with heartbeat sound, then holds final frame for 5 seconds.
 Heart is smaller at rest, expands to full size on each beat (single beat pattern).
 """
 
-import time
 import math
 import random
-from lib import display, sound
+from lib import clock, coro, display, sound
 
 SOUND_FILE = "sounds/heartbeat.wav"
 
@@ -40,9 +39,9 @@ def get_heart_pixels(scale=1.0, offset_x=0, offset_y=0):
     return pixels
 
 
-def play(su, graphics, check_interrupt=None):
+def frames(su, graphics, check_interrupt=None):
     """
-    Play the heart beating animation.
+    Frames of the heart beating animation.
 
     Args:
         su: Stellar Unicorn instance
@@ -65,18 +64,18 @@ def play(su, graphics, check_interrupt=None):
     sound.play(su, SOUND_FILE)
 
     # Animation phase (5 seconds)
-    start_time = time.ticks_ms()
+    start_time = clock.ticks_ms()
     animation_duration_ms = 5000
 
     frame = 0
-    while time.ticks_diff(time.ticks_ms(), start_time) < animation_duration_ms:
+    while clock.ticks_diff(clock.ticks_ms(), start_time) < animation_duration_ms:
         interrupted_by = check_interrupt() if check_interrupt else None
         if interrupted_by:
             sound.stop(su)
             return interrupted_by
 
         # Calculate beat phase (pulsing effect)
-        t = time.ticks_diff(time.ticks_ms(), start_time) / 1000.0
+        t = clock.ticks_diff(clock.ticks_ms(), start_time) / 1000.0
         # Single beat: quick expand, slow contract
         beat_cycle = (t * beat_speed * 1.0) % 1.0
 
@@ -107,7 +106,7 @@ def play(su, graphics, check_interrupt=None):
             display.pixel(graphics, 15 - y, x)
 
         su.update(graphics)
-        time.sleep_ms(33)  # ~30 fps
+        yield 33  # ~30 fps
         frame += 1
 
     # Hold phase (5 seconds) - show final heart at rest size
@@ -121,13 +120,18 @@ def play(su, graphics, check_interrupt=None):
         display.pixel(graphics, 15 - y, x)
     su.update(graphics)
 
-    hold_start = time.ticks_ms()
+    hold_start = clock.ticks_ms()
     hold_duration_ms = 5000
 
-    while time.ticks_diff(time.ticks_ms(), hold_start) < hold_duration_ms:
+    while clock.ticks_diff(clock.ticks_ms(), hold_start) < hold_duration_ms:
         interrupted_by = check_interrupt() if check_interrupt else None
         if interrupted_by:
             return interrupted_by
-        time.sleep_ms(50)
+        yield coro.hold(hold_duration_ms - clock.ticks_diff(clock.ticks_ms(), hold_start))
 
     return None  # Completed normally
+
+
+def play(su, graphics, check_interrupt=None):
+    """Play the heart animation, blocking until it ends; see frames()."""
+    return coro.run(frames(su, graphics, check_interrupt), clock.sleep_ms)
@@ -3,10 +3,9 @@ Moon/Night Sky animation - full moon rises from bottom-left to center.
 Plays for ~5 seconds with chime sound, then holds final frame for 5 seconds.
 """
 
-import time
 import math
 import random
-from lib import display, sound
+from lib import clock, coro, display, sound
 
 SOUND_FILE = "sounds/moon.wav"
 
@@ -51,9 +50,9 @@ def get_moon_pixels(cx, cy, radius, with_craters=False):
     return pixels, crater_pixels
 
 
-def play(su, graphics, check_interrupt=None):
+def frames(su, graphics, check_interrupt=None):
     """
-    Play the night sky animation with rising moon and twinkling stars.
+    Frames of the night sky animation with rising moon and twinkling stars.
 
     Args:
         su: Stellar Unicorn instance
@@ -102,16 +101,16 @@ def play(su, graphics, check_interrupt=None):
     sound.play(su, SOUND_FILE)
 
     # Animation phase (5 seconds)
-    start_time = time.ticks_ms()
+    start_time = clock.ticks_ms()
     animation_duration_ms = 5000
 
-    while time.ticks_diff(time.ticks_ms(), start_time) < animation_duration_ms:
+    while clock.ticks_diff(clock.ticks_ms(), start_time) < animation_duration_ms:
         interrupted_by = check_interrupt() if check_interrupt else None
         if interrupted_by:
             sound.stop(su)
             return interrupted_by
 
-        t = time.ticks_diff(time.ticks_ms(), start_time) / 1000.0
+        t = clock.ticks_diff(clock.ticks_ms(), start_time) / 1000.0
         progress = min(1.0, t / 4.0)  # Moon reaches center in 4 seconds
 
         # Clear with dark blue background
@@ -142,21 +141,21 @@ def play(su, graphics, check_interrupt=None):
             display.pixel(graphics, x, y)
 
         su.update(graphics)
-        time.sleep_ms(33)  # ~30 fps
+        yield 33  # ~30 fps
 
     # Hold phase (5 seconds) - moon at center, stars twinkling
-    hold_start = time.ticks_ms()
+    hold_start = clock.ticks_ms()
     hold_duration_ms = 5000
 
     # Pre-calculate final moon pixels with craters
     final_moon_pixels, final_crater_pixels = get_moon_pixels(end_cx, end_cy, moon_radius, with_craters=True)
 
-    while time.ticks_diff(time.ticks_ms(), hold_start) < hold_duration_ms:
+    while clock.ticks_diff(clock.ticks_ms(), hold_start) < hold_duration_ms:
         interrupted_by = check_interrupt() if check_interrupt else None
         if interrupted_by:
             return interrupted_by
 
-        t = time.ticks_diff(time.ticks_ms(), hold_start) / 1000.0
+        t = clock.ticks_diff(clock.ticks_ms(), hold_start) / 1000.0
 
         graphics.set_pen(graphics.create_pen(*bg_color))
         graphics.clear()
@@ -177,6 +176,11 @@ def play(su, graphics, check_interrupt=None):
             display.pixel(graphics, x, y)
 
         su.update(graphics)
-        time.sleep_ms(50)
+        yield 50
 
     return None  # Completed normally
+
+
+def play(su, graphics, check_interrupt=None):
+    """Play the night sky animation, blocking until it ends; see frames()."""
+    return coro.run(frames(su, graphics, check_interrupt), clock.sleep_ms)
@@ -4,10 +4,9 @@ Plays for ~5 seconds with sparkle sound, then holds final frame for 5 seconds.
 Star occupies roughly 70% of the display area.
 """
 
-import time
 import math
 import random
-from lib import display, sound
+from lib import clock, coro, display, sound
 
 SOUND_FILE = "sounds/star.wav"
 
@@ -71,9 +70,9 @@ def get_star_pixels(cx, cy, size, rotation, num_points=5):
     return list(pixels)
 
 
-def play(su, graphics, check_interrupt=None):
+def frames(su, graphics, check_interrupt=None):
     """
-    Play the star bouncing and rotating animation.
+    Frames of the star bouncing and rotating animation.
 
     Args:
         su: Stellar Unicorn instance
@@ -104,19 +103,19 @@ def play(su, graphics, check_interrupt=None):
     sound.play(su, SOUND_FILE)
 
     # Animation phase (5 seconds)
-    start_time = time.ticks_ms()
+    start_time = clock.ticks_ms()
     animation_duration_ms = 5000
 
     final_rotation = 0
     final_y = 7.5
 
-    while time.ticks_diff(time.ticks_ms(), start_time) < animation_duration_ms:
+    while clock.ticks_diff(clock.ticks_ms(), start_time) < animation_duration_ms:
         interrupted_by = check_interrupt() if check_interrupt else None
         if interrupted_by:
             sound.stop(su)
             return interrupted_by
 
-        t = time.ticks_diff(time.ticks_ms(), start_time) / 1000.0
+        t = clock.ticks_diff(clock.ticks_ms(), start_time) / 1000.0
 
         # Rotation
         rotation = t * rotation_speed * 2
@@ -142,7 +141,7 @@ def play(su, graphics, check_interrupt=None):
                 display.pixel(graphics, 15 - int(y), int(x))
 
         su.update(graphics)
-        time.sleep_ms(33)  # ~30 fps
+        yield 33  # ~30 fps
 
     # Hold phase (5 seconds) - show star at center, no rotation
     graphics.set_pen(graphics.create_pen(0, 0, 0))
@@ -156,13 +155,18 @@ def play(su, graphics, check_interrupt=None):
             display.pixel(graphics, 15 - int(y), int(x))
     su.update(graphics)
 
-    hold_start = time.ticks_ms()
+    hold_start = clock.ticks_ms()
     hold_duration_ms = 5000
 
-    while time.ticks_diff(time.ticks_ms(), hold_start) < hold_duration_ms:
+    while clock.ticks_diff(clock.ticks_ms(), hold_start) < hold_duration_ms:
         interrupted_by = check_interrupt() if check_interrupt else None
         if interrupted_by:
             return interrupted_by
-        time.sleep_ms(50)
+        yield coro.hold(hold_duration_ms - clock.ticks_diff(clock.ticks_ms(), hold_start))
 
     return None  # Completed normally
+
+
+def play(su, graphics, check_interrupt=None):
+    """Play the star animation, blocking until it ends; see frames()."""
+    return coro.run(frames(su, graphics, check_interrupt), clock.sleep_ms)
@@ -10,3 +10,7 @@ HOLD_MS = 20_000  # 20 seconds
 
 def play(su, graphics, check_interrupt=None):
     return boot.play(su, graphics, check_interrupt, hold_ms=HOLD_MS)
+
+
+def frames(su, graphics, check_interrupt=None):
+    return boot.frames(su, graphics, check_interrupt, hold_ms=HOLD_MS)
@@ -18,9 +18,10 @@ Physics (Rocket) is pure and hardware-free so it can be unit-tested; run() wires
 it to the KX134, display and sound.
 """
 
-import time
+from array import array
 
-from lib import display, sound
+from lib import arena, clock, coro, display, framestore, log, metrics, sound
+from lib.kx134 import BUFFER_SAMPLES, COUNTS_PER_G, SAMPLE_SIZE
 
 LAUNCH_SOUND = "sounds/rocket.wav"    # whoosh played once when a flight's shaking starts, if present
 STAR_SOUND   = "sounds/shimmer.wav"   # ~5 s shimmer played over the star shower, if present
@@ -50,29 +51,53 @@ GRAVITY        = 0.22   # downward pull per frame
 DRAG           = 0.87   # fraction of velocity kept each frame (settles the rocket)
 ACTIVE_SPEED   = 0.05   # |vy| above this counts as airborne activity (resets sleep)
 
-# Set True to print shake/height telemetry ~2x/second while the game runs, to
-# help tune SHAKE_DEADZONE/THRUST_SCALE/GRAVITY/DRAG on real hardware. Turn off
-# once the physics feels right — the prints are noise in normal play.
-DEBUG = True
+# Shake/height telemetry ~2x/second while the game runs, at log.DEBUG, to help
+# tune SHAKE_DEADZONE/THRUST_SCALE/GRAVITY/DRAG on real hardware:
+#   log.set_levels(console=log.DEBUG)
 _DEBUG_INTERVAL_MS = 500
 
-# ── Colours (veneer-safe; see display-color-visibility memory) ────────────────
-_BODY = (0, 200, 255)     # aqua body — the game rocket's signature colour
-_NOSE = (210,  30,  20)   # red nose cone + fins
-_WIN  = (240, 240, 215)   # magnolia window
-_FL_O = (220,  85,  10)   # deep orange (nearest the nozzle)
-_FL_H = (255, 210,  40)   # yellow hot tip
-_FL_X = (255, 245, 120)   # pale yellow extreme tip
+# ── Shake meter (KX134 sample buffer) ─────────────────────────────────────────
+# One reading per 33 ms frame misses a quick shake that peaks between frames.
+# With the KX134 buffering at 400 Hz, ShakeMeter sees every sample instead:
+# each axis is band-passed in integers (a slow high-pass removes gravity and
+# tilt, a light low-pass removes sensor jitter) and each frame reports the
+# RMS and peak of the filtered acceleration. The peak is held, decaying over a
+# few frames, so a burst between frames still drives the rocket.
+FIFO_SHAKE = True     # use ShakeMeter when run()'s kx has the sample buffer
+PEAK_HOLD = 0.75      # fraction of the held peak kept each frame
+SHAKE_GAIN = 0.57     # makes the meter read a shake as hard as one reading a frame
+                      # did, so the tuning above keeps its feel; measured over the
+                      # synthetic shakes by tools/sweep_rocket.py --calibrate
+_HP_SHIFT = 6         # high-pass pole 1/64 (~1 Hz at 400 Hz), below any shake
+_LP_SHIFT = 2         # low-pass pole 1/4 (~16 Hz), above any shake
+_DC_Q = 4             # fraction bits of the gravity tracker
+_E_SHIFT = 2          # counts → 1/1024 g before squaring, so squares stay small ints
+_SUM_SHIFT = 7        # a buffer's worth of energy sums stays a small int too
+_FIFO = arena.declare("kx_fifo", 'B', BUFFER_SAMPLES * SAMPLE_SIZE)
+
+# ── Rocket sprite ─────────────────────────────────────────────────────────────
+# A red nose cone over an aqua body 4 columns wide, a slim 2-pixel window, red
+# fins and a slim 2-wide flame, compiled from
+# generate_images/generate_rocket_images.py (GAME palette) into the shared
+# frame store, nose on the top row: frame flame_len - 1.
+SPRITE_NAME = "rocket_blast"
 
 # ── Star-shower launch flash ──────────────────────────────────────────────────
+# After a launch, twinkling stars burst from where the rocket left the top of
+# the display and drift down, while the loop keeps polling the exit gesture
+# and the accelerometer — shaking during the shower adds more sparkles.
 _STAR_SOFT = (240, 240, 215)   # magnolia
 _STAR_HOT  = (255, 210, 40)    # warm yellow
 _LAUNCH_FLASH_FRAMES = 160   # star shower lingers ~5.3 s to cover the shimmer sound
-_STARS = [
-    (2, 3), (4, 12), (6, 6), (9, 1), (11, 9), (13, 4),
-    (3, 9), (7, 13), (8, 5), (10, 14), (12, 2), (14, 11),
-    (1, 7), (5, 1), (9, 10), (13, 8),
-]
+MAX_STARS = 320          # particle slots, allocated once
+_STAR_BURST = 120        # stars in the launch burst
+_STAR_DRIZZLE = 2        # new stars per frame while the shower is young
+_STAR_TAIL = 50          # last frames of the shower: no new stars, the rest fade out
+_SHAKE_SPARKLES = 4      # extra stars per frame per g of shake
+_STAR_Q = 8              # star positions/velocities are Q8 pixels (per frame)
+_STAR_GRAVITY = 1        # Q8 px/frame² — a slow drift down
+_STAR_FADES = 4          # brightness steps as a star's last frames run out
+_STAR_FADE_SHIFT = 4     # ... 16 frames each
 
 
 def shake_amount(x, y, z):
@@ -89,6 +114,78 @@ def shake_amount(x, y, z):
     return dev if dev >= SHAKE_DEADZONE else 0.0
 
 
+class ShakeMeter:
+    """
+    Per-frame shake from every KX134 sample since the last frame (see above).
+
+    update() drains the buffer and returns the shake amount for Rocket.step —
+    in g, and 0.0 inside SHAKE_DEADZONE, like shake_amount(). rms and peak
+    hold the last frame's filtered RMS and peak acceleration in g. The
+    filtering is integer-only; a frame costs three float ops, not one per
+    sample.
+    """
+
+    def __init__(self, kx):
+        self._kx = kx
+        self._buf = arena.take(_FIFO)
+        self._state = array('i', bytes(4 * 6))   # per axis: gravity (Q4), low-passed
+        self._primed = False
+        self.rms = 0.0
+        self.peak = 0.0
+        self.held = 0.0
+        kx.enable_buffer()
+
+    def close(self):
+        self._kx.disable_buffer()
+
+    def _prime(self, buf):
+        # Start the gravity tracker at the first reading, so the 1 g already
+        # there doesn't read as a shake while the high-pass settles.
+        for a in range(3):
+            s = buf[2 * a] | (buf[2 * a + 1] << 8)
+            self._state[a] = (s - 0x10000 if s >= 0x8000 else s) << _DC_Q
+        self._primed = True
+
+    def update(self):
+        buf = self._buf
+        n = self._kx.read_buffer(buf)
+        if n and not self._primed:
+            self._prime(buf)
+        st = self._state
+        total = 0
+        peak = 0
+        o = 0
+        for _ in range(n):
+            e = 0
+            for a in range(3):
+                s = buf[o] | (buf[o + 1] << 8)
+                if s >= 0x8000:
+                    s -= 0x10000
+                d = st[a]
+                d += ((s << _DC_Q) - d) >> _HP_SHIFT
+                st[a] = d
+                lp = st[a + 3]
+                lp += (s - (d >> _DC_Q) - lp) >> _LP_SHIFT
+                st[a + 3] = lp
+                lp >>= _E_SHIFT
+                e += lp * lp
+                o += 2
+            total += e >> _SUM_SHIFT
+            if e > peak:
+                peak = e
+
+        unit = COUNTS_PER_G >> _E_SHIFT
+        if n:
+            self.rms = (total * (1 << _SUM_SHIFT) / n) ** 0.5 / unit
+            self.peak = peak ** 0.5 / unit
+        else:
+            self.rms = self.peak = 0.0
+        held = self.held * PEAK_HOLD
+        self.held = self.peak if self.peak > held else held
+        shake = self.held * SHAKE_GAIN
+        return shake if shake >= SHAKE_DEADZONE else 0.0
+
+
 class Rocket:
     """Continuous rocket height/velocity, driven by shake energy."""
 
@@ -135,52 +232,9 @@ def _flame_len(shake, vy):
     return 1
 
 
-def _px(graphics, x, y, r, g, b):
-    """Draw one pixel, clipping anything outside the 16×16 grid."""
-    if 0 <= x < 16 and 0 <= y < 16:
-        graphics.set_pen(graphics.create_pen(r, g, b))
-        display.pixel(graphics, x, y)
-
-
 def _draw_rocket(graphics, rx, flame_len):
-    """
-    Draw the game rocket with its nose tip at logical x = rx.
-
-    Distinct from the rocket Animation: a red nose cone over an aqua body 4
-    columns wide (two narrower), a slim single-row 2-pixel window, red fins, and
-    a slim 2-wide flame. The body fills columns y = 6–9 from just under the cone
-    down to the base level with the fins.
-    """
-    # Nose cone — 2-wide tip, then a 4-wide flare down to body width.
-    for y in (7, 8):
-        _px(graphics, rx, y, *_NOSE)
-    for y in range(6, 10):
-        _px(graphics, rx - 1, y, *_NOSE)
-
-    # Body — aqua, 4 wide, from the row under the cone down to the fin base.
-    for dx in (2, 3, 4, 5):
-        for y in range(6, 10):
-            _px(graphics, rx - dx, y, *_BODY)
-
-    # Window — 2 magnolia pixels on a single row (the top body row stays aqua).
-    for y in (7, 8):
-        _px(graphics, rx - 3, y, *_WIN)
-
-    # Fins — red, sticking out either side at the base (over the aqua body).
-    for y in (5, 10):
-        _px(graphics, rx - 4, y, *_NOSE)
-    for y in (4, 5, 10, 11):
-        _px(graphics, rx - 5, y, *_NOSE)
-
-    # Flame — slim, 2 wide, growing downward with flame_len.
-    for y in (7, 8):
-        _px(graphics, rx - 6, y, *_FL_O)
-    if flame_len >= 2:
-        for y in (7, 8):
-            _px(graphics, rx - 7, y, *_FL_H)
-    if flame_len >= 3:
-        for y in (7, 8):
-            _px(graphics, rx - 8, y, *_FL_X)
+    """Draw the game rocket with its nose tip at logical x = rx (flame_len 1–3)."""
+    framestore.shared().draw(graphics, flame_len - 1, dx=rx - 15)
 
 
 def _render(graphics, su, rocketball, shake):
@@ -200,76 +254,253 @@ def _try_play(su, filename):
         pass
 
 
-def _play_launch(su, graphics):
-    """A lingering shower of twinkling stars with a shimmer sound."""
-    # Stars appear with their own shimmer sound and stay on, gently shimmering.
-    _try_play(su, STAR_SOUND)
-    for frame in range(_LAUNCH_FLASH_FRAMES):
-        graphics.set_pen(graphics.create_pen(0, 0, 0))
-        graphics.clear()
-        for i, (sx, sy) in enumerate(_STARS):
-            # Every star stays lit; its colour shimmers slowly between warm
-            # yellow and magnolia so the field twinkles instead of blinking off.
-            colour = _STAR_HOT if ((i + frame // 4) % 2 == 0) else _STAR_SOFT
-            display.set_pixel(graphics, sx, sy, *colour)
-        su.update(graphics)
-        time.sleep_ms(FRAME_MS)
+class StarShower:
+    """
+    The launch star shower as a fixed pool of particles.
 
+    Positions, velocities and lifetimes live in preallocated arrays (Q8
+    pixels); a dead star is swapped with the last live one, so the live stars
+    are always the first ``count`` slots. step() and draw() allocate nothing —
+    the random numbers come from a 16-bit xorshift — so a frame stays cheap
+    with a few hundred stars (see bench()).
+    """
 
-def run(su, graphics, kx, should_exit=None):
+    def __init__(self, capacity=MAX_STARS):
+        self.capacity = capacity
+        self.x = array('h', bytes(2 * capacity))   # logical row, Q8
+        self.y = array('h', bytes(2 * capacity))   # logical column, Q8
+        self.vx = array('h', bytes(2 * capacity))
+        self.vy = array('h', bytes(2 * capacity))
+        self.life = array('H', bytes(2 * capacity))
+        self.twinkle = bytearray(capacity)
+        self.count = 0
+        self.frames_left = 0
+        self.frame = 0
+        self._seed = 0xACE1
+        self._pens = None
+        self._pens_for = None
+
+    @property
+    def active(self):
+        return self.frames_left > 0
+
+    def _rand(self, n):
+        """0 .. n-1 from a 16-bit xorshift (small ints only)."""
+        r = self._seed
+        r ^= (r << 7) & 0xFFFF
+        r ^= r >> 9
+        r ^= (r << 8) & 0xFFFF
+        self._seed = r
+        return r % n
+
+    def _spawn(self, x, y, vx, vy, life):
+        i = self.count
+        if i == self.capacity:
+            return
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.life[i] = life
+        self.twinkle[i] = self._rand(2)
+        self.count = i + 1
+
+    def _spawn_from_top(self, spread):
+        rand = self._rand
+        left = self.frames_left            # no star outlives the shower
+        life = 30 + rand(left - 29) if left > 30 else left
+        self._spawn((15 << _STAR_Q) + rand(256), (6 << _STAR_Q) + rand(4 << _STAR_Q),
+                    -(12 + rand(100)), rand(2 * spread + 1) - spread, life)
+
+    def start(self, frames=None):
+        """Burst from the top of the display; the shower lasts ``frames`` frames."""
+        self.frames_left = _LAUNCH_FLASH_FRAMES if frames is None else frames
+        self.count = 0
+        self.frame = 0
+        for _ in range(_STAR_BURST):
+            self._spawn_from_top(80)
+
+    def _kill(self, i):
+        last = self.count - 1
+        self.x[i] = self.x[last]
+        self.y[i] = self.y[last]
+        self.vx[i] = self.vx[last]
+        self.vy[i] = self.vy[last]
+        self.life[i] = self.life[last]
+        self.twinkle[i] = self.twinkle[last]
+        self.count = last
+
+    def step(self, shake=0.0):
+        """Advance one frame; shaking (g) sprinkles in extra stars."""
+        if self.frames_left <= 0:
+            return
+        self.frames_left -= 1
+        self.frame += 1
+        if self.frames_left > _STAR_TAIL:
+            for _ in range(_STAR_DRIZZLE + int(shake * _SHAKE_SPARKLES)):
+                self._spawn_from_top(40)
+
+        x, y, vx, vy, life = self.x, self.y, self.vx, self.vy, self.life
+        edge = 16 << _STAR_Q
+        i = 0
+        while i < self.count:
+            left = life[i] - 1
+            v = vx[i] - _STAR_GRAVITY
+            px = x[i] + v
+            py = y[i] + vy[i]
+            if left <= 0 or px < 0 or px >= edge or py < 0 or py >= edge:
+                self._kill(i)
+                continue
+            life[i] = left
+            vx[i] = v
+            x[i] = px
+            y[i] = py
+            i += 1
+        if not self.frames_left:
+            self.count = 0
+
+    def draw(self, graphics):
+        """Draw the live stars, fading through their last frames. Does not update."""
+        if self._pens_for is not graphics:
+            self._pens = []
+            for r, g, b in (_STAR_HOT, _STAR_SOFT):
+                for level in range(1, _STAR_FADES + 1):
+                    self._pens.append(graphics.create_pen(
+                        r * level // _STAR_FADES, g * level // _STAR_FADES,
+                        b * level // _STAR_FADES))
+            self._pens_for = graphics
+        pens = self._pens
+        phase = self.frame >> 2            # twinkle between the two colours
+        x, y, life, twinkle = self.x, self.y, self.life, self.twinkle
+        current = None
+        for i in range(self.count):
+            level = life[i] >> _STAR_FADE_SHIFT
+            if level >= _STAR_FADES:
+                level = _STAR_FADES - 1
+            pen = pens[((twinkle[i] + phase) & 1) * _STAR_FADES + level]
+            if pen is not current:
+                graphics.set_pen(pen)
+                current = pen
+            display.pixel(graphics, x[i] >> _STAR_Q, y[i] >> _STAR_Q)
+
+
+def _render_shower(graphics, su, shower):
+    graphics.set_pen(graphics.create_pen(0, 0, 0))
+    graphics.clear()
+    shower.draw(graphics)
+    su.update(graphics)
+
+
+def bench(graphics, counts=(100, 200, 300), frames=100):
     """
-    Run the Rocket Blast-off game until the player exits or it auto-sleeps.
+    Time StarShower.step() + draw() per frame with ``count`` live stars.
+    Returns [(count, us_per_frame)]; prints a table. On the toy:
+    ``import games.rocket_blast as r; r.bench(graphics)``.
+    """
+    results = []
+    print("stars   us/frame   %% of a %d ms frame" % FRAME_MS)
+    for count in counts:
+        shower = StarShower(max(count, MAX_STARS))
+        shower.start(frames + 1)
+        start = clock.ticks_us()
+        for _ in range(frames):
+            while shower.count < count:         # keep the pool topped up
+                shower._spawn_from_top(80)
+            shower.step()
+            shower.draw(graphics)
+        us = clock.ticks_diff(clock.ticks_us(), start) // frames
+        results.append((count, us))
+        print("{:>5} {:>10} {:>10.1f}".format(count, us, us / (FRAME_MS * 10)))
+    return results
+
+
+def frames(su, graphics, kx, should_exit=None):
+    """
+    Frames of the Rocket Blast-off game until the player exits or it auto-sleeps.
 
     should_exit() is polled each frame (the boat+butterfly hold from main.py).
     Returns EXIT if the player toggled out, or SLEEP if the toy was left still
     (rocket grounded, no shaking) for STILL_SLEEP_MS.
     """
     rocketball = Rocket()
-    last_active = time.ticks_ms()
-    last_debug = time.ticks_ms()
+    shower = StarShower()
+    framestore.shared().select(SPRITE_NAME)
+    last_active = clock.ticks_ms()
+    last_debug = clock.ticks_ms()
     whoosh_played = False   # whoosh fires once per flight; re-armed on landing
+    # The KX134, the trace Recorder wrapping it and a replayed trace all
+    # buffer; only a reader with nothing but read_xyz() falls back.
+    meter = ShakeMeter(kx) if FIFO_SHAKE and hasattr(kx, 'read_buffer') else None
+
+    try:
+        while True:
+            if should_exit and should_exit():
+                return EXIT
+
+            if meter:
+                shake = meter.update()
+            else:
+                raw = kx.read_xyz()
+                shake = shake_amount(*raw)
+
+            # Launched: the star shower plays out (the next rocket waits on
+            # the ground) with input still polled every frame.
+            if shower.active:
+                shower.step(shake)
+                last_active = last_debug = clock.ticks_ms()
+                _render_shower(graphics, su, shower)
+                yield FRAME_MS
+                continue
+
+            # Whoosh when a flight begins: the first shake after the rocket has been
+            # resting on the ground. It plays once and won't repeat until the rocket
+            # lands (or launches) and shaking starts again.
+            if shake > 0.0 and not whoosh_played:
+                metrics.inc(metrics.ROCKET_FLIGHTS)
+                _try_play(su, LAUNCH_SOUND)
+                whoosh_played = True
+
+            if rocketball.step(shake):
+                # Blast off: stars appear with their own shimmer sound.
+                metrics.inc(metrics.ROCKET_LAUNCHES)
+                _try_play(su, STAR_SOUND)
+                shower.start()
+                rocketball = Rocket()          # fresh rocket waits on the ground
+                whoosh_played = False          # re-arm the whoosh for the next flight
+                continue
+
+            # Back on the ground and not being shaken → the flight is over; re-arm
+            # the whoosh so the next shake starts a fresh one.
+            if rocketball.rx <= GROUND_RX and shake == 0.0:
+                whoosh_played = False
+
+            now = clock.ticks_ms()
+
+            # Tuning telemetry — the reading, derived shake, and rocket state.
+            if log.enabled(log.DEBUG) and clock.ticks_diff(now, last_debug) >= _DEBUG_INTERVAL_MS:
+                if meter:
+                    log.debug("[ROCKET] rms=%.2f peak=%.2fg  shake=%.2f  rx=%.1f/%.0f  vy=%+.2f",
+                              meter.rms, meter.peak, shake, rocketball.rx, LAUNCH_RX,
+                              rocketball.vy)
+                else:
+                    log.debug("[ROCKET] raw=(%+.2f,%+.2f,%+.2f)g  "
+                              "shake=%.2f  rx=%.1f/%.0f  vy=%+.2f",
+                              raw[0], raw[1], raw[2], shake, rocketball.rx, LAUNCH_RX,
+                              rocketball.vy)
+                last_debug = now
+
+            if rocketball.is_active(shake):
+                last_active = now
+            elif clock.ticks_diff(now, last_active) >= STILL_SLEEP_MS:
+                return SLEEP
+
+            _render(graphics, su, rocketball, shake)
+            yield FRAME_MS
+    finally:
+        if meter:
+            meter.close()
+
 
-    while True:
-        if should_exit and should_exit():
-            return EXIT
-
-        raw = kx.read_xyz()
-        shake = shake_amount(*raw)
-
-        # Whoosh when a flight begins: the first shake after the rocket has been
-        # resting on the ground. It plays once and won't repeat until the rocket
-        # lands (or launches) and shaking starts again.
-        if shake > 0.0 and not whoosh_played:
-            _try_play(su, LAUNCH_SOUND)
-            whoosh_played = True
-
-        if rocketball.step(shake):
-            _play_launch(su, graphics)
-            rocketball = Rocket()          # fresh rocket drops back to the ground
-            last_active = time.ticks_ms()
-            last_debug = time.ticks_ms()
-            whoosh_played = False          # re-arm the whoosh for the next flight
-            continue
-
-        # Back on the ground and not being shaken → the flight is over; re-arm
-        # the whoosh so the next shake starts a fresh one.
-        if rocketball.rx <= GROUND_RX and shake == 0.0:
-            whoosh_played = False
-
-        now = time.ticks_ms()
-
-        # Tuning telemetry — raw g-force, derived shake, and rocket state.
-        if DEBUG and time.ticks_diff(now, last_debug) >= _DEBUG_INTERVAL_MS:
-            rx, ry, rz = raw
-            print("[ROCKET] raw=({:+.2f},{:+.2f},{:+.2f})g  shake={:.2f}  "
-                  "rx={:.1f}/{:.0f}  vy={:+.2f}".format(
-                      rx, ry, rz, shake, rocketball.rx, LAUNCH_RX, rocketball.vy))
-            last_debug = now
-
-        if rocketball.is_active(shake):
-            last_active = now
-        elif time.ticks_diff(now, last_active) >= STILL_SLEEP_MS:
-            return SLEEP
-
-        _render(graphics, su, rocketball, shake)
-        time.sleep_ms(FRAME_MS)
+def run(su, graphics, kx, should_exit=None):
+    """Run Rocket Blast-off, blocking until it returns; see frames()."""
+    return coro.run(frames(su, graphics, kx, should_exit), clock.sleep_ms)
@@ -6,19 +6,26 @@ the four edges (losing a little energy each time), changes colour by direction
 of travel, and leaves a fading trail. Light friction lets it settle when the
 toy is held level. Entered/exited from main.py by holding yellow+red for 5s.
 
-Physics (TiltBall) is pure and hardware-free so it can be unit-tested; run()
+Physics is pure and hardware-free so it can be unit-tested. TiltBall is the
+float reference; FixedTiltBall is the same model in integer fixed point, which
+run() uses so a frame of physics allocates no floats (each float result is a
+heap object on MicroPython, and this mode runs for minutes at 30 fps). run()
 wires it to the KX134, display and sound.
 """
 
-import time
+from array import array
 
-from lib import display, sound
+from lib import clock, coro, metrics, sound
+from lib.compositor import BLACK, SIZE, CELLS, Compositor
 
 BOUNCE_SOUND = "sounds/bounce.wav"   # plays on each wall hit if present (issue #10)
 FRAME_MS = 33            # ~30 fps
 STILL_SLEEP_MS = 2 * 60 * 1000   # held still this long → return SLEEP
-TRAIL_LEN = 8            # number of past positions kept in the fading trail
+TRAIL_LEN = 8            # frames of past positions kept in the fading trail
 TRAIL_MAX_BRIGHT = 0.6   # brightest a trail pixel gets (ball itself is full)
+TRAIL_LEVELS = 64        # most fade steps a trail has; longer trails step every few frames
+AA_SHIFT = 3             # ball drawn at 1/8-pixel positions (anti-aliased)
+AA_LEVELS = 8            # brightness steps of a partly covered ball pixel
 
 # run() return values
 EXIT = "exit"    # player exited via the yellow+red toggle
@@ -43,12 +50,74 @@ BOUNCE_MIN_SPEED = 0.4  # min impact speed that counts as a bounce (plays sound)
 FRICTION = 0.92      # fraction of velocity kept each frame (lets it settle)
 ACTIVITY_SPEED = 0.15  # min speed (px/frame) counted as Tilt Activity
 
+# Fixed point (FixedTiltBall): positions/velocities are Q20 pixels (and
+# pixels/frame); tilt arrives as Q12 g, which is exactly the KX134's raw count
+# at ±8 g. The tuning factors become small exact fractions n/d, so every
+# product stays below 2**30 up to 44 px/frame — far past the 8 g terminal
+# speed — and nothing is promoted to a heap-allocated big int.
+Q = 20
+ONE = 1 << Q
+TILT_Q = 12              # tilt input: KX134 counts, 4096 per g
+_MOVE_SHIFT = 6          # is_moving() squares speeds at Q14 to stay small
+
+
+def _fraction(value, max_den=64):
+    """A tuning factor as an exact (numerator, denominator) pair."""
+    for den in range(1, max_den + 1):
+        num = int(value * den + 0.5)
+        if abs(num / den - value) < 1e-9:
+            return num, den
+    raise ValueError("%r is not n/d with d <= %d" % (value, max_den))
+
+
+def _at_least(value, one=ONE):
+    """Smallest integer n with n / one >= value (value >= 0)."""
+    n = int(value * one)
+    return n if n >= value * one else n + 1
+
+
+def _derive():
+    """Fixed-point forms of the physics tuning constants."""
+    global _ACCEL_N, _ACCEL_D, _FRICTION_N, _FRICTION_D, _DAMP_N, _DAMP_D
+    global _DEADZONE_Q, _BOUNCE_MIN_Q, _ACTIVITY_Q, _ACTIVITY_SQ
+    _ACCEL_N, _ACCEL_D = _fraction(ACCEL_SCALE)
+    _ACCEL_N <<= Q - TILT_Q                  # Q12 g in → Q20 px/frame out
+    _FRICTION_N, _FRICTION_D = _fraction(FRICTION)
+    _DAMP_N, _DAMP_D = _fraction(BOUNCE_DAMP)
+    _DEADZONE_Q = _at_least(DEADZONE, 1 << TILT_Q)
+    _BOUNCE_MIN_Q = _at_least(BOUNCE_MIN_SPEED)
+    _ACTIVITY_Q = _at_least(ACTIVITY_SPEED)
+    _ACTIVITY_SQ = _at_least(ACTIVITY_SPEED ** 2, (ONE >> _MOVE_SHIFT) ** 2)
+
+
+def tune(**settings):
+    """
+    Override physics tuning constants, e.g. tune(ACCEL_SCALE=0.2), and
+    re-derive their fixed-point forms. For desktop replays
+    (tools/replay_trace.py); on the toy, edit the constants above.
+    """
+    for name in settings:
+        if name not in _TUNABLE:
+            raise AttributeError("not a tuning constant: %s" % name)
+    globals().update(settings)
+    _derive()
+
+
+_TUNABLE = ("ACCEL_SCALE", "DEADZONE", "BOUNCE_DAMP", "BOUNCE_MIN_SPEED",
+            "FRICTION", "ACTIVITY_SPEED")
+_derive()
+_MIN_Q = int(MIN_POS * ONE)
+_MAX_Q = int(MAX_POS * ONE)
+_HALF = ONE // 2
+
 # Direction → colour (veneer-safe palette; see display-color-visibility memory).
 # Mapping of axis sign to physical direction may need flipping on hardware.
 RED    = (255, 0, 0)      # moving +x ("right")
 AQUA   = (0, 200, 255)    # moving -x ("left") — Aqua, never plain blue
 YELLOW = (255, 255, 0)    # moving +y ("up")
 GREEN  = (0, 255, 0)      # moving -y ("down")
+COLOURS = (RED, AQUA, YELLOW, GREEN)   # Trail stores an index into this
+_COLOUR_INDEX = {c: i for i, c in enumerate(COLOURS)}
 
 
 def _direction_colour(vx, vy):
@@ -77,6 +146,13 @@ def sensor_to_tilt(raw_x, raw_y):
     return raw_y, -raw_x
 
 
+def sensor_to_tilt_raw(raw_x, raw_y):
+    """sensor_to_tilt() for KX134 counts (Q12 g): same rotation and deadzone."""
+    raw_x = 0 if -_DEADZONE_Q < raw_x < _DEADZONE_Q else raw_x
+    raw_y = 0 if -_DEADZONE_Q < raw_y < _DEADZONE_Q else raw_y
+    return raw_y, -raw_x
+
+
 class TiltBall:
     """Continuous ball position/velocity in display pixel space."""
 
@@ -135,83 +211,314 @@ class TiltBall:
         """True while the ball is travelling fast enough to count as Tilt Activity."""
         return (self.vx * self.vx + self.vy * self.vy) >= ACTIVITY_SPEED ** 2
 
+    def pixel(self):
+        """The ball's top-left display pixel (x, y)."""
+        return int(round(self.x)), int(round(self.y))
 
-def _draw_block(graphics, x, y, colour):
-    """Draw a BALL_SIZE x BALL_SIZE block with its top-left at (x, y)."""
-    r, g, b = colour
-    graphics.set_pen(graphics.create_pen(r, g, b))
-    for dx in range(BALL_SIZE):
-        for dy in range(BALL_SIZE):
-            display.pixel(graphics, x + dx, y + dy)
 
+def _friction(v):
+    """v * FRICTION, rounded toward zero so a coasting ball comes to rest."""
+    if v >= 0:
+        return v * _FRICTION_N // _FRICTION_D
+    return -(-v * _FRICTION_N // _FRICTION_D)
 
-def _draw_border(graphics):
-    """Draw the 1px white frame around the edge of the display."""
-    graphics.set_pen(graphics.create_pen(*WHITE))
-    last = 15
-    for i in range(16):
-        display.pixel(graphics, i, 0)
-        display.pixel(graphics, i, last)
-        display.pixel(graphics, 0, i)
-        display.pixel(graphics, last, i)
 
+def _rebound(v):
+    """-v * BOUNCE_DAMP, rounded to nearest."""
+    return -((v * _DAMP_N + _DAMP_D // 2) // _DAMP_D)
 
-def _render(graphics, su, ball, trail):
-    """Clear the buffer, draw the frame, the fading trail, then the ball.
 
-    Clears the off-screen buffer directly (not display.clear, which would push
-    an extra black frame each loop and cause visible flicker).
+class FixedTiltBall:
     """
-    graphics.set_pen(graphics.create_pen(0, 0, 0))
-    graphics.clear()
-    _draw_border(graphics)
+    TiltBall in Q20 integer fixed point — same model, no float allocations.
 
-    # Trail: oldest (front of list) is dimmest, newest is brightest.
-    n = len(trail)
-    for i, (tx, ty, colour) in enumerate(trail):
-        factor = TRAIL_MAX_BRIGHT * (i + 1) / (n + 1)
-        r, g, b = colour
-        _draw_block(graphics, tx, ty, (int(r * factor), int(g * factor), int(b * factor)))
+    step() takes tilt as Q12 g (sensor_to_tilt_raw of KX134 counts); x/y/vx/vy
+    are Q20 pixels. The rendered pixel, bounces, colour and activity match
+    TiltBall frame for frame over recorded play (see the side-by-side property
+    test in tests/test_tilt.py).
+    """
 
-    ix = int(round(ball.x))
-    iy = int(round(ball.y))
-    _draw_block(graphics, ix, iy, ball.colour())
-    su.update(graphics)
+    def __init__(self, x=CENTRE, y=CENTRE):
+        self.x = int(x * ONE)
+        self.y = int(y * ONE)
+        self.vx = 0
+        self.vy = 0
+        self._colour = RED
+
+    def accelerate(self, ax, ay):
+        """Apply one frame of Q12 tilt and friction to the velocity only."""
+        if ax or ay:
+            self._colour = _direction_colour(ax, ay)
+        half = _ACCEL_D // 2
+        self.vx = _friction(self.vx + (ax * _ACCEL_N + half) // _ACCEL_D)
+        self.vy = _friction(self.vy + (ay * _ACCEL_N + half) // _ACCEL_D)
 
+    def step(self, ax, ay):
+        """Advance one frame given Q12 tilt; returns True on a wall bounce."""
+        self.accelerate(ax, ay)
+        vx = self.vx
+        vy = self.vy
+        self.x += vx
+        self.y += vy
 
-def run(su, graphics, kx, should_exit=None):
+        bounced = False
+        if self.x < _MIN_Q or self.x > _MAX_Q:
+            self.x = _MIN_Q if self.x < _MIN_Q else _MAX_Q
+            if vx >= _BOUNCE_MIN_Q or -vx >= _BOUNCE_MIN_Q:
+                bounced = True
+            self.vx = _rebound(vx)
+        if self.y < _MIN_Q or self.y > _MAX_Q:
+            self.y = _MIN_Q if self.y < _MIN_Q else _MAX_Q
+            if vy >= _BOUNCE_MIN_Q or -vy >= _BOUNCE_MIN_Q:
+                bounced = True
+            self.vy = _rebound(vy)
+
+        return bounced
+
+    def colour(self):
+        """The tilt-direction colour (see TiltBall.colour)."""
+        return self._colour
+
+    def is_moving(self):
+        """True while the ball is travelling fast enough to count as Tilt Activity."""
+        vx = abs(self.vx)
+        vy = abs(self.vy)
+        if vx >= _ACTIVITY_Q or vy >= _ACTIVITY_Q:
+            return True
+        vx >>= _MOVE_SHIFT       # keep the squares within small-int range
+        vy >>= _MOVE_SHIFT
+        return vx * vx + vy * vy >= _ACTIVITY_SQ
+
+    def pixel(self):
+        """The ball's top-left display pixel (x, y), rounded to nearest."""
+        return (self.x + _HALF) >> Q, (self.y + _HALF) >> Q
+
+
+def _fade(age, length=TRAIL_LEN):
+    """Brightness of a trail pixel ``age`` frames old (age 0 is under the ball)."""
+    return TRAIL_MAX_BRIGHT * (length - age) / (length + 1)
+
+
+def _trail_levels(length=TRAIL_LEN):
+    """Fade steps of a ``length``-frame trail: one per frame, up to TRAIL_LEVELS."""
+    return min(length, TRAIL_LEVELS)
+
+
+def _trail_pens(comp, length=TRAIL_LEN):
+    """
+    Fade table: pen for colour index c at fade level l is pens[c * levels + l],
+    where a pixel ``age`` frames old is at level age * levels // length.
+    """
+    levels = _trail_levels(length)
+    pens = []
+    for r, g, b in COLOURS:
+        for level in range(levels):
+            f = _fade((level * length + levels - 1) // levels, length)   # its first age
+            pens.append(comp.pen(int(r * f), int(g * f), int(b * f)))
+    return pens
+
+
+class Trail:
+    """
+    The ball's last ``length`` frames, drawn into the compositor's background.
+
+    Each cell the ball has covered remembers the frame it was last covered in
+    (its stamp) and that frame's colour index, and a ring keeps the ball pixel
+    of each recent frame, packed x << 4 | y. A cell's pen only changes when its
+    age reaches a new fade level, so draw() looks up just the frames at those
+    ages and repaints the cells they still own; the rest stay on the background
+    layer from earlier frames. A frame costs one lookup per fade level — at
+    most TRAIL_LEVELS, however long the trail — and a resting ball costs none.
+    Pushing and drawing never allocate.
+    """
+
+    def __init__(self, length=TRAIL_LEN):
+        self.length = length
+        self.levels = levels = _trail_levels(length)
+        self._pos = bytearray(length + 1)   # frame n's pixel at slot n % (length + 1)
+        self._stamp = array('H', bytes(2 * CELLS))
+        self._col = bytearray(CELLS)
+        self._now = 0                       # frame number of the newest push
+        # Frame numbers are stamps, so they wrap below 65536, and at a multiple
+        # of the ring's size so a frame keeps its slot across the wrap.
+        self._period = 65536 - 65536 % (length + 1)
+        self._seen = 0                      # frames pushed, up to length + 1
+        # Ages at which a pixel changes pen: 1, where it first shows, each
+        # new fade level, and length, where it drops off.
+        self._steps = array('H', [age for age in range(1, length + 1)
+                                  if age in (1, length)
+                                  or age * levels // length != (age - 1) * levels // length])
+
+    def __len__(self):
+        return min(self._seen, self.length)
+
+    def push(self, x, y, colour_index):
+        """Record this frame's ball pixel; the oldest frame drops off when full."""
+        now = self._now = (self._now + 1) % self._period
+        if self._seen <= self.length:
+            self._seen += 1
+        self._pos[now % (self.length + 1)] = (x << 4) | y
+        stamp = self._stamp
+        col = self._col
+        for dx in range(BALL_SIZE):
+            cell = (x + dx) * SIZE + y
+            for dy in range(BALL_SIZE):
+                stamp[cell + dy] = now
+                col[cell + dy] = colour_index
+
+    def draw(self, comp, pens):
+        """
+        Repaint the trail cells whose pen changed with the last push; call once
+        after every push(). The newest frame's cells keep what they showed (the
+        ball covers them) and join the fade a frame later, and a cell covered
+        again by a newer frame belongs to that frame instead.
+        """
+        length = self.length
+        levels = self.levels
+        ring = length + 1
+        now = self._now
+        period = self._period
+        stamp = self._stamp
+        col = self._col
+        for age in self._steps:
+            if age >= self._seen:
+                break                       # no such frame yet
+            frame = (now - age) % period
+            pos = self._pos[frame % ring]
+            x = pos >> 4
+            y = pos & 15
+            level = age * levels // length
+            for dx in range(BALL_SIZE):
+                for dy in range(BALL_SIZE):
+                    cell = (x + dx) * SIZE + y + dy
+                    if stamp[cell] == frame:
+                        pen = pens[col[cell] * levels + level] if age < length else BLACK
+                        comp.background(x + dx, y + dy, pen)
+
+
+AA_STEPS = 1 << AA_SHIFT
+
+
+def _aa_table():
+    """
+    Coverage weights for the anti-aliased ball, indexed
+    [((fx * AA_STEPS + fy) * 3 + dx) * 3 + dy] for a ball whose top-left corner
+    sits fx/AA_STEPS, fy/AA_STEPS of a pixel past (x, y). A 2x2 ball at a
+    fractional position overlaps a 3x3 patch: per axis it covers 1 - f of the
+    first pixel, all of the second and f of the third. Each weight is that
+    area in AA_LEVELS steps, rounded; 0 means the pixel is left alone.
     """
-    Run the Tilt Game until the player exits or the ball settles.
+    table = bytearray(AA_STEPS * AA_STEPS * 9)
+    area = AA_STEPS * AA_STEPS
+    for fx in range(AA_STEPS):
+        wx = (AA_STEPS - fx, AA_STEPS, fx)
+        for fy in range(AA_STEPS):
+            wy = (AA_STEPS - fy, AA_STEPS, fy)
+            base = (fx * AA_STEPS + fy) * 9
+            for dx in range(3):
+                for dy in range(3):
+                    table[base + dx * 3 + dy] = (wx[dx] * wy[dy] * AA_LEVELS + area // 2) // area
+    return table
+
+
+_AA = _aa_table()
+_AA_ROUND = 1 << (Q - AA_SHIFT - 1)   # round Q20 to the nearest 1/AA_STEPS pixel
+
+
+def _ball_pens(comp):
+    """Ball pens: colour index c at coverage level l is pens[c * (AA_LEVELS + 1) + l]."""
+    pens = []
+    for r, g, b in COLOURS:
+        for level in range(AA_LEVELS + 1):
+            pens.append(comp.pen(r * level // AA_LEVELS, g * level // AA_LEVELS,
+                                 b * level // AA_LEVELS))
+    return pens
+
+
+def _put_ball(comp, x, y, pens, colour_index):
+    """
+    Put a 2x2 ball at Q20 position (x, y), its brightness spread over the
+    pixels it overlaps by the precomputed weights — no per-frame float maths.
+    """
+    x = (x + _AA_ROUND) >> (Q - AA_SHIFT)
+    y = (y + _AA_ROUND) >> (Q - AA_SHIFT)
+    px = x >> AA_SHIFT
+    py = y >> AA_SHIFT
+    base = ((x & (AA_STEPS - 1)) * AA_STEPS + (y & (AA_STEPS - 1))) * 9
+    pens_base = colour_index * (AA_LEVELS + 1)
+    for dx in range(3):
+        for dy in range(3):
+            level = _AA[base + dx * 3 + dy]
+            if level:
+                comp.put(px + dx, py + dy, pens[pens_base + level])
+
+
+def _border_layer(comp):
+    """Put the 1px white frame into the compositor's static background."""
+    white = comp.pen(*WHITE)
+    last = 15
+    for i in range(16):
+        comp.background(i, 0, white)
+        comp.background(i, last, white)
+        comp.background(0, i, white)
+        comp.background(last, i, white)
+
+
+def _render(comp, su, ball, trail, pens, ball_pens):
+    """Composite the fading trail and the ball over the border and show it.
+
+    The ball is anti-aliased at its sub-pixel position (see _put_ball), so slow
+    rolls glide instead of stepping a whole pixel at a time. Only pixels that
+    changed since the last frame are drawn; the border is drawn once, on the
+    first frame.
+    """
+    trail.draw(comp, pens)
+    _put_ball(comp, ball.x, ball.y, ball_pens, _COLOUR_INDEX[ball.colour()])
+    comp.present(su)
+
+
+def frames(su, graphics, kx, should_exit=None):
+    """
+    Frames of the Tilt Game until the player exits or the ball settles.
 
     should_exit() is polled each frame (the yellow+red hold from main.py).
     Returns EXIT if the player toggled out, or SLEEP if the ball has been
     still for STILL_SLEEP_MS.
     """
-    ball = TiltBall()
-    trail = []
-    last_active = time.ticks_ms()
+    ball = FixedTiltBall()
+    trail = Trail()
+    comp = Compositor(graphics)
+    _border_layer(comp)
+    pens = _trail_pens(comp)
+    ball_pens = _ball_pens(comp)
+    last_active = clock.ticks_ms()
 
     while True:
         if should_exit and should_exit():
             return EXIT
 
-        ax, ay = sensor_to_tilt(*kx.read_xy())
+        ax, ay = sensor_to_tilt_raw(*kx.read_xy_raw())
         if ball.step(ax, ay):
+            metrics.inc(metrics.TILT_BOUNCES)
             try:
                 sound.play(su, BOUNCE_SOUND)
             except OSError:
                 pass   # bounce.wav not present yet (issue #10) — stay silent
 
-        # Record this position for the fading trail (keep the last TRAIL_LEN).
-        trail.append((int(round(ball.x)), int(round(ball.y)), ball.colour()))
-        if len(trail) > TRAIL_LEN:
-            trail.pop(0)
+        # Record this position for the fading trail (keeps the last TRAIL_LEN).
+        ix, iy = ball.pixel()
+        trail.push(ix, iy, _COLOUR_INDEX[ball.colour()])
 
-        now = time.ticks_ms()
+        now = clock.ticks_ms()
         if ball.is_moving():
             last_active = now
-        elif time.ticks_diff(now, last_active) >= STILL_SLEEP_MS:
+        elif clock.ticks_diff(now, last_active) >= STILL_SLEEP_MS:
             return SLEEP
 
-        _render(graphics, su, ball, trail)
-        time.sleep_ms(FRAME_MS)
+        _render(comp, su, ball, trail, pens, ball_pens)
+        yield FRAME_MS
+
+
+def run(su, graphics, kx, should_exit=None):
+    """Run the Tilt Game, blocking until it returns; see frames()."""
+    return coro.run(frames(su, graphics, kx, should_exit), clock.sleep_ms)
@@ -0,0 +1,249 @@
+"""
+Tilt Game, multi-ball — several balls roll around a few static obstacle blocks.
+
+Each ball uses the Tilt Game's fixed-point physics (tilt.FixedTiltBall), but
+instead of only clamping to the walls it moves through a 16x16 occupancy grid:
+a bytearray holding OBSTACLE for the border and blocks, a ball's number for
+the cells it covers, and 0 for free cells. Checking whether a move collides
+is then a lookup of the 2x2 cells the ball moves into, whatever the number of
+balls. Obstacles bounce a ball like a wall; two balls colliding swap their
+velocity along the axis of impact (an elastic collision of equal masses).
+
+Moves are taken at most one pixel at a time, so a fast ball can't tunnel
+through a block. Balls keep their own colour; there is no trail.
+
+run() and frames() have the same signatures and return values as tilt's;
+main.py plays it instead of the single ball when TILT_BALLS > 1. bench() measures the physics
+cost per frame as the ball count grows, on the device or the desktop (see
+tools/bench_tilt_multi.py).
+"""
+
+from games import tilt
+from lib import clock, coro, metrics, sound
+from lib.compositor import Compositor
+
+FRAME_MS = tilt.FRAME_MS
+EXIT = tilt.EXIT
+SLEEP = tilt.SLEEP
+
+OBSTACLE = 255   # grid value for the border and obstacle blocks (balls are 1..)
+FREE = 0
+
+# Static obstacle blocks as (x, y, height, width) in logical pixels, inside
+# the border. Kept small so the balls still have room to roll.
+OBSTACLES = (
+    (4, 4, 2, 2),
+    (10, 10, 2, 2),
+    (4, 10, 2, 2),
+    (10, 4, 2, 2),
+)
+OBSTACLE_COLOUR = (220, 180, 90)   # warm gold, veneer-safe
+BALL_COLOURS = (tilt.RED, tilt.YELLOW, tilt.AQUA, tilt.GREEN,
+                (255, 120, 0), (255, 255, 255))
+
+_SIZE = tilt.BALL_SIZE
+_ONE = tilt.ONE
+_HALF = tilt._HALF
+
+
+def _pixel(pos):
+    return (pos + _HALF) >> tilt.Q
+
+
+class MultiBall:
+    """
+    Several FixedTiltBalls and the obstacles, sharing one occupancy grid.
+
+    Positions/velocities are the balls' Q20 values; step() takes Q12 tilt
+    like FixedTiltBall.step() and returns True if anything hit hard enough to
+    play the bounce sound.
+    """
+
+    def __init__(self, count=3, obstacles=OBSTACLES):
+        self.grid = bytearray(256)
+        for i in range(16):
+            for cell in (i * 16, i * 16 + 15, i, 240 + i):
+                self.grid[cell] = OBSTACLE
+        for x, y, h, w in obstacles:
+            for dx in range(h):
+                for dy in range(w):
+                    self.grid[(x + dx) * 16 + y + dy] = OBSTACLE
+        self.obstacles = obstacles
+        self.balls = []
+        for px, py in self._free_spots(count):
+            self.balls.append(tilt.FixedTiltBall(px, py))
+            self._mark(len(self.balls), px, py)
+
+    def _free_spots(self, count):
+        """The first ``count`` free 2x2 spots, spiralling out from the centre."""
+        spots = []
+        taken = bytearray(self.grid)
+        order = sorted(((x, y) for x in range(1, 14) for y in range(1, 14)),
+                       key=lambda p: (abs(p[0] - 7) + abs(p[1] - 7), p))
+        for x, y in order:
+            if len(spots) == count:
+                break
+            cells = [(x + dx) * 16 + y + dy for dx in range(_SIZE) for dy in range(_SIZE)]
+            if all(taken[c] == FREE for c in cells):
+                for c in cells:
+                    taken[c] = OBSTACLE
+                spots.append((x, y))
+        if len(spots) < count:
+            raise ValueError("no room for %d balls" % count)
+        return spots
+
+    def _mark(self, value, px, py):
+        grid = self.grid
+        for dx in range(_SIZE):
+            base = (px + dx) * 16 + py
+            for dy in range(_SIZE):
+                grid[base + dy] = value
+
+    def _blocker(self, px, py):
+        """What occupies the 2x2 block at (px, py): FREE, OBSTACLE or a ball number."""
+        grid = self.grid
+        for dx in range(_SIZE):
+            base = (px + dx) * 16 + py
+            for dy in range(_SIZE):
+                v = grid[base + dy]
+                if v:
+                    return v
+        return FREE
+
+    def _slide(self, pos, vel, other, vertical):
+        """
+        Move one axis by vel, a pixel at a time, stopping at the first
+        collision. Returns (pos, vel, hit) where hit is FREE, OBSTACLE or the
+        number of the ball run into.
+        """
+        remaining = vel
+        px = _pixel(pos)
+        while remaining:
+            step = _ONE if remaining > _ONE else -_ONE if remaining < -_ONE else remaining
+            npx = _pixel(pos + step)
+            if npx != px:
+                hit = self._blocker(npx, other) if vertical else self._blocker(other, npx)
+                if hit:
+                    return pos, vel, hit
+                px = npx
+            pos += step
+            remaining -= step
+        return pos, vel, FREE
+
+    def step(self, ax, ay):
+        """Advance every ball one frame; True if a hit was hard enough to hear."""
+        loud = False
+        balls = self.balls
+        for n in range(1, len(balls) + 1):
+            ball = balls[n - 1]
+            ball.accelerate(ax, ay)
+            px, py = ball.pixel()
+            self._mark(FREE, px, py)
+
+            ball.x, ball.vx, hit = self._slide(ball.x, ball.vx, py, True)
+            if hit:
+                loud |= self._collide(ball, hit, True)
+            px = _pixel(ball.x)
+            ball.y, ball.vy, hit = self._slide(ball.y, ball.vy, px, False)
+            if hit:
+                loud |= self._collide(ball, hit, False)
+
+            self._mark(n, px, _pixel(ball.y))
+        return loud
+
+    def _collide(self, ball, hit, vertical):
+        """Resolve a hit along one axis; True if it was a bounce worth a sound."""
+        v = ball.vx if vertical else ball.vy
+        if hit == OBSTACLE:
+            speed = v if v >= 0 else -v
+            v = tilt._rebound(v)
+            if vertical:
+                ball.vx = v
+            else:
+                ball.vy = v
+            return speed >= tilt._BOUNCE_MIN_Q
+        other = self.balls[hit - 1]
+        if vertical:
+            ball.vx, other.vx = other.vx, v
+            rel = v - ball.vx
+        else:
+            ball.vy, other.vy = other.vy, v
+            rel = v - ball.vy
+        return (rel if rel >= 0 else -rel) >= tilt._BOUNCE_MIN_Q
+
+    def is_moving(self):
+        for ball in self.balls:
+            if ball.is_moving():
+                return True
+        return False
+
+
+def _scene(comp, world):
+    """Border and obstacle blocks into the compositor's background layer."""
+    white = comp.pen(*tilt.WHITE)
+    block = comp.pen(*OBSTACLE_COLOUR)
+    for x in range(16):
+        for y in range(16):
+            if world.grid[x * 16 + y] == OBSTACLE:
+                edge = x in (0, 15) or y in (0, 15)
+                comp.background(x, y, white if edge else block)
+
+
+def frames(su, graphics, kx, should_exit=None, balls=3):
+    """Frames of multi-ball Tilt until the player exits or every ball settles."""
+    world = MultiBall(balls)
+    comp = Compositor(graphics)
+    _scene(comp, world)
+    pens = [comp.pen(*BALL_COLOURS[i % len(BALL_COLOURS)]) for i in range(balls)]
+    last_active = clock.ticks_ms()
+
+    while True:
+        if should_exit and should_exit():
+            return EXIT
+
+        ax, ay = tilt.sensor_to_tilt_raw(*kx.read_xy_raw())
+        if world.step(ax, ay):
+            metrics.inc(metrics.TILT_BOUNCES)
+            try:
+                sound.play(su, tilt.BOUNCE_SOUND)
+            except OSError:
+                pass
+
+        now = clock.ticks_ms()
+        if world.is_moving():
+            last_active = now
+        elif clock.ticks_diff(now, last_active) >= tilt.STILL_SLEEP_MS:
+            return SLEEP
+
+        for i, ball in enumerate(world.balls):
+            px, py = ball.pixel()
+            comp.block(px, py, tilt.BALL_SIZE, pens[i])
+        comp.present(su)
+        yield FRAME_MS
+
+
+def run(su, graphics, kx, should_exit=None, balls=3):
+    """Run multi-ball Tilt, blocking until it returns; see frames()."""
+    return coro.run(frames(su, graphics, kx, should_exit, balls), clock.sleep_ms)
+
+
+def bench(counts=(1, 2, 4, 8, 12, 16), frames=300):
+    """
+    Time MultiBall.step() for each ball count over a sloshing tilt. Returns
+    [(count, us_per_frame)]; prints a table. Runs under MicroPython too:
+    ``import games.tilt_multi as m; m.bench()``.
+    """
+    results = []
+    print("balls   us/frame   %% of a %d ms frame" % FRAME_MS)
+    for count in counts:
+        world = MultiBall(count)
+        start = clock.ticks_us()
+        for i in range(frames):
+            phase = (i // 40) % 4       # tip the toy round in a square
+            ax = 3000 if phase in (0, 1) else -3000
+            ay = 3000 if phase in (1, 2) else -3000
+            world.step(ax, ay)
+        us = clock.ticks_diff(clock.ticks_us(), start) // frames
+        results.append((count, us))
+        print("{:>5} {:>10} {:>10.1f}".format(count, us, us / (FRAME_MS * 10)))
+    return results
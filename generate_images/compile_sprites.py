@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Compile sprite designs into device-ready indexed-colour sheets (lib/sprites.py).
+
+Inputs are the pixel layouts the preview scripts draw their PNGs from — a
+function returning frames of (col, row, rgb) pixels, or the ASCII rows + legend
+format (see _parse() in generate_candidate_images.py) — or PNG images, so a
+design is defined once and both previewed and shipped from it. Each output file
+holds every frame cropped to their shared bounding box, with a palette of at
+most 255 colours (4 bits per pixel when 15 or fewer).
+
+With no arguments, rebuilds the device frame store (lib/framestore.py) from
+every sheet listed in sprite_sources.SHEETS:
+
+  python3 generate_images/compile_sprites.py
+
+Or compile ad-hoc sources into one sheet:
+
+  python3 generate_images/compile_sprites.py -o sprites/bird.spr \\
+      generate_images/generate_candidate_images.py:_BIRD_UP,_BIRD_LEVEL:_BIRD_LEGEND \\
+      images/candidates/bird/bird_down.png
+
+Run from project root. PIL is only needed for PNG inputs.
+"""
+
+import argparse
+import ast
+import importlib.util
+import os
+import struct
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+
+from lib import framestore  # noqa: E402
+from lib.sprites import HEADER, MAGIC  # noqa: E402
+
+GRID_W = 16
+GRID_H = 16
+BG     = (0, 0, 0)   # treated as transparent in PNG inputs
+
+
+# ── sources ──────────────────────────────────────────────────────────────────
+
+def parse(rows, legend):
+    """Turn a list of 16 char-rows + legend dict into a pixel list (col, row, rgb)."""
+    out = []
+    for row, line in enumerate(rows):
+        for col, ch in enumerate(line):
+            if ch in legend:
+                out.append((col, row, tuple(legend[ch])))
+    return out
+
+
+def _eval(node, names):
+    """Evaluate a literal expression, resolving names bound earlier in the file."""
+    if isinstance(node, ast.Name):
+        return names[node.id]
+    if isinstance(node, (ast.List, ast.Tuple)):
+        items = [_eval(e, names) for e in node.elts]
+        return items if isinstance(node, ast.List) else tuple(items)
+    if isinstance(node, ast.Dict):
+        return {_eval(k, names): _eval(v, names) for k, v in zip(node.keys, node.values)}
+    return ast.literal_eval(node)
+
+
+def read_literals(path):
+    """
+    Return the module-level literal assignments of a Python file, by name.
+
+    The file is parsed, not imported, so preview scripts that need PIL (or any
+    other host dependency) can be used as sprite sources without it installed.
+    Assignments that are not plain literals are skipped.
+    """
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    names = {}
+    for stmt in tree.body:
+        if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 \
+                and isinstance(stmt.targets[0], ast.Name):
+            try:
+                names[stmt.targets[0].id] = _eval(stmt.value, names)
+            except (ValueError, KeyError):
+                pass
+    return names
+
+
+def load_png(path):
+    """
+    Read a PNG as a pixel list (col, row, rgb), black treated as transparent.
+
+    Accepts a true 16x16 image or a scaled preview (e.g. 32px cells with grid
+    lines, as the generate_*.py scripts save) — each cell is sampled at its
+    centre.
+    """
+    from PIL import Image
+
+    img = Image.open(path).convert('RGB')
+    w, h = img.size
+    if w % GRID_W or h % GRID_H:
+        raise ValueError(f"{path}: {w}x{h} is not a multiple of {GRID_W}x{GRID_H}")
+    cw, ch = w // GRID_W, h // GRID_H
+    out = []
+    for row in range(GRID_H):
+        for col in range(GRID_W):
+            colour = img.getpixel((col * cw + cw // 2, row * ch + ch // 2))
+            if colour != BG:
+                out.append((col, row, colour))
+    return out
+
+
+def load_script(path):
+    """
+    Import a preview script by path (each is imported once).
+
+    The scripts import PIL only where they render, so their pixel layouts can
+    be compiled without it installed.
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    module = sys.modules.get(name)
+    if module is None or getattr(module, '__file__', None) != os.path.abspath(path):
+        spec = importlib.util.spec_from_file_location(name, os.path.abspath(path))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def load_source(spec):
+    """
+    Load one source into a list of frames (pixel lists).
+
+      image.png                       → one frame
+      script.py:FUNCTION              → the frames FUNCTION() returns
+      script.py:ROWS[,ROWS...]:LEGEND → one frame per rows variable
+    """
+    if spec.lower().endswith('.png'):
+        return [load_png(spec)]
+    if spec.count(':') == 1:
+        path, function = spec.split(':')
+        return [list(pixels) for pixels in getattr(load_script(path), function)()]
+    path, rows_names, legend_name = spec.rsplit(':', 2)
+    names = read_literals(path)
+    legend = names[legend_name]
+    return [parse(names[n], legend) for n in rows_names.split(',')]
+
+
+# ── packing ──────────────────────────────────────────────────────────────────
+
+def pack_sheet(frames):
+    """
+    Pack frames (lists of (col, row, rgb)) into sheet bytes for lib/sprites.py.
+
+    Frames are cropped to the bounding box shared by all of them, so a sprite
+    that only uses part of the grid costs only that part per frame.
+    """
+    palette = [BG]          # index 0: transparent
+    index = {}
+    cells = []
+    for pixels in frames:
+        grid = {}
+        for col, row, colour in pixels:
+            if not (0 <= col < GRID_W and 0 <= row < GRID_H):
+                continue
+            colour = tuple(colour)
+            if colour not in index:
+                index[colour] = len(palette)
+                palette.append(colour)
+            grid[(col, row)] = index[colour]
+        cells.append(grid)
+
+    if len(palette) > 256:
+        raise ValueError(f"{len(palette) - 1} colours; a sheet holds at most 255")
+
+    used = [c for grid in cells for c in grid]
+    if used:
+        left = min(c for c, _ in used)
+        top = min(r for _, r in used)
+        width = max(c for c, _ in used) - left + 1
+        height = max(r for _, r in used) - top + 1
+    else:
+        left = top = 0
+        width = height = 1
+    bpp = 4 if len(palette) <= 16 else 8
+
+    out = bytearray(struct.pack(HEADER, MAGIC, width, height, left, top,
+                                bpp, len(palette), len(frames)))
+    for r, g, b in palette:
+        out += bytes((r, g, b))
+    for grid in cells:
+        for row in range(top, top + height):
+            line = [grid.get((col, row), 0) for col in range(left, left + width)]
+            if bpp == 4:
+                if len(line) % 2:
+                    line.append(0)
+                out += bytes((line[i] << 4) | line[i + 1] for i in range(0, len(line), 2))
+            else:
+                out += bytes(line)
+    return bytes(out)
+
+
+def pack_store(sheets):
+    """
+    Pack named sheets ({name: sheet bytes}) into one frame-store file.
+
+    The index comes first so the device can open the store by reading only
+    the index, then seek straight to the animation it needs.
+    """
+    names = list(sheets)
+    offset = struct.calcsize(framestore.HEADER) + len(names) * struct.calcsize(framestore.ENTRY)
+    out = bytearray(struct.pack(framestore.HEADER, framestore.MAGIC, len(names)))
+    for name in names:
+        encoded = name.encode()
+        if len(encoded) > 12:
+            raise ValueError(f"sheet name {name!r} is longer than 12 bytes")
+        out += struct.pack(framestore.ENTRY, encoded, offset, len(sheets[name]))
+        offset += len(sheets[name])
+    for name in names:
+        out += sheets[name]
+    return bytes(out)
+
+
+def _write(data, out_path, what):
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    with open(out_path, 'wb') as f:
+        f.write(data)
+    print(f'  saved {out_path} ({what}, {len(data)} bytes)')
+
+
+def write_sheet(frames, out_path):
+    _write(pack_sheet(frames), out_path, f'{len(frames)} frames')
+
+
+def build_store():
+    """Pack every sheet declared in sprite_sources.SHEETS into one store."""
+    sources = read_literals(os.path.join(HERE, 'sprite_sources.py'))
+    sheets = {}
+    for name, specs in sources['SHEETS'].items():
+        frames = []
+        for spec in specs:
+            frames.extend(load_source(os.path.join(HERE, spec)))
+        sheets[name] = pack_sheet(frames)
+    return pack_store(sheets)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('-o', '--output', help='sheet file to write')
+    ap.add_argument('sources', nargs='*', help='PNG files or script.py:ROWS:LEGEND')
+    args = ap.parse_args(argv)
+
+    if not args.sources:
+        _write(build_store(), framestore.STORE_FILE, 'frame store')
+        return
+    if not args.output:
+        ap.error('-o/--output is required when sources are given')
+    frames = []
+    for spec in args.sources:
+        frames.extend(load_source(spec))
+    write_sheet(frames, args.output)
+
+
+if __name__ == '__main__':
+    main()
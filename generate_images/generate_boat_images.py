@@ -6,11 +6,13 @@ Generate front-wheelhouse trawler preview images for the 16×16 LED matrix toy.
 - Blue water at bottom 2 rows (rows 14–15)
 - Animation: drifts right to left with gentle 1-pixel bob
 
+The boat's pixels (_boat) are also what compile_sprites.py packs into the
+device frame store, via sprite_frames(); PIL is imported only to render.
+
 Run from project root:  python3 generate_boat_images.py
 """
 
 import os
-from PIL import Image, ImageDraw
 
 CELL       = 32
 COMP_CELL  = 22
@@ -81,9 +83,16 @@ def _boat(bx=0, by=0):
     return out
 
 
+def sprite_frames():
+    """The device sprite: the boat at its base position, water left procedural."""
+    return [_boat()]
+
+
 # ── rendering ─────────────────────────────────────────────────────────────────
 
 def _render(bx=0, by=0, cell=CELL):
+    from PIL import Image, ImageDraw
+
     grid = [[BG] * GRID_W for _ in range(GRID_H)]
 
     # Water first, then boat on top (boat can overlap water when bobbing down)
@@ -126,6 +135,8 @@ TITLE_H = 22
 
 
 def _make_composite():
+    from PIL import Image, ImageDraw
+
     n  = len(KEY_FRAMES)
     cw = COMP_CELL * GRID_W
     ch = COMP_CELL * GRID_H
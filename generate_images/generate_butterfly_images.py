@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Generate butterfly preview images for the 16×16 LED matrix toy.
+- Pink body and antennae, white wing spots
+- Wings banded warm→cool from the body outward (pink, orange, yellow, light
+  blue, purple)
+- Animation: wings flap between closed and fully spread; the body bobs a row
+
+The wing layout (_butterfly) is also what compile_sprites.py packs into the
+device frame store, one frame per spread step, via sprite_frames(); PIL is
+imported only to render.
+
+Run from project root:  python3 generate_images/generate_butterfly_images.py
+"""
+
+import os
+
+CELL       = 32
+COMP_CELL  = 22
+GRID_W     = 16
+GRID_H     = 16
+GRID_COLOR = (12, 12, 18)
+BG         = (0, 0, 0)
+
+BODY    = (255,  80, 160)   # pink body — stands out against the wings
+ANTENNA = (255,  80, 160)
+SPOT    = (255, 255, 255)   # white wing spots
+
+# Wing colours, warm→cool from body outward
+WING = [
+    (255,  50, 150),  # pink  (nearest to body)
+    (255, 100,  50),  # orange
+    (255, 255,   0),  # yellow
+    (100, 200, 255),  # light blue
+    (200, 100, 255),  # purple
+]
+
+# Frames in the device sheet: spread 0.0 (closed) to 1.0 (fully open) in even
+# steps. animations/butterfly.py picks the nearest by the sheet's frame count.
+FLAP_FRAMES = 9
+
+# ── butterfly pixels ──────────────────────────────────────────────────────────
+# cx/cy are the body centre column/row; spread (0.0–1.0) opens the wings.
+#
+#   Body      col cx, rows cy-4 … cy+3
+#   Upper wings  rows cy-3 … cy+1, 2–7 columns out from the body
+#   Lower wings  rows cy+1 … cy+4, 1–5 columns out
+#   Spots     one per wing, moving outward as the wings open
+#   Antennae  3 pixels each, diagonal outward from the head
+
+def _butterfly(spread, cx=8, cy=8):
+    """Return list of (col, row, rgb). Clips nothing — caller filters out-of-bounds."""
+    out = []
+
+    # Body (8 pixels tall, centred at cy)
+    for dy in range(-4, 4):
+        out.append((int(cx), int(cy + dy), BODY))
+
+    # Upper wings
+    upper_width  = min(7, int(6 * spread) + 2)   # 2–7 columns from body at spread 0→1
+    upper_height = 5
+    for side in (-1, 1):
+        for wy in range(upper_height):
+            row_w = max(1, upper_width - wy // 2)
+            for wx in range(1, row_w + 1):
+                out.append((int(cx + side * wx), int(cy - 3 + wy),
+                            WING[min(wx - 1, len(WING) - 1)]))
+
+    # Lower wings
+    lower_width  = int(4 * spread) + 1   # 1–5 columns from body
+    lower_height = 4
+    for side in (-1, 1):
+        for wy in range(lower_height):
+            row_w = max(1, lower_width - abs(wy - 1))
+            for wx in range(1, row_w + 1):
+                out.append((int(cx + side * wx), int(cy + 1 + wy),
+                            WING[(min(wx - 1, len(WING) - 1) + 2) % len(WING)]))
+
+    # White wing spots
+    for side in (-1, 1):
+        out.append((int(cx + side * max(1, int(3 * spread + 1))), int(cy - 1), SPOT))
+        out.append((int(cx + side * max(1, int(2 * spread + 1))), int(cy + 2), SPOT))
+
+    # Antennae — pink, 3 pixels each, diagonal outward from head
+    for side in (-1, 1):
+        for step in range(3):
+            out.append((int(cx + side * (step + 1)), int(cy - 4 - step), ANTENNA))
+
+    return out
+
+
+def sprite_frames():
+    """The device sprite: one frame per spread step, closed to fully open."""
+    return [_butterfly(i / (FLAP_FRAMES - 1)) for i in range(FLAP_FRAMES)]
+
+
+# ── rendering ─────────────────────────────────────────────────────────────────
+
+def _render(spread, cy=8, cell=CELL):
+    from PIL import Image, ImageDraw
+
+    grid = [[BG] * GRID_W for _ in range(GRID_H)]
+    for col, row, colour in _butterfly(spread, cy=cy):
+        if 0 <= col < GRID_W and 0 <= row < GRID_H:
+            grid[row][col] = colour
+
+    W, H = cell * GRID_W, cell * GRID_H
+    img  = Image.new('RGB', (W, H))
+    draw = ImageDraw.Draw(img)
+    for row in range(GRID_H):
+        for col in range(GRID_W):
+            x0, y0 = col * cell, row * cell
+            draw.rectangle([x0, y0, x0 + cell - 1, y0 + cell - 1],
+                           fill=grid[row][col])
+    for i in range(GRID_W + 1):
+        draw.line([(i * cell, 0), (i * cell, H)], fill=GRID_COLOR, width=1)
+    for i in range(GRID_H + 1):
+        draw.line([(0, i * cell), (W, i * cell)], fill=GRID_COLOR, width=1)
+    return img
+
+
+# ── flap composite ────────────────────────────────────────────────────────────
+
+KEY_FRAMES = [
+    (0.0,  8, 'Closed'),
+    (0.5,  8, 'Half'),
+    (0.75, 7, 'Opening\n(bob up)'),
+    (1.0,  8, 'Open\n(hold)'),
+]
+
+LABEL_H = 48
+TITLE_H = 22
+
+
+def _make_composite():
+    from PIL import Image, ImageDraw
+
+    n  = len(KEY_FRAMES)
+    cw = COMP_CELL * GRID_W
+    ch = COMP_CELL * GRID_H
+    W  = n * (cw + 1) - 1
+    H  = TITLE_H + ch + LABEL_H
+
+    img  = Image.new('RGB', (W, H), (18, 18, 25))
+    draw = ImageDraw.Draw(img)
+    draw.text((6, 4), 'Butterfly — wings flap closed → open, body bobs a row',
+              fill=(190, 200, 215))
+
+    for i, (spread, cy, label) in enumerate(KEY_FRAMES):
+        frame = _render(spread, cy, cell=COMP_CELL)
+        x_off = i * (cw + 1)
+        img.paste(frame, (x_off, TITLE_H))
+        for j, line in enumerate(label.split('\n')):
+            draw.text((x_off + 4, TITLE_H + ch + 6 + j * 14), line,
+                      fill=(200, 210, 220))
+
+    return img
+
+
+# ── main ──────────────────────────────────────────────────────────────────────
+
+def main():
+    out_dir = os.path.join('images', 'butterfly')
+    os.makedirs(out_dir, exist_ok=True)
+
+    path = os.path.join(out_dir, 'design.png')
+    _render(1.0).save(path)
+    print(f'  saved {path}')
+
+    path = os.path.join(out_dir, 'composite.png')
+    _make_composite().save(path)
+    print(f'  saved {path}')
+
+    print('\nDone.')
+
+
+if __name__ == '__main__':
+    main()
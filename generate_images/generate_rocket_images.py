@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 """
 Generate rocket animation preview images for the dot-matrix wooden toy.
-Creates images/rocket/v1/, v2/, v3/ with frame PNGs and composite images.
+Creates images/rocket/v1/, v2/, v3/ with frame PNGs and composite images, and
+images/rocket/toy/ and images/rocket/game/ with the two rockets that ship.
+
+The shipped layouts (_rocket_pixels in the TOY palette for the rocket
+Animation, _game_rocket_pixels for Rocket Blast-off) are also what
+compile_sprites.py packs into the device frame store, via sprite_frames() and
+game_sprite_frames(); PIL is imported only to render.
 
 Run from project root:  python3 generate_rocket_images.py
 """
 
 import os
-from PIL import Image, ImageDraw
 
 # ── rendering constants ───────────────────────────────────────────────────────
 CELL      = 32     # pixels per LED cell (individual frames)
@@ -51,6 +56,25 @@ V3 = {   # High-energy — lime body, red-orange base flame
     'flame_hot':    (255, 222,  55),   # warm yellow tip
 }
 
+TOY = {   # What animations/rocket.py shows — mint body, four flame lengths
+    'sky':          (  0,   0,   0),
+    'body':         (  0, 255,  64),   # green-mint body
+    'nose':         (210,  30,  20),   # red nose cone + fins
+    'flame_outer':  (220,  85,  10),   # deep orange (closest to nozzle)
+    'flame_mid':    (255, 145,  20),   # orange mid
+    'flame_hot':    (255, 210,  40),   # yellow hot tip
+    'flame_tip':    (255, 245, 120),   # pale yellow extreme tip (flame_len 4)
+}
+
+GAME = {   # Rocket Blast-off — aqua, so it is told apart from the Animation
+    'sky':          (  0,   0,   0),
+    'body':         (  0, 200, 255),   # aqua body — the game rocket's signature colour
+    'nose':         (210,  30,  20),   # red nose cone + fins
+    'flame_outer':  (220,  85,  10),   # deep orange (nearest the nozzle)
+    'flame_hot':    (255, 210,  40),   # yellow hot tip
+    'flame_tip':    (255, 245, 120),   # pale yellow extreme tip
+}
+
 VERSIONS = [('v1', V1), ('v2', V2), ('v3', V3)]
 
 # ── rocket pixel layout ───────────────────────────────────────────────────────
@@ -65,6 +89,7 @@ VERSIONS = [('v1', V1), ('v2', V2), ('v3', V3)]
 #                  outer: cols 6-9  (4 wide, orange)
 #                  mid:   cols 6-9 or 5-10  (flickers)
 #                  hot:   cols 7-8  (2 wide, yellow)
+#                  tip:   cols 7-8  (2 wide, pale yellow; TOY only, flame_len 4)
 
 MAGNOLIA = (240, 240, 215)
 
@@ -120,15 +145,73 @@ def _rocket_pixels(palette, ry, flame_len=2, flame_seed=0):
         for col in (7, 8):
             pxs.append((col, ry + 11, p['flame_hot']))
 
+    if flame_len >= 4:
+        for col in (7, 8):
+            pxs.append((col, ry + 12, p['flame_tip']))
+
+    return pxs
+
+
+# ── game rocket pixel layout ──────────────────────────────────────────────────
+# Rocket Blast-off's own rocket: narrower and shorter than the Animation's.
+#
+#   Nose cone  — 2 rows: 2 → 4 wide                       (nose colour)
+#   Body       — rows ry+2 … ry+5, 4 wide (cols 6-9)      (aqua)
+#   Window     — row ry+3, cols 7-8, a single slim row     (magnolia)
+#   Fins       — row ry+4: cols 5, 10; row ry+5: cols 4-5, 10-11
+#   Flame      — 1-3 rows, 2 wide (cols 7-8): outer, hot, tip
+
+def _game_rocket_pixels(ry, flame_len=1):
+    """Return list of (col, row, rgb) for the game rocket with its nose at row ry."""
+    p = GAME
+    pxs = [(7, ry, p['nose']), (8, ry, p['nose'])]
+    for col in range(6, 10):
+        pxs.append((col, ry + 1, p['nose']))
+    for dy in (2, 3, 4, 5):
+        for col in range(6, 10):
+            pxs.append((col, ry + dy, p['body']))
+    for col in (7, 8):
+        pxs.append((col, ry + 3, MAGNOLIA))
+    for col in (5, 10):
+        pxs.append((col, ry + 4, p['nose']))
+    for col in (4, 5, 10, 11):
+        pxs.append((col, ry + 5, p['nose']))
+    for col in (7, 8):
+        pxs.append((col, ry + 6, p['flame_outer']))
+    if flame_len >= 2:
+        for col in (7, 8):
+            pxs.append((col, ry + 7, p['flame_hot']))
+    if flame_len >= 3:
+        for col in (7, 8):
+            pxs.append((col, ry + 8, p['flame_tip']))
     return pxs
 
 
+# ── device sprites ────────────────────────────────────────────────────────────
+# Nose on the top row; the device shifts a frame up or down to the rocket's
+# height. Frame order is the index animations/rocket.py and
+# games/rocket_blast.py compute from the flame state.
+
+def sprite_frames():
+    """The rocket Animation: frame (flame_len - 2) * 2 + flame_seed, flame_len 2-4."""
+    return [_rocket_pixels(TOY, 0, n, seed) for n in (2, 3, 4) for seed in (0, 1)]
+
+
+def game_sprite_frames():
+    """The Rocket Blast-off rocket: frame flame_len - 1, flame_len 1-3."""
+    return [_game_rocket_pixels(0, n) for n in (1, 2, 3)]
+
+
 # ── frame renderer ────────────────────────────────────────────────────────────
-def _render(palette, ry, flame_len=2, flame_seed=0, cell=CELL):
+def _render(palette, ry, flame_len=2, flame_seed=0, cell=CELL, pixels=None):
+    from PIL import Image, ImageDraw
+
     p = palette
     grid = [[p['sky']] * GRID_W for _ in range(GRID_H)]
 
-    for col, row, colour in _rocket_pixels(palette, ry, flame_len, flame_seed):
+    if pixels is None:
+        pixels = _rocket_pixels(palette, ry, flame_len, flame_seed)
+    for col, row, colour in pixels:
         if 0 <= col < GRID_W and 0 <= row < GRID_H:
             grid[row][col] = colour
 
@@ -174,7 +257,9 @@ def _add_text(draw, x, y, text, fill=(200, 210, 220)):
         draw.text((x, y + i * 13), line, fill=fill)
 
 
-def _make_composite(palette, frames, title):
+def _make_composite(palette, frames, title, pixels_of=None):
+    from PIL import Image, ImageDraw
+
     n  = len(frames)
     cw = COMP_CELL * GRID_W
     ch = COMP_CELL * GRID_H
@@ -186,7 +271,8 @@ def _make_composite(palette, frames, title):
     draw.text((6, 4), title, fill=(190, 200, 215))
 
     for i, (ry, flame_len, flame_seed, label) in enumerate(frames):
-        frame = _render(palette, ry, flame_len, flame_seed, cell=COMP_CELL)
+        pixels = pixels_of(ry, flame_len) if pixels_of else None
+        frame = _render(palette, ry, flame_len, flame_seed, cell=COMP_CELL, pixels=pixels)
         x_off = i * (cw + 1)
         img.paste(frame, (x_off, TITLE_H))
         _add_text(draw, x_off + 4, TITLE_H + ch + 4, label)
@@ -220,6 +306,22 @@ def main():
                         ).save(path)
         print(f'  saved {path}')
 
+    out_dir = os.path.join('images', 'rocket', 'toy')
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, 'composite_flicker.png')
+    _make_composite(TOY, [(3, n, seed, f'Flame {n}\nseed {seed}')
+                          for n in (2, 3, 4) for seed in (0, 1)],
+                    'Rocket Animation — every shipped flame frame').save(path)
+    print(f'  saved {path}')
+
+    out_dir = os.path.join('images', 'rocket', 'game')
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, 'composite_flame.png')
+    _make_composite(GAME, [(3, n, 0, f'Flame {n}') for n in (1, 2, 3)],
+                    'Rocket Blast-off — flame grows with shaking',
+                    pixels_of=_game_rocket_pixels).save(path)
+    print(f'  saved {path}')
+
     print('\nDone.')
 
 
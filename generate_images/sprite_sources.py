@@ -0,0 +1,25 @@
+"""
+Sources for the device frame store (sprites/frames.fst).
+
+Each sheet names where its frames come from, in any form compile_sprites.py
+load_source() accepts — usually the pixel-layout function of the preview
+script that designs the sprite, so the previews and the device draw the same
+pixels from one definition. compile_sprites.py reads this file without
+importing it, so it must stay plain literals.
+
+Run from project root:  python3 generate_images/compile_sprites.py
+"""
+
+# Frame-store name (max 12 chars) → sources, relative to generate_images/,
+# whose frames are concatenated in order. All of these are packed into
+# sprites/frames.fst.
+SHEETS = {
+    # Hull, wheelhouse and antenna; animations/boat.py keeps the water procedural.
+    'boat': ['generate_boat_images.py:sprite_frames'],
+    # One frame per wing spread, closed to fully open (animations/butterfly.py).
+    'butterfly': ['generate_butterfly_images.py:sprite_frames'],
+    # Every flame length and flicker of the rocket Animation (animations/rocket.py).
+    'rocket': ['generate_rocket_images.py:sprite_frames'],
+    # The Rocket Blast-off rocket's three flame lengths (games/rocket_blast.py).
+    'rocket_blast': ['generate_rocket_images.py:game_sprite_frames'],
+}
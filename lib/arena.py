@@ -0,0 +1,86 @@
+"""
+Fixed buffers reserved once at boot, before the heap fragments.
+
+lib/sound grabs its audio buffer the moment it is imported for the same
+reason: hours of animations and games leave the heap a patchwork of small
+free gaps, and a later bytearray that needs one contiguous block can fail
+with MemoryError though plenty is free in total. The other buffers the toy
+needs at a fixed size — core 1's framebuffers, the compositor's layers, the
+frame store's sprite page, the KX134 FIFO scratch — are declared here by
+the modules that own them and allocated together by reserve():
+
+  _FIFO = arena.declare("kx_fifo", 'B', BUFFER_SAMPLES * SAMPLE_SIZE)
+  ...
+  self._buf = arena.take(_FIFO)
+
+take() hands back the reserved buffer, zeroed, every time it is asked —
+whoever took it last owns it, so each name must have one user at a time
+(one game, one compositor, one Core1). Before reserve() has run, or for a
+name declared after it, take() simply allocates a new buffer, so the
+modules work unchanged in tests and tools. The zeroing is one copy from a
+zero buffer reserve() keeps per typecode, as long as the longest buffer of
+that typecode; those are the arena's only overhead.
+
+main.py imports everything, then calls reserve() before setting up the
+hardware. An owner that is otherwise only imported lazily (the frame store,
+which the boat animation loads) must be imported there too, or its buffer
+is allocated on first use after all.
+"""
+
+from array import array
+import gc
+import struct
+
+_specs = {}       # name -> (typecode, length)
+_buffers = {}     # name -> the reserved buffer
+_reserved = 0     # bytes reserved
+_zeros = {}       # typecode -> zeroed buffer as long as its longest reservation
+
+
+def declare(name, typecode, length):
+    """Declare a buffer of ``length`` items of ``typecode``; returns ``name``."""
+    _specs[name] = (typecode, length)
+    return name
+
+
+def _new(typecode, length):
+    if typecode == 'B':
+        return bytearray(length)
+    return array(typecode, bytes(struct.calcsize(typecode) * length))
+
+
+def reserve():
+    """Allocate every declared buffer not yet reserved; returns bytes reserved."""
+    global _reserved
+    gc.collect()   # so they are carved out of one clean heap
+    for name, (typecode, length) in _specs.items():
+        if name not in _buffers:
+            buf = _buffers[name] = _new(typecode, length)
+            _reserved += len(buf) * struct.calcsize(typecode)
+            if len(_zeros.get(typecode, ())) < length:
+                _zeros[typecode] = _new(typecode, length)
+    return _reserved
+
+
+def take(name):
+    """The buffer ``name``, zeroed: the reserved one if there is one."""
+    buf = _buffers.get(name)
+    if buf is None:
+        return _new(*_specs[name])
+    # One memmove from the zero buffer, rather than a store per item.
+    memoryview(buf)[:] = memoryview(_zeros[_specs[name][0]])[:len(buf)]
+    return buf
+
+
+def reserved():
+    """{name: bytes} of every reserved buffer."""
+    return {name: len(buf) * struct.calcsize(_specs[name][0])
+            for name, buf in _buffers.items()}
+
+
+def release():
+    """Drop every reserved buffer (for tests; the toy keeps them)."""
+    global _reserved
+    _buffers.clear()
+    _zeros.clear()
+    _reserved = 0
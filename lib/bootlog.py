@@ -0,0 +1,102 @@
+"""
+Boot-time profiler — wall time and heap delta of every startup step.
+
+main.py wraps each import and setup() step in ``with bootlog.step(name):`` and
+calls ready() once the toy is waiting for its first press. Each step is kept as
+a (name, elapsed_us, heap_delta_bytes) record; report() prints them as a table
+and save() writes them as JSON so boots can be compared across builds.
+
+The audio buffer comes first, so main.py imports sound before this module,
+reading the ticks and heap around it by hand, and hands them to record().
+Deliberately tiny all the same: it is loaded before anything else is.
+"""
+
+import gc
+
+from lib import clock
+
+LOG_FILE = "boot_profile.json"
+
+_records = []          # (name, elapsed_us, heap_delta_bytes)
+_ready_us = None       # boot-to-ready time once ready() has been called
+
+
+def _heap_used():
+    """Bytes of heap in use (gc.mem_alloc on the device, tracemalloc on desktop)."""
+    mem_alloc = getattr(gc, 'mem_alloc', None)
+    if mem_alloc:
+        return mem_alloc()
+    try:
+        import tracemalloc
+    except ImportError:
+        return 0
+    return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+_boot_us = clock.ticks_us()   # module import ≈ power-on, unless record() says earlier
+
+
+class step:
+    """Context manager that records one boot step's time and heap delta."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._heap = _heap_used()
+        self._start = clock.ticks_us()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = clock.ticks_diff(clock.ticks_us(), self._start)
+        _records.append((self.name, elapsed, _heap_used() - self._heap))
+        return False
+
+
+def record(name, start_us, heap_before):
+    """
+    Record a step that started before this module was imported, from the
+    ticks_us and heap in use at its start; it ends now. Boot-to-ready is
+    then counted from ``start_us``.
+    """
+    global _boot_us
+    _records.append((name, clock.ticks_diff(clock.ticks_us(), start_us),
+                     _heap_used() - heap_before))
+    if clock.ticks_diff(_boot_us, start_us) > 0:
+        _boot_us = start_us
+
+
+def ready():
+    """Mark the toy ready for input; returns boot-to-ready in microseconds."""
+    global _ready_us
+    _ready_us = clock.ticks_diff(clock.ticks_us(), _boot_us)
+    return _ready_us
+
+
+def records():
+    """The recorded steps as a list of dicts (name, us, heap)."""
+    return [{'name': n, 'us': us, 'heap': heap} for n, us, heap in _records]
+
+
+def summary():
+    """Everything recorded so far: steps plus boot-to-ready (None if not ready)."""
+    return {'ready_us': _ready_us, 'steps': records()}
+
+
+def report():
+    """Print the steps as a table, slowest first, followed by the total."""
+    print("[BOOT] step                          ms      heap")
+    for name, us, heap in sorted(_records, key=lambda r: -r[1]):
+        print("[BOOT] {:<28} {:>7.1f} {:>+9d}".format(name, us / 1000, heap))
+    if _ready_us is not None:
+        print("[BOOT] boot-to-ready {:.1f} ms".format(_ready_us / 1000))
+
+
+def save(filename=LOG_FILE):
+    """Write summary() as JSON. Failures (e.g. read-only flash) are ignored."""
+    import json
+    try:
+        with open(filename, 'w') as f:
+            json.dump(summary(), f)
+    except OSError:
+        pass
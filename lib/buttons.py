@@ -11,7 +11,8 @@ Pin mapping (active-low, internal pull-ups enabled):
 """
 
 from machine import Pin, I2C
-import time
+
+from lib import clock, log, metrics
 
 # MCP23017 I2C config
 MCP23017_ADDR = 0x20   # A0/A1/A2 all wired to GND
@@ -46,7 +47,7 @@ ROCKET_TOGGLE_BUTTONS = ('boat', 'butterfly')  # blue + pink
 TOGGLE_HOLD_MS = 5000
 
 _i2c = None
-_last_press_time = {name: 0 for name in BUTTON_BITS}
+_last_press_time = {name: None for name in BUTTON_BITS}   # None: not pressed yet
 
 # Per-combo hold state, keyed by the button tuple. Each entry tracks when the
 # hold began and whether it has already fired (so it fires once per hold).
@@ -65,43 +66,62 @@ def _read_portb():
     """Read port B byte from MCP23017. Returns 0xFF if not initialised."""
     if _i2c is None:
         return 0xFF
-    return _i2c.readfrom_mem(MCP23017_ADDR, _REG_GPIOB, 1)[0]
+    start = metrics.now()
+    try:
+        val = _i2c.readfrom_mem(MCP23017_ADDR, _REG_GPIOB, 1)[0]
+    except OSError:
+        metrics.inc(metrics.I2C_ERRORS)
+        raise
+    metrics.since(metrics.BTN_READ_US, start)
+    return val
+
+
+def snapshot():
+    """
+    Read every button at once: the port B byte (active-low). Pass it as
+    ``port`` to the functions below so one poll costs one I2C read; without
+    it each of them reads the port itself.
+    """
+    return _read_portb()
 
 
-def is_pressed(name):
+def is_pressed(name, port=None):
     """Check if a named button is currently pressed (no debounce)."""
     bit = BUTTON_BITS.get(name)
     if bit is None:
         return False
-    return (_read_portb() & (1 << bit)) == 0  # active-low
+    if port is None:
+        port = _read_portb()
+    return (port & (1 << bit)) == 0  # active-low
 
 
-def get_pressed():
+def get_pressed(port=None):
     """
     Return the name of a debounced button press, or None.
     Reads port B once and checks each button in priority order.
     """
-    val = _read_portb()
-    current_time = time.ticks_ms()
+    val = _read_portb() if port is None else port
+    current_time = clock.ticks_ms()
 
-    # Debug: log any raw presses
-    pressed_names = [n for n in BUTTON_ORDER if (val & (1 << BUTTON_BITS[n])) == 0]
-    if pressed_names:
-        print(f"[BTN DEBUG] Raw pressed: {', '.join(pressed_names)}")
+    # Debug: log any raw presses (port B as read, active-low)
+    if val != 0xFF:
+        log.debug("[BTN] Raw pressed: port B %02x", val)
 
     for name in BUTTON_ORDER:
         if (val & (1 << BUTTON_BITS[name])) == 0:  # active-low
-            if time.ticks_diff(current_time, _last_press_time[name]) > DEBOUNCE_MS:
+            last = _last_press_time[name]
+            # Not against 0: once ticks_ms is past half its period, 0 is ahead.
+            if last is None or clock.ticks_diff(current_time, last) > DEBOUNCE_MS:
                 _last_press_time[name] = current_time
-                print(f"[BTN DEBUG] Returning: {name}")
+                log.debug("[BTN] Returning: %s", name)
                 return name
 
     return None
 
 
-def any_pressed():
+def any_pressed(port=None):
     """Check if any button is currently pressed (no debounce)."""
-    val = _read_portb()
+    val = _read_portb() if port is None else port
     return any((val & (1 << bit)) == 0 for bit in BUTTON_BITS.values())
 
 
@@ -112,7 +132,7 @@ def reset_mode_toggle():
         state['fired'] = False
 
 
-def _check_combo_hold(combo):
+def _check_combo_hold(combo, port=None):
     """
     Detect a sustained hold of a two-button combo.
 
@@ -125,8 +145,10 @@ def _check_combo_hold(combo):
         state = {'start': None, 'fired': False}
         _toggle_state[combo] = state
 
-    now = time.ticks_ms()
-    both_held = all(is_pressed(name) for name in combo)
+    now = clock.ticks_ms()
+    if port is None:
+        port = _read_portb()
+    both_held = all(is_pressed(name, port) for name in combo)
 
     if not both_held:
         state['start'] = None
@@ -139,36 +161,36 @@ def _check_combo_hold(combo):
     if state['fired']:
         return False
 
-    if time.ticks_diff(now, state['start']) >= TOGGLE_HOLD_MS:
+    if clock.ticks_diff(now, state['start']) >= TOGGLE_HOLD_MS:
         state['fired'] = True
         return True
     return False
 
 
-def check_mode_toggle():
+def check_mode_toggle(port=None):
     """
     Detect a sustained hold of the yellow (star) + red (heart) buttons.
 
     Poll this from the main loop. Returns True exactly once per completed hold
     to toggle the Tilt Game on or off.
     """
-    return _check_combo_hold(TILT_TOGGLE_BUTTONS)
+    return _check_combo_hold(TILT_TOGGLE_BUTTONS, port)
 
 
-def check_rocket_toggle():
+def check_rocket_toggle(port=None):
     """
     Detect a sustained hold of the blue (boat) + pink (butterfly) buttons.
 
     Poll this from the main loop. Returns True exactly once per completed hold
     to toggle the Rocket Blast-off game on or off.
     """
-    return _check_combo_hold(ROCKET_TOGGLE_BUTTONS)
+    return _check_combo_hold(ROCKET_TOGGLE_BUTTONS, port)
 
 
 def wait_for_release():
     """Wait until all buttons are released."""
     while any_pressed():
-        time.sleep_ms(10)
+        clock.sleep_ms(10)
 
 
 def wait_for_press():
@@ -178,4 +200,4 @@ def wait_for_press():
         pressed = get_pressed()
         if pressed:
             return pressed
-        time.sleep_ms(10)
+        clock.sleep_ms(10)
@@ -0,0 +1,144 @@
+"""
+The toy's clock: ticks, their differences, sleeping and deadlines.
+
+Every module reads the time through here rather than importing time itself:
+
+  from lib import clock
+  start = clock.ticks_ms()
+  while clock.ticks_diff(clock.ticks_ms(), start) < 5000:
+      ...
+      clock.sleep_ms(33)
+
+so use() moves the whole toy — lib, the games and the animations — onto
+another backend in one call. There are two:
+
+  RealClock     MicroPython's time, the default. Its functions are bound
+                here as they are, so clock.ticks_ms() costs what
+                time.ticks_ms() did. On desktop CPython, which has no ticks,
+                perf_counter stands in for them.
+  VirtualClock  time that stands still while code runs and jumps to the end
+                of every sleep — the next deadline — at once, so a 10 s
+                animation takes only as long as its drawing. Its ticks wrap at
+                TICKS_PERIOD, as on the toy, if asked to.
+
+A deadline is a ticks_ms value: deadline(ms) is ``ms`` from now, remaining()
+the ms left until one (negative once it has passed), sleep_until() sleeps to
+it.
+
+Tests: ``self.addCleanup(clock.use, clock.use(clock.VirtualClock()))``.
+"""
+
+import time
+
+TICKS_PERIOD = 1 << 30   # MicroPython's ticks_ms and ticks_us wrap here
+_MASK = TICKS_PERIOD - 1
+_HALF = TICKS_PERIOD // 2
+
+
+def _ticks_diff(a, b):
+    return ((a - b + _HALF) & _MASK) - _HALF
+
+
+def _ticks_add(a, b):
+    return (a + b) & _MASK
+
+
+class RealClock:
+    """The time module's ticks and sleeps (perf_counter's on CPython)."""
+
+    def __init__(self, module=time):
+        if hasattr(module, 'ticks_us'):
+            self.ticks_ms = module.ticks_ms
+            self.ticks_us = module.ticks_us
+            self.ticks_diff = module.ticks_diff
+            self.ticks_add = module.ticks_add
+            self.sleep_ms = module.sleep_ms
+            self.sleep_us = module.sleep_us
+            return
+        counter = module.perf_counter
+        self.ticks_us = lambda: int(counter() * 1000000) & _MASK
+        self.ticks_ms = lambda: int(counter() * 1000) & _MASK
+        self.ticks_diff = _ticks_diff
+        self.ticks_add = _ticks_add
+        self.sleep_ms = lambda ms: module.sleep(ms / 1000)
+        self.sleep_us = lambda us: module.sleep(us / 1000000)
+
+
+class VirtualClock:
+    """
+    Time that only moves when something sleeps (or advance_ms() is called).
+    now_us() is the µs slept since reset(); the ticks start at ``start_us``
+    and, with ``wrap``, wrap at TICKS_PERIOD.
+    """
+
+    def __init__(self, start_us=0, wrap=False):
+        self.start_us = start_us
+        self.wrap = wrap
+        self.reset()
+
+    def reset(self):
+        self._slept_us = 0
+
+    def now_us(self):
+        return self._slept_us
+
+    def advance_ms(self, ms):
+        self._slept_us += int(ms * 1000)
+
+    def ticks_us(self):
+        us = self.start_us + self.now_us()
+        return us & _MASK if self.wrap else us
+
+    def ticks_ms(self):
+        ms = (self.start_us + self.now_us()) // 1000
+        return ms & _MASK if self.wrap else ms
+
+    def ticks_diff(self, a, b):
+        return _ticks_diff(a, b) if self.wrap else a - b
+
+    def ticks_add(self, a, b):
+        return _ticks_add(a, b) if self.wrap else a + b
+
+    def sleep_ms(self, ms):
+        self.advance_ms(ms)
+
+    def sleep_us(self, us):
+        self.advance_ms(us / 1000)
+
+
+# The backend in use. use() binds its ticks_ms, ticks_us, ticks_diff,
+# ticks_add, sleep_ms and sleep_us here as well.
+backend = None
+
+
+def use(new):
+    """Make ``new`` the clock everything reads; returns the one it replaces."""
+    global backend, ticks_ms, ticks_us, ticks_diff, ticks_add, sleep_ms, sleep_us
+    old, backend = backend, new
+    ticks_ms = new.ticks_ms
+    ticks_us = new.ticks_us
+    ticks_diff = new.ticks_diff
+    ticks_add = new.ticks_add
+    sleep_ms = new.sleep_ms
+    sleep_us = new.sleep_us
+    return old
+
+
+def deadline(ms):
+    """The ticks_ms ``ms`` from now."""
+    return ticks_add(ticks_ms(), ms)
+
+
+def remaining(when):
+    """ms until the deadline ``when``; 0 or less once it has passed."""
+    return ticks_diff(when, ticks_ms())
+
+
+def sleep_until(when):
+    """Sleep until the deadline ``when`` (not at all if it has passed)."""
+    ms = remaining(when)
+    if ms > 0:
+        sleep_ms(ms)
+
+
+use(RealClock())
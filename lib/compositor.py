@@ -0,0 +1,152 @@
+"""
+Layered compositor for the 16x16 display: a background layer plus per-frame
+sprite pixels, pushing only the pixels that changed.
+
+The background (a game's border, say) is set once, or changed a few cells at
+a time for something that changes slowly, like a fading trail. Each frame the
+game puts its moving pixels — the ball — and present() draws just the cells whose
+colour differs from what is already in the graphics buffer: cells put this
+frame, and cells put last frame that now fall back to the background. A
+still scene costs no pixel calls at all.
+
+Colours are registered once with pen() and referred to by index, so a frame
+creates no pens and allocates nothing. Coordinates are logical, as for
+display.pixel (x=0 bottom, y=0 left).
+"""
+
+from lib import arena, display
+
+SIZE = 16
+CELLS = SIZE * SIZE
+BLACK = 0   # pen index 0 is always black
+
+# One compositor is in use at a time (see lib/arena).
+_BG = arena.declare("comp_bg", 'H', CELLS)
+_TOP = arena.declare("comp_top", 'H', CELLS)
+_SHOWN = arena.declare("comp_shown", 'H', CELLS)
+_TOUCHED = arena.declare("comp_touched", 'B', CELLS)
+_PREV = arena.declare("comp_prev", 'B', CELLS)
+_MARKS = arena.declare("comp_marks", 'B', CELLS)
+
+
+class Compositor:
+
+    def __init__(self, graphics):
+        self.graphics = graphics
+        self._pens = [graphics.create_pen(0, 0, 0)]
+        self._colours = {(0, 0, 0): BLACK}
+        self._bg = arena.take(_BG)          # background layer
+        self._top = arena.take(_TOP)        # this frame's sprite pixels
+        self._shown = arena.take(_SHOWN)    # what the buffer holds now
+        # Cells put this frame and last frame, and which list each cell is in
+        # (1 or 2 = the frame's mark, 0 = neither), so a cell is listed once.
+        self._touched = arena.take(_TOUCHED)
+        self._count = 0
+        self._prev = arena.take(_PREV)
+        self._prev_count = 0
+        self._marks = arena.take(_MARKS)
+        self._mark = 1
+        self._full = True
+
+    def pen(self, r, g, b):
+        """Index of the pen for (r, g, b), creating it the first time."""
+        key = (r, g, b)
+        index = self._colours.get(key)
+        if index is None:
+            index = self._colours[key] = len(self._pens)
+            self._pens.append(self.graphics.create_pen(r, g, b))
+        return index
+
+    def background(self, x, y, index):
+        """
+        Set a background cell; it shows from the next present. Build the
+        background before put()ting the frame's sprites.
+        """
+        cell = x * SIZE + y
+        self._bg[cell] = index
+        self._top[cell] = index
+        self._touch(cell)
+
+    def put(self, x, y, index):
+        """Draw a sprite pixel for this frame only; later puts win. Clipped."""
+        if 0 <= x < SIZE and 0 <= y < SIZE:
+            cell = x * SIZE + y
+            self._top[cell] = index
+            self._touch(cell)
+
+    def block(self, x, y, size, index):
+        """put() a size x size block with its bottom-left corner at (x, y)."""
+        for dx in range(size):
+            for dy in range(size):
+                self.put(x + dx, y + dy, index)
+
+    def _touch(self, cell):
+        # A cell still listed from last frame keeps that entry too; its mark
+        # now says "this frame", so present() skips it in the old list.
+        if self._marks[cell] != self._mark:
+            self._marks[cell] = self._mark
+            self._touched[self._count] = cell
+            self._count += 1
+
+    def redraw(self):
+        """Repaint every cell at the next present (e.g. after a display.clear)."""
+        self._full = True
+
+    def present(self, su=None):
+        """
+        Push this frame's changes to the graphics buffer (and to the display
+        if su is given). Returns the number of pixels drawn.
+        """
+        graphics = self.graphics
+        pens = self._pens
+        shown = self._shown
+        drawn = 0
+
+        if self._full:
+            self._full = False
+            graphics.set_pen(pens[BLACK])
+            graphics.clear()
+            for cell in range(CELLS):
+                shown[cell] = BLACK
+                if self._bg[cell] != BLACK and self._marks[cell] != self._mark:
+                    self._marks[cell] = self._mark
+                    self._touched[self._count] = cell
+                    self._count += 1
+                    self._top[cell] = self._bg[cell]
+
+        marks = self._marks
+        mark = self._mark
+        top = self._top
+        bg = self._bg
+        touched = self._touched
+        for i in range(self._count):
+            cell = touched[i]
+            want = top[cell]
+            if shown[cell] != want:
+                graphics.set_pen(pens[want])
+                display.pixel(graphics, cell >> 4, cell & 15)
+                shown[cell] = want
+                drawn += 1
+            top[cell] = bg[cell]          # next frame starts from the background
+
+        prev = self._prev
+        for i in range(self._prev_count):
+            cell = prev[i]
+            if marks[cell] == mark:
+                continue                  # put again this frame: already done
+            marks[cell] = 0
+            want = bg[cell]
+            if shown[cell] != want:
+                graphics.set_pen(pens[want])
+                display.pixel(graphics, cell >> 4, cell & 15)
+                shown[cell] = want
+                drawn += 1
+
+        # This frame's cells become last frame's; the mark flips between 1 and 2.
+        self._prev, self._touched = touched, prev
+        self._prev_count, self._count = self._count, 0
+        self._mark = 3 - mark
+
+        if su is not None:
+            su.update(graphics)
+        return drawn
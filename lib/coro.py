@@ -0,0 +1,95 @@
+"""
+Animations, games and sleep as frame generators, run blocking or as uasyncio
+coroutines.
+
+A frames() generator draws a frame and then yields how many ms to wait before
+the next one. Its return value is the result: None or the interrupting button
+for an animation, EXIT or SLEEP for a game. run() drives a generator with a
+blocking sleep, which is what play() and the games' run() do at boot and on
+the desktop. run_async() awaits asyncio.sleep_ms instead, so main.py's input
+and audio tasks get the CPU between frames.
+
+A hold phase, which only shows a still frame until its time is up or a button
+interrupts it, yields hold(remaining_ms) instead of a frame time. run() sleeps
+at most HOLD_POLL_MS of it before resuming the generator, as before; run_async()
+given a ``wake`` event sleeps until the event is set or the hold is over, so a
+hold costs one wake-up rather than one every 50 ms.
+
+Both time each frame's drawing into metrics.FRAME_US, and count it in
+metrics.FRAMES_LATE when it took longer than the wait it then asked for.
+Each wait, hold or not, is offered to lib/memory as a window to collect in.
+"""
+
+from lib import memory, metrics
+
+HOLD_POLL_MS = 50
+
+
+def hold(ms):
+    """What a hold phase yields: wait up to ``ms``, or less if input arrives."""
+    return -ms if ms > 0 else 0
+
+
+def asyncio():
+    """The uasyncio module (``asyncio`` on newer MicroPython and the desktop)."""
+    try:
+        import uasyncio as module
+    except ImportError:
+        import asyncio as module
+    return module
+
+
+def _drawn(start, ms):
+    """Record a frame that began at ``start`` and asked for ``ms``."""
+    us = metrics.since(metrics.FRAME_US, start)
+    if ms > 0 and us > ms * 1000:
+        metrics.inc(metrics.FRAMES_LATE)
+    memory.frame_done()
+
+
+def run(gen, sleep_ms):
+    """Drive ``gen`` to its end, calling ``sleep_ms`` between frames; returns its value."""
+    try:
+        while True:
+            start = metrics.now()
+            ms = next(gen)
+            _drawn(start, ms)
+            if ms >= 0:
+                sleep_ms(ms - memory.idle(ms))
+            else:
+                spent = memory.idle(-ms)
+                sleep_ms(min(-ms - spent, HOLD_POLL_MS))
+    except StopIteration as e:
+        return e.value
+
+
+async def run_async(gen, wake=None):
+    """
+    run() as a coroutine. Holds end early when ``wake`` (an Event set on new
+    input) is set. Cancelling it closes ``gen`` (its finally blocks run).
+    """
+    module = asyncio()
+    sleep_ms = module.sleep_ms
+    try:
+        while True:
+            if wake is not None:
+                wake.clear()   # before gen checks for input, so none is missed
+            start = metrics.now()
+            try:
+                ms = next(gen)
+            except StopIteration as e:
+                return e.value
+            _drawn(start, ms)
+            if ms >= 0:
+                await sleep_ms(ms - memory.idle(ms))
+                continue
+            ms = -ms - memory.idle(-ms)
+            if wake is None:
+                await sleep_ms(min(ms, HOLD_POLL_MS))
+            else:
+                try:
+                    await module.wait_for_ms(wake.wait(), ms)
+                except module.TimeoutError:
+                    pass
+    finally:
+        gen.close()
@@ -2,8 +2,12 @@
 Shared display helpers for the Stellar Unicorn 16x16 RGB LED matrix.
 """
 
+from lib import clock, metrics
+
+
 def clear(graphics, su):
     """Clear the display to black."""
+    metrics.inc(metrics.DISPLAY_CLEARS)
     graphics.set_pen(graphics.create_pen(0, 0, 0))
     graphics.clear()
     su.update(graphics)
@@ -11,6 +15,7 @@ def clear(graphics, su):
 
 def fill(graphics, su, r, g, b):
     """Fill the entire display with a solid colour."""
+    metrics.inc(metrics.DISPLAY_CLEARS)
     graphics.set_pen(graphics.create_pen(r, g, b))
     graphics.clear()
     su.update(graphics)
@@ -47,13 +52,12 @@ def fade_to_black(graphics, su, steps=10, delay_ms=50):
     Note: This reads from a buffer, so it requires storing frame data.
     For simplicity, we just do a quick fade by dimming brightness.
     """
-    import time
     original_brightness = su.get_brightness()
     for i in range(steps, -1, -1):
         brightness = original_brightness * (i / steps)
         su.set_brightness(brightness)
         su.update(graphics)
-        time.sleep_ms(delay_ms)
+        clock.sleep_ms(delay_ms)
     # Clear and restore brightness
     clear(graphics, su)
     su.set_brightness(original_brightness)
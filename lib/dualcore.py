@@ -0,0 +1,291 @@
+"""
+Optional dual-core rendering: core 1 composes an animation's frames into a
+double-buffered framebuffer; core 0 keeps the input, audio and mode tasks
+and only pushes finished frames to the display.
+
+Core1.frames() wraps an animation's frames() so it can be played like any
+other frames generator (coro.run or the Renderer task). The animation itself
+runs on core 1, drawing into a Surface — PicoGraphics' drawing calls on a
+plain array of packed 0xRRGGBB words — and handed an ``su`` whose update()
+does nothing and whose other calls (the sound module's play and stop) are
+queued with the frame and made on core 0 just before it is shown. Its
+check_interrupt reads what core 0's own check_interrupt returned.
+
+Handoff (one producer on core 1, one consumer on core 0, no locks). Frame n
+is drawn into buffer n & 1. Two counters in an array, each written by one
+side only: PUBLISHED, the last frame core 1 finished, and TAKEN, the last
+frame core 0 started showing. Core 0 is done with a buffer before it takes
+the next frame, so once TAKEN >= n - 1 it will not touch buffer (n - 2) & 1
+again and core 1 may draw frame n there. Core 1 is therefore at most one
+frame ahead. Each frame starts as a copy of the one before, so animations
+that redraw part of the screen, or nothing during a hold, still show right.
+When the animation returns, its last drawing and queued calls go out as one
+final frame with DONE set to its number.
+
+Only animations run on core 1: the games read the KX134 on the I2C bus the
+input task polls, and sleep does nothing worth moving.
+"""
+
+from array import array
+
+from lib import arena, clock, coro
+
+WIDTH = 16
+HEIGHT = 16
+CELLS = WIDTH * HEIGHT
+
+# Slots in Core1._slots; each is written by one core only (noted).
+_PUBLISHED = 0   # core 1: last frame drawn
+_TAKEN = 1       # core 0: last frame taken for showing
+_DONE = 2        # core 1: number of the final frame, 0 while running
+_JOB = 3         # core 0: bumped to hand core 1 a new animation
+_FINISHED = 4    # core 1: the last job it finished
+_STOP = 5        # core 0: abandon the current job
+_INTERRUPT = 6   # core 0: check_interrupt fired; the value is in .interrupt
+
+_FRAME0 = arena.declare("frame0", 'I', CELLS)
+_FRAME1 = arena.declare("frame1", 'I', CELLS)
+_SHOWN = arena.declare("frame_shown", 'I', CELLS)
+
+
+class Surface:
+    """
+    The PicoGraphics calls an animation draws with, into ``buf``: an
+    array('I') of WIDTH * HEIGHT packed pens, row by row in physical
+    coordinates. Pens are plain ints, so they stay valid whichever buffer
+    is current.
+    """
+
+    def __init__(self):
+        self.buf = None
+        self._pen = 0
+
+    def create_pen(self, r, g, b):
+        return (r << 16) | (g << 8) | b
+
+    def set_pen(self, pen):
+        self._pen = pen
+
+    def clear(self):
+        buf = self.buf
+        pen = self._pen
+        for i in range(CELLS):
+            buf[i] = pen
+
+    def pixel(self, x, y):
+        if 0 <= x < WIDTH and 0 <= y < HEIGHT:
+            self.buf[y * WIDTH + x] = self._pen
+
+    def get_bounds(self):
+        return WIDTH, HEIGHT
+
+
+class _QueuedUnicorn:
+    """The ``su`` core 1 sees: update() is the frame's yield; the rest is queued."""
+
+    def __init__(self, core1):
+        self._core1 = core1
+
+    def update(self, graphics):
+        pass
+
+    def __getattr__(self, name):
+        calls = self._core1._calls_now
+
+        def call(*args):
+            calls.append((name, args))
+        return call
+
+
+class Core1:
+    """
+    Core 1's render loop and the handoff to core 0. ``pause`` is what either
+    side calls while it waits on the other.
+    """
+
+    def __init__(self, pause=None):
+        self._pause = pause or _pause
+        self._slots = array('i', [0] * 7)
+        self._bufs = (arena.take(_FRAME0), arena.take(_FRAME1))
+        self._ms = array('i', [0, 0])
+        self._at = array('i', [0, 0])        # ticks_ms each buffer's frame was published
+        self._calls = ([], [])
+        self._calls_now = self._calls[1]
+        self.surface = Surface()
+        self._su = _QueuedUnicorn(self)
+        self._job = None
+        self.interrupt = None
+        self.result = None
+        self.error = None
+        self._shown = arena.take(_SHOWN)   # what core 0 last pushed
+        self._pens = {}
+        self._pens_for = None
+        self._repaint = True
+        self._started = False
+
+    # ── core 0 ────────────────────────────────────────────────────────────
+
+    def start(self):
+        """Start core 1's loop (once; it then waits for animations)."""
+        if not self._started:
+            import _thread
+            _thread.start_new_thread(self._loop, ())
+            self._started = True
+
+    def shutdown(self):
+        """End core 1's loop once its current job is done (for tests and tools)."""
+        if self._started:
+            self._job = None
+            self._slots[_JOB] += 1
+            self._started = False
+
+    def frames(self, animation_frames, su, graphics, check_interrupt=None):
+        """
+        Frames of ``animation_frames(su, graphics, check_interrupt)``, composed
+        on core 1 and shown here. Returns what the animation returned.
+        """
+        self.start()
+        slots = self._slots
+        slots[_PUBLISHED] = 0
+        slots[_TAKEN] = 0
+        slots[_DONE] = 0
+        slots[_STOP] = 0
+        slots[_INTERRUPT] = 0
+        self.interrupt = self.result = self.error = None
+        # Start from black and repaint everything with the first frame: the
+        # display may have been drawn on since the last animation.
+        buf = self._bufs[1]
+        for i in range(CELLS):
+            buf[i] = 0
+        self._repaint = True
+        self._job = animation_frames
+        slots[_JOB] += 1
+
+        taken = 0
+        try:
+            while True:
+                if check_interrupt is not None and not slots[_INTERRUPT]:
+                    pressed = check_interrupt()
+                    if pressed:
+                        self.interrupt = pressed
+                        slots[_INTERRUPT] = 1
+                if slots[_PUBLISHED] == taken:
+                    yield 1   # core 1 is still drawing the next frame
+                    continue
+                taken += 1
+                slots[_TAKEN] = taken
+                calls = self._calls[taken & 1]
+                for name, args in calls:
+                    getattr(su, name)(*args)
+                calls.clear()
+                done = slots[_DONE] == taken
+                # Once interrupted, only the animation's final frame is shown.
+                if done or not slots[_INTERRUPT]:
+                    self.blit(graphics, self._bufs[taken & 1])
+                    su.update(graphics)
+                if done:
+                    if self.error is not None:
+                        raise self.error
+                    return self.result
+                ms = self._ms[taken & 1]
+                if slots[_INTERRUPT]:
+                    ms = 1   # don't sit out the frame or hold; let core 1 finish
+                elif ms < 0:
+                    # A hold's length was worked out when core 1 drew it, up
+                    # to a frame ago: count it from then.
+                    ms = coro.hold(-ms - clock.ticks_diff(clock.ticks_ms(), self._at[taken & 1]))
+                yield ms
+        finally:
+            if slots[_FINISHED] != slots[_JOB]:
+                slots[_STOP] = 1
+                while slots[_FINISHED] != slots[_JOB]:
+                    self._pause()
+
+    def blit(self, graphics, buf):
+        """Push the cells of ``buf`` that differ from what was last pushed."""
+        if self._pens_for is not graphics:
+            self._pens = {}
+            self._pens_for = graphics
+            self._repaint = True
+        if self._repaint:
+            self._repaint = False
+            graphics.set_pen(graphics.create_pen(0, 0, 0))
+            graphics.clear()
+            shown = self._shown
+            for i in range(CELLS):
+                shown[i] = 0
+        pens = self._pens
+        shown = self._shown
+        current = -1
+        for i in range(CELLS):
+            colour = buf[i]
+            if colour != shown[i]:
+                if colour != current:
+                    pen = pens.get(colour)
+                    if pen is None:
+                        pen = pens[colour] = graphics.create_pen(
+                            colour >> 16, (colour >> 8) & 0xFF, colour & 0xFF)
+                    graphics.set_pen(pen)
+                    current = colour
+                graphics.pixel(i % WIDTH, i // WIDTH)
+                shown[i] = colour
+
+    # ── core 1 ────────────────────────────────────────────────────────────
+
+    def _check(self):
+        return self.interrupt if self._slots[_INTERRUPT] else None
+
+    def _loop(self):
+        slots = self._slots
+        job = 0
+        while True:
+            while slots[_JOB] == job:
+                self._pause()
+            job = slots[_JOB]
+            animation_frames = self._job
+            if animation_frames is None:
+                slots[_FINISHED] = job
+                return
+            self._compose(animation_frames)
+            slots[_FINISHED] = job
+
+    def _compose(self, animation_frames):
+        slots = self._slots
+        bufs = self._bufs
+        surface = self.surface
+        n = 1
+        surface.buf = bufs[1]
+        self._calls_now = self._calls[1]
+        gen = None
+        try:
+            gen = animation_frames(self._su, surface, self._check)
+            while True:
+                ms = next(gen)
+                self._ms[n & 1] = ms
+                self._at[n & 1] = clock.ticks_ms()
+                slots[_PUBLISHED] = n
+                # Frame n + 1 goes where frame n - 1 was: wait for core 0 to
+                # have moved on to frame n, then start from a copy of it.
+                while slots[_TAKEN] < n:
+                    if slots[_STOP]:
+                        return
+                    self._pause()
+                if slots[_STOP]:
+                    return
+                n += 1
+                bufs[n & 1][:] = bufs[(n - 1) & 1]
+                surface.buf = bufs[n & 1]
+                self._calls_now = self._calls[n & 1]
+        except StopIteration as e:
+            self.result = e.value
+        except Exception as e:   # raised again on core 0, in frames()
+            self.error = e
+        finally:
+            if gen is not None:
+                gen.close()
+        slots[_DONE] = n
+        slots[_PUBLISHED] = n
+
+
+def _pause():
+    clock.sleep_us(100)
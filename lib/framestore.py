@@ -0,0 +1,135 @@
+"""
+Paged store of precomputed animation frames on flash.
+
+Every compiled sprite sheet (see lib/sprites.py) lives back-to-back in one file
+with a small index in front. Opening the store reads only the index. Selecting
+an animation loads its header and palette and, if all its frames fit, pulls
+them into one reusable buffer with a single readinto(); otherwise frames are
+paged in one at a time as they are drawn. Selecting a different animation
+evicts the previous one — the buffer is allocated once and never grows, so
+shipping more animations costs flash, not RAM.
+
+File layout (little-endian):
+  magic    4s  b'FST1'
+  count    H   number of sheets
+  index    count * (name 12s NUL-padded, offset I, length I)
+  sheets   SPR1 sheets at the offsets given in the index
+
+Built by generate_images/compile_sprites.py.
+"""
+
+import struct
+
+from lib import arena, sprites
+
+MAGIC = b'FST1'
+HEADER = '<4sH'
+HEADER_SIZE = struct.calcsize(HEADER)   # 6 bytes
+ENTRY = '<12sII'
+ENTRY_SIZE = struct.calcsize(ENTRY)     # 20 bytes
+
+STORE_FILE = "sprites/frames.fst"
+BUFFER_SIZE = 2048   # bytes of frame data kept in RAM at once
+
+_PAGE = arena.declare("sprite_page", 'B', BUFFER_SIZE)
+
+_shared = None
+
+
+class FrameStore:
+    """Frames of one animation at a time, paged from a single file."""
+
+    def __init__(self, filename, buffer_size=BUFFER_SIZE, buffer=None):
+        """
+        Open ``filename``, reading only its index. Frames are paged into
+        ``buffer`` if given, else into a new bytearray of ``buffer_size``.
+        """
+        self._f = open(filename, 'rb')
+        magic, count = struct.unpack(HEADER, self._f.read(HEADER_SIZE))
+        if magic != MAGIC:
+            self._f.close()
+            raise ValueError("Not a frame store")
+        self._index = {}
+        for _ in range(count):
+            name, offset, length = struct.unpack(ENTRY, self._f.read(ENTRY_SIZE))
+            self._index[name.rstrip(b'\x00').decode()] = (offset, length)
+
+        self._buf = bytearray(buffer_size) if buffer is None else buffer
+        self._mv = memoryview(self._buf)
+        self._hdr = bytearray(sprites.HEADER_SIZE)
+        self.current = None
+        self.frames = 0
+        self._pens = None
+        self._pens_for = None
+
+    def names(self):
+        """Names of every animation in the store."""
+        return list(self._index)
+
+    def select(self, name):
+        """
+        Make ``name`` the current animation, evicting the previous one.
+
+        Loads the whole animation into the buffer if it fits, otherwise leaves
+        frames to be paged in on demand. A no-op if it is already selected.
+        Raises KeyError for an unknown name.
+        """
+        if name == self.current:
+            return
+        offset, _ = self._index[name]
+        self.current = None
+        self._pens = None
+        self._pens_for = None
+
+        f = self._f
+        f.seek(offset)
+        f.readinto(self._hdr)
+        (self.width, self.height, self.left, self.top,
+         self.bpp, colours, self.frames) = sprites.parse_header(self._hdr)
+        self.palette = f.read(colours * 3)
+        self.frame_bytes = sprites.frame_size(self.width, self.height, self.bpp)
+        if self.frame_bytes > len(self._buf):
+            raise ValueError("Frame larger than the store buffer")
+        self._data_offset = offset + sprites.HEADER_SIZE + colours * 3
+
+        total = self.frame_bytes * self.frames
+        self._resident = total <= len(self._buf)
+        if self._resident:
+            f.readinto(self._mv[:total])
+        self._paged = -1     # frame currently in the buffer when paging
+        self.current = name
+
+    def frame(self, index):
+        """Return a memoryview of one frame of the current animation."""
+        fb = self.frame_bytes
+        if self._resident:
+            start = index * fb
+            return self._mv[start:start + fb]
+        if index != self._paged:
+            self._f.seek(self._data_offset + index * fb)
+            self._f.readinto(self._mv[:fb])
+            self._paged = index
+        return self._mv[:fb]
+
+    def draw(self, graphics, index=0, dx=0, dy=0):
+        """Draw frame ``index`` of the current animation. Does not update the display."""
+        if self._pens_for is not graphics:
+            self._pens = sprites.make_pens(graphics, self.palette)
+            self._pens_for = graphics
+        sprites.draw_frame(graphics, self._pens, self.frame(index), self.width,
+                           self.height, self.left, self.top, self.bpp, dx, dy)
+
+    def close(self):
+        self._f.close()
+        self.current = None
+
+
+def shared():
+    """
+    The store every animation draws from, opened on first use. It is the one
+    user of the reserved sprite page; other stores allocate their own buffer.
+    """
+    global _shared
+    if _shared is None:
+        _shared = FrameStore(STORE_FILE, buffer=arena.take(_PAGE))
+    return _shared
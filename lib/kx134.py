@@ -11,6 +11,8 @@ see docs/double-tap-detection.md if you want to revive it.
 
 from machine import I2C
 
+from lib import metrics
+
 _ADDR_DEFAULT = 0x1F
 
 # Acceleration output (little-endian 16-bit signed pairs)
@@ -22,11 +24,26 @@ _REG_ZOUTL = 0x0C
 _REG_CNTL1  = 0x1B   # PC1=bit7 run, RES=bit6 16-bit, GSEL=bits4:3
 _REG_ODCNTL = 0x21   # output data rate (0x09 = 400 Hz)
 
+# Sample buffer (FIFO)
+_REG_BUF_CNTL2    = 0x5F   # BUFE=bit7 enable, BRES=bit6 16-bit, BM=bits1:0 mode
+_REG_BUF_STATUS_1 = 0x60   # SMP_LEV[7:0]: bytes waiting
+_REG_BUF_STATUS_2 = 0x61   # SMP_LEV[9:8] in bits 1:0
+_REG_BUF_CLEAR    = 0x62   # any write empties the buffer
+_REG_BUF_READ     = 0x63   # successive reads return successive buffer bytes
+
 # CNTL1 bit masks
 _PC1     = 0x80   # operating mode (1 = run)
 _RES     = 0x40   # resolution (1 = 16-bit)
 _GSEL_8G = 0x00   # g-range bits4:3 = 00 → ±8 g
 _SCALE_8G = 8.0 / 32768.0
+COUNTS_PER_G = 4096   # at ±8 g, 16-bit
+
+# BUF_CNTL2 bits
+_BUFE      = 0x80   # buffer enabled
+_BRES      = 0x40   # 16-bit samples
+_BM_STREAM = 0x01   # stream mode: when full, the oldest sample is dropped
+SAMPLE_SIZE = 6        # one buffered X/Y/Z sample, 16-bit little-endian
+BUFFER_SAMPLES = 86    # 16-bit samples the buffer holds (~215 ms at 400 Hz)
 
 
 def _to_signed(raw):
@@ -55,7 +72,14 @@ class KX134:
         self._i2c.writeto_mem(self._addr, reg, bytes([value]))
 
     def _read(self, reg, n=1):
-        return self._i2c.readfrom_mem(self._addr, reg, n)
+        start = metrics.now()
+        try:
+            data = self._i2c.readfrom_mem(self._addr, reg, n)
+        except OSError:
+            metrics.inc(metrics.I2C_ERRORS)
+            raise
+        metrics.since(metrics.KX_READ_US, start)
+        return data
 
     # ── Public interface ──────────────────────────────────────────────────────
 
@@ -67,6 +91,22 @@ class KX134:
         y = _to_signed(yb[0] | (yb[1] << 8))
         return x * self._scale, y * self._scale
 
+    def read_xy_raw(self):
+        """
+        Return (x, y) as signed counts (one I2C read, no floats).
+
+        At ±8 g a count is 1/4096 g, so the values are already Q12 fixed-point
+        G-force — what the fixed-point tilt physics consumes.
+        """
+        b = self._read(_REG_XOUTL, 4)
+        return _to_signed(b[0] | (b[1] << 8)), _to_signed(b[2] | (b[3] << 8))
+
+    def read_xyz_raw(self):
+        """Return (x, y, z) as signed counts (one I2C read, no floats)."""
+        b = self._read(_REG_XOUTL, 6)
+        return (_to_signed(b[0] | (b[1] << 8)), _to_signed(b[2] | (b[3] << 8)),
+                _to_signed(b[4] | (b[5] << 8)))
+
     def read_xyz(self):
         """Return (x, y, z) acceleration as signed G-force floats (one I2C read)."""
         b = self._read(_REG_XOUTL, 6)
@@ -74,3 +114,49 @@ class KX134:
         y = _to_signed(b[2] | (b[3] << 8))
         z = _to_signed(b[4] | (b[5] << 8))
         return x * self._scale, y * self._scale, z * self._scale
+
+    # ── Sample buffer ─────────────────────────────────────────────────────────
+
+    def enable_buffer(self):
+        """
+        Start buffering every sample (400 Hz) in stream mode, so a reader
+        polling once a frame still sees each one (up to BUFFER_SAMPLES back).
+        """
+        self._write(_REG_CNTL1, 0x00)                    # configure in standby
+        self._write(_REG_BUF_CNTL2, _BUFE | _BRES | _BM_STREAM)
+        self._write(_REG_CNTL1, _PC1 | _RES | _GSEL_8G)
+        self._write(_REG_BUF_CLEAR, 0x00)
+
+    def disable_buffer(self):
+        """Stop buffering; the buffered samples are discarded."""
+        self._write(_REG_CNTL1, 0x00)
+        self._write(_REG_BUF_CNTL2, 0x00)
+        self._write(_REG_CNTL1, _PC1 | _RES | _GSEL_8G)
+
+    def buffered(self):
+        """Number of whole samples waiting in the buffer."""
+        b = self._read(_REG_BUF_STATUS_1, 2)
+        return (b[0] | ((b[1] & 0x03) << 8)) // SAMPLE_SIZE
+
+    def read_buffer(self, buf):
+        """
+        Move the waiting samples (as many as fit) into buf, a bytearray of
+        whole SAMPLE_SIZE records of X/Y/Z signed little-endian counts.
+        Returns the number of samples read; buf is reused, not reallocated.
+        """
+        n = self.buffered()
+        metrics.observe(metrics.KX_BACKLOG, n)
+        room = len(buf) // SAMPLE_SIZE
+        if n > room:
+            n = room
+        if n:
+            start = metrics.now()
+            try:
+                self._i2c.readfrom_mem_into(self._addr, _REG_BUF_READ,
+                                            memoryview(buf)[:n * SAMPLE_SIZE])
+            except OSError:
+                metrics.inc(metrics.I2C_ERRORS)
+                raise
+            metrics.since(metrics.KX_READ_US, start)
+            metrics.inc(metrics.KX_SAMPLES, n)
+        return n
@@ -0,0 +1,130 @@
+"""
+Levelled logging that costs next to nothing when it is off.
+
+  from lib import log
+  log.debug("[BTN] raw pressed: %s", name)
+
+A message is a %-format string and its arguments; it is only formatted when
+it is printed. Two sinks, each with its own level:
+
+  console — print()ed as it happens (default INFO and up);
+  ring    — the last RING_SIZE messages kept in RAM, unformatted, for dump()
+            from the REPL after something went wrong (default INFO and up).
+
+Debug messages are off by default: log.level(log.DEBUG) keeps them in the
+ring too, and set_levels() sets either sink. A call below both levels
+returns after one comparison (its arguments are
+still evaluated, so guard anything costly with ``if log.enabled(log.DEBUG):``).
+The ring stores references: pass numbers and strings, not buffers that
+change afterwards.
+
+tools/build_mpy.py --strip-debug removes log.debug(...) statements outright
+and turns log.enabled(log.DEBUG) into False, so a release build carries no
+debug logging at all.
+"""
+
+from array import array
+
+from lib import clock
+
+DEBUG = 10
+INFO = 20
+WARN = 30
+ERROR = 40
+OFF = 50
+_NAMES = {DEBUG: 'D', INFO: 'I', WARN: 'W', ERROR: 'E'}
+
+RING_SIZE = 64
+
+_console = INFO
+_ring = INFO
+_min = INFO     # min(_console, _ring): anything below is dropped at once
+
+_ring_at = array('i', [0] * RING_SIZE)   # ticks_ms
+_ring_level = bytearray(RING_SIZE)
+_ring_fmt = [None] * RING_SIZE
+_ring_args = [None] * RING_SIZE
+_ring_next = 0
+_ring_count = 0
+
+
+def set_levels(console=None, ring=None):
+    """Set either sink's level (OFF silences it); returns the previous (console, ring)."""
+    global _console, _ring, _min
+    previous = (_console, _ring)
+    if console is not None:
+        _console = console
+    if ring is not None:
+        _ring = ring
+    _min = min(_console, _ring)
+    return previous
+
+
+def level(ring):
+    """Keep ``ring`` and up in the ring (log.level(log.DEBUG) turns debug on); returns the previous."""
+    return set_levels(ring=ring)[1]
+
+
+def enabled(level):
+    """Whether a message at ``level`` would go anywhere."""
+    return level >= _min
+
+
+def _emit(level, fmt, args):
+    global _ring_next, _ring_count
+    if level >= _ring:
+        i = _ring_next
+        _ring_at[i] = clock.ticks_ms() & 0x3FFFFFFF
+        _ring_level[i] = level
+        _ring_fmt[i] = fmt
+        _ring_args[i] = args
+        _ring_next = i + 1 if i + 1 < RING_SIZE else 0
+        if _ring_count < RING_SIZE:
+            _ring_count += 1
+    if level >= _console:
+        print(fmt % args if args else fmt)
+
+
+def debug(fmt, *args):
+    if DEBUG >= _min:
+        _emit(DEBUG, fmt, args)
+
+
+def info(fmt, *args):
+    if INFO >= _min:
+        _emit(INFO, fmt, args)
+
+
+def warn(fmt, *args):
+    if WARN >= _min:
+        _emit(WARN, fmt, args)
+
+
+def error(fmt, *args):
+    if ERROR >= _min:
+        _emit(ERROR, fmt, args)
+
+
+def records():
+    """The ring's messages, oldest first: (ticks_ms, level, formatted message)."""
+    out = []
+    start = (_ring_next - _ring_count) % RING_SIZE
+    for k in range(_ring_count):
+        i = (start + k) % RING_SIZE
+        fmt, args = _ring_fmt[i], _ring_args[i]
+        out.append((_ring_at[i], _ring_level[i], fmt % args if args else fmt))
+    return out
+
+
+def dump():
+    """Print the ring, oldest first."""
+    for at, level, message in records():
+        print("{:>10} {} {}".format(at, _NAMES.get(level, '?'), message))
+
+
+def clear():
+    """Empty the ring."""
+    global _ring_next, _ring_count
+    _ring_next = _ring_count = 0
+    for i in range(RING_SIZE):
+        _ring_fmt[i] = _ring_args[i] = None
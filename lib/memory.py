@@ -0,0 +1,172 @@
+"""
+Garbage collection on the toy's schedule rather than the heap's.
+
+Left alone, MicroPython collects when an allocation finds the heap full,
+wherever that happens to be — often halfway through drawing a frame, where
+a pass over the whole heap is a visible stutter. Instead:
+
+  * gc.threshold(THRESHOLD) makes the collector run after that many bytes,
+    before the heap is full, as a backstop;
+  * idle() collects in the waits between frames, during hold phases and
+    while the toy idles, once IDLE_COLLECT_BYTES have been allocated since
+    the last collection — if the wait is longer than a collection takes
+    (measured, in collect_us);
+  * frame_done() counts the bytes each frame allocated, per name given to
+    track(), so report() shows which animation or game makes the garbage;
+  * fragmentation() collects and prints what is left, with MicroPython's
+    mem_info() and its largest free block ("max free sz", in 16-byte
+    blocks), in the next idle window rather than at once — with
+    HEAP_REPORT, main.py asks for it on every mode change, so a heap that
+    is slowly breaking up shows long before an allocation fails, without
+    delaying the next mode's first frame.
+
+lib/coro calls frame_done() after every frame and idle() before every wait;
+main.py names what is playing. MicroPython's collector is not incremental,
+so frequent small collections at quiet moments are the nearest thing.
+Collections counted in metrics.GC_MIDFRAME are the ones that still landed
+inside a frame.
+
+Desktop CPython has no gc.mem_alloc, so there nothing is measured or
+collected here; tools/alloc_frames.py measures each frame with tracemalloc.
+"""
+
+from array import array
+import gc
+
+try:
+    import micropython
+except ImportError:
+    micropython = None
+
+from lib import clock, metrics
+
+THRESHOLD = 32 * 1024            # gc.threshold: allocate this much and it collects
+IDLE_COLLECT_BYTES = 8 * 1024    # collect in an idle window once this much is allocated
+COLLECT_MARGIN_US = 2000         # a window must outlast a collection by this much
+
+collect_us = 5000     # how long a collection takes (updated by each one)
+
+_base = 0             # heap in use just after the last collection
+_last = None          # heap in use at the last frame_done(), None if unknown
+_name = None
+_stats = {}           # name -> array('I', [frames, bytes, largest frame])
+_report = None        # label of the fragmentation() report still to print
+
+
+def heap_used():
+    """Bytes of heap in use, or None where it can't be measured."""
+    mem_alloc = getattr(gc, 'mem_alloc', None)
+    return mem_alloc() if mem_alloc else None
+
+
+def init():
+    """Set the collection threshold (on MicroPython) and collect, timing it."""
+    if hasattr(gc, 'threshold'):
+        gc.threshold(THRESHOLD)
+    collect()
+
+
+def collect():
+    """Collect now, counted in metrics.GC_IDLE; returns the µs it took."""
+    us = _collect()
+    metrics.inc(metrics.GC_IDLE)
+    return us
+
+
+def _collect():
+    global collect_us, _base, _last
+    start = metrics.now()
+    gc.collect()
+    us = metrics.since(metrics.GC_US, start)
+    # Follow a slower collection at once, a faster one gradually.
+    collect_us = us if us > collect_us else (collect_us * 7 + us) // 8
+    _base = _last = heap_used()
+    return us
+
+
+def idle(ms):
+    """
+    An idle window of ``ms`` is starting: collect in it if it is worth it
+    and there is time. Returns the ms spent, to take off the wait.
+    """
+    if ms * 1000 < collect_us + COLLECT_MARGIN_US:
+        return 0
+    if _report is not None:
+        start = clock.ticks_us()
+        _print_fragmentation()
+        return min((clock.ticks_diff(clock.ticks_us(), start) + 999) // 1000, ms)
+    used = heap_used()
+    if used is None or _base is None or used - _base < IDLE_COLLECT_BYTES:
+        return 0
+    return min((collect() + 999) // 1000, ms)
+
+
+def track(name):
+    """Count the frames from now on as ``name``'s."""
+    global _name, _last
+    _name = name
+    if name not in _stats:
+        _stats[name] = array('I', [0, 0, 0])
+    _last = heap_used()
+
+
+def frame_done():
+    """A frame was drawn: record what was allocated since the last one."""
+    global _last, _base
+    used = heap_used()
+    if used is None or _last is None:
+        _last = used
+        return
+    grew = used - _last
+    _last = used
+    if grew < 0:
+        # A collection we didn't schedule ran during the frame.
+        metrics.inc(metrics.GC_MIDFRAME)
+        _base = used
+        return
+    metrics.observe(metrics.FRAME_ALLOC, grew)
+    s = _stats.get(_name)
+    if s is not None:
+        s[0] += 1
+        s[1] = (s[1] + grew) & 0x3FFFFFFF
+        if grew > s[2]:
+            s[2] = grew
+
+
+def stats():
+    """{name: (frames, bytes allocated, largest frame)} for every tracked name."""
+    return {name: tuple(s) for name, s in _stats.items()}
+
+
+def reset():
+    """Forget the per-name counts."""
+    _stats.clear()
+
+
+def report():
+    """Print bytes allocated per frame for each tracked name, the most first."""
+    print("[MEM] {:<12} {:>7} {:>9} {:>7}".format("playing", "frames", "B/frame", "max"))
+    rows = sorted(_stats.items(), key=lambda kv: -(kv[1][1] // max(kv[1][0], 1)))
+    for name, (frames, total, largest) in rows:
+        print("[MEM] {:<12} {:>7} {:>9} {:>7}".format(
+            name, frames, total // max(frames, 1), largest))
+    print("[MEM] collection takes ~{} us".format(collect_us))
+
+
+def fragmentation(label):
+    """
+    Collect, then print the heap's state after ``label`` (a mode change), in
+    the next idle window; a later call before then replaces the label.
+    """
+    global _report
+    _report = label
+
+
+def _print_fragmentation():
+    global _report
+    label, _report = _report, None
+    _collect()     # not an idle collection: kept out of GC_IDLE
+    free = getattr(gc, 'mem_free', None)
+    print("[MEM] {}: {} used, {} free".format(label, heap_used(), free() if free else None))
+    if micropython is not None:
+        micropython.mem_info()
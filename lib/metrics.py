@@ -0,0 +1,162 @@
+"""
+Counters and histograms a deployed toy keeps about itself: frame times, I2C
+traffic, sound loads and what the games get up to.
+
+Every metric is declared below with a fixed index, and all of them live in
+preallocated arrays, so recording one allocates nothing:
+
+  metrics.inc(metrics.I2C_ERRORS)
+  t = metrics.now()
+  ...
+  metrics.since(metrics.KX_READ_US, t)   # observe the µs since t
+
+A histogram keeps a count per power-of-two bucket (bucket k holds values
+from 2**(k-1) to 2**k - 1, the last bucket everything above) and its largest
+value. Counters and buckets wrap at 2**30, so they stay small ints.
+
+dump() prints everything as one base64 line of packed binary, over USB
+serial from the REPL:
+
+  mpremote exec "from lib import metrics; metrics.dump()"
+
+and tools/collect_metrics.py turns that line into a readable report.
+decode() reads it back here too. New metrics go at the end of their list,
+so a dump from older firmware still decodes.
+"""
+
+from array import array
+import struct
+
+from lib import clock
+
+# ── Counters ──────────────────────────────────────────────────────────────────
+FRAMES_LATE = 0       # frames that took longer to draw than the wait they asked for
+DISPLAY_CLEARS = 1    # display.clear() and fill()
+I2C_ERRORS = 2        # failed MCP23017 or KX134 reads
+KX_SAMPLES = 3        # samples drained from the KX134's buffer
+SOUND_DEFERRED = 4    # sounds held back until their button was released
+SOUND_MISSING = 5     # sounds that could not be loaded
+TILT_BOUNCES = 6      # wall (and obstacle) hits loud enough for a sound
+ROCKET_FLIGHTS = 7    # shakes that lifted the rocket off the ground
+ROCKET_LAUNCHES = 8   # rockets that reached space
+GC_IDLE = 9           # collections lib/memory ran in idle windows
+GC_MIDFRAME = 10      # collections that ran during a frame all the same
+
+COUNTER_NAMES = ('frames_late', 'display_clears', 'i2c_errors', 'kx_samples',
+                 'sound_deferred', 'sound_missing', 'tilt_bounces',
+                 'rocket_flights', 'rocket_launches', 'gc_idle', 'gc_midframe')
+
+# ── Histograms ────────────────────────────────────────────────────────────────
+FRAME_US = 0       # drawing one frame (one step of a frames() generator)
+BTN_READ_US = 1    # one MCP23017 port read
+KX_READ_US = 2     # one KX134 register or buffer read
+KX_BACKLOG = 3     # samples waiting in the KX134's buffer when drained
+WAV_LOAD_US = 4    # loading a WAV into the audio buffer
+FRAME_ALLOC = 5    # bytes of heap one frame allocated
+GC_US = 6          # one gc.collect() run by lib/memory
+
+HISTOGRAM_NAMES = ('frame_us', 'btn_read_us', 'kx_read_us', 'kx_backlog',
+                   'wav_load_us', 'frame_alloc', 'gc_us')
+
+BUCKETS = 20   # the last holds 2**18 and up (262 ms, for the µs histograms)
+
+MAGIC = b'MET1'
+HEADER = '<4sIBBB'   # magic, uptime ms, counters, histograms, buckets
+HEADER_SIZE = struct.calcsize(HEADER)
+
+_MASK = 0x3FFFFFFF
+_TOP = BUCKETS - 1
+
+
+_counters = array('I', [0] * len(COUNTER_NAMES))
+_max = array('I', [0] * len(HISTOGRAM_NAMES))
+_buckets = array('I', [0] * (len(HISTOGRAM_NAMES) * BUCKETS))
+
+
+def inc(counter, n=1):
+    """Add ``n`` to a counter."""
+    _counters[counter] = (_counters[counter] + n) & _MASK
+
+
+def observe(histogram, value):
+    """Record one value (negative counts as 0) in a histogram."""
+    if value > _max[histogram]:
+        _max[histogram] = value if value <= _MASK else _MASK
+    b = 0
+    while value > 0 and b < _TOP:
+        value >>= 1
+        b += 1
+    i = histogram * BUCKETS + b
+    _buckets[i] = (_buckets[i] + 1) & _MASK
+
+
+def now():
+    """A ticks_us timestamp for since()."""
+    return clock.ticks_us()
+
+
+def since(histogram, start):
+    """Observe the µs from ``start`` (a now()) to now; returns them."""
+    us = clock.ticks_diff(clock.ticks_us(), start)
+    observe(histogram, us)
+    return us
+
+
+def counter(index):
+    """A counter's value."""
+    return _counters[index]
+
+
+def histogram(index):
+    """(count, max, buckets) of one histogram."""
+    buckets = list(_buckets[index * BUCKETS:(index + 1) * BUCKETS])
+    return sum(buckets), _max[index], buckets
+
+
+def reset():
+    """Zero everything."""
+    for a in (_counters, _max, _buckets):
+        for i in range(len(a)):
+            a[i] = 0
+
+
+def snapshot():
+    """Everything, packed: the header, the counters, then each histogram's max and buckets."""
+    out = bytearray(struct.pack(HEADER, MAGIC, clock.ticks_ms() & 0xFFFFFFFF,
+                                len(_counters), len(_max), BUCKETS))
+    out += struct.pack('<%dI' % len(_counters), *_counters)
+    for h in range(len(_max)):
+        out += struct.pack('<I', _max[h])
+        out += struct.pack('<%dI' % BUCKETS, *_buckets[h * BUCKETS:(h + 1) * BUCKETS])
+    return bytes(out)
+
+
+def dump():
+    """Print snapshot() as one line: '[METRICS] ' and base64."""
+    import binascii
+    print('[METRICS] ' + binascii.b2a_base64(snapshot()).decode().strip())
+
+
+def decode(data):
+    """
+    A snapshot() as a dict: uptime_ms, counters {name: value} and histograms
+    {name: (count, max, buckets)}. Metrics newer than this code are named
+    by index.
+    """
+    magic, uptime_ms, n_counters, n_histograms, buckets = struct.unpack_from(HEADER, data)
+    if magic != MAGIC:
+        raise ValueError("Not a metrics snapshot")
+    values = struct.unpack_from('<%dI' % (n_counters + n_histograms * (buckets + 1)),
+                                data, HEADER_SIZE)
+    counters = {}
+    for i in range(n_counters):
+        name = COUNTER_NAMES[i] if i < len(COUNTER_NAMES) else 'counter_%d' % i
+        counters[name] = values[i]
+    histograms = {}
+    o = n_counters
+    for h in range(n_histograms):
+        name = HISTOGRAM_NAMES[h] if h < len(HISTOGRAM_NAMES) else 'histogram_%d' % h
+        counts = list(values[o + 1:o + 1 + buckets])
+        histograms[name] = (sum(counts), values[o], counts)
+        o += buckets + 1
+    return {'uptime_ms': uptime_ms, 'counters': counters, 'histograms': histograms}
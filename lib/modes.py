@@ -0,0 +1,166 @@
+"""
+The toy's mode state machine: Idle, Animation, Tilt Game, Rocket Blast-off
+and Sleep, the events that move between them, and how long each move took.
+
+No hardware, and it never reads the clock: the caller passes the time
+(ticks_us) to fire(), along with when the cause was first seen (the input task
+latching a press, a game returning), and lib/clock differences the two. The
+machine keeps, per (from, to) pair, how many transitions there were and their
+latest, longest and total latency from cause to the new mode starting. It also
+keeps a ring of the most recent transitions. A fire() is a table lookup and a
+few array stores. tools/fuzz_modes.py drives main.py's mode task through it
+with random input on the desktop.
+
+Side effects that belong to a transition rather than to a mode (reset the
+two-button holds, restart the sleep timer) go in the ``on_change`` hook.
+"""
+
+from array import array
+
+from lib import clock
+
+# States
+IDLE = 0
+ANIMATION = 1
+TILT = 2
+ROCKET = 3
+SLEEP = 4
+NAMES = ('idle', 'animation', 'tilt', 'rocket', 'sleep')
+
+# Events
+PRESS = 0          # an Animation Button press (or one interrupting an animation)
+TILT_HOLD = 1      # yellow + red held 5 s
+ROCKET_HOLD = 2    # blue + pink held 5 s
+DONE = 3           # the animation finished
+SETTLED = 4        # a game was left still → sleep
+SLEEP_DUE = 5      # the inactivity timeout ran out
+WAKE = 6           # a button woke the toy
+EVENT_NAMES = ('press', 'tilt hold', 'rocket hold', 'done', 'settled', 'sleep due', 'wake')
+
+_N_STATES = len(NAMES)
+_N_EVENTS = len(EVENT_NAMES)
+
+# (state, event) → next state. Each game is left by its own combo; the other
+# game's combo and the Animation Buttons are ignored while it runs.
+TRANSITIONS = {
+    (IDLE, PRESS): ANIMATION,
+    (IDLE, TILT_HOLD): TILT,
+    (IDLE, ROCKET_HOLD): ROCKET,
+    (IDLE, SLEEP_DUE): SLEEP,
+    (ANIMATION, PRESS): ANIMATION,
+    (ANIMATION, DONE): IDLE,
+    (ANIMATION, TILT_HOLD): TILT,
+    (ANIMATION, ROCKET_HOLD): ROCKET,
+    (TILT, TILT_HOLD): IDLE,
+    (TILT, SETTLED): SLEEP,
+    (ROCKET, ROCKET_HOLD): IDLE,
+    (ROCKET, SETTLED): SLEEP,
+    (SLEEP, WAKE): IDLE,
+}
+
+_NONE = 255
+_TABLE = bytearray([_NONE] * (_N_STATES * _N_EVENTS))
+for (_state, _event), _next in TRANSITIONS.items():
+    _TABLE[_state * _N_EVENTS + _event] = _next
+
+
+class ModeMachine:
+    """
+    The current mode and its transition counters. ``history`` is how many
+    recent transitions are kept for history().
+    """
+
+    def __init__(self, history=32, on_change=None):
+        self.on_change = on_change    # on_change(old, new, event), after the move
+        self.state = IDLE
+        self.since = 0                # ticks_us the current state was entered
+        self.entered_by = None        # the event that entered it
+        self.rejected = 0             # events that mean nothing in their state
+        pairs = _N_STATES * _N_STATES
+        self.counts = array('L', [0] * pairs)
+        self.last_us = array('L', [0] * pairs)
+        self.max_us = array('L', [0] * pairs)
+        self.total_us = [0] * pairs   # may outgrow 32 bits over a long uptime
+        self._ring_at = array('L', [0] * history)
+        self._ring_move = bytearray(3 * history)   # from, to, event
+        self._ring_len = history
+        self._ring_next = 0
+        self.transitions = 0
+
+    def next_state(self, event):
+        """Where ``event`` would take the machine, or None if it is ignored."""
+        to = _TABLE[self.state * _N_EVENTS + event]
+        return None if to == _NONE else to
+
+    def fire(self, event, now, cause=None):
+        """
+        Apply ``event`` at ticks_us ``now``. ``cause`` is when what caused it
+        was first seen (defaults to ``now``). Returns the new state, or None
+        if the event is ignored in this state.
+        """
+        old = self.state
+        to = _TABLE[old * _N_EVENTS + event]
+        if to == _NONE:
+            self.rejected += 1
+            return None
+        latency = 0 if cause is None else clock.ticks_diff(now, cause)
+        if latency < 0:
+            latency = 0
+        pair = old * _N_STATES + to
+        self.counts[pair] += 1
+        self.last_us[pair] = latency
+        if latency > self.max_us[pair]:
+            self.max_us[pair] = latency
+        self.total_us[pair] += latency
+
+        i = self._ring_next
+        self._ring_at[i] = now & (clock.TICKS_PERIOD - 1)
+        j = 3 * i
+        self._ring_move[j] = old
+        self._ring_move[j + 1] = to
+        self._ring_move[j + 2] = event
+        self._ring_next = i + 1 if i + 1 < self._ring_len else 0
+        self.transitions += 1
+
+        self.state = to
+        self.since = now
+        self.entered_by = event
+        if self.on_change is not None:
+            self.on_change(old, to, event)
+        return to
+
+    def history(self):
+        """Recent transitions, oldest first: (ticks_us, from, to, event)."""
+        n = min(self.transitions, self._ring_len)
+        start = (self._ring_next - n) % self._ring_len
+        moves = []
+        for k in range(n):
+            i = (start + k) % self._ring_len
+            j = 3 * i
+            moves.append((self._ring_at[i], self._ring_move[j],
+                          self._ring_move[j + 1], self._ring_move[j + 2]))
+        return moves
+
+    def latency(self, old, new):
+        """(count, last_us, max_us, mean_us) for transitions from old to new."""
+        pair = old * _N_STATES + new
+        count = self.counts[pair]
+        mean = self.total_us[pair] // count if count else 0
+        return count, self.last_us[pair], self.max_us[pair], mean
+
+    def stats(self):
+        """Every transition seen so far as {'from→to': (count, last, max, mean)}."""
+        out = {}
+        for old in range(_N_STATES):
+            for new in range(_N_STATES):
+                if self.counts[old * _N_STATES + new]:
+                    out[NAMES[old] + '→' + NAMES[new]] = self.latency(old, new)
+        return out
+
+    def report(self):
+        """Print the transition latency counters as a table."""
+        print("[MODES] transition            count   last us    max us   mean us")
+        for name, (count, last, top, mean) in sorted(self.stats().items()):
+            print("[MODES] {:<22} {:>6} {:>9} {:>9} {:>9}".format(name, count, last, top, mean))
+        if self.rejected:
+            print("[MODES] ignored events: {}".format(self.rejected))
@@ -3,9 +3,10 @@ Auto-sleep timer and sleep/wake logic.
 The toy sleeps after 2 minutes of inactivity to conserve battery.
 """
 
-import time
 import machine
 
+from lib import clock
+
 # Sleep timeout in milliseconds (2 minutes)
 SLEEP_TIMEOUT_MS = 2 * 60 * 1000
 
@@ -16,14 +17,14 @@ _last_activity = 0
 def reset_timer():
     """Reset the inactivity timer (call on any button press)."""
     global _last_activity
-    _last_activity = time.ticks_ms()
+    _last_activity = clock.ticks_ms()
 
 
 def should_sleep():
     """Check if the inactivity timeout has been reached."""
     if _last_activity == 0:
         return False
-    elapsed = time.ticks_diff(time.ticks_ms(), _last_activity)
+    elapsed = clock.ticks_diff(clock.ticks_ms(), _last_activity)
     return elapsed >= SLEEP_TIMEOUT_MS
 
 
@@ -31,16 +32,16 @@ def time_until_sleep_ms():
     """Return milliseconds until sleep, or 0 if should sleep now."""
     if _last_activity == 0:
         return SLEEP_TIMEOUT_MS
-    elapsed = time.ticks_diff(time.ticks_ms(), _last_activity)
+    elapsed = clock.ticks_diff(clock.ticks_ms(), _last_activity)
     remaining = SLEEP_TIMEOUT_MS - elapsed
     return max(0, remaining)
 
 
-def enter_sleep(su, graphics):
+def sleeping(su, graphics):
     """
-    Enter low-power sleep mode.
+    Low-power sleep as a frame generator (lib/coro.py): yields the ms to wait
+    between button checks and returns once a press has woken the toy.
     Display is turned off, minimal power consumption.
-    Any button press will wake the device.
     """
     from lib import display, buttons
 
@@ -54,11 +55,21 @@ def enter_sleep(su, graphics):
         # Check for button press to wake
         if buttons.any_pressed():
             reset_timer()
-            buttons.wait_for_release()
+            while buttons.any_pressed():   # wait for release
+                yield 10
             return  # Wake up
 
         # Light sleep for a short period
-        time.sleep_ms(100)
+        yield 100
+
+
+def enter_sleep(su, graphics):
+    """
+    Enter low-power sleep mode, blocking until woken.
+    Any button press will wake the device.
+    """
+    from lib import coro
+    coro.run(sleeping(su, graphics), clock.sleep_ms)
 
 
 def init():
@@ -14,6 +14,9 @@ import gc
 gc.collect()  # Clean up before allocation
 AUDIO_BUFFER_SIZE = 200000
 _audio_buffer = bytearray(AUDIO_BUFFER_SIZE)
+
+# Only now: the metrics registry allocates its arrays when imported.
+from lib import metrics  # noqa: E402
 _audio_length = 0  # Actual length of data in buffer
 _current_sample_rate = 16000
 
@@ -119,13 +122,20 @@ def play(su, filename):
     global _deferred
     if _gate_armed:
         _deferred = filename   # hold until the button is released
+        metrics.inc(metrics.SOUND_DEFERRED)
         return
     _play_now(su, filename)
 
 
 def _play_now(su, filename):
     """Load and start a WAV file immediately, bypassing the gate."""
-    audio_data, sample_rate = load_wav(filename)
+    start = metrics.now()
+    try:
+        audio_data, sample_rate = load_wav(filename)
+    except OSError:
+        metrics.inc(metrics.SOUND_MISSING)
+        raise
+    metrics.since(metrics.WAV_LOAD_US, start)
     su.play_sample(audio_data)
 
 
@@ -0,0 +1,128 @@
+"""
+Indexed-colour sprite sheets compiled on the host.
+
+generate_images/compile_sprites.py turns the ASCII sprite designs (the same
+rows + legend format the preview scripts use) or PNGs into a small binary file.
+The device reads the header and palette, then pulls every frame in with a
+single readinto() — no per-frame geometry code or float maths.
+
+File layout (little-endian):
+  magic    4s  b'SPR1'
+  width    B   frame width in sprite columns
+  height   B   frame height in sprite rows
+  left     B   column of the frame's left edge on the 16x16 design grid
+  top      B   row of the frame's top edge on the 16x16 design grid
+  bpp      B   4 (<= 15 colours) or 8 bits per pixel
+  colours  B   palette entries, including index 0 (transparent)
+  frames   H   number of frames
+  palette  colours * 3 bytes (r, g, b); entry 0 is never drawn
+  pixels   frames * frame_bytes, row-major; 4bpp packs two pixels per byte,
+           the left pixel in the high nibble
+
+Sprite grid convention (matches the preview images): col 0 is the left column,
+row 0 is the top row. On the display that is logical (x, y) = (15 - row, col),
+so dx moves a sprite up and dy moves it right.
+"""
+
+import struct
+
+from lib import display
+
+MAGIC = b'SPR1'
+HEADER = '<4sBBBBBBH'
+HEADER_SIZE = struct.calcsize(HEADER)   # 12 bytes
+
+
+def parse_header(buf):
+    """
+    Decode a sheet header.
+
+    Returns (width, height, left, top, bpp, colours, frames). Raises ValueError
+    if the magic or bit depth is wrong.
+    """
+    magic, width, height, left, top, bpp, colours, frames = struct.unpack(HEADER, buf)
+    if magic != MAGIC:
+        raise ValueError("Not a sprite sheet")
+    if bpp not in (4, 8):
+        raise ValueError("Unsupported bit depth: {}".format(bpp))
+    return width, height, left, top, bpp, colours, frames
+
+
+def frame_size(width, height, bpp):
+    """Bytes used by one frame (4bpp rows are padded to a whole byte)."""
+    if bpp == 4:
+        return ((width + 1) // 2) * height
+    return width * height
+
+
+def make_pens(graphics, palette):
+    """Create one pen per palette entry (index 0 is a placeholder)."""
+    pens = [0]
+    for i in range(3, len(palette), 3):
+        pens.append(graphics.create_pen(palette[i], palette[i + 1], palette[i + 2]))
+    return pens
+
+
+def draw_frame(graphics, pens, data, width, height, left, top, bpp, dx=0, dy=0):
+    """
+    Draw one frame's pixel data, clipped to the 16x16 display.
+
+    data is a bytes-like object holding exactly one frame. Transparent pixels
+    (index 0) are skipped and the pen only changes between colour runs. Does
+    not update the display.
+    """
+    # Clip to the visible rows/columns once, so the inner loop has no bounds
+    # checks: logical x = 15 - (top + row) + dx, logical y = left + col + dy.
+    row_lo = max(0, dx - top)
+    row_hi = min(height, 16 + dx - top)
+    col_lo = max(0, -(left + dy))
+    col_hi = min(width, 16 - left - dy)
+    if row_lo >= row_hi or col_lo >= col_hi:
+        return
+
+    stride = (width + 1) // 2 if bpp == 4 else width
+    current = 0
+    for row in range(row_lo, row_hi):
+        x = 15 - (top + row) + dx
+        base = row * stride
+        for col in range(col_lo, col_hi):
+            if bpp == 4:
+                b = data[base + (col >> 1)]
+                idx = (b & 0x0F) if (col & 1) else (b >> 4)
+            else:
+                idx = data[base + col]
+            if idx == 0:
+                continue
+            if idx != current:
+                graphics.set_pen(pens[idx])
+                current = idx
+            display.pixel(graphics, x, left + col + dy)
+
+
+class SpriteSheet:
+    """A compiled sprite sheet held entirely in RAM."""
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as f:
+            (self.width, self.height, self.left, self.top,
+             self.bpp, colours, self.frames) = parse_header(f.read(HEADER_SIZE))
+            self.palette = f.read(colours * 3)
+            self.frame_bytes = frame_size(self.width, self.height, self.bpp)
+            self._data = bytearray(self.frame_bytes * self.frames)
+            if f.readinto(self._data) != len(self._data):
+                raise ValueError("Truncated sprite sheet")
+        self._pens = None
+        self._pens_for = None
+
+    def frame(self, index):
+        """Return a memoryview of one frame's packed pixels."""
+        start = index * self.frame_bytes
+        return memoryview(self._data)[start:start + self.frame_bytes]
+
+    def draw(self, graphics, index=0, dx=0, dy=0):
+        """Draw frame ``index`` shifted by (dx, dy). Does not update the display."""
+        if self._pens_for is not graphics:
+            self._pens = make_pens(graphics, self.palette)
+            self._pens_for = graphics
+        draw_frame(graphics, self._pens, self.frame(index), self.width,
+                   self.height, self.left, self.top, self.bpp, dx, dy)
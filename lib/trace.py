@@ -0,0 +1,176 @@
+"""
+Accelerometer traces: record what the games read from the KX134 so a play
+session can be replayed on the desktop (tools/replay_trace.py).
+
+A Recorder stands in for the KX134 during a game. It passes every reading
+through unchanged and appends it, timestamped, to a ring buffer in a
+preallocated flash file, so the file never grows and always holds the most
+recent CAPACITY readings. Records are packed into a preallocated RAM block
+and written BLOCK at a time, so most frames never touch flash.
+
+It forwards the KX134's sample buffer too, so Rocket Blast-off plays the same
+with a recording running as without. Each buffered sample is recorded, all
+of one read_buffer() stamped with the time of that read: a replay hands the
+game the same samples on the same frames. The buffer runs at 400 Hz, so a
+rocket trace holds about CAPACITY / 400 s.
+
+File layout (little-endian):
+  magic     4s  b'KXT1'
+  capacity  I   record slots in the ring
+  head      I   slot the next record goes into
+  count     I   records held (<= capacity; oldest is at head - count)
+  records   capacity * (t_ms I, x h, y h, z h)
+
+t_ms counts from the start of the recording; x/y/z are raw KX134 counts
+(4096 per g at ±8 g), exactly what read_xyz_raw() or read_buffer() returned.
+"""
+
+import struct
+
+from lib import clock
+from lib.kx134 import COUNTS_PER_G, SAMPLE_SIZE
+
+MAGIC = b'KXT1'
+HEADER = '<4sIII'
+HEADER_SIZE = struct.calcsize(HEADER)   # 16 bytes
+RECORD = '<Ihhh'
+RECORD_SIZE = struct.calcsize(RECORD)   # 10 bytes
+SAMPLE = '<hhh'                         # one buffered KX134 sample
+
+TRACE_FILE = "trace.kxt"
+CAPACITY = 9000   # ~5 minutes of play at 30 fps, 90 KB of flash
+BLOCK = 64        # records buffered in RAM between flash writes (~2 s)
+
+
+def _open_ring(filename, capacity):
+    """Open the ring file, reusing it if its capacity matches, else recreate it."""
+    try:
+        f = open(filename, 'r+b')
+        head = f.read(HEADER_SIZE)
+        if len(head) == HEADER_SIZE:
+            magic, cap, _, _ = struct.unpack(HEADER, head)
+            if magic == MAGIC and cap == capacity:
+                return f
+        f.close()
+    except OSError:
+        pass
+    f = open(filename, 'w+b')
+    f.write(struct.pack(HEADER, MAGIC, capacity, 0, 0))
+    zeros = bytes(RECORD_SIZE * BLOCK)   # preallocate in block-sized writes
+    left = capacity * RECORD_SIZE
+    while left:
+        n = min(left, len(zeros))
+        f.write(zeros if n == len(zeros) else zeros[:n])
+        left -= n
+    return f
+
+
+class Recorder:
+    """
+    Wraps a KX134 for a game: same read methods and sample buffer, every
+    reading and buffered sample recorded.
+
+    Call close() when the game ends to write out the last partial block.
+    """
+
+    def __init__(self, kx, filename=TRACE_FILE, capacity=CAPACITY, block=BLOCK):
+        self._kx = kx
+        self.capacity = capacity
+        self._block = min(block, capacity)
+        self._buf = bytearray(self._block * RECORD_SIZE)
+        self._mv = memoryview(self._buf)
+        self._pending = 0
+        self._head = 0
+        self._count = 0
+        self._f = _open_ring(filename, capacity)
+        self._write_header()
+        self._t0 = clock.ticks_ms()
+
+    def _write_header(self):
+        self._f.seek(0)
+        self._f.write(struct.pack(HEADER, MAGIC, self.capacity, self._head, self._count))
+
+    def _record(self, t, x, y, z):
+        struct.pack_into(RECORD, self._buf, self._pending * RECORD_SIZE, t, x, y, z)
+        self._pending += 1
+        if self._pending == self._block:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered records into the ring and update the header."""
+        n = self._pending
+        if not n:
+            return
+        f = self._f
+        first = min(n, self.capacity - self._head)
+        f.seek(HEADER_SIZE + self._head * RECORD_SIZE)
+        f.write(self._mv[:first * RECORD_SIZE])
+        if first < n:
+            f.seek(HEADER_SIZE)
+            f.write(self._mv[first * RECORD_SIZE:n * RECORD_SIZE])
+        self._head = (self._head + n) % self.capacity
+        self._count = min(self.capacity, self._count + n)
+        self._pending = 0
+        self._write_header()
+        f.flush()
+
+    def close(self):
+        self.flush()
+        self._f.close()
+
+    # ── KX134 interface ───────────────────────────────────────────────────────
+
+    def read_xyz_raw(self):
+        x, y, z = self._kx.read_xyz_raw()
+        self._record(clock.ticks_diff(clock.ticks_ms(), self._t0), x, y, z)
+        return x, y, z
+
+    def read_xy_raw(self):
+        x, y, _ = self.read_xyz_raw()
+        return x, y
+
+    def read_xyz(self):
+        x, y, z = self.read_xyz_raw()
+        return x / COUNTS_PER_G, y / COUNTS_PER_G, z / COUNTS_PER_G
+
+    def read_xy(self):
+        x, y, _ = self.read_xyz_raw()
+        return x / COUNTS_PER_G, y / COUNTS_PER_G
+
+    def enable_buffer(self):
+        self._kx.enable_buffer()
+
+    def disable_buffer(self):
+        self._kx.disable_buffer()
+
+    def buffered(self):
+        return self._kx.buffered()
+
+    def read_buffer(self, buf):
+        n = self._kx.read_buffer(buf)
+        t = clock.ticks_diff(clock.ticks_ms(), self._t0)
+        for i in range(n):
+            self._record(t, *struct.unpack_from(SAMPLE, buf, i * SAMPLE_SIZE))
+        return n
+
+
+def load(filename):
+    """Every record in a trace file, oldest first, as (t_ms, x, y, z) tuples."""
+    with open(filename, 'rb') as f:
+        magic, capacity, head, count = struct.unpack(HEADER, f.read(HEADER_SIZE))
+        if magic != MAGIC:
+            raise ValueError("Not an accelerometer trace")
+        if not count:
+            return []
+        data = f.read(capacity * RECORD_SIZE)
+    start = (head - count) % capacity
+    return [struct.unpack_from(RECORD, data, ((start + i) % capacity) * RECORD_SIZE)
+            for i in range(count)]
+
+
+def save(filename, samples):
+    """Write (t_ms, x, y, z) samples as a full trace file (for synthetic traces)."""
+    with open(filename, 'wb') as f:
+        f.write(struct.pack(HEADER, MAGIC, len(samples), 0, len(samples)))
+        for sample in samples:
+            f.write(struct.pack(RECORD, *sample))
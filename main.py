@@ -11,39 +11,68 @@ Hardware: Pimoroni Stellar Unicorn with Raspberry Pi Pico 2 W + MCP23017
 import gc
 gc.collect()  # Clean memory before any allocations
 
-# CRITICAL: Import sound FIRST to allocate audio buffer before fragmentation
+# CRITICAL: Import sound FIRST to allocate audio buffer before fragmentation.
+# Not even the boot profiler comes before it, so the import is timed by hand
+# and recorded once bootlog is loaded. (Desktop CPython has no gc.mem_alloc:
+# there the heap is tracemalloc's count from 0, started just before main is
+# imported, so the step also carries main.py's own load.)
+import time
+_sound_start = time.ticks_us(), gc.mem_alloc() if hasattr(gc, 'mem_alloc') else 0
 from lib import sound
 
-import time
-from machine import I2C, Pin
-from stellar import StellarUnicorn
-from picographics import PicoGraphics, DISPLAY_STELLAR_UNICORN
+# Boot profiler next: every step after it gets timed.
+from lib import bootlog
+bootlog.record("import sound", *_sound_start)
+
+with bootlog.step("import asyncio"):
+    try:
+        import uasyncio as asyncio
+    except ImportError:
+        import asyncio
+with bootlog.step("import hardware"):
+    from machine import I2C, Pin
+    from stellar import StellarUnicorn
+    from picographics import PicoGraphics, DISPLAY_STELLAR_UNICORN
 
 # Import remaining modules
-from lib import display, buttons, sleep
-from lib.kx134 import KX134
-from animations import get_animation, play_boot
-from games import tilt, rocket_blast
+with bootlog.step("import lib"):
+    from lib import arena, clock, coro, display, buttons, dualcore, log, memory, modes, sleep
+    from lib import framestore   # boat's, loaded lazily: here so its page is reserved
+    from lib.kx134 import KX134
+    from lib import trace
+with bootlog.step("import animations"):
+    from animations import get_animation, play_boot, warm_up
+with bootlog.step("import games"):
+    from games import tilt, tilt_multi, rocket_blast
 
 # Configuration
 DEFAULT_BRIGHTNESS = 1  # 75% brightness
 MIN_BRIGHTNESS = 0.1      # Minimum brightness floor
 MAX_BRIGHTNESS = 1.0
 VOLUME = 0.45             # Fixed moderate volume (~45%)
+WARM_UP_IDLE_MS = 3000    # idle this long → pre-import animations (0 disables)
+SAVE_BOOT_PROFILE = True  # write bootlog.LOG_FILE on every boot
+TILT_BALLS = 1            # >1 plays the multi-ball obstacle Tilt Game instead
+RECORD_TRACE = False      # record the KX134 during games to trace.TRACE_FILE
+INPUT_MS = 10             # input task poll period
+DUAL_CORE = False         # compose animation frames on core 1 (lib/dualcore.py)
+HEAP_REPORT = False       # print the heap's fragmentation after every mode change
 
 
 def setup():
     """Initialize hardware and return instances."""
     print("[SETUP] Creating display...")
-    su = StellarUnicorn()
-    graphics = PicoGraphics(display=DISPLAY_STELLAR_UNICORN)
+    with bootlog.step("setup display"):
+        su = StellarUnicorn()
+        graphics = PicoGraphics(display=DISPLAY_STELLAR_UNICORN)
 
     print("[SETUP] Setting brightness and volume...")
     su.set_brightness(DEFAULT_BRIGHTNESS)
     sound.set_volume(su, VOLUME)
 
     print("[SETUP] Initialising buttons (MCP23017)...")
-    buttons.init(su)
+    with bootlog.step("setup buttons"):
+        buttons.init(su)
     print("[SETUP] Buttons OK")
 
     print("[SETUP] Initialising sleep timer...")
@@ -52,10 +81,12 @@ def setup():
     print("[SETUP] Initialising KX134 accelerometer...")
     kx = None
     try:
-        kx_i2c = I2C(0, sda=Pin(4), scl=Pin(5), freq=400_000)
-        devices = kx_i2c.scan()
+        with bootlog.step("setup i2c scan"):
+            kx_i2c = I2C(0, sda=Pin(4), scl=Pin(5), freq=400_000)
+            devices = kx_i2c.scan()
         print(f"[SETUP] I2C scan found devices: {[hex(d) for d in devices]}")
-        kx = KX134(kx_i2c)
+        with bootlog.step("setup kx134"):
+            kx = KX134(kx_i2c)
         print("[SETUP] KX134 OK — X/Y/Z measurement enabled")
     except Exception as e:
         print(f"[SETUP] KX134 FAILED: {e} — accelerometer disabled")
@@ -63,6 +94,37 @@ def setup():
     return su, graphics, kx
 
 
+def boot():
+    """
+    Run the power-on sequence up to the point the toy is ready for a press.
+
+    Sets up the hardware, plays the boot animation and clears the display,
+    timing every step with bootlog. Returns (su, graphics, kx).
+    """
+    print("=== TOY STARTING ===")
+    # Everything is imported: the fixed-size buffers go next, in one piece,
+    # like the audio buffer before them.
+    with bootlog.step("reserve buffers"):
+        print("[SETUP] Reserved {} bytes of buffers".format(arena.reserve()))
+    with bootlog.step("setup"):
+        su, graphics, kx = setup()
+    print("[SETUP] All done")
+    memory.init()
+
+    print("[MAIN] Playing boot animation...")
+    with bootlog.step("boot animation"):
+        memory.track("boot")
+        play_boot(su, graphics)
+
+    display.clear(graphics, su)
+    bootlog.ready()
+    bootlog.report()
+    if SAVE_BOOT_PROFILE:
+        bootlog.save()
+    print("[MAIN] Ready — waiting for button press")
+    return su, graphics, kx
+
+
 def check_brightness_buttons(su):
     """
     Check and handle the Stellar Unicorn's built-in brightness buttons.
@@ -86,203 +148,424 @@ def check_brightness_buttons(su):
     return brightness_changed
 
 
-def create_interrupt_checker(su):
+class App:
+    """
+    What the tasks share: the hardware, the mode machine and the latest input.
+
+    The input task latches a debounced Animation Button press in ``pressed``
+    and a completed two-button hold in ``toggle`` (modes.TILT_HOLD or
+    ROCKET_HOLD), with the ticks_us it saw them, then sets ``changed``; the
+    mode task takes them. ``held`` is whether any button was down at the last
+    poll.
+    """
+
+    def __init__(self, su, graphics, kx):
+        self.su = su
+        self.graphics = graphics
+        self.kx = kx
+        self.modes = modes.ModeMachine(on_change=self._mode_changed)
+        self.pressed = None
+        self.pressed_at = 0
+        self.toggle = None
+        self.toggle_at = 0
+        self.exit_at = 0          # when the hold that ended the current game was seen
+        self.held = False
+        self.button = None        # the playing animation's button and module
+        self.animation = None
+        self.changed = asyncio.Event()   # pressed or toggle latched
+        self.gate = asyncio.Event()      # an animation's sound waits for button-up
+        self.awake = asyncio.Event()     # cleared while the toy sleeps
+        self.awake.set()
+        self.renderer = Renderer(wake=self.changed)
+        self.core1 = dualcore.Core1() if DUAL_CORE else None
+
+    @property
+    def mode(self):
+        return self.modes.state
+
+    def take_pressed(self):
+        pressed = self.pressed
+        self.pressed = None
+        return pressed
+
+    def should_exit(self):
+        """A game's should_exit: its own combo has been held again."""
+        own = modes.TILT_HOLD if self.modes.state == modes.TILT else modes.ROCKET_HOLD
+        if self.toggle == own:
+            self.toggle = None
+            self.exit_at = self.toggle_at
+            return True
+        return False
+
+    def _mode_changed(self, old, new, event):
+        """What every transition into or out of a mode must do."""
+        if old == modes.TILT or old == modes.ROCKET or old == modes.SLEEP:
+            # The combo that left a game (or the press that woke the toy) may
+            # still be held; don't let it count toward a new toggle.
+            buttons.reset_mode_toggle()
+        if new == modes.IDLE or new == modes.ANIMATION:
+            sleep.reset_timer()
+        if new == modes.SLEEP:
+            self.awake.clear()
+        elif old == modes.SLEEP:
+            self.pressed = self.toggle = None
+            self.awake.set()
+        if HEAP_REPORT:
+            memory.fragmentation("{} -> {}".format(modes.NAMES[old], modes.NAMES[new]))
+
+
+class Renderer:
+    """
+    The renderer task: runs one frames() generator at a time (an animation, a
+    game or sleep) and hands its result back to play()'s caller. An
+    animation's hold ends early when ``wake`` is set. ``finished_at`` is the
+    ticks_us the last one returned.
+    """
+
+    def __init__(self, wake=None):
+        self.wake = wake
+        self._frames = None
+        self._start = asyncio.Event()
+        self._done = asyncio.Event()
+        self._result = None
+        self._error = None
+        self.finished_at = 0
+
+    async def play(self, frames):
+        """Render ``frames`` to its end; returns its return value."""
+        self._frames = frames
+        self._done.clear()
+        self._start.set()
+        await self._done.wait()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        return self._result
+
+    async def run(self):
+        while True:
+            await self._start.wait()
+            self._start.clear()
+            try:
+                self._result = await coro.run_async(self._frames, self.wake)
+            except Exception as e:   # re-raised in play(), in the mode task
+                self._error = e
+            self.finished_at = clock.ticks_us()
+            self._frames = None
+            self._done.set()
+
+
+def poll_input(app):
+    """
+    One pass of the input task: the brightness buttons, the two-button holds
+    that matter in this mode, and (out of the games) Animation Button presses.
+    The Animation Buttons are read once, with a single I2C read, and every
+    check below looks at that snapshot.
+    """
+    check_brightness_buttons(app.su)
+    port = buttons.snapshot()
+    app.held = buttons.any_pressed(port)
+    mode = app.mode
+    in_animations = mode == modes.IDLE or mode == modes.ANIMATION
+    # Yellow (star) + red (heart) held 5 s toggles the Tilt Game; blue (boat) +
+    # pink (butterfly) toggles Rocket Blast-off. Each game only watches its own.
+    if (in_animations or mode == modes.TILT) and buttons.check_mode_toggle(port):
+        app.toggle = modes.TILT_HOLD
+        app.toggle_at = clock.ticks_us()
+        app.changed.set()
+    if (in_animations or mode == modes.ROCKET) and buttons.check_rocket_toggle(port):
+        app.toggle = modes.ROCKET_HOLD
+        app.toggle_at = clock.ticks_us()
+        app.changed.set()
+    if not in_animations:
+        return   # the games ignore the Animation Buttons
+
+    # While either toggle combo is being held, don't fire an animation — let
+    # the hold accumulate toward the mode toggle instead.
+    if buttons.is_pressed('star', port) and buttons.is_pressed('heart', port):
+        return
+    if buttons.is_pressed('boat', port) and buttons.is_pressed('butterfly', port):
+        return
+    pressed = buttons.get_pressed(port)
+    if pressed:
+        app.pressed = pressed
+        app.pressed_at = clock.ticks_us()
+        app.changed.set()
+
+
+def create_interrupt_checker(app):
     """
     Create a closure that checks for button interrupts.
-    Returns a function that returns the name of pressed button or None.
+    Returns a function that returns the name of pressed button, 'toggle' once a
+    game's hold completes, or None. It only reads what the input task latched
+    from its one snapshot per poll, so it costs no I2C; an animation's hold
+    phase calls it only when the renderer's wake event says there is input.
     """
     def check_interrupt():
-        # Also handle brightness buttons
-        check_brightness_buttons(su)
-        # Hold-to-delay audio: once the trigger button is released, let the
-        # animation's deferred sound start.
-        if not buttons.any_pressed():
-            sound.release_gate(su)
-        return buttons.get_pressed()
+        if app.toggle is not None:
+            return 'toggle'   # the hold itself is left for the mode task
+        return app.take_pressed()
 
     return check_interrupt
 
 
-def play_tilt_game(su, graphics, kx):
-    """
-    Run the Tilt Game as a blocking loop until the player exits (holds
-    yellow+red for 5s again) or the ball settles and the toy sleeps.
+def _recording(kx):
+    """kx wrapped in a trace.Recorder when RECORD_TRACE is set, else kx itself."""
+    if not RECORD_TRACE:
+        return kx
+    try:
+        return trace.Recorder(kx)
+    except OSError as e:
+        print(f"[TRACE] Cannot record ({e}); playing without a trace")
+        return kx
 
-    While in the game the Animation Buttons are ignored — tilt.run() only reads
-    the KX134 and the exit gesture.
-    """
-    print("[MODE] Yellow + Red held 5s → entering Tilt Game")
-    sound.stop(su)
-    display.clear(graphics, su)
 
-    if kx is None:
-        print("[TILT] No KX134 — cannot run Tilt Game; returning to Animation Mode")
-        return
+def _stop_recording(kx):
+    if isinstance(kx, trace.Recorder):
+        kx.close()
+        print(f"[TRACE] Saved {trace.TRACE_FILE}")
 
-    # Exit when the yellow+red combo is held for 5s again. check_mode_toggle()
-    # won't re-fire until the entry hold is released first (its fired-latch).
-    outcome = tilt.run(su, graphics, kx, should_exit=buttons.check_mode_toggle)
 
-    display.clear(graphics, su)
-    buttons.reset_mode_toggle()
+def _start_animation(app, pressed, cause):
+    """Load a button's animation and move to ANIMATION; False if it has none."""
+    print(f"[BTN] {pressed} pressed")
+    animation = get_animation(pressed)
+    if not animation:
+        return False
+    app.button = pressed
+    app.animation = animation
+    app.modes.fire(modes.PRESS, clock.ticks_us(), cause)
+    return True
 
-    if outcome == tilt.SLEEP:
-        print("[MODE] Tilt Game settled (held still) → entering sleep")
-        sleep.enter_sleep(su, graphics)
-        print("[MODE] Woke from sleep → Animation Mode")
+
+def _start_game(app):
+    """
+    Enter the game whose hold completed (app.toggle); False if it can't run.
+
+    While in a game the Animation Buttons are ignored — the input task only
+    watches that game's own combo (its exit gesture) and the game only reads
+    the KX134. The Tilt Game and Rocket Game are mutually exclusive: you exit
+    one before the other can be entered.
+    """
+    event = app.toggle
+    app.toggle = None
+    if event == modes.TILT_HOLD:
+        print("[MODE] Yellow + Red held 5s → entering Tilt Game")
     else:
-        print("[MODE] Exited Tilt Game → Animation Mode")
+        print("[MODE] Blue + Pink held 5s → entering Rocket Blast-off")
+    sound.stop(app.su)
+    display.clear(app.graphics, app.su)
 
-    sleep.reset_timer()
+    if app.kx is None:
+        if event == modes.TILT_HOLD:
+            print("[TILT] No KX134 — cannot run Tilt Game; returning to Animation Mode")
+        else:
+            print("[ROCKET] No KX134 — cannot run Rocket Blast-off; returning to Animation Mode")
+        return False
+    app.modes.fire(event, clock.ticks_us(), app.toggle_at)
+    return True
 
 
-def play_rocket_game(su, graphics, kx):
+async def idle(app):
     """
-    Run the Rocket Blast-off game as a blocking loop until the player exits
-    (holds blue+pink for 5s again) or the toy is left still and sleeps.
-
-    While in the game the Animation Buttons are ignored — rocket_blast.run()
-    only reads the KX134 (shake) and the exit gesture. The Tilt Game and Rocket
-    Game are mutually exclusive: you exit one before the other can be entered.
+    IDLE: wait for a press, a completed hold or the sleep timeout, importing
+    animations ahead of their first press meanwhile.
     """
-    print("[MODE] Blue + Pink held 5s → entering Rocket Blast-off")
+    idle_since = clock.ticks_ms()
+    warming = bool(WARM_UP_IDLE_MS)
+    while True:
+        # Check for auto-sleep
+        if sleep.should_sleep():
+            print("Entering sleep mode...")
+            app.modes.fire(modes.SLEEP_DUE, clock.ticks_us())
+            return
+
+        # Mode toggle: hold yellow + red (Tilt Game) or blue + pink (Rocket
+        # Blast-off) for 5 seconds; holding the same combo again exits.
+        if app.toggle is not None and _start_game(app):
+            return
+
+        pressed = app.take_pressed()
+        if pressed and _start_animation(app, pressed, app.pressed_at):
+            return
+
+        # Wait for input, the sleep timeout, or time to warm up.
+        timeout = sleep.time_until_sleep_ms()
+        if warming:
+            due = WARM_UP_IDLE_MS - clock.ticks_diff(clock.ticks_ms(), idle_since)
+            if due <= 0:
+                # Import the next animation module ahead of its first press,
+                # one per input poll so a press is still picked up quickly.
+                warming = warm_up()
+                due = INPUT_MS if warming else timeout
+            timeout = min(timeout, due)
+        timeout -= memory.idle(timeout)
+        app.changed.clear()
+        try:
+            await asyncio.wait_for_ms(app.changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def play_animation(app):
+    """ANIMATION: play the pressed button's animation until it ends or is interrupted."""
+    su, graphics = app.su, app.graphics
+    pressed = app.button
+    # Stop any playing sound
     sound.stop(su)
-    display.clear(graphics, su)
 
-    if kx is None:
-        print("[ROCKET] No KX134 — cannot run Rocket Blast-off; returning to Animation Mode")
-        return
+    # Defer this animation's audio until the trigger button is released. The
+    # audio task opens the gate on button-up.
+    sound.arm_gate()
+    app.gate.set()
+    check_interrupt = create_interrupt_checker(app)
+    memory.track(app.animation.__name__.rsplit('.', 1)[-1])
+    if app.core1 is not None:
+        frames = app.core1.frames(app.animation.frames, su, graphics, check_interrupt)
+    else:
+        frames = app.animation.frames(su, graphics, check_interrupt)
+    try:
+        interrupted_by = await app.renderer.play(frames)
+    finally:
+        # Animation over — don't leak deferred audio into the next one
+        sound.disarm_gate()
+
+    if app.toggle is not None:
+        game = "tilt" if app.toggle == modes.TILT_HOLD else "rocket"
+        print(f"Animation {pressed} interrupted by the {game} toggle")
+        if _start_game(app):
+            return
+    elif interrupted_by:
+        print(f"Animation {pressed} interrupted by {interrupted_by}")
+        # Play the interrupting button's animation straight away
+        if _start_animation(app, interrupted_by, app.pressed_at):
+            return
+    else:
+        print(f"Animation {pressed} completed")
+        # Clear display after animation completes normally
+        display.clear(graphics, su)
+    app.modes.fire(modes.DONE, clock.ticks_us(), app.renderer.finished_at)
 
-    # Exit when the blue+pink combo is held for 5s again. check_rocket_toggle()
-    # won't re-fire until the entry hold is released first (its fired-latch).
-    outcome = rocket_blast.run(su, graphics, kx, should_exit=buttons.check_rocket_toggle)
 
-    display.clear(graphics, su)
-    buttons.reset_mode_toggle()
+async def play_game(app):
+    """
+    TILT or ROCKET: run the game until the player exits (holds its combo for
+    5s again) or the toy is left still and sleeps.
+    """
+    su, graphics = app.su, app.graphics
+    game = app.mode
+    kx = _recording(app.kx)
+    memory.track("rocket" if game == modes.ROCKET else "tilt")
+    try:
+        if game == modes.ROCKET:
+            frames = rocket_blast.frames(su, graphics, kx, should_exit=app.should_exit)
+        elif TILT_BALLS > 1:
+            frames = tilt_multi.frames(su, graphics, kx, should_exit=app.should_exit,
+                                       balls=TILT_BALLS)
+        else:
+            frames = tilt.frames(su, graphics, kx, should_exit=app.should_exit)
+        outcome = await app.renderer.play(frames)
+    finally:
+        _stop_recording(kx)
 
-    if outcome == rocket_blast.SLEEP:
-        print("[MODE] Rocket Blast-off left still → entering sleep")
-        sleep.enter_sleep(su, graphics)
-        print("[MODE] Woke from sleep → Animation Mode")
+    display.clear(graphics, su)
+    name = "Tilt Game" if game == modes.TILT else "Rocket Blast-off"
+    if outcome == tilt.SLEEP:
+        if game == modes.TILT:
+            print("[MODE] Tilt Game settled (held still) → entering sleep")
+        else:
+            print("[MODE] Rocket Blast-off left still → entering sleep")
+        app.modes.fire(modes.SETTLED, clock.ticks_us(), app.renderer.finished_at)
     else:
-        print("[MODE] Exited Rocket Blast-off → Animation Mode")
+        print(f"[MODE] Exited {name} → Animation Mode")
+        own = modes.TILT_HOLD if game == modes.TILT else modes.ROCKET_HOLD
+        app.modes.fire(own, clock.ticks_us(), app.exit_at)
 
-    sleep.reset_timer()
 
+async def sleeping(app):
+    """SLEEP: display off until a button wakes the toy; the input task rests."""
+    memory.track("sleep")
+    await app.renderer.play(sleep.sleeping(app.su, app.graphics))
+    timed_out = app.modes.entered_by == modes.SLEEP_DUE
+    app.modes.fire(modes.WAKE, clock.ticks_us(), app.renderer.finished_at)
+    print("Woke from sleep" if timed_out else "[MODE] Woke from sleep → Animation Mode")
 
-def main():
-    """Main program loop."""
-    print("=== TOY STARTING ===")
-    su, graphics, kx = setup()
-    print("[SETUP] All done")
 
-    print("[MAIN] Playing boot animation...")
-    play_boot(su, graphics)
+async def input_task(app):
+    """
+    Poll the buttons every INPUT_MS, whatever is rendering, and latch what
+    they say for the mode task. Rests while the toy sleeps.
+    """
+    last_heartbeat = last_kx_print = clock.ticks_ms()
+    while True:
+        if not app.awake.is_set():
+            await app.awake.wait()
+        poll_input(app)
 
-    display.clear(graphics, su)
-    print("[MAIN] Ready — waiting for button press")
+        now = clock.ticks_ms()
+        # Heartbeat so you can tell the loop is alive
+        if clock.ticks_diff(now, last_heartbeat) >= 5000:
+            print("[MAIN] loop alive")
+            last_heartbeat = now
 
-    next_button = None
-    _last_kx_print = time.ticks_ms()
-    _last_heartbeat = time.ticks_ms()
+        # KX134 accelerometer — periodic X/Y/Z readout while idle, at log.DEBUG
+        if (log.enabled(log.DEBUG) and app.kx and app.mode == modes.IDLE
+                and clock.ticks_diff(now, last_kx_print) >= 500):
+            x, y, z = app.kx.read_xyz()
+            log.debug("[KX134] X=%+.3fg  Y=%+.3fg  Z=%+.3fg", x, y, z)
+            last_kx_print = now
 
-    while True:
-        # Check for auto-sleep
-        if sleep.should_sleep():
-            print("Entering sleep mode...")
-            sleep.enter_sleep(su, graphics)
-            print("Woke from sleep")
-            # After wake, just go back to idle (no boot animation per PRD)
-            next_button = None
-            buttons.reset_mode_toggle()
-            continue
-
-        # Mode toggle: hold the yellow (star) + red (heart) buttons together for
-        # 5 seconds to enter the Tilt Game. The game runs as a blocking loop;
-        # holding the same combo again (or the ball settling) exits it.
-        if buttons.check_mode_toggle():
-            play_tilt_game(su, graphics, kx)
-            next_button = None
-            continue
-
-        # Mode toggle: hold the blue (boat) + pink (butterfly) buttons together
-        # for 5 seconds to enter the Rocket Blast-off game (same combo exits).
-        if buttons.check_rocket_toggle():
-            play_rocket_game(su, graphics, kx)
-            next_button = None
-            continue
-
-        now = time.ticks_ms()
-
-        # ── Animation Mode ────────────────────────────────────────────────────
-        # Handle brightness buttons
-        check_brightness_buttons(su)
-
-        # While either toggle combo is being held, don't fire an animation — let
-        # the hold accumulate toward the mode toggle instead (yellow+red → Tilt
-        # Game, blue+pink → Rocket Blast-off).
-        if buttons.is_pressed('star') and buttons.is_pressed('heart'):
-            time.sleep_ms(10)
-            continue
-        if buttons.is_pressed('boat') and buttons.is_pressed('butterfly'):
-            time.sleep_ms(10)
-            continue
-
-        # Check for button press (use queued button or poll for new one)
-        pressed = next_button or buttons.get_pressed()
-        next_button = None  # Clear queued button
-
-        if pressed:
-            print(f"[BTN] {pressed} pressed")
-            sleep.reset_timer()
+        await asyncio.sleep_ms(INPUT_MS)
 
-            # Get the animation for this button
-            animation = get_animation(pressed)
 
-            if animation:
-                # Stop any playing sound
-                sound.stop(su)
+async def audio_task(app):
+    """Start an animation's deferred sound once its trigger button is released."""
+    while True:
+        await app.gate.wait()
+        app.gate.clear()
+        while app.held:
+            await asyncio.sleep_ms(INPUT_MS)
+        sound.release_gate(app.su)
 
-                # Defer this animation's audio until the trigger button is
-                # released. The interrupt checker opens the gate on button-up;
-                # if the button is only tapped, the gate opens on the next frame.
-                sound.arm_gate()
 
-                # Create interrupt checker
-                check_interrupt = create_interrupt_checker(su)
+_MODE_HANDLERS = {
+    modes.IDLE: idle,
+    modes.ANIMATION: play_animation,
+    modes.TILT: play_game,
+    modes.ROCKET: play_game,
+    modes.SLEEP: sleeping,
+}
 
-                # Play the animation - returns None if completed, or button name if interrupted
-                interrupted_by = animation.play(su, graphics, check_interrupt)
 
-                # Animation over — don't leak deferred audio into the next one
-                sound.disarm_gate()
+async def mode_task(app):
+    """
+    Run the mode machine: each mode's handler does that mode's work and fires
+    the event that leaves it. Between events it waits on the input task, so
+    the CPU idles.
+    """
+    while True:
+        await _MODE_HANDLERS[app.mode](app)
+
 
-                if interrupted_by:
-                    print(f"Animation {pressed} interrupted by {interrupted_by}")
-                    # Queue the interrupting button for immediate playback
-                    next_button = interrupted_by
-                else:
-                    print(f"Animation {pressed} completed")
-                    # Clear display after animation completes normally
-                    display.clear(graphics, su)
+async def run(app):
+    """Start the input, audio and renderer tasks and run the mode task."""
+    asyncio.create_task(input_task(app))
+    asyncio.create_task(audio_task(app))
+    asyncio.create_task(app.renderer.run())
+    await mode_task(app)
 
-                # Reset sleep timer after animation ends
-                sleep.reset_timer()
 
-        # Heartbeat so you can tell the loop is alive
-        if time.ticks_diff(now, _last_heartbeat) >= 5000:
-            print("[MAIN] loop alive")
-            _last_heartbeat = now
+# The running App. From the REPL, app.modes.report() shows the mode counters
+# and memory.report() the bytes each animation allocates per frame.
+app = None
 
-        # KX134 accelerometer — periodic X/Y/Z readout
-        if kx:
-            if time.ticks_diff(now, _last_kx_print) >= 500:
-                x, y, z = kx.read_xyz()
-                print(f"[KX134] X={x:+.3f}g  Y={y:+.3f}g  Z={z:+.3f}g")
-                _last_kx_print = now
 
-        # Small delay to prevent busy-waiting
-        time.sleep_ms(10)
+def main():
+    """Boot, then run the app's uasyncio tasks."""
+    global app
+    su, graphics, kx = boot()
+    app = App(su, graphics, kx)
+    asyncio.run(run(app))
 
 
 if __name__ == "__main__":
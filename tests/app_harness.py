@@ -0,0 +1,166 @@
+"""
+Desktop app harness — boots main.py on the hardware stand-ins and runs its
+uasyncio tasks in virtual time against a script of button presses.
+
+It logs every mode change, every input poll (with the I2C reads it made),
+every interrupt check and every sound that starts, so a run shows how promptly
+input is serviced in each mode, what it costs on the bus, and that the toy
+rests while it sleeps. A few minutes of play run in a second or two.
+
+Run from the project root:  python3 -m tests.app_harness [--seconds N]
+                            [--press AT_S:HOLD_S:BUTTON[+BUTTON] ...] [--json FILE]
+"""
+
+import argparse
+import json
+import sys
+
+from tests import standins
+
+# An Animation Button press, a second button interrupting it, then the Tilt
+# Game toggled in and out with its 5 s hold.
+DEFAULT_SCRIPT = [(0.5, 0.3, ('heart',)), (3.0, 0.1, ('star',)),
+                  (20.0, 5.5, ('star', 'heart')), (27.0, 5.5, ('star', 'heart'))]
+
+
+def parse_press(text):
+    """'20:5.5:star+heart' → (20.0, 5.5, ('star', 'heart'))."""
+    at, hold, names = text.split(':')
+    return float(at), float(hold), tuple(names.split('+'))
+
+
+def run_app(script=DEFAULT_SCRIPT, seconds=60):
+    """
+    Boot main.py, run it for ``seconds`` of virtual time while pressing
+    buttons as ``script`` says ((at_s, hold_s, names) each); returns the log.
+    """
+    stand = standins.install()
+    import main
+    import uasyncio as asyncio
+    from lib import buttons, modes, sound
+
+    main.SAVE_BOOT_PROFILE = False
+    su, graphics, kx = main.boot()
+    clock = stand.clock
+    log = {"modes": [], "polls": [], "checks": [], "sounds": []}
+
+    def now_ms():
+        return clock.now_us() // 1000
+
+    reads = [0]
+    readfrom_mem = stand.bus.readfrom_mem
+
+    def counted_read(addr, reg, n):
+        reads[0] += 1
+        return readfrom_mem(addr, reg, n)
+
+    stand.bus.readfrom_mem = counted_read
+    poll_input = main.poll_input
+
+    def logged_poll(app):
+        t, mode, before = now_ms(), modes.NAMES[app.mode], reads[0]
+        poll_input(app)
+        log["polls"].append((t, mode, reads[0] - before))
+
+    create_interrupt_checker = main.create_interrupt_checker
+
+    def logged_checker(app):
+        check_interrupt = create_interrupt_checker(app)
+
+        def logged_check():
+            log["checks"].append(now_ms())
+            return check_interrupt()
+        return logged_check
+
+    play_now = sound._play_now
+
+    def logged_play(su, filename):
+        log["sounds"].append((now_ms(), filename))
+        play_now(su, filename)
+
+    main.poll_input = logged_poll
+    main.create_interrupt_checker = logged_checker
+    sound._play_now = logged_play
+
+    async def press_buttons():
+        start = now_ms()
+        for at_s, hold_s, names in sorted(script):
+            await asyncio.sleep_ms(start + int(at_s * 1000) - now_ms())
+            stand.mcp.press(*(buttons.BUTTON_BITS[n] for n in names))
+            await asyncio.sleep_ms(int(hold_s * 1000))
+            stand.mcp.release_all()
+
+    async def session():
+        app = main.App(su, graphics, kx)
+        on_change = app.modes.on_change
+
+        def logged_change(old, new, event):
+            log["modes"].append((now_ms(), modes.NAMES[new]))
+            on_change(old, new, event)
+
+        app.modes.on_change = logged_change
+        log["modes"].append((now_ms(), modes.NAMES[app.mode]))
+        asyncio.create_task(press_buttons())
+        task = asyncio.create_task(main.run(app))
+        await asyncio.sleep_ms(int(seconds * 1000))
+        task.cancel()
+        log["latency_us"] = app.modes.stats()
+
+    start = now_ms()
+    asyncio.run(session())
+    log["start_ms"] = start
+    log["frames"] = su.frames
+    return log
+
+
+def summarise(log):
+    """
+    Per mode: how many input polls ran, the longest gap between two in a
+    row with no mode change between them, and the most I2C reads one made.
+    """
+    polls = {}
+    changes = [t for t, _ in log["modes"]]
+    i = 0
+    last = None
+    for t, mode, reads in log["polls"]:
+        entry = polls.setdefault(mode, {"count": 0, "max_gap_ms": 0, "max_reads": 0})
+        entry["count"] += 1
+        entry["max_reads"] = max(entry["max_reads"], reads)
+        changed = False
+        while i < len(changes) and changes[i] <= t:
+            changed = True
+            i += 1
+        if last is not None and not changed:
+            entry["max_gap_ms"] = max(entry["max_gap_ms"], t - last)
+        last = t
+    return polls
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--press", action="append", type=parse_press, metavar="AT:HOLD:BUTTONS",
+                        help="press buttons (a+b for a combo) at AT s for HOLD s (repeatable)")
+    parser.add_argument("--json", metavar="FILE", help="write the log here")
+    args = parser.parse_args(argv)
+
+    log = run_app(args.press or DEFAULT_SCRIPT, args.seconds)
+    log["summary"] = summarise(log)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(log, f)
+
+    print("[APP] modes: " + ", ".join("%.2fs %s" % ((t - log["start_ms"]) / 1000, m)
+                                     for t, m in log["modes"]))
+    for mode, entry in log["summary"].items():
+        print("[APP] {:<10} {:>6} polls, longest gap {} ms, up to {} I2C reads".format(
+            mode, entry["count"], entry["max_gap_ms"], entry["max_reads"]))
+    print("[APP] {} interrupt checks".format(len(log["checks"])))
+    for move, (count, last, top, mean) in sorted(log["latency_us"].items()):
+        print("[APP] {:<20} {:>4} transitions, latency max {} us, mean {} us".format(
+            move, count, top, mean))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Desktop boot harness — runs main.boot() against the hardware stand-ins and
+checks boot-to-ready against a budget, and reports which fixed buffers
+(lib/arena.py) boot reserved and which animations idle warm-up then loads.
+
+Time is virtual (tests/standins.py): sleeps cost nothing to wait for but are
+counted, and host CPU time is added on top, so the figure tracks the device's
+power-on delay without the harness having to sit through it. Heap deltas come
+from tracemalloc.
+
+Run from the project root:  python3 -m tests.boot_harness [--budget-ms N] [--json FILE]
+Exits 1 if boot-to-ready is over budget.
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+
+from tests import standins
+
+# Boot animation is 1.5 s + a 200 ms hold; everything else should fit in the rest.
+BOOT_BUDGET_MS = 2000
+
+
+def run_boot():
+    """
+    Boot main.py once on the stand-ins and return bootlog.summary(), with
+    arena.reserved() under 'reserved' and the animation modules loaded once
+    warm-up has filled its slots under 'warmed'.
+    """
+    standins.install(follow_host=True)
+    tracemalloc.start()
+    import main
+    import animations
+    from lib import arena, bootlog
+    main.SAVE_BOOT_PROFILE = False
+    main.boot()
+    tracemalloc.stop()
+    summary = bootlog.summary()
+    summary['reserved'] = arena.reserved()
+    while animations.warm_up():
+        pass
+    summary['warmed'] = animations.loaded()
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=BOOT_BUDGET_MS)
+    parser.add_argument("--json", metavar="FILE", help="write the boot summary here")
+    args = parser.parse_args(argv)
+
+    summary = run_boot()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+    ready_ms = summary['ready_us'] / 1000
+    verdict = "OK" if ready_ms <= args.budget_ms else "OVER BUDGET"
+    print("[BOOT] budget {:.0f} ms: {}".format(args.budget_ms, verdict))
+    return 0 if ready_ms <= args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,513 @@
+"""
+Desktop stand-ins for the device-only modules (time, machine, stellar,
+picographics, uasyncio), so main.py and the games can run unmodified under
+CPython.
+
+  clock     — lib/clock's VirtualClock: sleeps advance it instantly; with
+              follow_host=True it also advances with real CPU time, so compute
+              cost still shows up in timings without waiting out the sleeps.
+              With wrap=True the ticks wrap at TICKS_PERIOD as on the toy.
+  machine   — Pin and I2C on one shared bus holding a fake MCP23017 (0x20,
+              buttons on port B, active-low) and a fake KX134 (0x1F).
+  stellar   — StellarUnicorn with brightness, volume, switches and audio.
+  picographics — PicoGraphics with a 16x16 RGB framebuffer.
+  uasyncio  — the subset of MicroPython's asyncio main.py uses, scheduled on
+              the virtual clock: when every task is waiting, time jumps to the
+              next wake-up, so an idle minute costs nothing to run.
+  _thread   — core 1 as a host thread, one at a time as on the RP2350; an
+              exception that ends it is kept for the test to raise.
+
+install() puts all six into sys.modules and makes the clock lib/clock's
+backend; call it before importing main or anything under lib/, games/ or
+animations/. It replaces the process-wide time module, so harnesses that use
+it run in their own process.
+"""
+
+import _thread as _host_thread
+import heapq
+import importlib.machinery
+import importlib.util
+import sys
+import threading
+import types
+
+from lib import clock as _clock
+
+
+def _load_host_time():
+    """The real time module, even if a test has already replaced sys.modules['time']."""
+    spec = importlib.machinery.BuiltinImporter.find_spec("time")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_host_time = _load_host_time()
+
+
+# ── Virtual clock ─────────────────────────────────────────────────────────────
+
+TICKS_PERIOD = _clock.TICKS_PERIOD
+
+
+class VirtualClock(_clock.VirtualClock):
+    """
+    lib/clock's virtual time, optionally following the host's CPU time too;
+    now_us() itself never wraps.
+    """
+
+    def __init__(self, follow_host=False, start_us=0, wrap=False):
+        self.follow_host = follow_host
+        super().__init__(start_us, wrap)
+
+    def reset(self):
+        super().reset()
+        self._host0 = _host_time.perf_counter()
+
+    def now_us(self):
+        us = self._slept_us
+        if self.follow_host:
+            us += int((_host_time.perf_counter() - self._host0) * 1_000_000)
+        return us
+
+    def module(self):
+        """A time module backed by this clock (other attributes from host time)."""
+        mod = types.ModuleType("time")
+        mod.__dict__.update({k: v for k, v in vars(_host_time).items()
+                             if not k.startswith('__')})
+        for name in ('ticks_us', 'ticks_ms', 'ticks_diff', 'ticks_add', 'sleep_ms', 'sleep_us'):
+            setattr(mod, name, getattr(self, name))
+        mod.sleep = lambda s: self.advance_ms(s * 1000)
+        return mod
+
+
+# ── I2C devices ───────────────────────────────────────────────────────────────
+
+class FakeMCP23017:
+    """Port expander: reads of GPIOB return ``portb`` (0xFF = nothing pressed)."""
+    ADDR = 0x20
+    _REG_GPIOB = 0x13
+
+    def __init__(self):
+        self.portb = 0xFF
+        self.regs = {}
+
+    def press(self, *bits):
+        for bit in bits:
+            self.portb &= ~(1 << bit) & 0xFF
+
+    def release_all(self):
+        self.portb = 0xFF
+
+    def write(self, reg, data):
+        self.regs[reg] = bytes(data)
+
+    def read(self, reg, n):
+        if reg == self._REG_GPIOB:
+            return bytes([self.portb])
+        return self.regs.get(reg, bytes(n))[:n]
+
+
+class FakeKX134:
+    """
+    Accelerometer register file; set_counts() sets the X/Y/Z outputs. With
+    the sample buffer enabled, each set_counts() also buffers one sample.
+    """
+    ADDR = 0x1F
+    _REG_XOUTL = 0x08
+    _REG_BUF_CNTL2 = 0x5F
+    _REG_BUF_STATUS_1 = 0x60
+    _REG_BUF_CLEAR = 0x62
+    _REG_BUF_READ = 0x63
+    _BUFFER_BYTES = 86 * 6
+
+    def __init__(self):
+        self.regs = bytearray(0x80)
+        self.fifo = bytearray()
+
+    def set_counts(self, x, y, z=4096):
+        for i, v in enumerate((x, y, z)):
+            v &= 0xFFFF
+            self.regs[self._REG_XOUTL + 2 * i] = v & 0xFF
+            self.regs[self._REG_XOUTL + 2 * i + 1] = v >> 8
+        if self.regs[self._REG_BUF_CNTL2] & 0x80:
+            self.fifo += self.regs[self._REG_XOUTL:self._REG_XOUTL + 6]
+            del self.fifo[:-self._BUFFER_BYTES]     # stream mode drops the oldest
+
+    def write(self, reg, data):
+        if reg == self._REG_BUF_CLEAR or (reg == self._REG_BUF_CNTL2 and not data[0] & 0x80):
+            self.fifo = bytearray()
+        self.regs[reg:reg + len(data)] = data
+
+    def read(self, reg, n):
+        if reg == self._REG_BUF_STATUS_1:
+            level = len(self.fifo)
+            return bytes([level & 0xFF, level >> 8])[:n]
+        if reg == self._REG_BUF_READ:
+            data, self.fifo = bytes(self.fifo[:n]), self.fifo[n:]
+            return data
+        return bytes(self.regs[reg:reg + n])
+
+
+class Bus:
+    """The one I2C bus every machine.I2C instance talks to."""
+
+    def __init__(self):
+        self.devices = {}
+
+    def attach(self, device, addr=None):
+        self.devices[device.ADDR if addr is None else addr] = device
+        return device
+
+    def _device(self, addr):
+        try:
+            return self.devices[addr]
+        except KeyError:
+            raise OSError(5) from None   # EIO, as machine.I2C reports a NAK
+
+    def scan(self):
+        return sorted(self.devices)
+
+    def writeto_mem(self, addr, reg, data):
+        self._device(addr).write(reg, data)
+
+    def readfrom_mem(self, addr, reg, n):
+        return self._device(addr).read(reg, n)
+
+    def readfrom_mem_into(self, addr, reg, buf):
+        buf[:] = self._device(addr).read(reg, len(buf))
+
+
+# ── Module builders ───────────────────────────────────────────────────────────
+
+def _machine_module(bus):
+    mod = types.ModuleType("machine")
+
+    class Pin:
+        IN, OUT, PULL_UP = 0, 1, 2
+
+        def __init__(self, pin, *args, **kwargs):
+            self.pin = pin
+
+        def value(self, *args):
+            return 1
+
+    class I2C:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def scan(self):
+            return bus.scan()
+
+        def writeto_mem(self, addr, reg, data):
+            bus.writeto_mem(addr, reg, data)
+
+        def readfrom_mem(self, addr, reg, n):
+            return bus.readfrom_mem(addr, reg, n)
+
+        def readfrom_mem_into(self, addr, reg, buf):
+            bus.readfrom_mem_into(addr, reg, buf)
+
+    mod.Pin = Pin
+    mod.I2C = I2C
+    mod.freq = lambda *args: 150_000_000
+    mod.lightsleep = lambda ms=0: None
+    mod.reset = lambda: None
+    return mod
+
+
+class StellarUnicorn:
+    WIDTH = HEIGHT = 16
+    SWITCH_BRIGHTNESS_UP = 21
+    SWITCH_BRIGHTNESS_DOWN = 26
+
+    def __init__(self):
+        self.brightness = 0.5
+        self.volume = 0.5
+        self.pressed = set()
+        self.frames = 0
+        self.playing = False
+
+    def set_brightness(self, value):
+        self.brightness = max(0.0, min(1.0, value))
+
+    def get_brightness(self):
+        return self.brightness
+
+    def set_volume(self, value):
+        self.volume = value
+
+    def is_pressed(self, switch):
+        return switch in self.pressed
+
+    def update(self, graphics):
+        self.frames += 1
+
+    def play_sample(self, data):
+        self.playing = True
+
+    def stop_playing(self):
+        self.playing = False
+
+    def is_playing(self):
+        return self.playing
+
+
+class PicoGraphics:
+    def __init__(self, display=None):
+        self.pen = (0, 0, 0)
+        self.pixels = [[(0, 0, 0)] * 16 for _ in range(16)]
+
+    def create_pen(self, r, g, b):
+        return (r, g, b)
+
+    def set_pen(self, pen):
+        self.pen = pen
+
+    def clear(self):
+        for row in self.pixels:
+            row[:] = [self.pen] * 16
+
+    def pixel(self, x, y):
+        if 0 <= x < 16 and 0 <= y < 16:
+            self.pixels[y][x] = self.pen
+
+
+# ── uasyncio ──────────────────────────────────────────────────────────────────
+
+class _Suspend:
+    """Awaitable that hands the scheduler a request: ('sleep', us) or ('wait', list, us)."""
+
+    def __init__(self, *request):
+        self.request = request
+
+    def __await__(self):
+        yield self.request
+
+
+def _asyncio_module(clock):
+    """
+    uasyncio on the virtual clock: create_task, run, sleep/sleep_ms, Event,
+    wait_for/wait_for_ms and Task.cancel, with MicroPython's semantics.
+
+    Unlike the device, an exception escaping any task ends run() with that
+    exception, so a harness fails loudly instead of printing and carrying on.
+    """
+    mod = types.ModuleType("uasyncio")
+    queue = []          # (wake_us, seq, task, token) heap
+    state = {"seq": 0, "failed": None, "main": None}
+
+    class CancelledError(BaseException):
+        pass
+
+    class TimeoutError(Exception):
+        pass
+
+    def _schedule(task, token, wake_us):
+        state["seq"] += 1
+        heapq.heappush(queue, (wake_us, state["seq"], task, token))
+
+    class Task:
+        def __init__(self, coro):
+            self.coro = coro
+            self.done_ = False
+            self.result = None
+            self.exc = None
+            self.joiners = []     # (task, token) waiting for this one
+            self.token = 0        # bumped each time it runs; stale wake-ups are dropped
+            self._throw = None
+            _schedule(self, 0, clock.now_us())
+
+        def done(self):
+            return self.done_
+
+        def cancel(self):
+            if self.done_:
+                return False
+            self._throw = CancelledError()
+            _schedule(self, self.token, clock.now_us())
+            return True
+
+        def __await__(self):
+            if not self.done_:
+                yield ("wait", self.joiners, None)
+            if self.exc is not None:
+                raise self.exc
+            return self.result
+
+        def _step(self):
+            self.token += 1
+            exc, self._throw = self._throw, None
+            try:
+                request = self.coro.throw(exc) if exc else self.coro.send(None)
+            except StopIteration as e:
+                self._finish(e.value, None)
+                return
+            except BaseException as e:
+                self._finish(None, e)
+                return
+            if request[0] == "sleep":
+                _schedule(self, self.token, clock.now_us() + request[1])
+            else:
+                _, waiters, timeout_us = request
+                waiters.append((self, self.token))
+                if timeout_us is not None:
+                    _schedule(self, self.token, clock.now_us() + timeout_us)
+
+        def _finish(self, result, exc):
+            self.done_ = True
+            self.result, self.exc = result, exc
+            if (exc is not None and not self.joiners and self is not state["main"]
+                    and not isinstance(exc, CancelledError)):
+                state["failed"] = state["failed"] or exc
+            _wake(self.joiners)
+
+    def _wake(waiters):
+        now = clock.now_us()
+        for task, token in waiters:
+            if task.token == token:
+                _schedule(task, token, now)
+        del waiters[:]
+
+    class Event:
+        def __init__(self):
+            self.state = False
+            self.waiting = []
+
+        def set(self):
+            self.state = True
+            _wake(self.waiting)
+
+        def clear(self):
+            self.state = False
+
+        def is_set(self):
+            return self.state
+
+        async def wait(self):
+            if not self.state:
+                await _Suspend("wait", self.waiting, None)
+            return True
+
+    def create_task(coro):
+        return Task(coro)
+
+    def sleep_ms(ms):
+        return _Suspend("sleep", max(0, int(ms * 1000)))
+
+    def sleep(s):
+        return sleep_ms(s * 1000)
+
+    async def wait_for_ms(aw, timeout):
+        task = aw if isinstance(aw, Task) else Task(aw)
+        if not task.done_:
+            await _Suspend("wait", task.joiners, max(0, int(timeout * 1000)))
+        if not task.done_:
+            task.cancel()
+            raise TimeoutError
+        return await task
+
+    def wait_for(aw, timeout):
+        return wait_for_ms(aw, timeout * 1000)
+
+    def run(coro):
+        """Run ``coro`` (and the tasks it starts) until it returns."""
+        main = state["main"] = Task(coro)
+        while not main.done_:
+            if state["failed"] is not None:
+                failed, state["failed"] = state["failed"], None
+                raise failed
+            if not queue:
+                raise RuntimeError("every task is waiting and nothing can wake them")
+            wake_us, _, task, token = heapq.heappop(queue)
+            if task.done_ or token != task.token:
+                continue
+            now = clock.now_us()
+            if wake_us > now:
+                clock.advance_ms((wake_us - now) / 1000)
+            task._step()
+        del queue[:]
+        if main.exc is not None:
+            raise main.exc
+        return main.result
+
+    mod.CancelledError = CancelledError
+    mod.TimeoutError = TimeoutError
+    mod.Task = Task
+    mod.Event = Event
+    mod.create_task = create_task
+    mod.sleep_ms = sleep_ms
+    mod.sleep = sleep
+    mod.wait_for_ms = wait_for_ms
+    mod.wait_for = wait_for
+    mod.run = run
+    return mod
+
+
+# ── _thread ───────────────────────────────────────────────────────────────────
+
+def _thread_module():
+    """
+    MicroPython's _thread on a host thread. As on the Pico, there is one
+    other core: starting a thread while the last one still runs raises
+    OSError. ``core1`` is the running threading.Thread and ``errors`` the
+    exceptions that ended any of them. Everything else is the host _thread
+    (the threading module holds its own reference to it).
+    """
+    mod = types.ModuleType("_thread")
+    mod.core1 = None
+    mod.errors = []
+
+    def start_new_thread(function, args, kwargs=None):
+        if mod.core1 is not None and mod.core1.is_alive():
+            raise OSError("core1 in use")
+
+        def core1():
+            try:
+                function(*args, **(kwargs or {}))
+            except BaseException as e:   # MicroPython prints it; keep it for the test
+                mod.errors.append(e)
+
+        mod.core1 = threading.Thread(target=core1, name="core1", daemon=True)
+        mod.core1.start()
+        return mod.core1.ident
+
+    mod.start_new_thread = start_new_thread
+    mod.__getattr__ = lambda name: getattr(_host_thread, name)
+    return mod
+
+
+# ── Installation ──────────────────────────────────────────────────────────────
+
+class StandIns:
+    """What install() returns: the clock, the bus and its two devices."""
+
+    def __init__(self, follow_host, start_us=0, wrap=False):
+        self.clock = VirtualClock(follow_host, start_us, wrap)
+        self.bus = Bus()
+        self.mcp = self.bus.attach(FakeMCP23017())
+        self.kx = self.bus.attach(FakeKX134())
+        self.kx.set_counts(0, 0)
+
+
+def install(follow_host=False, start_us=0, wrap=False):
+    """
+    Install the stand-ins into sys.modules and return a StandIns; the other
+    arguments are the clock's (see VirtualClock).
+    """
+    s = StandIns(follow_host, start_us, wrap)
+    _clock.use(s.clock)
+    sys.modules["time"] = s.clock.module()
+    sys.modules["machine"] = _machine_module(s.bus)
+
+    stellar = types.ModuleType("stellar")
+    stellar.StellarUnicorn = StellarUnicorn
+    sys.modules["stellar"] = stellar
+
+    pg = types.ModuleType("picographics")
+    pg.PicoGraphics = PicoGraphics
+    pg.DISPLAY_STELLAR_UNICORN = 0
+    sys.modules["picographics"] = pg
+    sys.modules["uasyncio"] = _asyncio_module(s.clock)
+    sys.modules["_thread"] = _thread_module()
+    return s
@@ -0,0 +1,132 @@
+"""
+Behavioural tests for the lazy animation registry.
+
+animations/__init__.py imports an animation module the first time its button
+is pressed (or when warm_up() is called while idle), keeps recently played
+modules in a small LRU and unloads the least recently used ones when there are
+too many or the heap is low.
+
+Runs on desktop CPython — no Raspberry Pi required.
+Run from the project root:  python3 -m unittest tests.test_animations
+"""
+
+import subprocess
+import sys
+import types
+import unittest
+from unittest.mock import patch
+
+import animations
+
+
+def _fake(modname):
+    module = types.ModuleType("animations." + modname)
+    module.play = lambda *a, **k: None
+    sys.modules["animations." + modname] = module
+    return module
+
+
+class LazyImportTest(unittest.TestCase):
+
+    def test_package_import_loads_no_animation(self):
+        """Importing the registry alone imports none of the animation modules."""
+        code = ("import sys, animations; "
+                "print(sorted(m for m in sys.modules if m.startswith('animations.')))")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                             text=True, check=True).stdout.strip()
+        self.assertEqual(out, "[]")
+
+
+class RegistryLruTest(unittest.TestCase):
+
+    def setUp(self):
+        self.names = ["fake_a", "fake_b", "fake_c", "fake_d"]
+        self.modules = {n: _fake(n) for n in self.names}
+        registry = {"btn_" + n: n for n in self.names}
+        self._patchers = [
+            patch.object(animations, "ANIMATIONS", registry),
+            patch.object(animations, "WARM_UP_ORDER", ("fake_c", "fake_a", "fake_b", "fake_d")),
+            patch.object(animations, "MAX_LOADED", 3),
+            patch.object(animations, "_loaded", []),
+        ]
+        for p in self._patchers:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self._patchers):
+            p.stop()
+        for n in self.names:
+            sys.modules.pop("animations." + n, None)
+
+    def test_first_press_returns_the_module(self):
+        self.assertIs(animations.get_animation("btn_fake_a"), self.modules["fake_a"])
+        self.assertEqual(animations.loaded(), ["fake_a"])
+
+    def test_unknown_button_returns_none(self):
+        self.assertIsNone(animations.get_animation("fish"))
+
+    def test_least_recently_used_module_is_unloaded(self):
+        """Past MAX_LOADED, the module played longest ago is dropped."""
+        for n in ("fake_a", "fake_b", "fake_c"):
+            animations.get_animation("btn_" + n)
+        animations.get_animation("btn_fake_a")          # a is fresh again
+        animations.get_animation("btn_fake_d")          # evicts b, not a
+        self.assertEqual(animations.loaded(), ["fake_c", "fake_a", "fake_d"])
+        self.assertNotIn("animations.fake_b", sys.modules)
+
+    def test_low_memory_unloads_all_but_the_current_module(self):
+        for n in ("fake_a", "fake_b"):
+            animations.get_animation("btn_" + n)
+        with patch.object(animations, "_free_heap", return_value=1024):
+            animations.get_animation("btn_fake_c")
+        self.assertEqual(animations.loaded(), ["fake_c"])
+
+    def test_warm_up_loads_one_module_per_call(self):
+        """Idle warm-up imports one module at a time, until the LRU is full."""
+        self.assertTrue(animations.warm_up())
+        self.assertEqual(len(animations.loaded()), 1)
+        self.assertTrue(animations.warm_up())
+        self.assertTrue(animations.warm_up())
+        self.assertFalse(animations.warm_up())           # MAX_LOADED reached
+        self.assertEqual(len(animations.loaded()), 3)
+
+    def test_warm_up_follows_the_warm_up_order(self):
+        animations.get_animation("btn_fake_a")
+        animations.warm_up()
+        animations.warm_up()
+        self.assertEqual(animations.loaded(), ["fake_b", "fake_c", "fake_a"])
+
+    def test_boot_is_unloaded_once_it_has_played(self):
+        boot = _fake("boot")
+        self.addCleanup(sys.modules.pop, "animations.boot", None)
+        played = []
+        boot.play = lambda *a: played.append(a)
+        animations.play_boot("su", "graphics")
+        self.assertEqual(played, [("su", "graphics", None)])
+        self.assertEqual(animations.loaded(), [])
+        self.assertNotIn("animations.boot", sys.modules)
+
+    def test_warmed_modules_are_evicted_before_played_ones(self):
+        animations.get_animation("btn_fake_d")
+        animations.warm_up()
+        animations.warm_up()
+        animations.get_animation("btn_fake_c")           # evicts a warmed module
+        self.assertEqual(animations.loaded()[-2:], ["fake_d", "fake_c"])
+        self.assertEqual(len(animations.loaded()), 3)
+
+    def test_warm_up_skips_when_memory_is_low(self):
+        with patch.object(animations, "_free_heap", return_value=1024):
+            self.assertFalse(animations.warm_up())
+        self.assertEqual(animations.loaded(), [])
+
+
+class WarmUpOrderTest(unittest.TestCase):
+
+    def test_every_animation_is_warmed_costliest_first(self):
+        self.assertEqual(sorted(animations.WARM_UP_ORDER),
+                         sorted(set(animations.ANIMATIONS.values())))
+        self.assertEqual(animations.WARM_UP_ORDER[0], "flower")
+
+
+if __name__ == "__main__":
+    unittest.main()
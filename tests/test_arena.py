@@ -0,0 +1,77 @@
+"""
+Tests for the boot-time buffer reservation (lib/arena.py).
+
+Before reserve() every take() is a fresh buffer, so tests and tools see no
+difference; after it, each name comes back as the one reserved buffer,
+zeroed, and the modules that declared buffers draw from it.
+
+Runs on desktop CPython against the hardware stand-ins.
+Run from the project root:  python3 -m unittest tests.test_arena
+"""
+
+import unittest
+
+from lib import arena, compositor, dualcore, framestore
+from tests import standins
+
+
+class ArenaTest(unittest.TestCase):
+
+    def setUp(self):
+        arena.release()
+        self.addCleanup(arena.release)
+
+    def test_unreserved_takes_are_fresh(self):
+        a = arena.take(compositor._BG)
+        b = arena.take(compositor._BG)
+        self.assertIsNot(a, b)
+        self.assertEqual((a.typecode, len(a)), ('H', compositor.CELLS))
+
+    def test_reserved_takes_are_the_same_buffer_zeroed(self):
+        arena.reserve()
+        a = arena.take(dualcore._FRAME0)
+        a[7] = 0xFFFFFF
+        b = arena.take(dualcore._FRAME0)
+        self.assertIs(a, b)
+        self.assertEqual(b[7], 0)
+
+    def test_take_zeroes_every_item_of_every_typecode(self):
+        arena.reserve()
+        name = arena.declare("test_long", 'H', 4 * compositor.CELLS)
+        self.addCleanup(arena._specs.pop, name)
+        arena.reserve()   # longer than any 'H' buffer so far
+        for n in arena.reserved():
+            buf = arena.take(n)
+            for i in range(len(buf)):
+                buf[i] = 0xFF
+            self.assertIs(arena.take(n), buf)
+            self.assertEqual(max(buf), 0, n)
+
+    def test_reserve_counts_bytes_once(self):
+        total = arena.reserve()
+        self.assertEqual(total, sum(arena.reserved().values()))
+        self.assertEqual(arena.reserved()["sprite_page"], framestore.BUFFER_SIZE)
+        self.assertEqual(arena.reserved()["frame0"], 4 * dualcore.CELLS)
+        self.assertEqual(arena.reserve(), total)
+
+    def test_a_name_declared_later_is_reserved_next_time(self):
+        arena.reserve()
+        name = arena.declare("test_late", 'B', 10)
+        self.addCleanup(arena._specs.pop, name)
+        self.assertIsNot(arena.take(name), arena.take(name))
+        arena.reserve()
+        self.assertIs(arena.take(name), arena.take(name))
+
+    def test_owners_draw_from_the_reservation(self):
+        arena.reserve()
+        comp = compositor.Compositor(standins.PicoGraphics())
+        comp.background(3, 4, comp.pen(255, 0, 0))
+        comp = compositor.Compositor(standins.PicoGraphics())   # the next game
+        self.assertIs(comp._bg, arena.take(compositor._BG))
+        self.assertEqual(max(comp._bg), 0)
+        core1 = dualcore.Core1()
+        self.assertIs(core1._bufs[1], arena.take(dualcore._FRAME1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Boot profile and startup budget.
+
+main.boot() records every import and setup() step with lib/bootlog.py;
+tests/boot_harness.py replays the boot on the hardware stand-ins. The harness
+runs in a subprocess because it installs its own time and machine modules.
+
+Runs on desktop CPython — no Raspberry Pi required.
+Run from the project root:  python3 -m unittest tests.test_boot
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+sys.modules.setdefault("machine", MagicMock())
+
+from lib import bootlog, clock  # noqa: E402
+
+_ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+class BootBudgetTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        cls.proc = subprocess.run(
+            [sys.executable, "-m", "tests.boot_harness", "--json", path],
+            cwd=_ROOT, capture_output=True, text=True)
+        with open(path) as f:
+            cls.summary = json.load(f)
+        os.remove(path)
+
+    def test_boot_to_ready_is_within_budget(self):
+        self.assertEqual(self.proc.returncode, 0, self.proc.stdout + self.proc.stderr)
+        from tests import boot_harness
+        self.assertLessEqual(self.summary['ready_us'] / 1000, boot_harness.BOOT_BUDGET_MS)
+
+    def test_every_boot_step_is_recorded(self):
+        names = [s['name'] for s in self.summary['steps']]
+        for expected in ("import sound", "import lib", "import animations",
+                         "import games", "setup display", "setup buttons",
+                         "setup i2c scan", "setup kx134", "boot animation"):
+            self.assertIn(expected, names)
+
+    def test_sound_buffer_shows_up_in_its_import(self):
+        """The 200 KB audio buffer is charged to 'import sound', not a later step."""
+        step = next(s for s in self.summary['steps'] if s['name'] == "import sound")
+        self.assertGreaterEqual(step['heap'], 200000 * 0.9)
+
+    def test_every_fixed_buffer_is_reserved_at_boot(self):
+        """Owners loaded lazily (the frame store) must be imported before reserve()."""
+        from games import rocket_blast  # noqa: F401
+        from lib import arena, compositor, dualcore, framestore  # noqa: F401
+        self.assertIn("sprite_page", self.summary['reserved'])
+        self.assertEqual(set(self.summary['reserved']), set(arena._specs))
+
+    def test_warm_up_after_boot_reaches_the_costly_import(self):
+        """The boot animation gives its slot back, so flower is pre-loaded."""
+        self.assertNotIn("boot", self.summary['warmed'])
+        self.assertIn("flower", self.summary['warmed'])
+
+
+class BootlogTest(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = list(bootlog._records)
+        del bootlog._records[:]
+
+    def tearDown(self):
+        bootlog._records[:] = self._saved
+
+    def test_step_records_name_and_time(self):
+        with bootlog.step("thing"):
+            pass
+        (record,) = bootlog.records()
+        self.assertEqual(record['name'], "thing")
+        self.assertGreaterEqual(record['us'], 0)
+
+    def test_step_is_recorded_when_it_raises(self):
+        with self.assertRaises(RuntimeError):
+            with bootlog.step("broken"):
+                raise RuntimeError
+        self.assertEqual([r['name'] for r in bootlog.records()], ["broken"])
+
+    def test_record_counts_a_step_from_before_the_import(self):
+        """main.py times the sound import by hand; boot-to-ready starts there."""
+        virtual = clock.VirtualClock()
+        self.addCleanup(clock.use, clock.use(virtual))
+        self.addCleanup(setattr, bootlog, "_boot_us", bootlog._boot_us)
+        self.addCleanup(setattr, bootlog, "_ready_us", bootlog._ready_us)
+        bootlog._boot_us = 5000
+        virtual.advance_ms(7)
+        bootlog.record("early", 2000, 0)
+        (record,) = bootlog.records()
+        self.assertEqual((record['name'], record['us']), ("early", 5000))
+        self.assertEqual(bootlog.ready(), 5000)
+
+
+if __name__ == "__main__":
+    unittest.main()
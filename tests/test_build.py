@@ -0,0 +1,109 @@
+"""
+Tests for the .mpy build pipeline (tools/build_mpy.py).
+
+Debug stripping must remove log.debug calls and tagged prints without
+disturbing line numbers or anything else, and the built bundle must still import against the desktop
+stand-ins. The mpy-cross step is only exercised when mpy-cross is installed.
+
+Runs on desktop CPython — no Raspberry Pi required.
+Run from the project root:  python3 -m unittest tests.test_build
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tools"))
+import build_mpy  # noqa: E402
+
+
+class StripDebugTest(unittest.TestCase):
+
+    def test_button_debug_logging_is_removed(self):
+        with open(os.path.join(build_mpy.ROOT, "lib", "buttons.py")) as f:
+            source = f.read()
+        self.assertIn("log.debug(", source)
+        stripped = build_mpy.strip_debug(source)
+        self.assertNotIn("log.debug(", stripped)
+        self.assertEqual(stripped.count("\n"), source.count("\n"))
+
+    def test_log_debug_calls_go_and_other_levels_stay(self):
+        source = ("def f(x):\n"
+                  "    log.debug('x=%d',\n"
+                  "              x)\n"
+                  "    log.info('ok')\n"
+                  "    return x\n")
+        self.assertEqual(build_mpy.strip_debug(source),
+                         "def f(x):\n    pass\n\n    log.info('ok')\n    return x\n")
+
+    def test_debug_checks_become_false(self):
+        source = ("if log.enabled(log.DEBUG) and n > 3:\n"
+                  "    log.debug('n=%d', n)\n"
+                  "    show(n)\n"
+                  "w = log.enabled(log.WARN)\n")
+        self.assertEqual(build_mpy.strip_debug(source),
+                         "if False and n > 3:\n    pass\n    show(n)\n"
+                         "w = log.enabled(log.WARN)\n")
+
+    def test_guarded_block_of_debug_output_goes_whole(self):
+        source = ("if log.enabled(log.DEBUG):\n"
+                  "    log.debug('a')\n"
+                  "b = 1\n")
+        self.assertEqual(build_mpy.strip_debug(source), "pass\n\nb = 1\n")
+
+    def test_other_prints_and_code_are_kept(self):
+        source = ("def f(x):\n"
+                  "    print('[SETUP] ok')\n"
+                  "    print(f'[X DEBUG] {x}')\n"
+                  "    return x\n")
+        stripped = build_mpy.strip_debug(source)
+        self.assertIn("[SETUP] ok", stripped)
+        self.assertNotIn("DEBUG", stripped)
+        self.assertIn("return x", stripped)
+
+    def test_if_holding_only_debug_output_goes_too(self):
+        source = ("if a:\n"
+                  "    print('[BTN DEBUG] a',\n"
+                  "          a)\n"
+                  "b = 1\n")
+        self.assertEqual(build_mpy.strip_debug(source), "pass\n\n\nb = 1\n")
+
+    def test_lone_debug_print_in_a_block_leaves_a_valid_body(self):
+        source = "for i in x:\n    print('[BTN DEBUG]', i)\n"
+        self.assertEqual(build_mpy.strip_debug(source), "for i in x:\n    pass\n")
+
+    def test_module_debug_flag_is_turned_off(self):
+        stripped = build_mpy.strip_debug("DEBUG = True\nVERBOSE = True\n")
+        self.assertEqual(stripped, "DEBUG = False\nVERBOSE = True\n")
+
+
+class BundleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.out = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.out)
+
+    def test_stripped_bundle_imports_against_the_standins(self):
+        report = build_mpy.build(self.out, strip=True)
+        ok, output = build_mpy.check_imports(self.out)
+        self.assertTrue(ok, output)
+        modules = [r["module"] for r in report]
+        self.assertIn(os.path.join("lib", "buttons.py"), modules)
+        self.assertIn("main.py", modules)
+        self.assertTrue(os.path.exists(
+            os.path.join(self.out, "bundle", "sprites", "frames.fst")))
+
+    @unittest.skipUnless(shutil.which("mpy-cross"), "mpy-cross not installed")
+    def test_modules_compile_to_mpy(self):
+        report = build_mpy.build(self.out, strip=True,
+                                 mpy_cross=build_mpy.find_mpy_cross())
+        row = next(r for r in report if r["module"].endswith("buttons.py"))
+        self.assertIsNotNone(row["mpy"])
+        self.assertTrue(os.path.exists(
+            os.path.join(self.out, "bundle", "lib", "buttons.mpy")))
+
+
+if __name__ == "__main__":
+    unittest.main()
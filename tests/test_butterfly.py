@@ -0,0 +1,107 @@
+"""
+Behavioural tests for the butterfly animation.
+
+The wings come from the compiled frame store; each frame must show the
+design's pixels (generate_images/generate_butterfly_images.py) for the
+nearest spread step, moved by whole rows as the body bobs.
+
+Run from the project root:  python3 -m unittest tests.test_butterfly
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+from lib import clock
+from tests import standins
+
+# ── MicroPython hardware stub ─────────────────────────────────────────────────
+sys.modules.setdefault("machine", MagicMock())
+
+# ── Import module under test ──────────────────────────────────────────────────
+import animations.butterfly as butterfly_module  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "generate_images"))
+import generate_butterfly_images as design  # noqa: E402
+
+
+# ── Helpers ───────────────────────────────────────────────────────────────────
+
+class _Screen:
+    """Graphics stub keeping the colour drawn at each design (col, row)."""
+
+    def __init__(self):
+        self._pen = (0, 0, 0)
+        self.cells = {}
+
+    def create_pen(self, r, g, b):
+        return (r, g, b)
+
+    def set_pen(self, pen):
+        self._pen = pen
+
+    def clear(self):
+        self.cells = {}
+
+    def pixel(self, px, py):
+        # display.pixel maps logical (x, y) → physical (15 - x, 15 - y);
+        # design col = logical y, row = 15 - logical x.
+        self.cells[(15 - py, px)] = self._pen
+
+
+def _designed(spread, cy):
+    cells = {}
+    for col, row, colour in design._butterfly(spread, cy=cy):
+        if 0 <= col < 16 and 0 <= row < 16:
+            cells[(col, row)] = colour
+    return cells
+
+
+# ── Test cases ────────────────────────────────────────────────────────────────
+
+class ButterflyAnimationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.addCleanup(clock.use, clock.use(clock.VirtualClock()))
+        self.su = MagicMock()
+        self._sound_patcher = patch.object(butterfly_module, "sound", MagicMock())
+        self.mock_sound = self._sound_patcher.start()
+
+    def tearDown(self):
+        self._sound_patcher.stop()
+
+    def test_play_completes_returns_none(self):
+        self.assertIsNone(butterfly_module.play(self.su, standins.PicoGraphics()))
+
+    def test_interrupt_during_animation_returns_button_name(self):
+        calls = [0]
+
+        def check():
+            calls[0] += 1
+            return "heart" if calls[0] >= 3 else None
+        result = butterfly_module.play(self.su, standins.PicoGraphics(), check_interrupt=check)
+        self.assertEqual(result, "heart")
+
+    def test_frames_show_the_design_at_each_spread_step(self):
+        """Spread snaps to the sheet's steps; the body moves with int(cy)."""
+        butterfly_module.framestore.shared().select(butterfly_module.SPRITE_NAME)
+        steps = design.FLAP_FRAMES - 1
+        for i in range(design.FLAP_FRAMES):
+            for cy in (7.5, 7.9, 8.0, 8.4):
+                for nudge in (-0.4, 0.0, 0.4):
+                    spread = min(1.0, max(0.0, (i + nudge) / steps))
+                    screen = _Screen()
+                    butterfly_module._render(screen, self.su, cy, 0.0, spread)
+                    self.assertEqual(screen.cells, _designed(i / steps, int(cy)),
+                                     "spread %.3f at cy=%.1f" % (spread, cy))
+
+    def test_hold_frame_is_fully_spread(self):
+        screen = _Screen()
+        butterfly_module.framestore.shared().select(butterfly_module.SPRITE_NAME)
+        butterfly_module._render(screen, self.su, 8.0, 0.0, 1.0)
+        self.assertEqual(screen.cells, _designed(1.0, 8))
+
+
+if __name__ == "__main__":
+    unittest.main()
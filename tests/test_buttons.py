@@ -10,42 +10,12 @@ Run from the project root:  python3 -m unittest tests.test_buttons
 """
 
 import sys
-import types
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
-# ── Fake, settable clock ──────────────────────────────────────────────────────
-# Installed before buttons.py is imported so the module binds our fake time.
-
-
-class _FakeClock:
-    def __init__(self):
-        self._ms = 0
-
-    def set(self, ms):
-        self._ms = ms
-
-    def advance(self, ms):
-        self._ms += ms
-
-    def ticks_ms(self):
-        return self._ms
-
-    def ticks_diff(self, a, b):
-        return a - b
-
-
-_clock = _FakeClock()
-
-_fake_time = types.ModuleType("time")
-_fake_time.ticks_ms = _clock.ticks_ms
-_fake_time.ticks_diff = _clock.ticks_diff
-_fake_time.sleep_ms = lambda _ms: None
-sys.modules["time"] = _fake_time
+from lib import clock
 
 # ── MicroPython hardware stub ─────────────────────────────────────────────────
-from unittest.mock import MagicMock  # noqa: E402
-
 sys.modules.setdefault("machine", MagicMock())
 
 # ── Import module under test ──────────────────────────────────────────────────
@@ -65,7 +35,8 @@ def _portb_with(*pressed_names):
 class ModeToggleTest(unittest.TestCase):
 
     def setUp(self):
-        _clock.set(0)
+        self.clock = clock.VirtualClock()
+        self.addCleanup(clock.use, clock.use(self.clock))
         buttons.reset_mode_toggle()
 
     def _hold(self, *names):
@@ -78,7 +49,7 @@ class ModeToggleTest(unittest.TestCase):
         """Holding star + heart for 5s makes check_mode_toggle() return True."""
         with self._hold("star", "heart"):
             self.assertFalse(buttons.check_mode_toggle())  # t=0, start hold
-            _clock.advance(5000)
+            self.clock.advance_ms(5000)
             self.assertTrue(buttons.check_mode_toggle())   # t=5s, fires
 
     # ── Cycle 2: only one button of the pair is held ─────────────────────────
@@ -87,7 +58,7 @@ class ModeToggleTest(unittest.TestCase):
         """Holding only the star button (not heart) never toggles, even past 5s."""
         with self._hold("star"):
             self.assertFalse(buttons.check_mode_toggle())
-            _clock.advance(10000)
+            self.clock.advance_ms(10000)
             self.assertFalse(buttons.check_mode_toggle())
 
     # ── Cycle 3: fires once, not every poll ──────────────────────────────────
@@ -96,11 +67,11 @@ class ModeToggleTest(unittest.TestCase):
         """Continuing to hold past 5s does not re-fire on every poll."""
         with self._hold("star", "heart"):
             buttons.check_mode_toggle()           # start hold at t=0
-            _clock.advance(5000)
+            self.clock.advance_ms(5000)
             self.assertTrue(buttons.check_mode_toggle())   # fires once
-            _clock.advance(1000)
+            self.clock.advance_ms(1000)
             self.assertFalse(buttons.check_mode_toggle())  # still held, no re-fire
-            _clock.advance(5000)
+            self.clock.advance_ms(5000)
             self.assertFalse(buttons.check_mode_toggle())  # still no re-fire
 
     # ── Cycle 4: releasing before 5s resets the hold timer ───────────────────
@@ -109,7 +80,7 @@ class ModeToggleTest(unittest.TestCase):
         """A hold released before 5s does not count toward the next hold."""
         with self._hold("star", "heart"):
             buttons.check_mode_toggle()           # start hold at t=0
-            _clock.advance(3000)
+            self.clock.advance_ms(3000)
             self.assertFalse(buttons.check_mode_toggle())  # 3s, not yet
         # Buttons released.
         with self._hold():
@@ -117,9 +88,9 @@ class ModeToggleTest(unittest.TestCase):
         # Re-hold: needs a fresh 5s, so 3s more is not enough.
         with self._hold("star", "heart"):
             self.assertFalse(buttons.check_mode_toggle())  # restart hold
-            _clock.advance(3000)
+            self.clock.advance_ms(3000)
             self.assertFalse(buttons.check_mode_toggle())  # only 3s into re-hold
-            _clock.advance(2000)
+            self.clock.advance_ms(2000)
             self.assertTrue(buttons.check_mode_toggle())   # now 5s into re-hold
 
     # ── Cycle 5: same gesture toggles again (enter, then exit) ────────────────
@@ -128,7 +99,7 @@ class ModeToggleTest(unittest.TestCase):
         """After firing (enter) and releasing, another 5s hold fires again (exit)."""
         with self._hold("star", "heart"):
             buttons.check_mode_toggle()           # start hold
-            _clock.advance(5000)
+            self.clock.advance_ms(5000)
             self.assertTrue(buttons.check_mode_toggle())   # 1st fire (enter game)
         # Release the buttons.
         with self._hold():
@@ -136,7 +107,7 @@ class ModeToggleTest(unittest.TestCase):
         # Hold again for a full 5s → fires again to exit.
         with self._hold("star", "heart"):
             self.assertFalse(buttons.check_mode_toggle())
-            _clock.advance(5000)
+            self.clock.advance_ms(5000)
             self.assertTrue(buttons.check_mode_toggle())   # 2nd fire (exit game)
 
 
@@ -144,7 +115,8 @@ class RocketToggleTest(unittest.TestCase):
     """The Rocket Blast-off game uses the blue (boat) + pink (butterfly) combo."""
 
     def setUp(self):
-        _clock.set(0)
+        self.clock = clock.VirtualClock()
+        self.addCleanup(clock.use, clock.use(self.clock))
         buttons.reset_mode_toggle()
 
     def _hold(self, *names):
@@ -154,14 +126,14 @@ class RocketToggleTest(unittest.TestCase):
         """Holding boat + butterfly for 5s makes check_rocket_toggle() return True."""
         with self._hold("boat", "butterfly"):
             self.assertFalse(buttons.check_rocket_toggle())  # t=0, start hold
-            _clock.advance(5000)
+            self.clock.advance_ms(5000)
             self.assertTrue(buttons.check_rocket_toggle())   # t=5s, fires
 
     def test_single_button_never_fires(self):
         """Holding only the boat button never toggles the rocket game."""
         with self._hold("boat"):
             self.assertFalse(buttons.check_rocket_toggle())
-            _clock.advance(10000)
+            self.clock.advance_ms(10000)
             self.assertFalse(buttons.check_rocket_toggle())
 
     def test_rocket_and_tilt_combos_are_independent(self):
@@ -170,19 +142,58 @@ class RocketToggleTest(unittest.TestCase):
         with self._hold("star", "heart"):
             buttons.check_mode_toggle()
             buttons.check_rocket_toggle()
-            _clock.advance(5000)
+            self.clock.advance_ms(5000)
             self.assertTrue(buttons.check_mode_toggle())
             self.assertFalse(buttons.check_rocket_toggle())
         buttons.reset_mode_toggle()
-        _clock.set(0)
+        self.clock.reset()
         # Holding the rocket combo for 5s fires rocket, never tilt.
         with self._hold("boat", "butterfly"):
             buttons.check_mode_toggle()
             buttons.check_rocket_toggle()
-            _clock.advance(5000)
+            self.clock.advance_ms(5000)
             self.assertTrue(buttons.check_rocket_toggle())
             self.assertFalse(buttons.check_mode_toggle())
 
 
+class SnapshotTest(unittest.TestCase):
+    """Given a snapshot, a whole poll's checks make no further port reads."""
+
+    def setUp(self):
+        self.clock = clock.VirtualClock()
+        self.addCleanup(clock.use, clock.use(self.clock))
+        buttons.reset_mode_toggle()
+
+    def test_checks_read_the_snapshot_not_the_port(self):
+        port = _portb_with("star", "heart")
+        with patch.object(buttons, "_read_portb", return_value=0xFF) as read:
+            self.assertTrue(buttons.any_pressed(port))
+            self.assertTrue(buttons.is_pressed("heart", port))
+            self.assertFalse(buttons.is_pressed("boat", port))
+            self.assertFalse(buttons.check_mode_toggle(port))
+            self.assertFalse(buttons.check_rocket_toggle(port))
+            self.clock.advance_ms(5000)
+            self.assertTrue(buttons.check_mode_toggle(port))
+            self.assertEqual(buttons.get_pressed(port), "heart")
+            read.assert_not_called()
+
+    def test_first_press_counts_whatever_ticks_ms_reads(self):
+        """A button not pressed yet is no less pressable late in the ticks period."""
+        self.clock = clock.VirtualClock(start_us=(clock.TICKS_PERIOD - 1000) * 1000, wrap=True)
+        clock.use(self.clock)
+        not_pressed = patch.dict(buttons._last_press_time, black=None)
+        not_pressed.start()
+        self.addCleanup(not_pressed.stop)
+        self.assertEqual(buttons.get_pressed(_portb_with("black")), "black")
+        self.assertIsNone(buttons.get_pressed(_portb_with("black")))
+        self.clock.advance_ms(buttons.DEBOUNCE_MS + 1)
+        self.assertEqual(buttons.get_pressed(_portb_with("black")), "black")
+
+    def test_snapshot_reads_the_port_once(self):
+        with patch.object(buttons, "_read_portb", return_value=0x7F) as read:
+            self.assertEqual(buttons.snapshot(), 0x7F)
+            read.assert_called_once_with()
+
+
 if __name__ == "__main__":
     unittest.main()
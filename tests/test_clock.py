@@ -0,0 +1,91 @@
+"""
+Tests for the shared clock (lib/clock.py).
+
+use() must move every module onto the new backend at once and hand back the
+old one; the virtual backend must jump each sleep to its end, wrap like
+MicroPython's ticks when asked, and carry a whole animation through in far
+less than its own length; the real backend must work on desktop CPython too.
+
+Run from the project root:  python3 -m unittest tests.test_clock
+"""
+
+import time
+import types
+import unittest
+from unittest.mock import MagicMock
+
+from lib import clock
+from tests import standins
+
+
+class VirtualClockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = clock.VirtualClock()
+        self.addCleanup(clock.use, clock.use(self.clock))
+
+    def test_use_returns_the_backend_it_replaces(self):
+        other = clock.VirtualClock()
+        self.assertIs(clock.use(other), self.clock)
+        self.assertIs(clock.backend, other)
+        self.assertIs(clock.use(self.clock), other)
+
+    def test_sleeps_jump_to_their_end(self):
+        start = clock.ticks_ms()
+        clock.sleep_ms(250)
+        clock.sleep_us(1500)
+        self.assertEqual(clock.ticks_diff(clock.ticks_ms(), start), 251)
+        self.assertEqual(clock.ticks_us(), 251500)
+
+    def test_deadlines(self):
+        when = clock.deadline(100)
+        self.assertEqual(clock.remaining(when), 100)
+        clock.sleep_until(when)
+        self.assertEqual(clock.remaining(when), 0)
+        self.clock.advance_ms(30)
+        clock.sleep_until(when)          # passed: no sleep
+        self.assertEqual(clock.remaining(when), -30)
+        self.assertEqual(clock.ticks_ms(), 130)
+
+    def test_deadlines_across_the_wrap(self):
+        clock.use(clock.VirtualClock(start_us=(clock.TICKS_PERIOD - 40) * 1000, wrap=True))
+        when = clock.deadline(100)
+        self.assertEqual(when, 60)
+        self.assertEqual(clock.remaining(when), 100)
+        clock.sleep_until(when)
+        self.assertEqual(clock.ticks_ms(), 60)
+        self.assertEqual(clock.remaining(when), 0)
+
+    def test_a_whole_animation_runs_quickly(self):
+        from animations import flower
+        began = time.perf_counter()
+        flower.play(MagicMock(), standins.PicoGraphics())
+        self.assertGreaterEqual(clock.ticks_ms(), 10000)
+        self.assertLess(time.perf_counter() - began, 5)
+
+
+class RealClockTest(unittest.TestCase):
+
+    def test_micropython_functions_are_bound_as_they_are(self):
+        mod = types.SimpleNamespace(ticks_ms=MagicMock(), ticks_us=MagicMock(),
+                                    ticks_diff=MagicMock(), ticks_add=MagicMock(),
+                                    sleep_ms=MagicMock(), sleep_us=MagicMock())
+        real = clock.RealClock(mod)
+        self.assertIs(real.ticks_ms, mod.ticks_ms)
+        self.assertIs(real.sleep_ms, mod.sleep_ms)
+
+    def test_perf_counter_stands_in_on_cpython(self):
+        counter = [(clock.TICKS_PERIOD - 0.5) / 1000]
+        slept = []
+        mod = types.SimpleNamespace(perf_counter=lambda: counter[0], sleep=slept.append)
+        real = clock.RealClock(mod)
+        before = real.ticks_ms()
+        counter[0] += 0.002
+        self.assertLess(real.ticks_ms(), before)        # wrapped
+        self.assertEqual(real.ticks_diff(real.ticks_ms(), before), 2)
+        real.sleep_ms(20)
+        self.assertEqual(slept, [0.02])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Behavioural tests for the layered compositor (lib/compositor.py).
+
+The compositor keeps a static background and per-frame sprite pixels, and
+draws only the cells that changed. Whatever it skips, the screen must end up
+exactly as if every frame had been cleared and redrawn in full.
+
+Runs on desktop CPython — no Raspberry Pi required.
+Run from the project root:  python3 -m unittest tests.test_compositor
+"""
+
+import random
+import unittest
+
+from lib.compositor import Compositor
+
+
+class _Screen:
+    """Graphics stub holding a real 16x16 buffer and counting pixel calls."""
+
+    def __init__(self):
+        self._pen = (0, 0, 0)
+        self.buffer = {}
+        self.pixels = 0
+        self.pens_created = 0
+
+    def create_pen(self, r, g, b):
+        self.pens_created += 1
+        return (r, g, b)
+
+    def set_pen(self, pen):
+        self._pen = pen
+
+    def clear(self):
+        self.buffer = {(x, y): self._pen for x in range(16) for y in range(16)}
+
+    def pixel(self, px, py):
+        self.buffer[(15 - px, 15 - py)] = self._pen   # back to logical (x, y)
+        self.pixels += 1
+
+
+def _border(comp, colour=(255, 255, 255)):
+    pen = comp.pen(*colour)
+    for i in range(16):
+        for x, y in ((i, 0), (i, 15), (0, i), (15, i)):
+            comp.background(x, y, pen)
+
+
+class CompositorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = _Screen()
+        self.comp = Compositor(self.screen)
+        _border(self.comp)
+
+    def test_background_is_drawn_once(self):
+        self.assertEqual(self.comp.present(), 60)
+        self.assertEqual(self.screen.buffer[(0, 0)], (255, 255, 255))
+        self.assertEqual(self.screen.buffer[(7, 7)], (0, 0, 0))
+        self.assertEqual(self.comp.present(), 0)
+
+    def test_still_sprite_costs_nothing_after_the_first_frame(self):
+        red = self.comp.pen(255, 0, 0)
+        self.comp.block(7, 7, 2, red)
+        self.comp.present()
+        for _ in range(5):
+            self.comp.block(7, 7, 2, red)
+            self.assertEqual(self.comp.present(), 0)
+
+    def test_moving_sprite_draws_only_the_changed_cells(self):
+        red = self.comp.pen(255, 0, 0)
+        self.comp.block(7, 7, 2, red)
+        self.comp.present()
+        self.comp.block(7, 8, 2, red)        # one pixel to the right
+        self.assertEqual(self.comp.present(), 4)   # 2 new cells, 2 uncovered
+        self.assertEqual(self.screen.buffer[(7, 7)], (0, 0, 0))
+        self.assertEqual(self.screen.buffer[(7, 9)], (255, 0, 0))
+
+    def test_sprite_leaving_the_border_restores_it(self):
+        red = self.comp.pen(255, 0, 0)
+        self.comp.put(0, 5, red)
+        self.comp.present()
+        self.assertEqual(self.screen.buffer[(0, 5)], (255, 0, 0))
+        self.comp.present()
+        self.assertEqual(self.screen.buffer[(0, 5)], (255, 255, 255))
+
+    def test_pens_are_created_once_per_colour(self):
+        before = self.screen.pens_created
+        self.assertEqual(self.comp.pen(1, 2, 3), self.comp.pen(1, 2, 3))
+        self.assertEqual(self.screen.pens_created, before + 1)
+
+    def test_redraw_repaints_after_the_screen_was_cleared(self):
+        self.comp.present()
+        self.screen.set_pen((0, 0, 0))
+        self.screen.clear()                  # e.g. display.clear() elsewhere
+        self.comp.redraw()
+        self.comp.present()
+        self.assertEqual(self.screen.buffer[(15, 3)], (255, 255, 255))
+
+    def test_matches_full_redraw_over_random_frames(self):
+        """After every frame the screen equals a from-scratch composite."""
+        rnd = random.Random(3)
+        colours = [(255, 0, 0), (0, 200, 255), (20, 20, 0), (255, 255, 255)]
+        pens = [self.comp.pen(*c) for c in colours]
+        for _ in range(300):
+            sprites = [(rnd.randint(-1, 15), rnd.randint(-1, 15), rnd.randrange(4))
+                       for _ in range(rnd.randint(0, 12))]
+            expected = {(x, y): (0, 0, 0) for x in range(16) for y in range(16)}
+            for i in range(16):
+                for cell in ((i, 0), (i, 15), (0, i), (15, i)):
+                    expected[cell] = (255, 255, 255)
+            for x, y, c in sprites:
+                self.comp.block(x, y, 2, pens[c])
+                for dx in (0, 1):
+                    for dy in (0, 1):
+                        if (x + dx, y + dy) in expected:
+                            expected[(x + dx, y + dy)] = colours[c]
+            self.comp.present()
+            self.assertEqual(self.screen.buffer, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,278 @@
+"""
+Tests for dual-core rendering (lib/dualcore.py).
+
+An animation composed on core 1 must show the same frames, in the same order,
+as when it runs on core 0, with its sound calls made on core 0. The handoff
+must never show a frame core 1 is still drawing: the stress test runs core 1
+as a host thread with a tiny switch interval and checks every frame shown is
+whole and in sequence.
+
+Runs on desktop CPython — core 1 is a host thread (tests/standins.py).
+Run from the project root:  python3 -m unittest tests.test_dualcore
+"""
+
+import os
+import random
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+
+from lib import clock, coro, dualcore
+from tests import standins
+
+BLACK = (0, 0, 0)
+
+
+def _snapshot(graphics):
+    return [row[:] for row in graphics.pixels]
+
+
+class RecordingUnicorn(standins.StellarUnicorn):
+    """A StellarUnicorn that keeps each frame shown and each sound call."""
+
+    def __init__(self, graphics):
+        super().__init__()
+        self.graphics = graphics
+        self.shown = []
+        self.sounds = []
+
+    def update(self, graphics):
+        super().update(graphics)
+        self.shown.append(_snapshot(self.graphics))
+
+    def play_sample(self, data):
+        super().play_sample(data)
+        self.sounds.append(("play", data, threading.get_ident()))
+
+    def stop_playing(self):
+        super().stop_playing()
+        self.sounds.append(("stop", None, threading.get_ident()))
+
+
+def bars(su, graphics, check_interrupt=None, frames=12, fail_at=None):
+    """A small deterministic animation: bars that grow, a hold, then clear."""
+    su.play_sample(b"bars")
+    black = graphics.create_pen(0, 0, 0)
+    for n in range(frames):
+        if check_interrupt is not None:
+            pressed = check_interrupt()
+            if pressed:
+                su.stop_playing()
+                return pressed
+        if n == fail_at:
+            raise ValueError("frame %d" % n)
+        if n % 4 == 3:
+            su.update(graphics)      # a hold: nothing redrawn
+            yield 50
+            continue
+        graphics.set_pen(black)
+        graphics.clear()
+        graphics.set_pen(graphics.create_pen(10 * n, 255 - 10 * n, n))
+        for x in range(n + 1):
+            graphics.pixel(x, x % 16)
+        graphics.set_pen(graphics.create_pen(0, 0, 200))
+        graphics.pixel(15 - n, 3)     # a second colour in the same frame
+        su.update(graphics)
+        yield 33
+    graphics.set_pen(black)
+    graphics.clear()
+    su.update(graphics)
+    return "done"
+
+
+class _Core1Test(unittest.TestCase):
+    """Core 1 on a host thread, shut down and joined after each test."""
+
+    def setUp(self):
+        self.thread = standins._thread_module()
+        patcher = patch.dict(sys.modules, {"_thread": self.thread})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # MicroPython's ticks, moving with host time so core 1's work shows.
+        self.clock = standins.VirtualClock(follow_host=True)
+        self.addCleanup(clock.use, clock.use(self.clock))
+        self.core1 = dualcore.Core1(pause=os.sched_yield)
+        self.addCleanup(self._join)
+
+    def _join(self):
+        self.core1.shutdown()
+        if self.thread.core1 is not None:
+            self.thread.core1.join(5)
+            self.assertFalse(self.thread.core1.is_alive())
+        self.assertEqual(self.thread.errors, [])
+
+    def play(self, animation_frames, su, graphics, check_interrupt=None):
+        return coro.run(self.core1.frames(animation_frames, su, graphics, check_interrupt),
+                        lambda ms: None)
+
+
+class SurfaceTest(unittest.TestCase):
+
+    def test_draws_packed_pens_and_clips(self):
+        s = dualcore.Surface()
+        s.buf = [0] * dualcore.CELLS
+        pen = s.create_pen(1, 2, 3)
+        self.assertEqual(pen, 0x010203)
+        s.set_pen(pen)
+        s.pixel(2, 1)
+        s.pixel(16, 0)
+        s.pixel(0, -1)
+        self.assertEqual(s.buf[1 * 16 + 2], pen)
+        self.assertEqual(sum(1 for c in s.buf if c), 1)
+        s.clear()
+        self.assertTrue(all(c == pen for c in s.buf))
+
+
+class EquivalenceTest(_Core1Test):
+
+    def run_both(self, animation, check_interrupt=None):
+        g0 = standins.PicoGraphics()
+        su0 = RecordingUnicorn(g0)
+        result0 = coro.run(animation(su0, g0, check_interrupt), lambda ms: None)
+        g1 = standins.PicoGraphics()
+        su1 = RecordingUnicorn(g1)
+        result1 = self.play(animation, su1, g1, check_interrupt)
+        return (result0, su0), (result1, su1)
+
+    def test_same_frames_as_on_core_0(self):
+        (r0, su0), (r1, su1) = self.run_both(bars)
+        self.assertEqual(r1, r0)
+        self.assertEqual(r1, "done")
+        self.assertEqual(su1.shown, su0.shown)
+        self.assertEqual(su1.shown[-1], [[BLACK] * 16 for _ in range(16)])
+
+    def test_sound_calls_run_on_core_0(self):
+        g = standins.PicoGraphics()
+        su = RecordingUnicorn(g)
+        self.play(bars, su, g)
+        self.assertEqual([(kind, data) for kind, data, _ in su.sounds], [("play", b"bars")])
+        self.assertEqual(su.sounds[0][2], threading.get_ident())
+
+    def test_frame_delays_pass_through(self):
+        g = standins.PicoGraphics()
+        su = RecordingUnicorn(g)
+        waits = []
+        coro.run(self.core1.frames(bars, su, g), waits.append)
+        self.assertEqual([ms for ms in waits if ms != 1], [33, 33, 33, 50] * 3)
+
+    def test_a_hold_lasts_its_length_once(self):
+        # Core 1 works out the hold's remaining time a frame early; core 0
+        # must count it from then, not wait it out again.
+        def still(su, graphics, check_interrupt):
+            graphics.clear()
+            start = clock.ticks_ms()
+            while clock.ticks_diff(clock.ticks_ms(), start) < 300:
+                yield coro.hold(300 - clock.ticks_diff(clock.ticks_ms(), start))
+
+        def sleep_ms(ms):
+            standins._host_time.sleep(0.01)   # core 1 draws the next frame meanwhile
+            self.clock.advance_ms(ms)
+
+        g = standins.PicoGraphics()
+        began = self.clock.now_us()
+        for ms in self.core1.frames(still, RecordingUnicorn(g), g):
+            sleep_ms(abs(ms))   # a hold sat out whole, as run_async does with no input
+        self.assertLess((self.clock.now_us() - began) // 1000, 400)
+
+    def test_interrupt_is_relayed_and_returned(self):
+        calls = []
+
+        def check_interrupt():
+            calls.append(threading.get_ident())
+            return "star" if len(calls) >= 5 else None
+
+        g = standins.PicoGraphics()
+        su = RecordingUnicorn(g)
+        self.assertEqual(self.play(bars, su, g, check_interrupt), "star")
+        self.assertEqual(len(calls), 5)   # not asked again once it fired
+        self.assertEqual(set(calls), {threading.get_ident()})
+        self.assertEqual([kind for kind, _, _ in su.sounds], ["play", "stop"])
+
+    def test_error_on_core_1_is_raised_on_core_0(self):
+        g = standins.PicoGraphics()
+        su = RecordingUnicorn(g)
+        with self.assertRaises(ValueError):
+            self.play(lambda su, g, c: bars(su, g, c, fail_at=5), su, g)
+        # Core 1 is free for the next animation.
+        self.assertEqual(self.play(bars, su, g), "done")
+
+    def test_closing_early_stops_core_1(self):
+        closed = []
+
+        def endless(su, graphics, check_interrupt):
+            try:
+                while True:
+                    graphics.clear()
+                    yield 33
+            finally:
+                closed.append(True)
+
+        g = standins.PicoGraphics()
+        su = RecordingUnicorn(g)
+        frames = self.core1.frames(endless, su, g)
+        for _ in range(20):
+            next(frames)
+        frames.close()
+        self.assertEqual(closed, [True])
+        self.assertEqual(self.play(bars, su, g), "done")
+
+
+class TearingStressTest(_Core1Test):
+    """Every frame core 0 shows must be whole: one value throughout, in order."""
+
+    FRAMES = 1500
+
+    def setUp(self):
+        super().setUp()
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+
+    def test_no_torn_or_skipped_frames(self):
+        rnd = random.Random(7)
+        order = list(range(256))
+
+        def numbered(su, graphics, check_interrupt):
+            for n in range(1, self.FRAMES + 1):
+                if n % 7 == 0:
+                    yield 0          # a hold: the frame must still be n - 1 throughout
+                    continue
+                graphics.set_pen(graphics.create_pen(n >> 16, (n >> 8) & 0xFF, n & 0xFF))
+                rnd.shuffle(order)
+                for k, cell in enumerate(order):
+                    graphics.pixel(cell & 15, cell >> 4)
+                    if rnd.random() < 0.02:
+                        os.sched_yield()
+                yield 0
+            return "done"
+
+        class Yielding(standins.PicoGraphics):
+            """Core 0's blit gives core 1 every chance to write under it."""
+            calls = 0
+
+            def pixel(self, x, y):
+                super().pixel(x, y)
+                self.calls += 1
+                if self.calls % 16 == 0:
+                    os.sched_yield()
+
+        g = Yielding()
+        seen = []
+
+        class Checking(standins.StellarUnicorn):
+            def update(self, graphics):
+                cells = {c for row in graphics.pixels for c in row}
+                seen.append(cells)
+
+        self.assertEqual(self.play(numbered, Checking(), g), "done")
+        torn = [i for i, cells in enumerate(seen) if len(cells) != 1]
+        self.assertEqual(torn, [])
+        values = [r << 16 | gr << 8 | b for (r, gr, b), in seen]
+        expected = [n - 1 if n % 7 == 0 else n for n in range(1, self.FRAMES + 1)]
+        self.assertEqual(values[:-1], expected)
+        self.assertEqual(values[-1], expected[-1])   # the final frame: nothing new drawn
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,39 +6,11 @@ Run from the project root:  python3 -m unittest tests.test_fish
 """
 
 import sys
-import types
 import unittest
 from unittest.mock import MagicMock, patch
 
-# ── Fake time module ──────────────────────────────────────────────────────────
-# Must be installed before fish_module is imported so the module binds our fake.
-
-class _FakeClock:
-    STEP_MS = 500
-
-    def __init__(self):
-        self._ms = 0
-
-    def reset(self):
-        self._ms = 0
-
-    def ticks_ms(self):
-        return self._ms
-
-    def ticks_diff(self, a, b):
-        return a - b
-
-    def sleep_ms(self, _ms):
-        self._ms += self.STEP_MS
-
-
-_clock = _FakeClock()
-
-_fake_time = types.ModuleType("time")
-_fake_time.ticks_ms   = _clock.ticks_ms
-_fake_time.ticks_diff = _clock.ticks_diff
-_fake_time.sleep_ms   = _clock.sleep_ms
-sys.modules["time"] = _fake_time
+from lib import clock
+from tests import standins
 
 # ── MicroPython hardware stub ─────────────────────────────────────────────────
 # lib/buttons.py imports 'machine' which only exists on hardware.
@@ -53,8 +25,9 @@ import animations.fish as fish_module  # noqa: E402
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 def _make_graphics():
-    g = MagicMock()
-    g.create_pen.side_effect = lambda r, green, b: (r, green, b)
+    # Plain set_pen/pixel keep a whole play() quick; create_pen is recorded.
+    g = standins.PicoGraphics()
+    g.create_pen = MagicMock(side_effect=lambda r, green, b: (r, green, b))
     return g
 
 def _make_su():
@@ -66,7 +39,8 @@ def _make_su():
 class FishAnimationTest(unittest.TestCase):
 
     def setUp(self):
-        _clock.reset()
+        self.clock = clock.VirtualClock()
+        self.addCleanup(clock.use, clock.use(self.clock))
         self.su       = _make_su()
         self.graphics = _make_graphics()
         self._sound_patcher = patch.object(fish_module, "sound", MagicMock())
@@ -98,13 +72,11 @@ class FishAnimationTest(unittest.TestCase):
     def test_interrupt_during_hold_returns_button_name(self):
         """play() returns the button name when interrupted during the Hold Phase.
 
-        With STEP_MS=500 the 5-second animation loop runs exactly 10 times.
-        Call #11 is therefore the first check inside the Hold Phase.
+        The animation phase ends 5 s into virtual time, so a check a frame
+        after that is inside the Hold Phase.
         """
-        calls = [0]
         def check():
-            calls[0] += 1
-            return "star" if calls[0] > 10 else None
+            return "star" if clock.ticks_ms() > 5100 else None
         result = fish_module.play(self.su, self.graphics, check_interrupt=check)
         self.assertEqual(result, "star")
 
@@ -124,10 +96,8 @@ class FishAnimationTest(unittest.TestCase):
 
     def test_sound_not_stopped_on_hold_interrupt(self):
         """sound.stop is NOT called when interrupted during the Hold Phase."""
-        calls = [0]
         def check():
-            calls[0] += 1
-            return "butterfly" if calls[0] > 10 else None
+            return "butterfly" if clock.ticks_ms() > 5100 else None
         fish_module.play(self.su, self.graphics, check_interrupt=check)
         self.mock_sound.stop.assert_not_called()
 
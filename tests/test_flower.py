@@ -5,44 +5,13 @@ Runs on desktop CPython with hardware stubs — no Raspberry Pi required.
 Run from the project root:  python -m pytest tests/test_flower.py  (or unittest)
 """
 
-import sys
-import types
 import unittest
 from unittest.mock import MagicMock, patch, call
 
-# ── 1. Fake time module ───────────────────────────────────────────────────────
-# MicroPython exposes ticks_ms / ticks_diff / sleep_ms; CPython does not.
-# Each sleep_ms call advances the clock by STEP_MS so 5 s loops finish fast.
+from lib import clock
+from tests import standins
 
-class _FakeClock:
-    STEP_MS = 500
-
-    def __init__(self):
-        self._ms = 0
-
-    def reset(self):
-        self._ms = 0
-
-    def ticks_ms(self):
-        return self._ms
-
-    def ticks_diff(self, a, b):
-        return a - b
-
-    def sleep_ms(self, _ms):
-        self._ms += self.STEP_MS
-
-
-_clock = _FakeClock()
-
-_fake_time = types.ModuleType("time")
-_fake_time.ticks_ms   = _clock.ticks_ms
-_fake_time.ticks_diff = _clock.ticks_diff
-_fake_time.sleep_ms   = _clock.sleep_ms
-sys.modules["time"] = _fake_time
-
-# ── 2. Import the module under test ──────────────────────────────────────────
-# Must happen AFTER time is replaced so the module binds our fake.
+# ── Import the module under test ─────────────────────────────────────────────
 
 import animations.flower as flower_module  # noqa: E402
 
@@ -65,7 +34,8 @@ def _make_su():
 class FlowerAnimationTest(unittest.TestCase):
 
     def setUp(self):
-        _clock.reset()
+        self.clock = clock.VirtualClock()
+        self.addCleanup(clock.use, clock.use(self.clock))
         self.su       = _make_su()
         self.graphics = _make_graphics()
         # Replace flower_module.sound with a fresh mock each test
@@ -98,13 +68,11 @@ class FlowerAnimationTest(unittest.TestCase):
     def test_interrupt_during_hold_returns_button_name(self):
         """play() returns the button name when interrupted during the Hold Phase.
 
-        With STEP_MS=500 the animation loop runs exactly 10 times (0→4500 ms).
-        Call #11 is therefore the first check inside the Hold Phase.
+        The animation phase ends 5 s into virtual time, so a check a frame
+        after that is inside the Hold Phase.
         """
-        calls = [0]
         def check():
-            calls[0] += 1
-            return "heart" if calls[0] > 10 else None
+            return "heart" if clock.ticks_ms() > 5100 else None
         result = flower_module.play(self.su, self.graphics, check_interrupt=check)
         self.assertEqual(result, "heart")
 
@@ -124,10 +92,8 @@ class FlowerAnimationTest(unittest.TestCase):
 
     def test_sound_not_stopped_on_hold_phase_interrupt(self):
         """sound.stop is NOT called when interrupted during the Hold Phase."""
-        calls = [0]
         def check():
-            calls[0] += 1
-            return "butterfly" if calls[0] > 10 else None
+            return "butterfly" if clock.ticks_ms() > 5100 else None
         flower_module.play(self.su, self.graphics, check_interrupt=check)
         self.mock_sound.stop.assert_not_called()
 
@@ -176,7 +142,7 @@ class FlowerAnimationTest(unittest.TestCase):
     def test_identical_on_every_play(self):
         """The flower looks the same on every button press — no random variation."""
         def fingerprint():
-            _clock.reset()
+            self.clock.reset()
             g = _make_graphics()
             flower_module.play(self.su, g)
             return tuple(c.args for c in g.create_pen.call_args_list)
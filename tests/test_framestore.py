@@ -0,0 +1,135 @@
+"""
+Behavioural tests for the paged frame store.
+
+One file holds every animation's packed frames behind an index; the store
+keeps only the selected animation in a fixed buffer, paging frames in when the
+whole animation does not fit, and evicting it when another is selected.
+
+Runs on desktop CPython — no Raspberry Pi required.
+Run from the project root:  python3 -m unittest tests.test_framestore
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+import unittest.mock
+
+from lib import arena, framestore
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "generate_images"))
+import compile_sprites  # noqa: E402
+
+
+class _RecordingGraphics:
+    """Graphics stub that records the colour drawn at each logical (x, y)."""
+    def __init__(self):
+        self._pen = (0, 0, 0)
+        self.drawn = {}
+
+    def create_pen(self, r, g, b):
+        return (r, g, b)
+
+    def set_pen(self, pen):
+        self._pen = pen
+
+    def pixel(self, px, py):
+        self.drawn[(15 - px, 15 - py)] = self._pen
+
+
+def _dot_frames(n, colour):
+    """n frames of one pixel walking along the top row."""
+    return [[(i, 0, colour)] for i in range(n)]
+
+
+def _big_frames(n):
+    """n full-grid frames (128 bytes each at 4bpp) — too many to stay resident."""
+    return [[(c, r, (255, 0, 0)) for c in range(16) for r in range(16)
+             if (c + r + i) % 3 == 0] + [(0, 0, (0, 255, 0)), (15, 15, (0, 0, 255))]
+            for i in range(n)]
+
+
+class FrameStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        data = compile_sprites.pack_store({
+            "dots": compile_sprites.pack_sheet(_dot_frames(4, (255, 90, 150))),
+            "big": compile_sprites.pack_sheet(_big_frames(6)),
+        })
+        fd, self.path = tempfile.mkstemp(suffix=".fst")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self.store = framestore.FrameStore(self.path, buffer_size=256)
+
+    def tearDown(self):
+        self.store.close()
+        os.remove(self.path)
+
+    def _draw(self, index):
+        g = _RecordingGraphics()
+        self.store.draw(g, index)
+        return g.drawn
+
+    def test_index_lists_every_animation(self):
+        self.assertEqual(sorted(self.store.names()), ["big", "dots"])
+
+    def test_small_animation_is_resident(self):
+        """An animation that fits the buffer is loaded whole and drawn per frame."""
+        self.store.select("dots")
+        self.assertTrue(self.store._resident)
+        self.assertEqual(self._draw(2), {(15, 2): (255, 90, 150)})
+        self.assertEqual(self._draw(0), {(15, 0): (255, 90, 150)})
+
+    def test_large_animation_is_paged(self):
+        """Frames that don't all fit are paged in one at a time, in any order."""
+        self.store.select("big")
+        self.assertFalse(self.store._resident)
+        for i in (5, 0, 3, 3):
+            drawn = self._draw(i)
+            expected = {(15 - r, c) for c in range(16) for r in range(16)
+                        if (c + r + i) % 3 == 0}
+            reds = {p for p, colour in drawn.items() if colour == (255, 0, 0)}
+            self.assertEqual(reds, expected - {(15, 0), (0, 15)})
+
+    def test_switching_animation_evicts_and_reuses_the_buffer(self):
+        """Selecting another animation replaces the frames in the same buffer."""
+        buf = self.store._buf
+        self.store.select("big")
+        self._draw(1)
+        self.store.select("dots")
+        self.assertIs(self.store._buf, buf)
+        self.assertEqual(self.store.current, "dots")
+        self.assertEqual(self._draw(3), {(15, 3): (255, 90, 150)})
+
+    def test_frame_too_big_for_buffer_is_rejected(self):
+        small = framestore.FrameStore(self.path, buffer_size=64)
+        self.addCleanup(small.close)
+        with self.assertRaises(ValueError):
+            small.select("big")
+
+    def test_unknown_animation_raises(self):
+        with self.assertRaises(KeyError):
+            self.store.select("moon")
+
+    def test_each_store_allocates_its_own_buffer(self):
+        """Only shared() pages into the arena's sprite page; others never alias it."""
+        a = framestore.FrameStore(self.path)
+        b = framestore.FrameStore(self.path)
+        self.addCleanup(a.close)
+        self.addCleanup(b.close)
+        self.assertEqual(len(a._buf), framestore.BUFFER_SIZE)
+        self.assertIsNot(a._buf, b._buf)
+
+    def test_shared_store_pages_into_the_arena_buffer(self):
+        page = bytearray(8)
+        self.addCleanup(setattr, framestore, "_shared", framestore._shared)
+        framestore._shared = None
+        with unittest.mock.patch.object(arena, "take", return_value=page) as take:
+            store = framestore.shared()
+        self.addCleanup(store.close)
+        take.assert_called_once_with("sprite_page")
+        self.assertIs(store._buf, page)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,36 +5,14 @@ Run from the project root:  python3 -m unittest tests.test_kx134
 
 import sys
 import struct
-import types
 import unittest
 from unittest.mock import MagicMock
 
 # ── MicroPython hardware stub ─────────────────────────────────────────────────
 sys.modules.setdefault("machine", MagicMock())
 
-# ── Fake time module ──────────────────────────────────────────────────────────
-class _FakeClock:
-    def __init__(self):
-        self._ms = 0
-
-    def set(self, ms):
-        self._ms = ms
-
-    def ticks_ms(self):
-        return self._ms
-
-    def ticks_diff(self, a, b):
-        return a - b
-
-
-_clock = _FakeClock()
-_fake_time = types.ModuleType("time")
-_fake_time.ticks_ms   = _clock.ticks_ms
-_fake_time.ticks_diff = _clock.ticks_diff
-sys.modules["time"] = _fake_time
-
 # ── Import module under test ──────────────────────────────────────────────────
-from lib.kx134 import KX134  # noqa: E402
+from lib.kx134 import KX134, COUNTS_PER_G as KX134_COUNTS_PER_G  # noqa: E402
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
@@ -127,5 +105,72 @@ class KX134ReadXYZTest(unittest.TestCase):
         self.assertAlmostEqual(z, 3.0, places=4)
 
 
+class KX134ReadXYRawTest(unittest.TestCase):
+
+    def test_read_xy_raw_returns_signed_counts(self):
+        """read_xy_raw() returns the signed counts themselves (Q12 g), as ints."""
+        kx = KX134(_i2c_returning_xyz(x_raw=4096, y_raw=-8192, z_raw=0))
+        self.assertEqual(kx.read_xy_raw(), (4096, -8192))
+
+    def test_read_xy_raw_matches_read_xy(self):
+        regs = bytearray(0x20)
+        regs[KX134._REG_XOUTL:KX134._REG_XOUTL + 4] = struct.pack("<hh", -123, 2345)
+        i2c = MagicMock()
+        i2c.readfrom_mem.side_effect = lambda addr, reg, n: bytes(regs[reg:reg + n])
+        kx = KX134(i2c)
+        x, y = kx.read_xy_raw()
+        fx, fy = kx.read_xy()
+        self.assertEqual((x / KX134_COUNTS_PER_G, y / KX134_COUNTS_PER_G), (fx, fy))
+
+    def test_read_xyz_raw_returns_all_three_axes(self):
+        kx = KX134(_i2c_returning_xyz(x_raw=-1, y_raw=300, z_raw=4096))
+        self.assertEqual(kx.read_xyz_raw(), (-1, 300, 4096))
+
+
+class KX134BufferTest(unittest.TestCase):
+    """The sample buffer: stream mode, drained a frame's worth at a time."""
+
+    def _kx_with_buffer(self, samples):
+        fifo = bytearray(b"".join(struct.pack("<hhh", *s) for s in samples))
+        i2c = MagicMock()
+
+        def readfrom_mem(addr, reg, n):
+            if reg == 0x60:                           # BUF_STATUS_1/2: bytes waiting
+                return bytes([len(fifo) & 0xFF, len(fifo) >> 8])
+            return b'\x00' * n
+
+        def readfrom_mem_into(addr, reg, buf):
+            self.assertEqual(reg, 0x63)               # BUF_READ
+            buf[:] = fifo[:len(buf)]
+            del fifo[:len(buf)]
+
+        i2c.readfrom_mem.side_effect = readfrom_mem
+        i2c.readfrom_mem_into.side_effect = readfrom_mem_into
+        return KX134(i2c), i2c
+
+    def test_enable_buffer_selects_16_bit_stream_mode(self):
+        kx, i2c = self._kx_with_buffer([])
+        i2c.writeto_mem.reset_mock()
+        kx.enable_buffer()
+        writes = [c.args[1:] for c in i2c.writeto_mem.call_args_list]
+        self.assertIn((0x5F, bytes([0xC1])), writes)
+        self.assertEqual(writes[-2], (0x1B, bytes([0xC0])))   # back in run mode
+
+    def test_read_buffer_drains_waiting_samples(self):
+        samples = [(i, -i, 4096) for i in range(5)]
+        kx, _ = self._kx_with_buffer(samples)
+        self.assertEqual(kx.buffered(), 5)
+        buf = bytearray(6 * 8)
+        self.assertEqual(kx.read_buffer(buf), 5)
+        self.assertEqual([struct.unpack_from("<hhh", buf, 6 * i) for i in range(5)], samples)
+        self.assertEqual(kx.buffered(), 0)
+        self.assertEqual(kx.read_buffer(buf), 0)
+
+    def test_read_buffer_takes_only_what_fits(self):
+        kx, _ = self._kx_with_buffer([(1, 2, 3)] * 10)
+        self.assertEqual(kx.read_buffer(bytearray(6 * 4)), 4)
+        self.assertEqual(kx.buffered(), 6)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,127 @@
+"""
+Tests for the logging layer (lib/log.py).
+
+Each sink must keep to its own level, a message must not be formatted unless
+it is printed or read back, and the ring must keep the latest RING_SIZE
+messages in order.
+
+Runs on desktop CPython — no hardware involved.
+Run from the project root:  python3 -m unittest tests.test_log
+"""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from lib import clock, log
+
+
+class Counted:
+    """Counts how often it is turned into text."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "counted"
+
+    __repr__ = __str__
+
+
+class _LogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = clock.VirtualClock()
+        self.addCleanup(clock.use, clock.use(self.clock))
+        self.defaults = log.set_levels(console=log.INFO, ring=log.DEBUG)
+        self.addCleanup(log.set_levels, *self.defaults)
+        log.clear()
+        self.addCleanup(log.clear)
+
+    def printed(self, fn, *args):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            fn(*args)
+        return out.getvalue()
+
+
+class LevelTest(_LogTest):
+
+    def test_console_prints_its_level_and_up(self):
+        self.assertEqual(self.printed(log.debug, "d %d", 1), "")
+        self.assertEqual(self.printed(log.info, "i %d", 2), "i 2\n")
+        self.assertEqual(self.printed(log.error, "e"), "e\n")
+        log.set_levels(console=log.DEBUG)
+        self.assertEqual(self.printed(log.debug, "d %s", "x"), "d x\n")
+
+    def test_ring_keeps_its_level_and_up(self):
+        log.set_levels(ring=log.WARN)
+        log.info("i")
+        log.warn("w")
+        self.assertEqual([m for _, _, m in log.records()], ["w"])
+
+    def test_enabled_follows_the_lower_sink(self):
+        self.assertTrue(log.enabled(log.DEBUG))
+        log.set_levels(ring=log.OFF)
+        self.assertFalse(log.enabled(log.DEBUG))
+        self.assertTrue(log.enabled(log.INFO))
+        log.set_levels(console=log.OFF)
+        self.assertFalse(log.enabled(log.ERROR))
+
+    def test_debug_is_off_until_level_turns_it_on(self):
+        self.assertEqual(self.defaults, (log.INFO, log.INFO))
+        log.set_levels(*self.defaults)
+        self.assertFalse(log.enabled(log.DEBUG))
+        log.debug("off")
+        self.assertEqual(log.records(), [])
+        self.assertEqual(log.level(log.DEBUG), log.INFO)
+        log.debug("d")
+        self.assertEqual([m for _, _, m in log.records()], ["d"])
+
+    def test_set_levels_returns_the_previous_pair(self):
+        self.assertEqual(log.set_levels(console=log.WARN), (log.INFO, log.DEBUG))
+        self.assertEqual(log.set_levels(), (log.WARN, log.DEBUG))
+
+
+class LazyFormattingTest(_LogTest):
+
+    def test_not_formatted_when_off(self):
+        log.set_levels(ring=log.OFF)
+        arg = Counted()
+        self.printed(log.debug, "%s", arg)
+        self.assertEqual(arg.formatted, 0)
+
+    def test_ring_only_formats_when_read(self):
+        arg = Counted()
+        self.printed(log.debug, "%s", arg)
+        self.assertEqual(arg.formatted, 0)
+        self.assertEqual(log.records()[-1][2], "counted")
+        self.assertEqual(arg.formatted, 1)
+
+    def test_no_arguments_means_no_formatting(self):
+        self.assertEqual(self.printed(log.info, "100%"), "100%\n")
+
+
+class RingTest(_LogTest):
+
+    def test_keeps_the_latest_oldest_first(self):
+        for n in range(log.RING_SIZE + 5):
+            log.debug("m%d", n)
+            self.clock.advance_ms(10)
+        records = log.records()
+        self.assertEqual(len(records), log.RING_SIZE)
+        self.assertEqual(records[0], (50, log.DEBUG, "m5"))
+        self.assertEqual(records[-1][2], "m%d" % (log.RING_SIZE + 4))
+
+    def test_dump_and_clear(self):
+        self.clock.advance_ms(1234)
+        log.warn("low %d", 3)
+        self.assertEqual(self.printed(log.dump).split(), ["1234", "W", "low", "3"])
+        log.clear()
+        self.assertEqual(log.records(), [])
+        self.assertEqual(self.printed(log.dump), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+The app's uasyncio tasks (main.py), run by tests/app_harness.py on the
+hardware stand-ins in virtual time.
+
+Input must be serviced at a steady rate whatever is rendering, with one I2C
+read per poll; an animation's hold phase must sleep until input arrives; an
+animation's sound must wait for its button to come up, and the toy must rest
+while it sleeps. The harness runs in a subprocess because it installs its own time and
+machine modules.
+
+Runs on desktop CPython — no Raspberry Pi required.
+Run from the project root:  python3 -m unittest tests.test_main
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+_ROOT = os.path.join(os.path.dirname(__file__), "..")
+INPUT_MS = 10   # main.INPUT_MS
+
+SCRIPT = ["0.5:0.3:heart", "3:0.1:star", "10:0.1:heart", "20:5.5:star+heart",
+          "27:5.5:star+heart", "170:0.2:heart"]
+
+
+class AppTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        args = [sys.executable, "-m", "tests.app_harness", "--seconds", "175", "--json", path]
+        for press in SCRIPT:
+            args += ["--press", press]
+        cls.proc = subprocess.run(args, cwd=_ROOT, capture_output=True, text=True,
+                                  timeout=120)
+        with open(path) as f:
+            cls.log = json.load(f)
+        os.remove(path)
+        start = cls.log["start_ms"]
+        cls.modes = [(t - start, m) for t, m in cls.log["modes"]]
+        cls.sounds = [(t - start, f) for t, f in cls.log["sounds"]]
+
+    def _entered(self, mode, after_ms):
+        return next(t for t, m in self.modes if m == mode and t >= after_ms)
+
+    def test_harness_ran(self):
+        self.assertEqual(self.proc.returncode, 0, self.proc.stderr)
+
+    def test_a_press_starts_its_animation_within_one_poll(self):
+        self.assertLessEqual(self._entered("animation", 500) - 500, INPUT_MS)
+
+    def test_input_is_polled_steadily_while_rendering(self):
+        for mode in ("animation", "tilt"):
+            self.assertLessEqual(self.log["summary"][mode]["max_gap_ms"], INPUT_MS, mode)
+
+    def test_each_poll_reads_the_buttons_once(self):
+        for mode, entry in self.log["summary"].items():
+            self.assertEqual(entry["max_reads"], 1, mode)
+
+    def test_a_hold_sleeps_until_a_press_interrupts_it(self):
+        # The star animation runs 3-8 s, then holds; the heart press at 10 s
+        # ends the hold.
+        start = self.log["start_ms"]
+        checks = [t - start for t in self.log["checks"]]
+        self.assertEqual([t for t in checks if 8200 <= t < 10000], [])
+        self.assertLessEqual(self._entered("animation", 10000) - 10000, INPUT_MS)
+
+    def test_the_sound_waits_for_the_button_to_come_up(self):
+        t, filename = self.sounds[0]
+        self.assertEqual(filename, "sounds/heartbeat.wav")
+        self.assertGreaterEqual(t, 800)                    # released at 0.8 s
+        self.assertLessEqual(t, 800 + 2 * INPUT_MS)
+
+    def test_another_button_interrupts_the_animation(self):
+        self.assertIn("sounds/star.wav", [f for t, f in self.sounds if t >= 3000])
+
+    def test_the_combo_hold_enters_and_leaves_the_tilt_game(self):
+        entered = self._entered("tilt", 20000)
+        self.assertAlmostEqual(entered, 25000, delta=2 * INPUT_MS)
+        self.assertAlmostEqual(self._entered("idle", entered), 32000, delta=5 * INPUT_MS)
+
+    def test_sleeps_when_left_alone_and_rests_until_woken(self):
+        asleep = self._entered("sleep", 32000)
+        self.assertAlmostEqual(asleep, 32000 + 120000, delta=100)
+        self.assertNotIn("sleep", self.log["summary"])    # no input polls while asleep
+        woke = self._entered("idle", asleep)
+        self.assertGreaterEqual(woke, 170000)
+        self.assertLessEqual(woke, 170300)
+        self.assertNotIn("animation", [m for t, m in self.modes if t >= asleep])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+"""
+Tests for the GC scheduler (lib/memory.py) and the per-frame allocation
+harness (tools/alloc_frames.py).
+
+Collections must happen in idle windows long enough to hold one, and only
+once enough has been allocated; each frame's allocation must be counted
+against what is playing, and a collection that lands inside a frame must be
+noticed rather than counted as a negative allocation.
+
+Runs on desktop CPython with a fake gc module standing in for MicroPython's.
+Run from the project root:  python3 -m unittest tests.test_memory
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from lib import coro, memory, metrics
+
+_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class FakeGC:
+    """MicroPython's gc: mem_alloc() is ``used``, collect() frees ``garbage``."""
+
+    def __init__(self, used=20000):
+        self.used = used
+        self.garbage = 0
+        self.collections = 0
+        self.threshold_set = None
+
+    def mem_alloc(self):
+        return self.used
+
+    def collect(self):
+        self.collections += 1
+        self.used -= self.garbage
+        self.garbage = 0
+
+    def threshold(self, n):
+        self.threshold_set = n
+
+    def allocate(self, n, garbage=True):
+        self.used += n
+        if garbage:
+            self.garbage += n
+
+
+class _MemoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.gc = FakeGC()
+        for name, value in (("gc", self.gc), ("collect_us", 3000), ("_base", 0),
+                            ("_last", None), ("_name", None), ("_stats", {}),
+                            ("_report", None)):
+            patcher = patch.object(memory, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        memory.init()
+
+
+class SchedulingTest(_MemoryTest):
+
+    def test_init_sets_the_threshold_and_collects(self):
+        self.assertEqual(self.gc.threshold_set, memory.THRESHOLD)
+        self.assertEqual(self.gc.collections, 1)
+        self.assertEqual(metrics.counter(metrics.GC_IDLE), 1)
+
+    def test_collects_once_enough_is_allocated(self):
+        self.gc.allocate(memory.IDLE_COLLECT_BYTES - 1)
+        self.assertEqual(memory.idle(1000), 0)
+        self.assertEqual(self.gc.collections, 1)
+        self.gc.allocate(1)
+        memory.idle(1000)
+        self.assertEqual(self.gc.collections, 2)
+        memory.idle(1000)    # nothing new allocated
+        self.assertEqual(self.gc.collections, 2)
+
+    def test_a_window_must_hold_a_collection(self):
+        self.gc.allocate(memory.IDLE_COLLECT_BYTES * 2)
+        enough = -(-(memory.collect_us + memory.COLLECT_MARGIN_US) // 1000)
+        memory.idle(enough - 1)
+        self.assertEqual(self.gc.collections, 1)
+        memory.idle(enough)
+        self.assertEqual(self.gc.collections, 2)
+
+    def test_time_spent_comes_off_the_wait(self):
+        self.gc.allocate(memory.IDLE_COLLECT_BYTES)
+        spent = memory.idle(500)
+        self.assertGreaterEqual(spent, 0)
+        self.assertLessEqual(spent, 500)
+
+    def test_coro_collects_in_waits_and_holds(self):
+        def frames():
+            self.gc.allocate(memory.IDLE_COLLECT_BYTES)
+            yield 33
+            self.gc.allocate(memory.IDLE_COLLECT_BYTES)
+            yield coro.hold(2000)
+            yield 1     # no time for one
+            return "done"
+
+        self.assertEqual(coro.run(frames(), lambda ms: None), "done")
+        self.assertEqual(self.gc.collections, 3)
+
+
+class FrameAllocationTest(_MemoryTest):
+
+    def test_allocation_is_counted_per_name(self):
+        memory.track("heart")
+        for n in (100, 0, 300):
+            self.gc.allocate(n)
+            memory.frame_done()
+        memory.track("star")
+        self.gc.allocate(50)
+        memory.frame_done()
+        self.assertEqual(memory.stats(), {"heart": (3, 400, 300), "star": (1, 50, 50)})
+        self.assertEqual(metrics.histogram(metrics.FRAME_ALLOC)[:2], (4, 300))
+
+    def test_a_collection_mid_frame_is_noticed(self):
+        memory.track("heart")
+        self.gc.allocate(5000)
+        memory.frame_done()
+        self.gc.collect()            # MicroPython's own, mid-frame
+        memory.frame_done()
+        self.assertEqual(metrics.counter(metrics.GC_MIDFRAME), 1)
+        self.assertEqual(memory.stats()["heart"], (1, 5000, 5000))
+
+    def test_report_lists_the_worst_first(self):
+        memory.track("fish")
+        self.gc.allocate(10)
+        memory.frame_done()
+        memory.track("star")
+        self.gc.allocate(900)
+        memory.frame_done()
+        with patch("builtins.print") as printed:
+            memory.report()
+        rows = [call.args[0] for call in printed.call_args_list]
+        self.assertIn("star", rows[1])
+        self.assertIn("fish", rows[2])
+
+    def test_fragmentation_waits_for_an_idle_window(self):
+        self.gc.allocate(5000)
+        self.gc.mem_free = lambda: 100000
+        mem_info = MagicMock()
+        with patch.object(memory, "micropython", MagicMock(mem_info=mem_info)), \
+                patch("builtins.print") as printed:
+            memory.fragmentation("idle -> tilt")
+            memory.fragmentation("tilt -> idle")
+            self.assertEqual(self.gc.collections, 1)
+            memory.idle(1)               # too short for a collection
+            printed.assert_not_called()
+            memory.idle(1000)
+            memory.idle(1000)            # reported once
+        self.assertEqual(self.gc.collections, 2)
+        self.assertEqual(metrics.counter(metrics.GC_IDLE), 1)   # init()'s only
+        self.assertEqual(printed.call_count, 1)
+        self.assertEqual(printed.call_args.args[0],
+                         "[MEM] tilt -> idle: 20000 used, 100000 free")
+        mem_info.assert_called_once_with()
+
+    def test_nothing_is_measured_without_mem_alloc(self):
+        del FakeGC.mem_alloc
+        self.addCleanup(setattr, FakeGC, "mem_alloc", lambda self: self.used)
+        memory.track("heart")
+        memory.frame_done()
+        self.assertEqual(memory.idle(10000), 0)
+        self.assertEqual(memory.stats(), {"heart": (0, 0, 0)})
+
+
+class HarnessTest(unittest.TestCase):
+
+    def test_reports_animations_and_games(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "alloc.json")
+            proc = subprocess.run(
+                [sys.executable, "tools/alloc_frames.py", "heart", "tilt",
+                 "--frames", "40", "--game-frames", "40", "--json", path],
+                cwd=_ROOT, capture_output=True, text=True, timeout=120)
+            self.assertEqual(proc.returncode, 0, proc.stderr)
+            with open(path) as f:
+                results = json.load(f)
+        self.assertEqual(set(results), {"heart", "tilt"})
+        for r in results.values():
+            self.assertEqual(r["frames"], 40)
+            self.assertGreater(r["setup"], 0)   # the first frame builds its tables
+            self.assertIn("temp_mean", r)
+        self.assertIn("heart", proc.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+Tests for the metrics registry (lib/metrics.py) and its host-side collector
+(tools/collect_metrics.py).
+
+Values must land in the right power-of-two bucket, counters must wrap rather
+than grow into long ints, a dump must decode back to what was recorded, and
+the modules that record must record what they did: frames drawn, I2C reads
+and failures, sound loads.
+
+Runs on desktop CPython against the hardware stand-ins.
+Run from the project root:  python3 -m unittest tests.test_metrics
+"""
+
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import MagicMock, patch
+
+sys.modules.setdefault("machine", MagicMock())
+
+from lib import buttons, clock, coro, metrics, sound  # noqa: E402
+from lib.kx134 import KX134, SAMPLE_SIZE  # noqa: E402
+from tests import standins  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tools"))
+
+import collect_metrics  # noqa: E402
+
+
+class _MetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = clock.VirtualClock()
+        self.addCleanup(clock.use, clock.use(self.clock))
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+
+class RegistryTest(_MetricsTest):
+
+    def test_buckets_are_powers_of_two(self):
+        for value in (0, 1, 2, 3, 4, 1000, -5):
+            metrics.observe(metrics.FRAME_US, value)
+        count, top, buckets = metrics.histogram(metrics.FRAME_US)
+        self.assertEqual((count, top), (7, 1000))
+        self.assertEqual(buckets[:4], [2, 1, 2, 1])   # 0 and -5 | 1 | 2, 3 | 4
+        self.assertEqual(buckets[10], 1)              # 512..1023
+
+    def test_the_last_bucket_holds_everything_above(self):
+        metrics.observe(metrics.WAV_LOAD_US, 1 << 40)
+        count, top, buckets = metrics.histogram(metrics.WAV_LOAD_US)
+        self.assertEqual(buckets[-1], 1)
+        self.assertEqual(top, 0x3FFFFFFF)
+
+    def test_counters_wrap_at_2_to_the_30(self):
+        metrics.inc(metrics.KX_SAMPLES, 0x3FFFFFFF)
+        metrics.inc(metrics.KX_SAMPLES, 3)
+        self.assertEqual(metrics.counter(metrics.KX_SAMPLES), 2)
+
+    def test_since_times_from_now(self):
+        start = metrics.now()
+        self.clock.advance_ms(1.5)
+        self.assertEqual(metrics.since(metrics.BTN_READ_US, start), 1500)
+        self.assertEqual(metrics.histogram(metrics.BTN_READ_US)[1], 1500)
+
+    def test_every_metric_has_a_name(self):
+        self.assertEqual(len(set(metrics.COUNTER_NAMES)), metrics.GC_MIDFRAME + 1)
+        self.assertEqual(len(set(metrics.HISTOGRAM_NAMES)), metrics.GC_US + 1)
+
+
+class DumpTest(_MetricsTest):
+
+    def test_snapshot_decodes_to_what_was_recorded(self):
+        self.clock.advance_ms(90000)
+        metrics.inc(metrics.TILT_BOUNCES, 4)
+        metrics.observe(metrics.KX_BACKLOG, 12)
+        dump = metrics.decode(metrics.snapshot())
+        self.assertEqual(dump["uptime_ms"], 90000)
+        self.assertEqual(dump["counters"]["tilt_bounces"], 4)
+        self.assertEqual(dump["histograms"]["kx_backlog"][:2], (1, 12))
+        self.assertEqual(list(dump["counters"]), list(metrics.COUNTER_NAMES))
+
+    def test_a_dump_from_newer_firmware_still_decodes(self):
+        with patch.object(metrics, "COUNTER_NAMES", metrics.COUNTER_NAMES[:-1]):
+            dump = metrics.decode(metrics.snapshot())
+        self.assertIn("counter_%d" % metrics.GC_MIDFRAME, dump["counters"])
+
+    def test_not_a_snapshot(self):
+        with self.assertRaises(ValueError):
+            metrics.decode(bytes(64))
+
+    def test_collector_reads_the_last_dump_line(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            metrics.dump()
+            metrics.inc(metrics.ROCKET_LAUNCHES)
+            for us in (100, 200, 300, 5000):
+                metrics.observe(metrics.FRAME_US, us)
+            self.clock.advance_ms(60000)
+            print("[MAIN] loop alive")
+            metrics.dump()
+        dump = collect_metrics.find_dump(out.getvalue())
+        self.assertEqual(dump["counters"]["rocket_launches"], 1)
+        report = "\n".join(collect_metrics.report(dump))
+        self.assertIn("rocket_launches", report)
+        frame = next(line for line in report.splitlines() if line.startswith("frame_us"))
+        self.assertEqual(frame.split()[1:], ["4", "255", "5000", "5000", "5000"])
+
+    def test_collector_needs_a_dump(self):
+        with self.assertRaises(ValueError):
+            collect_metrics.find_dump("[MAIN] loop alive\n")
+
+
+class RecordingTest(_MetricsTest):
+
+    def test_frames_are_timed_and_late_ones_counted(self):
+        def frames():
+            self.clock.advance_ms(5)
+            yield 33
+            self.clock.advance_ms(40)      # over its 33 ms
+            yield 33
+            self.clock.advance_ms(40)      # a hold: never late
+            yield coro.hold(100)
+            return "done"
+
+        self.assertEqual(coro.run(frames(), lambda ms: None), "done")
+        count, top, _ = metrics.histogram(metrics.FRAME_US)
+        self.assertEqual((count, top), (3, 40000))
+        self.assertEqual(metrics.counter(metrics.FRAMES_LATE), 1)
+
+    def test_i2c_reads_and_failures(self):
+        bus = standins.Bus()
+        bus.attach(standins.FakeMCP23017())
+        bus.attach(standins.FakeKX134())
+        patcher = patch.object(buttons, "_i2c", bus)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        buttons.snapshot()
+        kx = KX134(bus)
+        kx.read_xyz_raw()
+        self.assertEqual(metrics.histogram(metrics.BTN_READ_US)[0], 1)
+        self.assertEqual(metrics.histogram(metrics.KX_READ_US)[0], 1)
+
+        del bus.devices[standins.FakeMCP23017.ADDR]   # unplugged: reads NAK
+        with self.assertRaises(OSError):
+            buttons.snapshot()
+        self.assertEqual(metrics.counter(metrics.I2C_ERRORS), 1)
+        self.assertEqual(metrics.histogram(metrics.BTN_READ_US)[0], 1)
+
+    def test_buffered_samples(self):
+        fake_kx = standins.FakeKX134()
+        bus = standins.Bus()
+        bus.attach(fake_kx)
+        kx = KX134(bus)
+        kx.enable_buffer()
+        for n in range(5):
+            fake_kx.set_counts(n, 0)
+        buf = bytearray(3 * SAMPLE_SIZE)
+        self.assertEqual(kx.read_buffer(buf), 3)
+        self.assertEqual(metrics.counter(metrics.KX_SAMPLES), 3)
+        self.assertEqual(metrics.histogram(metrics.KX_BACKLOG)[1], 5)
+
+    def test_missing_sound_is_counted(self):
+        with self.assertRaises(OSError):
+            sound.play(standins.StellarUnicorn(), "no/such.wav")
+        self.assertEqual(metrics.counter(metrics.SOUND_MISSING), 1)
+        sound.arm_gate()
+        self.addCleanup(sound.disarm_gate)
+        sound.play(standins.StellarUnicorn(), "no/such.wav")
+        self.assertEqual(metrics.counter(metrics.SOUND_DEFERRED), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Tests for the mode state machine (lib/modes.py).
+
+The machine must follow its transition table exactly, ignore events that mean
+nothing in the current state, time each transition from its cause across the
+ticks_us wrap, and keep the most recent moves in order. Under random input on
+the stand-ins, main.py's mode task must only ever take the table's moves.
+
+Runs on desktop CPython — no hardware involved.
+Run from the project root:  python3 -m unittest tests.test_modes
+"""
+
+import io
+import os
+import subprocess
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+from lib import clock, modes
+
+_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class TransitionTest(unittest.TestCase):
+
+    def test_starts_idle(self):
+        self.assertEqual(modes.ModeMachine().state, modes.IDLE)
+
+    def test_press_plays_an_animation_and_done_returns_to_idle(self):
+        m = modes.ModeMachine()
+        self.assertEqual(m.fire(modes.PRESS, 100), modes.ANIMATION)
+        self.assertEqual(m.fire(modes.PRESS, 200), modes.ANIMATION)
+        self.assertEqual(m.fire(modes.DONE, 300), modes.IDLE)
+        self.assertEqual((m.since, m.entered_by), (300, modes.DONE))
+
+    def test_each_game_is_left_only_by_its_own_hold(self):
+        m = modes.ModeMachine()
+        m.fire(modes.TILT_HOLD, 0)
+        for event in (modes.PRESS, modes.ROCKET_HOLD, modes.DONE, modes.WAKE, modes.SLEEP_DUE):
+            self.assertIsNone(m.fire(event, 1))
+        self.assertEqual(m.state, modes.TILT)
+        self.assertEqual(m.rejected, 5)
+        self.assertEqual(m.fire(modes.TILT_HOLD, 2), modes.IDLE)
+
+    def test_settled_game_sleeps_and_wake_returns_to_idle(self):
+        m = modes.ModeMachine()
+        m.fire(modes.ROCKET_HOLD, 0)
+        self.assertEqual(m.fire(modes.SETTLED, 1), modes.SLEEP)
+        self.assertIsNone(m.fire(modes.PRESS, 2))
+        self.assertEqual(m.fire(modes.WAKE, 3), modes.IDLE)
+
+    def test_next_state_does_not_move(self):
+        m = modes.ModeMachine()
+        self.assertEqual(m.next_state(modes.SLEEP_DUE), modes.SLEEP)
+        self.assertIsNone(m.next_state(modes.WAKE))
+        self.assertEqual((m.state, m.transitions, m.rejected), (modes.IDLE, 0, 0))
+
+    def test_on_change_sees_each_move_after_it_happens(self):
+        seen = []
+        m = modes.ModeMachine(on_change=lambda old, new, event: seen.append(
+            (old, new, event, m.state)))
+        m.fire(modes.PRESS, 0)
+        m.fire(modes.WAKE, 1)    # ignored: no call
+        m.fire(modes.DONE, 2)
+        self.assertEqual(seen, [(modes.IDLE, modes.ANIMATION, modes.PRESS, modes.ANIMATION),
+                                (modes.ANIMATION, modes.IDLE, modes.DONE, modes.IDLE)])
+
+
+class LatencyTest(unittest.TestCase):
+
+    def test_latency_is_from_cause_to_fire(self):
+        m = modes.ModeMachine()
+        m.fire(modes.PRESS, 5000, 1000)
+        m.fire(modes.DONE, 6000)
+        m.fire(modes.PRESS, 9000, 7000)
+        self.assertEqual(m.latency(modes.IDLE, modes.ANIMATION), (2, 2000, 4000, 3000))
+        self.assertEqual(m.latency(modes.ANIMATION, modes.IDLE), (1, 0, 0, 0))
+        self.assertEqual(m.latency(modes.IDLE, modes.SLEEP), (0, 0, 0, 0))
+
+    def test_latency_across_the_ticks_wrap(self):
+        self.addCleanup(clock.use, clock.use(clock.VirtualClock(wrap=True)))
+        m = modes.ModeMachine()
+        m.fire(modes.TILT_HOLD, 150, (1 << 30) - 250)
+        self.assertEqual(m.latency(modes.IDLE, modes.TILT)[1], 400)
+
+    def test_a_cause_after_the_fire_counts_as_zero(self):
+        m = modes.ModeMachine()
+        m.fire(modes.PRESS, 1000, 1500)
+        self.assertEqual(m.latency(modes.IDLE, modes.ANIMATION)[1], 0)
+
+    def test_stats_and_report_name_the_transitions(self):
+        m = modes.ModeMachine()
+        m.fire(modes.SLEEP_DUE, 10, 0)
+        m.fire(modes.PRESS, 20)
+        self.assertEqual(m.stats(), {"idle→sleep": (1, 10, 10, 10)})
+        out = io.StringIO()
+        with redirect_stdout(out):
+            m.report()
+        self.assertIn("idle→sleep", out.getvalue())
+        self.assertIn("ignored events: 1", out.getvalue())
+
+
+class HistoryTest(unittest.TestCase):
+
+    def test_history_keeps_the_latest_moves_oldest_first(self):
+        m = modes.ModeMachine(history=3)
+        for t, event in enumerate((modes.PRESS, modes.DONE, modes.TILT_HOLD,
+                                   modes.TILT_HOLD, modes.SLEEP_DUE)):
+            m.fire(event, t)
+        self.assertEqual(m.history(), [
+            (2, modes.IDLE, modes.TILT, modes.TILT_HOLD),
+            (3, modes.TILT, modes.IDLE, modes.TILT_HOLD),
+            (4, modes.IDLE, modes.SLEEP, modes.SLEEP_DUE),
+        ])
+
+    def test_short_history(self):
+        m = modes.ModeMachine(history=3)
+        self.assertEqual(m.history(), [])
+        m.fire(modes.PRESS, 7)
+        self.assertEqual(m.history(), [(7, modes.IDLE, modes.ANIMATION, modes.PRESS)])
+
+
+class FuzzTest(unittest.TestCase):
+
+    def test_random_input_keeps_main_in_the_table(self):
+        """tools/fuzz_modes.py runs main.py's mode task (in its own process)."""
+        for seed in range(3):
+            proc = subprocess.run(
+                [sys.executable, "tools/fuzz_modes.py", "--actions", "200", "--seed", str(seed)],
+                cwd=_ROOT, capture_output=True, text=True, timeout=300)
+            self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+            self.assertIn("invariants hold", proc.stdout)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,39 +6,11 @@ Run from the project root:  python3 -m unittest tests.test_rocket
 """
 
 import sys
-import types
 import unittest
 from unittest.mock import MagicMock, patch
 
-# ── Fake time module ──────────────────────────────────────────────────────────
-# Must be installed before rocket_module is imported so the module binds our fake.
-
-class _FakeClock:
-    STEP_MS = 500
-
-    def __init__(self):
-        self._ms = 0
-
-    def reset(self):
-        self._ms = 0
-
-    def ticks_ms(self):
-        return self._ms
-
-    def ticks_diff(self, a, b):
-        return a - b
-
-    def sleep_ms(self, _ms):
-        self._ms += self.STEP_MS
-
-
-_clock = _FakeClock()
-
-_fake_time = types.ModuleType("time")
-_fake_time.ticks_ms   = _clock.ticks_ms
-_fake_time.ticks_diff = _clock.ticks_diff
-_fake_time.sleep_ms   = _clock.sleep_ms
-sys.modules["time"] = _fake_time
+from lib import clock, display
+from tests import standins
 
 # ── MicroPython hardware stub ─────────────────────────────────────────────────
 sys.modules.setdefault("machine", MagicMock())
@@ -51,8 +23,9 @@ import animations.rocket as rocket_module  # noqa: E402
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
 def _make_graphics():
-    g = MagicMock()
-    g.create_pen.side_effect = lambda r, green, b: (r, green, b)
+    # Plain set_pen/pixel keep a whole play() quick; create_pen is recorded.
+    g = standins.PicoGraphics()
+    g.create_pen = MagicMock(side_effect=lambda r, green, b: (r, green, b))
     return g
 
 def _make_su():
@@ -64,18 +37,14 @@ def _make_su():
 class RocketAnimationTest(unittest.TestCase):
 
     def setUp(self):
-        _clock.reset()
+        self.clock = clock.VirtualClock()
+        self.addCleanup(clock.use, clock.use(self.clock))
         self.su       = _make_su()
         self.graphics = _make_graphics()
-        # Belt-and-braces: patch rocket_module.time directly in case it was
-        # imported before this test file set sys.modules["time"].
-        self._time_patcher  = patch.object(rocket_module, "time", _fake_time)
-        self._time_patcher.start()
         self._sound_patcher = patch.object(rocket_module, "sound", MagicMock())
         self.mock_sound = self._sound_patcher.start()
 
     def tearDown(self):
-        self._time_patcher.stop()
         self._sound_patcher.stop()
 
     # ── Cycle 1: tracer bullet ────────────────────────────────────────────────
@@ -101,13 +70,11 @@ class RocketAnimationTest(unittest.TestCase):
     def test_interrupt_during_hold_returns_button_name(self):
         """play() returns the button name when interrupted during the Hold Phase.
 
-        With STEP_MS=500 the 5-second animation loop runs exactly 10 times.
-        Call #11 is therefore the first check inside the Hold Phase.
+        The animation phase ends 5 s into virtual time, so a check a frame
+        after that is inside the Hold Phase.
         """
-        calls = [0]
         def check():
-            calls[0] += 1
-            return "star" if calls[0] > 10 else None
+            return "star" if clock.ticks_ms() > 5100 else None
         result = rocket_module.play(self.su, self.graphics, check_interrupt=check)
         self.assertEqual(result, "star")
 
@@ -129,10 +96,8 @@ class RocketAnimationTest(unittest.TestCase):
         """sound.stop is called exactly once when the rocket parks at the top
         (at the animation→hold transition), whether or not the hold is later
         interrupted."""
-        calls = [0]
         def check():
-            calls[0] += 1
-            return "butterfly" if calls[0] > 10 else None
+            return "butterfly" if clock.ticks_ms() > 5100 else None
         rocket_module.play(self.su, self.graphics, check_interrupt=check)
         self.mock_sound.stop.assert_called_once_with(self.su)
 
@@ -207,7 +172,7 @@ class RocketAnimationTest(unittest.TestCase):
         """
         drawn = []
         with patch.object(
-            rocket_module.display, "pixel",
+            display, "pixel",
             side_effect=lambda _g, x, y: drawn.append((x, y)),
         ):
             rocket_module.play(self.su, self.graphics)
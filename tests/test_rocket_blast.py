@@ -11,39 +11,16 @@ Runs on desktop CPython with hardware stubs.
 Run from the project root:  python3 -m unittest tests.test_rocket_blast
 """
 
+import math
+import struct
 import sys
-import types
 import unittest
 from unittest.mock import MagicMock, call, patch
 
-# ── Fake time module (installed before rocket_blast is imported) ──────────────
-class _FakeClock:
-    def __init__(self):
-        self._ms = 0
-
-    def reset(self):
-        self._ms = 0
-
-    def ticks_ms(self):
-        return self._ms
-
-    def ticks_diff(self, a, b):
-        return a - b
-
-    def sleep_ms(self, ms):
-        self._ms += ms
-
-
-_clock = _FakeClock()
-_fake_time = types.ModuleType("time")
-_fake_time.ticks_ms = _clock.ticks_ms
-_fake_time.ticks_diff = _clock.ticks_diff
-_fake_time.sleep_ms = _clock.sleep_ms
-sys.modules["time"] = _fake_time
-
 sys.modules.setdefault("machine", MagicMock())
 
 from games import rocket_blast  # noqa: E402
+from lib import arena, clock, log  # noqa: E402
 
 
 class ShakeAmountTest(unittest.TestCase):
@@ -154,6 +131,103 @@ class RocketTest(unittest.TestCase):
         self.assertTrue(r.is_active(0.0))           # airborne → active even if still
 
 
+class _BufferedKX:
+    """KX134 sample buffer stand-in: queue(g) adds 400 Hz samples of (x, y, z) g."""
+
+    def __init__(self):
+        self.samples = []
+        self.enabled = False
+        self.read_xyz = MagicMock(return_value=(0.0, 0.0, 1.0))
+
+    def enable_buffer(self):
+        self.enabled = True
+
+    def disable_buffer(self):
+        self.enabled = False
+
+    def queue(self, readings):
+        for g in readings:
+            self.samples.append(tuple(int(v * rocket_blast.COUNTS_PER_G) for v in g))
+        del self.samples[:-rocket_blast.BUFFER_SAMPLES]
+
+    def read_buffer(self, buf):
+        n = min(len(self.samples), len(buf) // 6)
+        for i in range(n):
+            struct.pack_into("<hhh", buf, 6 * i, *self.samples[i])
+        del self.samples[:n]
+        return n
+
+
+def _shake(hz, amplitude, seconds, start=0.0):
+    """400 Hz readings of a toy shaken up and down (z) at hz, amplitude in g."""
+    return [(0.0, 0.0, 1.0 + amplitude * math.sin(2 * math.pi * hz * (start + i / 400)))
+            for i in range(int(seconds * 400))]
+
+
+def _frames(meter, kx, readings, per_frame=13):
+    """Feed readings a frame's worth at a time; returns each frame's shake."""
+    shakes = []
+    for i in range(0, len(readings), per_frame):
+        kx.queue(readings[i:i + per_frame])
+        shakes.append(meter.update())
+    return shakes
+
+
+class ShakeMeterTest(unittest.TestCase):
+    """ShakeMeter reads every buffered sample, not one per frame."""
+
+    def setUp(self):
+        self.kx = _BufferedKX()
+        self.meter = rocket_blast.ShakeMeter(self.kx)
+
+    def test_enables_the_buffer_and_closes_it(self):
+        self.assertTrue(self.kx.enabled)
+        self.meter.close()
+        self.assertFalse(self.kx.enabled)
+
+    def test_still_toy_reads_no_shake(self):
+        tip = [(math.sin(i / 1000), 0.0, math.cos(i / 1000)) for i in range(780)]
+        still = [(0.0, 0.0, 1.0)] * 390 + tip        # then slowly tipped onto its side
+        self.assertEqual(set(_frames(self.meter, self.kx, still)), {0.0})
+
+    def test_steady_shake_reads_its_peak_and_rms(self):
+        readings = _shake(4, 1.5, 1.95)
+        _frames(self.meter, self.kx, readings[:390])
+        peaks, squares = [], []
+        for i in range(390, len(readings), 13):          # the last 30 frames, 2 shakes
+            self.kx.queue(readings[i:i + 13])
+            shake = self.meter.update()
+            self.assertGreater(shake, rocket_blast.SHAKE_DEADZONE)
+            peaks.append(self.meter.peak)
+            squares.append(self.meter.rms ** 2)
+        self.assertAlmostEqual(max(peaks), 1.5, delta=0.2)
+        self.assertAlmostEqual(math.sqrt(sum(squares) / len(squares)), 1.5 / math.sqrt(2),
+                               delta=0.15)
+
+    def test_burst_between_frames_is_not_missed(self):
+        """A 20 ms jolt that a once-per-frame reading would skip still counts."""
+        quiet = [(0.0, 0.0, 1.0)] * 13
+        jolt = [(0.0, 0.0, 3.0)] * 8 + [(0.0, 0.0, 1.0)] * 5
+        shakes = _frames(self.meter, self.kx, quiet * 20 + jolt + quiet * 2)
+        self.assertGreater(shakes[20], 0.0)
+        self.assertGreater(shakes[21], 0.0)                 # peak-hold
+        self.assertGreater(shakes[20], shakes[22])          # ... decaying
+
+    def test_the_fifo_scratch_is_reserved_at_boot(self):
+        arena.reserve()
+        self.addCleanup(arena.release)
+        meter = rocket_blast.ShakeMeter(self.kx)
+        self.assertIs(meter._buf, arena.take(rocket_blast._FIFO))
+        self.assertEqual(len(meter._buf), rocket_blast.BUFFER_SAMPLES * rocket_blast.SAMPLE_SIZE)
+
+    def test_slower_frames_lose_nothing(self):
+        readings = _shake(5, 1.2, 1.95)    # 60 frames of 13, or 15 of 52
+        fast = _frames(self.meter, self.kx, readings, per_frame=13)
+        slow_kx = _BufferedKX()
+        slow = _frames(rocket_blast.ShakeMeter(slow_kx), slow_kx, readings, per_frame=52)
+        self.assertAlmostEqual(fast[-1], slow[-1], delta=0.15)
+
+
 def _make_graphics():
     g = MagicMock()
     g.create_pen.side_effect = lambda r, green, b: (r, green, b)
@@ -161,15 +235,75 @@ def _make_graphics():
 
 
 def _make_kx(x=0.0, y=0.0, z=1.0):
-    kx = MagicMock()
+    """A reader without the sample buffer: run() falls back to shake_amount()."""
+    kx = MagicMock(spec=["read_xyz"])
     kx.read_xyz.return_value = (x, y, z)
     return kx
 
 
+class StarShowerTest(unittest.TestCase):
+
+    def _shower(self, capacity=rocket_blast.MAX_STARS, frames=160):
+        shower = rocket_blast.StarShower(capacity)
+        shower.start(frames)
+        return shower
+
+    def test_burst_starts_at_the_top_of_the_display(self):
+        shower = self._shower()
+        self.assertTrue(shower.active)
+        self.assertGreater(shower.count, 0)
+        for i in range(shower.count):
+            self.assertEqual(shower.x[i] >> rocket_blast._STAR_Q, 15)
+
+    def test_stars_fall(self):
+        shower = self._shower()
+        top = sum(shower.x[i] for i in range(shower.count)) / shower.count
+        for _ in range(20):
+            shower.step()
+        self.assertLess(sum(shower.x[i] for i in range(shower.count)) / shower.count, top)
+
+    def test_stars_stay_on_the_display_and_in_their_slots(self):
+        shower = self._shower(capacity=64)
+        edge = 16 << rocket_blast._STAR_Q
+        for _ in range(160):
+            shower.step(3.0)
+            self.assertLessEqual(shower.count, 64)
+            for i in range(shower.count):
+                self.assertTrue(0 <= shower.x[i] < edge and 0 <= shower.y[i] < edge)
+
+    def test_shaking_adds_sparkles(self):
+        calm, shaken = self._shower(), self._shower()
+        for _ in range(10):
+            calm.step(0.0)
+            shaken.step(2.0)
+        self.assertGreater(shaken.count, calm.count)
+
+    def test_shower_ends_with_no_stars_left(self):
+        shower = self._shower(frames=100)
+        for _ in range(99):
+            shower.step()
+        self.assertTrue(shower.active)
+        shower.step()
+        self.assertFalse(shower.active)
+        self.assertEqual(shower.count, 0)
+
+    def test_draw_sets_a_pen_only_when_it_changes(self):
+        shower = self._shower()
+        drawn = []
+        graphics = _make_graphics()
+        with patch.object(rocket_blast.display, "pixel",
+                          side_effect=lambda g, x, y: drawn.append((x, y))):
+            shower.draw(graphics)
+        self.assertEqual(len(drawn), shower.count)
+        self.assertLessEqual(graphics.set_pen.call_count, shower.count)
+        self.assertLessEqual(graphics.create_pen.call_count, 2 * rocket_blast._STAR_FADES)
+
+
 class RocketRunTest(unittest.TestCase):
 
     def setUp(self):
-        _clock.reset()
+        self.clock = clock.VirtualClock()
+        self.addCleanup(clock.use, clock.use(self.clock))
         self.su = MagicMock()
         self.graphics = _make_graphics()
         self._sound_patcher = patch.object(rocket_blast, "sound", MagicMock())
@@ -179,12 +313,12 @@ class RocketRunTest(unittest.TestCase):
         # lives in the _LAUNCH_FLASH_FRAMES constant, not in these tests.
         self._flash_patcher = patch.object(rocket_blast, "_LAUNCH_FLASH_FRAMES", 3)
         self._flash_patcher.start()
-        # Keep the tuning telemetry out of the test output.
-        self._debug_patcher = patch.object(rocket_blast, "DEBUG", False)
-        self._debug_patcher.start()
+        # Keep the tuning telemetry out of the test output (it still goes to
+        # the log ring).
+        self._levels = log.set_levels(console=log.INFO)
 
     def tearDown(self):
-        self._debug_patcher.stop()
+        log.set_levels(*self._levels)
         self._flash_patcher.stop()
         self._sound_patcher.stop()
 
@@ -221,7 +355,7 @@ class RocketRunTest(unittest.TestCase):
                   + [(0.0, 0.0, 1.0)] * 80
                   + [(2.0, 0.0, 0.0)] * 8)
         it = iter(script)
-        kx = MagicMock()
+        kx = _make_kx()
         kx.read_xyz.side_effect = lambda: next(it, (0.0, 0.0, 1.0))
         # Keep it from launching so we isolate the ground→shake re-arm behaviour.
         with patch.object(rocket_blast, "LAUNCH_RX", 1000.0):
@@ -237,6 +371,29 @@ class RocketRunTest(unittest.TestCase):
                          should_exit=self._exit_after(300))
         self.mock_sound.play.assert_any_call(self.su, rocket_blast.STAR_SOUND)
 
+    def test_exit_gesture_works_during_the_star_shower(self):
+        """The launch no longer blocks: should_exit is polled every shower frame."""
+        polls = []
+        def should_exit():
+            polls.append(clock.ticks_ms())
+            return bool(self.mock_sound.play.call_args_list.count(
+                call(self.su, rocket_blast.STAR_SOUND)))
+        with patch.object(rocket_blast, "_LAUNCH_FLASH_FRAMES", 160):
+            result = rocket_blast.run(self.su, self.graphics, _make_kx(x=3.0),
+                                      should_exit=should_exit)
+        self.assertEqual(result, rocket_blast.EXIT)
+        # Exited on the first frame after the launch, not 160 frames later.
+        self.assertLessEqual(polls[-1] - polls[-2], rocket_blast.FRAME_MS)
+
+    def test_rocket_waits_out_the_star_shower(self):
+        """No second launch until the shower (and its stars) are gone."""
+        with patch.object(rocket_blast, "_LAUNCH_FLASH_FRAMES", 40):
+            rocket_blast.run(self.su, self.graphics, _make_kx(x=3.0),
+                             should_exit=self._exit_after(60))
+        stars = self.mock_sound.play.call_args_list.count(
+            call(self.su, rocket_blast.STAR_SOUND))
+        self.assertEqual(stars, 1)
+
     def test_missing_launch_sound_is_ignored(self):
         """A missing rocket.wav (OSError) does not crash the game."""
         self.mock_sound.play.side_effect = OSError("no file")
@@ -260,11 +417,19 @@ class RocketRunTest(unittest.TestCase):
                                       should_exit=self._exit_after(60))
         self.assertEqual(result, rocket_blast.EXIT)
 
+    def test_run_uses_the_shake_meter_on_a_buffering_kx(self):
+        kx = _BufferedKX()
+        kx.queue(_shake(5, 2.0, 0.2))
+        rocket_blast.run(self.su, self.graphics, kx, should_exit=self._exit_after(1))
+        self.assertEqual(self._whoosh_count(), 1)
+        kx.read_xyz.assert_not_called()
+        self.assertFalse(kx.enabled)                # buffer released on exit
+
     def test_rocket_pixels_are_drawn(self):
         """Each frame draws the rocket sprite (some pixels light up)."""
         drawn = []
-        with patch.object(rocket_blast, "_px",
-                          side_effect=lambda g, x, y, r, gr, b: drawn.append((x, y))):
+        with patch.object(rocket_blast.display, "pixel",
+                          side_effect=lambda g, x, y: drawn.append((x, y))):
             rocket_blast.run(self.su, self.graphics, _make_kx(),
                              should_exit=self._exit_after(1))
         self.assertTrue(drawn, "no rocket pixels were drawn")
@@ -0,0 +1,71 @@
+"""
+Tests for the soak harness (tools/soak.py) and the wrapping virtual clock it
+runs on (tests/standins.py).
+
+The clock's ticks must wrap and difference like MicroPython's; a soak must
+run main.main() for the time asked, through a ticks_ms wrap, the same way
+every time for the same seed, and report each seed from its own process.
+
+Run from the project root:  python3 -m unittest tests.test_soak
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from tests import standins
+
+_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class WrappingClockTest(unittest.TestCase):
+
+    def test_ticks_wrap_and_difference_across_the_wrap(self):
+        clock = standins.VirtualClock(start_us=(standins.TICKS_PERIOD - 5) * 1000, wrap=True)
+        time = clock.module()
+        before = time.ticks_ms()
+        self.assertEqual(before, standins.TICKS_PERIOD - 5)
+        clock.advance_ms(10)
+        after = time.ticks_ms()
+        self.assertEqual(after, 5)
+        self.assertEqual(time.ticks_diff(after, before), 10)
+        self.assertEqual(time.ticks_diff(before, after), -10)
+        self.assertEqual(time.ticks_add(before, 10), after)
+        self.assertLess(time.ticks_us(), standins.TICKS_PERIOD)
+
+    def test_unwrapped_by_default(self):
+        clock = standins.VirtualClock(start_us=standins.TICKS_PERIOD * 1000)
+        self.assertEqual(clock.module().ticks_ms(), standins.TICKS_PERIOD)
+
+
+class SoakTest(unittest.TestCase):
+
+    def test_seeds_run_in_their_own_processes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "soak.json")
+            proc = subprocess.run(
+                [sys.executable, "tools/soak.py", "--hours", "0.05", "--seed", "7",
+                 "--seed", "7", "--seed", "8", "--jobs", "2", "--wrap-in", "1.5",
+                 "--json", path],
+                cwd=_ROOT, capture_output=True, text=True, timeout=300)
+            self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+            with open(path) as f:
+                results = json.load(f)
+        self.assertEqual([r["seed"] for r in results], [7, 7, 8])
+        for r in results:
+            self.assertIsNone(r["error"])
+            self.assertAlmostEqual(r["hours"], 0.05, places=3)
+            self.assertEqual(r["ms_wraps"], 1)
+            self.assertGreater(r["heap_peak"], 0)
+            self.assertGreater(r["frames"], 0)
+        self.assertEqual(results[0]["frames"], results[1]["frames"])
+        self.assertEqual([h[2] for h in results[0]["hourly"]],
+                         [h[2] for h in results[1]["hourly"]])
+        self.assertIn("no exceptions", proc.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Behavioural tests for compiled sprite sheets.
+
+generate_images/compile_sprites.py packs ASCII/PNG designs into indexed-colour
+sheets; lib/sprites.py loads them with one readinto() and draws them, clipped,
+at an offset. These tests compile on the host and draw on a recording stub.
+
+Runs on desktop CPython — no Raspberry Pi required.
+Run from the project root:  python3 -m unittest tests.test_sprites
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+from lib import framestore, sprites
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "generate_images"))
+import compile_sprites  # noqa: E402
+import generate_rocket_images as rocket_design  # noqa: E402
+
+
+class _RecordingGraphics:
+    """Graphics stub that records the colour drawn at each logical (x, y)."""
+    def __init__(self):
+        self._pen = (0, 0, 0)
+        self.drawn = {}
+
+    def create_pen(self, r, g, b):
+        return (r, g, b)
+
+    def set_pen(self, pen):
+        self._pen = pen
+
+    def pixel(self, px, py):
+        # display.pixel maps logical (x, y) → physical (15 - x, 15 - y)
+        self.drawn[(15 - px, 15 - py)] = self._pen
+
+
+def _write(data):
+    fd, path = tempfile.mkstemp(suffix=".spr")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return path
+
+
+_LEGEND = {'r': (255, 0, 0), 'y': (255, 255, 0)}
+_ROWS = ["." * 16] * 5 + ["......ry........", "......yr........"] + ["." * 16] * 9
+
+
+class SpriteSheetTest(unittest.TestCase):
+
+    def _load(self, frames):
+        path = _write(compile_sprites.pack_sheet(frames))
+        self.addCleanup(os.remove, path)
+        return sprites.SpriteSheet(path)
+
+    def test_round_trip_matches_the_design(self):
+        """Every designed pixel lands at logical (15 - row, col) in its colour."""
+        sheet = self._load([compile_sprites.parse(_ROWS, _LEGEND)])
+        g = _RecordingGraphics()
+        sheet.draw(g)
+        self.assertEqual(g.drawn, {
+            (10, 6): (255, 0, 0), (10, 7): (255, 255, 0),
+            (9, 6): (255, 255, 0), (9, 7): (255, 0, 0),
+        })
+
+    def test_frames_are_cropped_to_their_bounding_box(self):
+        """A 2x2 sprite costs 2 bytes per frame at 4 bits per pixel, not 128."""
+        sheet = self._load([compile_sprites.parse(_ROWS, _LEGEND)])
+        self.assertEqual((sheet.width, sheet.height, sheet.bpp), (2, 2, 4))
+        self.assertEqual(sheet.frame_bytes, 2)
+
+    def test_offsets_shift_and_clip(self):
+        """dx moves the sprite up, dy right, and off-grid pixels are dropped."""
+        sheet = self._load([compile_sprites.parse(_ROWS, _LEGEND)])
+        g = _RecordingGraphics()
+        sheet.draw(g, dx=5, dy=9)
+        self.assertEqual(set(g.drawn), {(15, 15), (14, 15)})
+
+    def test_many_colours_use_a_byte_per_pixel(self):
+        """More than 15 colours switches to 8 bits per pixel and still round-trips."""
+        pixels = [(i, 0, (i * 10, 200, 0)) for i in range(16)] + [(0, 1, (1, 2, 3))]
+        sheet = self._load([pixels])
+        self.assertEqual(sheet.bpp, 8)
+        g = _RecordingGraphics()
+        sheet.draw(g)
+        self.assertEqual(g.drawn[(15, 9)], (90, 200, 0))
+        self.assertEqual(g.drawn[(14, 0)], (1, 2, 3))
+
+    def test_bad_magic_is_rejected(self):
+        path = _write(b"NOPE" + bytes(20))
+        self.addCleanup(os.remove, path)
+        with self.assertRaises(ValueError):
+            sprites.SpriteSheet(path)
+
+
+class BoatSheetTest(unittest.TestCase):
+
+    def test_shipped_store_matches_its_source(self):
+        """sprites/frames.fst is up to date with generate_images/sprite_sources.py."""
+        with open(framestore.STORE_FILE, "rb") as f:
+            self.assertEqual(f.read(), compile_sprites.build_store(),
+                             "re-run generate_images/compile_sprites.py")
+
+    def test_boat_layout(self):
+        """The compiled boat keeps the hull/keel/antenna rows boat.py documents."""
+        store = framestore.FrameStore(framestore.STORE_FILE)
+        self.addCleanup(store.close)
+        store.select("boat")
+        g = _RecordingGraphics()
+        store.draw(g)
+        rows = {}
+        for (x, y) in g.drawn:
+            rows.setdefault(x, []).append(y)
+        self.assertEqual(sorted(rows[2]), list(range(3, 13)))    # keel
+        self.assertEqual(sorted(rows[4]), list(range(1, 15)))    # upper hull
+        self.assertEqual(sorted(rows[12]), [4])                  # antenna tip
+
+
+class _CountingGraphics(_RecordingGraphics):
+
+    def __init__(self):
+        super().__init__()
+        self.pens_created = 0
+
+    def create_pen(self, r, g, b):
+        self.pens_created += 1
+        return (r, g, b)
+
+
+class RocketSheetTest(unittest.TestCase):
+    """Both rockets draw their design at every height, clipped at the edges."""
+
+    def setUp(self):
+        self.store = framestore.FrameStore(framestore.STORE_FILE, buffer_size=1024)
+        self.addCleanup(self.store.close)
+
+    def _check(self, name, frames):
+        self.store.select(name)
+        for index, design in enumerate(frames):
+            for rx in range(-2, 26):
+                g = _RecordingGraphics()
+                self.store.draw(g, index, dx=rx - 15)
+                expected = {(15 - row, col): colour for col, row, colour in design(15 - rx)
+                            if 0 <= col < 16 and 0 <= row < 16}
+                self.assertEqual(g.drawn, expected, "%s frame %d at x=%d" % (name, index, rx))
+
+    def test_animation_rocket(self):
+        self._check("rocket", [
+            lambda ry, n=n, seed=seed: rocket_design._rocket_pixels(rocket_design.TOY, ry, n, seed)
+            for n in (2, 3, 4) for seed in (0, 1)])
+
+    def test_game_rocket(self):
+        self._check("rocket_blast", [
+            lambda ry, n=n: rocket_design._game_rocket_pixels(ry, n) for n in (1, 2, 3)])
+
+    def test_a_frame_creates_no_pens(self):
+        self.store.select("rocket_blast")
+        g = _CountingGraphics()
+        self.store.draw(g, 2, dx=-2)
+        g.pens_created = 0
+        self.store.draw(g, 2, dx=-1)
+        self.assertEqual(g.pens_created, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
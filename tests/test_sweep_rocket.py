@@ -0,0 +1,115 @@
+"""
+Tests for the Rocket Blast-off parameter sweep (tools/sweep_rocket.py).
+
+The sweep must read shakes through the game's own ShakeMeter and fly its own
+Rocket physics, so its verdicts carry over to the toy, and the NumPy path
+must agree with it exactly.
+
+Runs on desktop CPython — no Raspberry Pi required.
+Run from the project root:  python3 -m unittest tests.test_sweep_rocket
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+sys.modules.setdefault("machine", MagicMock())
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tools"))
+import sweep_rocket  # noqa: E402
+from games import rocket_blast  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def _current(**changes):
+    combo = {name: getattr(rocket_blast, name) for name in sweep_rocket.PARAMS}
+    combo.update(changes)
+    return tuple(combo[name] for name in sweep_rocket.PARAMS)
+
+
+def _frames(kind):
+    return sweep_rocket._shakes(sweep_rocket._synthetic(kind))
+
+
+class SweepTest(unittest.TestCase):
+
+    def test_hard_shaking_launches_and_stillness_does_not(self):
+        (vigorous, still), = sweep_rocket.simulate(
+            [_current()], [_frames("vigorous"), _frames("still")], use_numpy=False)
+        self.assertTrue(vigorous)
+        self.assertEqual(still, [])
+
+    def test_no_thrust_never_launches(self):
+        (launches,), = sweep_rocket.simulate(
+            [_current(THRUST_SCALE=0.0)], [_frames("vigorous")], use_numpy=False)
+        self.assertEqual(launches, [])
+
+    def test_launches_wait_out_the_star_shower(self):
+        (launches,), = sweep_rocket.simulate(
+            [_current(THRUST_SCALE=0.6)], [_frames("vigorous")], use_numpy=False)
+        gaps = [b - a for a, b in zip(launches, launches[1:])]
+        self.assertTrue(gaps)
+        self.assertTrue(all(g > sweep_rocket.SHOWER_FRAMES for g in gaps))
+
+    def test_sweep_leaves_the_game_constants_alone(self):
+        before = _current()
+        sweep_rocket.simulate([_current(GRAVITY=0.5, DRAG=0.5)], [_frames("still")],
+                              use_numpy=False)
+        self.assertEqual(_current(), before)
+
+    def test_rows_rank_false_launches_last(self):
+        """A faster launch doesn't win if it also launches when it shouldn't."""
+        grid = {name: (getattr(rocket_blast, name),) for name in sweep_rocket.PARAMS}
+        grid["THRUST_SCALE"] = (0.8, 0.3)
+        rows = sweep_rocket.sweep(grid, [sweep_rocket._synthetic("vigorous")],
+                                  [sweep_rocket._synthetic("gentle")], jobs=1,
+                                  use_numpy=False)
+        self.assertEqual([r["THRUST_SCALE"] for r in rows], [0.3, 0.8])
+        self.assertEqual(rows[0]["false_launches"], 0)
+        self.assertGreater(rows[1]["false_launches"], 0)
+        self.assertLess(rows[1]["time_to_launch"], rows[0]["time_to_launch"])
+
+    def test_shakes_come_from_the_shake_meter(self):
+        """A jolt between two frames' readings still shakes, as in the game."""
+        still = [(t, 0, 0, sweep_rocket.G) for t in range(0, 660, 3)]
+        jolted = [(t, 0, 0, 3 * sweep_rocket.G if 340 < t < 360 else z)
+                  for t, _, _, z in still]
+        self.assertEqual(set(sweep_rocket._shakes(still)), {0.0})
+        self.assertGreater(max(sweep_rocket._shakes(jolted)), rocket_blast.SHAKE_DEADZONE)
+
+    def test_the_shipped_gain_is_the_calibrated_one(self):
+        shakes = [sweep_rocket._synthetic(k) for k in sweep_rocket.SYNTHETIC_SHAKE]
+        self.assertAlmostEqual(sweep_rocket.calibrate(shakes), rocket_blast.SHAKE_GAIN,
+                               delta=0.005)
+
+    @unittest.skipUnless(sweep_rocket.numpy, "NumPy not installed")
+    def test_numpy_matches_rocket_step(self):
+        combos = [_current(), _current(THRUST_SCALE=0.4, DRAG=0.9),
+                  _current(SHAKE_DEADZONE=0.1, GRAVITY=0.18)]
+        traces = [_frames(k) for k in ("gentle", "vigorous", "knocked")]
+        self.assertEqual(sweep_rocket.simulate(combos, traces, use_numpy=True),
+                         sweep_rocket.simulate(combos, traces, use_numpy=False))
+
+    def test_command_line_sweep_over_a_process_pool(self):
+        out_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, out_dir)
+        out = os.path.join(out_dir, "sweep.json")
+        proc = subprocess.run(
+            [sys.executable, os.path.join(ROOT, "tools", "sweep_rocket.py"),
+             "--grid", "THRUST_SCALE=0.2:0.4:0.1", "--grid", "DRAG=0.87,0.9",
+             "--jobs", "2", "--json", out],
+            cwd=ROOT, capture_output=True, text=True, timeout=120)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        with open(out) as f:
+            rows = json.load(f)["rows"]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual({r["THRUST_SCALE"] for r in rows}, {0.2, 0.3, 0.4})
+
+
+if __name__ == "__main__":
+    unittest.main()
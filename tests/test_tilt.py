@@ -9,41 +9,17 @@ Runs on desktop CPython with hardware stubs.
 Run from the project root:  python3 -m unittest tests.test_tilt
 """
 
+import math
+import random
 import sys
-import types
 import unittest
 from unittest.mock import MagicMock, patch
 
-# ── Fake time module (installed before tilt is imported) ──────────────────────
-class _FakeClock:
-    STEP_MS = 33
-
-    def __init__(self):
-        self._ms = 0
-
-    def reset(self):
-        self._ms = 0
-
-    def ticks_ms(self):
-        return self._ms
-
-    def ticks_diff(self, a, b):
-        return a - b
-
-    def sleep_ms(self, ms):
-        self._ms += ms
-
-
-_clock = _FakeClock()
-_fake_time = types.ModuleType("time")
-_fake_time.ticks_ms = _clock.ticks_ms
-_fake_time.ticks_diff = _clock.ticks_diff
-_fake_time.sleep_ms = _clock.sleep_ms
-sys.modules["time"] = _fake_time
-
 sys.modules.setdefault("machine", MagicMock())
 
 from games import tilt  # noqa: E402
+from lib import clock, display  # noqa: E402
+from lib.compositor import Compositor  # noqa: E402
 
 
 class TiltBallTest(unittest.TestCase):
@@ -210,6 +186,101 @@ class TiltBallTest(unittest.TestCase):
         self.assertFalse(ball.step(0.0, 0.0))
 
 
+_COUNTS_PER_G = 4096   # KX134 at ±8 g
+
+
+def _play_trace(seed, frames=3000):
+    """
+    A seeded accelerometer trace (raw X/Y counts) in the shapes seen in play:
+    sitting on a table (noise inside the deadzone), slow sloshing tilts, the
+    toy tipped and held, and vigorous shaking.
+    """
+    rnd = random.Random(seed)
+    trace = []
+    while len(trace) < frames:
+        kind = rnd.choice(("still", "slosh", "tip", "shake"))
+        n = rnd.randint(30, 300)
+        if kind == "still":
+            trace += [(rnd.randint(-120, 120), rnd.randint(-120, 120)) for _ in range(n)]
+        elif kind == "slosh":
+            gx, gy, f = rnd.uniform(-1, 1), rnd.uniform(-1, 1), rnd.uniform(0.01, 0.2)
+            trace += [(int(_COUNTS_PER_G * gx * math.sin(f * i)) + rnd.randint(-60, 60),
+                       int(_COUNTS_PER_G * gy * math.cos(f * i)) + rnd.randint(-60, 60))
+                      for i in range(n)]
+        elif kind == "tip":
+            x, y = rnd.randint(-4096, 4096), rnd.randint(-4096, 4096)
+            trace += [(x + rnd.randint(-40, 40), y + rnd.randint(-40, 40)) for _ in range(n)]
+        else:
+            trace += [(rnd.randint(-12000, 12000), rnd.randint(-12000, 12000))
+                      for _ in range(n)]
+    return trace[:frames]
+
+
+def _near_half(v, tol):
+    """True if v is within tol of a pixel rounding boundary (k + 0.5)."""
+    return abs(v - math.floor(v) - 0.5) < tol
+
+
+class FixedTiltBallTest(unittest.TestCase):
+    """FixedTiltBall (what run() uses) against the float TiltBall reference."""
+
+    TIE_PX = 0.005   # float position this close to k + 0.5 may round either way
+
+    def test_matches_float_ball_over_play_traces(self):
+        """Side by side over recorded-style play, every observable agrees.
+
+        Bounces and colour match on every frame. The drawn pixel and activity
+        flag may only differ on frames where the float value itself sits on a
+        rounding/threshold tie, and the two positions never drift apart.
+        """
+        frames = 0
+        for seed in range(12):
+            ref, fixed = tilt.TiltBall(), tilt.FixedTiltBall()
+            for raw_x, raw_y in _play_trace(seed):
+                frames += 1
+                bounced = ref.step(*tilt.sensor_to_tilt(raw_x / _COUNTS_PER_G,
+                                                        raw_y / _COUNTS_PER_G))
+                self.assertEqual(fixed.step(*tilt.sensor_to_tilt_raw(raw_x, raw_y)),
+                                 bounced, f"bounce, seed {seed} frame {frames}")
+                self.assertEqual(fixed.colour(), ref.colour())
+                self.assertLess(abs(fixed.x / tilt.ONE - ref.x), self.TIE_PX)
+                self.assertLess(abs(fixed.y / tilt.ONE - ref.y), self.TIE_PX)
+
+                (rx, ry), (fx, fy) = ref.pixel(), fixed.pixel()
+                self.assertTrue(rx == fx or _near_half(ref.x, self.TIE_PX))
+                self.assertTrue(ry == fy or _near_half(ref.y, self.TIE_PX))
+                speed = math.hypot(ref.vx, ref.vy)
+                self.assertTrue(ref.is_moving() == fixed.is_moving()
+                                or abs(speed - tilt.ACTIVITY_SPEED) < 0.001)
+        self.assertEqual(frames, 12 * 3000)
+
+    def test_deadzone_matches_float(self):
+        """sensor_to_tilt_raw drops exactly the counts sensor_to_tilt drops."""
+        for raw in range(-400, 401):
+            ax, ay = tilt.sensor_to_tilt(raw / _COUNTS_PER_G, 0.0)
+            rax, ray = tilt.sensor_to_tilt_raw(raw, 0)
+            self.assertEqual(ay == 0.0, ray == 0, raw)
+
+    def test_coasting_ball_comes_to_rest(self):
+        """With the toy level the fixed-point velocity reaches exactly zero."""
+        ball = tilt.FixedTiltBall()
+        ball.step(2000, -1500)
+        for _ in range(300):
+            ball.step(0, 0)
+        self.assertEqual((ball.vx, ball.vy), (0, 0))
+        self.assertFalse(ball.is_moving())
+
+    def test_state_stays_integer_and_small(self):
+        """Full-scale shaking keeps every value an int well inside 31 bits."""
+        ball = tilt.FixedTiltBall()
+        for i in range(200):
+            s = 32767 if (i // 7) % 2 else -32768
+            ball.step(s, -s)
+            for v in (ball.x, ball.y, ball.vx, ball.vy):
+                self.assertIsInstance(v, int)
+                self.assertLess(abs(v) * 32, 2 ** 30)   # products use n <= 32
+
+
 class SensorOrientationTest(unittest.TestCase):
     """The KX134 is mounted rotated 90° vs the display; sensor_to_tilt fixes it.
 
@@ -249,8 +320,10 @@ def _make_graphics():
 
 
 def _make_kx(x=0.0, y=0.0):
+    """A KX134 stub reading a steady tilt of x/y g (as floats and raw counts)."""
     kx = MagicMock()
     kx.read_xy.return_value = (x, y)
+    kx.read_xy_raw.return_value = (int(x * _COUNTS_PER_G), int(y * _COUNTS_PER_G))
     return kx
 
 
@@ -276,10 +349,161 @@ class _RecordingGraphics:
         pass
 
 
+class TrailTest(unittest.TestCase):
+    """The ring-buffer trail draws what the old list-of-positions trail drew."""
+
+    @staticmethod
+    def _reference(entries):
+        """Old renderer: oldest first, factor (i + 1) / (n + 1)."""
+        g = _RecordingGraphics()
+        n = len(entries)
+        for i, (x, y, c) in enumerate(entries):
+            f = tilt.TRAIL_MAX_BRIGHT * (i + 1) / (n + 1)
+            r, gr, b = tilt.COLOURS[c]
+            g.set_pen((int(r * f), int(gr * f), int(b * f)))
+            for dx in (0, 1):
+                for dy in (0, 1):
+                    g.pixel(15 - x - dx, 15 - y - dy)
+        return g.drawn
+
+    @staticmethod
+    def _screen(length):
+        """A trail drawn each frame onto one compositor over a recording stub."""
+        g = _RecordingGraphics()
+        comp = Compositor(g)
+        return tilt.Trail(length), comp, tilt._trail_pens(comp, length), g
+
+    @staticmethod
+    def _outside_ball(drawn, x, y):
+        """Drop the pixels the ball (at logical x, y) is about to cover."""
+        ball = {(15 - x - dx, 15 - y - dy) for dx in (0, 1) for dy in (0, 1)}
+        return {p: c for p, c in drawn.items() if p not in ball and c != (0, 0, 0)}
+
+    def test_full_trail_matches_list_renderer(self):
+        rnd = random.Random(7)
+        for length in (tilt.TRAIL_LEN, 40):
+            trail, comp, pens, g = self._screen(length)
+            entries = []
+            x, y = 7, 7
+            for _ in range(300):
+                if rnd.random() < 0.6:   # sit still for a frame or move a pixel
+                    x = min(13, max(1, x + rnd.choice((-1, 1))))
+                    y = min(13, max(1, y + rnd.choice((-1, 0, 1))))
+                c = rnd.choice((0, 0, 0, 2))
+                trail.push(x, y, c)
+                trail.draw(comp, pens)
+                comp.present()
+                entries = (entries + [(x, y, c)])[-length:]
+                if len(entries) == length:
+                    self.assertEqual(self._outside_ball(g.drawn, x, y),
+                                     self._outside_ball(self._reference(entries), x, y))
+
+    def test_keeps_only_the_last_length_frames(self):
+        trail, comp, pens, g = self._screen(4)
+        for x in range(1, 10):
+            trail.push(x, 1, 0)
+            trail.draw(comp, pens)
+            comp.present()
+        self.assertEqual(len(trail), 4)
+        lit = {15 - px for (px, _py), c in g.drawn.items() if c != (0, 0, 0)}
+        self.assertEqual(lit, {6, 7, 8})        # 9 is the ball's, 5 has dropped off
+
+    def test_no_stale_cells_after_the_frame_count_wraps(self):
+        trail, comp, pens, g = self._screen(tilt.TRAIL_LEN)
+        x, y, dx, dy = 1, 1, 1, 1
+        recent = []
+        for frame in range(65700):              # past the 16-bit frame stamps
+            if not 1 <= x + dx <= 13:
+                dx = -dx
+            if not 1 <= y + dy <= 13:
+                dy = -dy
+            x += dx
+            y += dy if x % 3 else 0             # a diagonal that drifts off its line
+            trail.push(x, y, 0)
+            trail.draw(comp, pens)
+            recent = (recent + [(x, y)])[-tilt.TRAIL_LEN:]
+            if frame >= 65500:
+                comp.present()
+                trail_cells = {(15 - bx - i, 15 - by - j)
+                               for bx, by in recent for i in (0, 1) for j in (0, 1)}
+                lit = {p for p, c in g.drawn.items() if c != (0, 0, 0)}
+                self.assertLessEqual(lit, trail_cells, frame)
+
+    def test_resting_ball_draws_nothing(self):
+        """A long trail behind a still ball draws nothing but the ball's own run."""
+        trail, comp, pens, _g = self._screen(256)
+        comp.background = MagicMock()
+        for _ in range(1000):
+            trail.push(5, 5, 1)
+            trail.draw(comp, pens)
+        comp.background.assert_not_called()
+
+    def test_moving_ball_cost_does_not_grow_with_length(self):
+        """Each frame repaints only the cells crossing a fade step."""
+        cost = {}
+        for length in (32, 1024):
+            trail, comp, pens, _g = self._screen(length)
+            comp.background = MagicMock()
+            x, dx = 1, 1
+            for _ in range(3000):
+                if not 1 <= x + dx <= 13:
+                    dx = -dx
+                x += dx
+                trail.push(x, 3 + x % 4, 0)
+                trail.draw(comp, pens)
+            self.assertLessEqual(len(trail._steps), tilt.TRAIL_LEVELS + 1)
+            cost[length] = comp.background.call_count / 3000
+        self.assertLess(cost[1024], 2 * cost[32])
+
+
+class AntiAliasTest(unittest.TestCase):
+    """The ball's brightness is split across pixels by its sub-pixel position."""
+
+    def _levels(self, x, y):
+        """{(x, y): coverage level} put for a red ball at float position (x, y)."""
+        comp = MagicMock()
+        pens = list(range(len(tilt.COLOURS) * (tilt.AA_LEVELS + 1)))
+        tilt._put_ball(comp, int(x * tilt.ONE), int(y * tilt.ONE), pens, 0)
+        return {(c.args[0], c.args[1]): c.args[2] for c in comp.put.call_args_list}
+
+    def test_whole_pixel_position_is_a_solid_block(self):
+        full = tilt.AA_LEVELS
+        self.assertEqual(self._levels(7.0, 7.0),
+                         {(7, 7): full, (8, 7): full, (7, 8): full, (8, 8): full})
+
+    def test_half_pixel_splits_the_edge_pixels(self):
+        half = tilt.AA_LEVELS // 2
+        levels = self._levels(7.5, 7.0)
+        self.assertEqual(levels[(7, 7)], half)
+        self.assertEqual(levels[(8, 7)], tilt.AA_LEVELS)
+        self.assertEqual(levels[(9, 7)], half)
+        self.assertNotIn((10, 7), levels)
+
+    def test_weights_keep_the_ball_brightness(self):
+        """Every sub-pixel position lights the same total as the 2x2 block (±rounding)."""
+        for fx in range(tilt.AA_STEPS):
+            for fy in range(tilt.AA_STEPS):
+                total = sum(tilt._AA[(fx * tilt.AA_STEPS + fy) * 9:][:9])
+                self.assertLessEqual(abs(total - 4 * tilt.AA_LEVELS), 2)
+
+    def test_slow_roll_changes_the_picture_every_step(self):
+        """A roll of one sub-pixel step is visible, unlike the old rounded block."""
+        step = 1.0 / tilt.AA_STEPS
+        frames = [self._levels(5.0 + i * step, 7.0) for i in range(tilt.AA_STEPS + 1)]
+        for before, after in zip(frames, frames[1:]):
+            self.assertNotEqual(before, after)
+
+    def test_ball_never_covers_the_border(self):
+        for pos in (tilt.MIN_POS, tilt.MAX_POS, tilt.MAX_POS - 0.01, tilt.MIN_POS + 0.01):
+            for cell in self._levels(pos, pos):
+                self.assertTrue(all(1 <= v <= 14 for v in cell), cell)
+
+
 class TiltRunTest(unittest.TestCase):
 
     def setUp(self):
-        _clock.reset()
+        self.clock = clock.VirtualClock()
+        self.addCleanup(clock.use, clock.use(self.clock))
         self.su = MagicMock()
         self.graphics = _make_graphics()
         self._sound_patcher = patch.object(tilt, "sound", MagicMock())
@@ -334,7 +558,7 @@ class TiltRunTest(unittest.TestCase):
     def test_ball_drawn_as_2x2_block(self):
         """One frame draws the ball's four pixels around the centre."""
         drawn = []
-        with patch.object(tilt.display, "pixel",
+        with patch.object(display, "pixel",
                            side_effect=lambda _g, x, y: drawn.append((x, y))):
             tilt.run(self.su, self.graphics, _make_kx(), should_exit=self._exit_after(1))
         for px in [(7, 7), (8, 7), (7, 8), (8, 8)]:
@@ -345,7 +569,7 @@ class TiltRunTest(unittest.TestCase):
     def test_ball_leaves_a_fading_trail(self):
         """A moving ball draws dimmed pixels behind it (a fading trail)."""
         drawn = []
-        with patch.object(tilt.display, "pixel",
+        with patch.object(display, "pixel",
                            side_effect=lambda _g, x, y: drawn.append((x, y))):
             # Roll steadily in one direction for several frames.
             tilt.run(self.su, self.graphics, _make_kx(x=0.4),
@@ -378,8 +602,9 @@ class TiltRunTest(unittest.TestCase):
             calls[0] += 1
             # Reverse the tilt every 10 frames so the ball sloshes across the
             # display, staying above the activity threshold like real play.
-            return (0.6 if (calls[0] // 10) % 2 == 0 else -0.6, 0.0)
-        kx.read_xy.side_effect = read_xy
+            g = 0.6 if (calls[0] // 10) % 2 == 0 else -0.6
+            return (int(g * _COUNTS_PER_G), 0)
+        kx.read_xy_raw.side_effect = read_xy
         with patch.object(tilt, "STILL_SLEEP_MS", 200):
             result = tilt.run(self.su, self.graphics, kx,
                               should_exit=self._exit_after(60))
@@ -0,0 +1,119 @@
+"""
+Behavioural tests for the multi-ball Tilt Game (games/tilt_multi.py).
+
+Balls move through a 16x16 occupancy grid: they must never overlap each other
+or the obstacle blocks, bounce off blocks like walls, and swap velocities when
+they collide (equal-mass elastic collision).
+
+Runs on desktop CPython with hardware stubs.
+Run from the project root:  python3 -m unittest tests.test_tilt_multi
+"""
+
+import random
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+from lib import clock
+from tests import standins
+
+sys.modules.setdefault("machine", MagicMock())
+
+from games import tilt, tilt_multi  # noqa: E402
+
+
+def _occupied(world):
+    """Logical cells covered by each ball, by ball number."""
+    cells = {}
+    for n, ball in enumerate(world.balls, 1):
+        px, py = ball.pixel()
+        cells[n] = {(px + dx, py + dy) for dx in (0, 1) for dy in (0, 1)}
+    return cells
+
+
+class MultiBallTest(unittest.TestCase):
+
+    def test_balls_start_apart_and_off_the_obstacles(self):
+        world = tilt_multi.MultiBall(8)
+        cells = _occupied(world)
+        every = [c for n in cells for c in cells[n]]
+        self.assertEqual(len(every), len(set(every)))
+        for x, y in every:
+            self.assertNotEqual(world.grid[x * 16 + y], tilt_multi.OBSTACLE)
+
+    def test_shaking_never_overlaps_anything(self):
+        """Under violent random tilt, balls stay apart and out of the blocks."""
+        world = tilt_multi.MultiBall(12)
+        rnd = random.Random(5)
+        for _ in range(2000):
+            world.step(rnd.randint(-12000, 12000), rnd.randint(-12000, 12000))
+            cells = _occupied(world)
+            for n, mine in cells.items():
+                for x, y in mine:
+                    self.assertEqual(world.grid[x * 16 + y], n)
+            every = [c for n in cells for c in cells[n]]
+            self.assertEqual(len(every), len(set(every)))
+
+    def test_obstacle_bounces_the_ball_back(self):
+        world = tilt_multi.MultiBall(0, obstacles=((8, 4, 2, 8),))
+        world.balls.append(tilt.FixedTiltBall(5, 6))
+        world._mark(1, 5, 6)
+        world.balls[0].vx = tilt.ONE            # 1 px/frame up, into the block
+        for _ in range(5):
+            world.step(0, 0)
+        self.assertLess(world.balls[0].vx, 0)
+        self.assertLessEqual(world.balls[0].pixel()[0], 6)
+
+    def test_head_on_collision_swaps_velocities(self):
+        """Equal masses: the moving ball stops and the one it hits moves on."""
+        world = tilt_multi.MultiBall(0, obstacles=())
+        for n, y in enumerate((3, 6), 1):
+            world.balls.append(tilt.FixedTiltBall(7, y))
+            world._mark(n, 7, y)
+        mover, target = world.balls
+        mover.vy = tilt.ONE
+        loud = False
+        for _ in range(4):
+            loud |= world.step(0, 0)
+        self.assertGreater(target.vy, 0)
+        self.assertLess(abs(mover.vy), target.vy)
+        self.assertTrue(loud)
+
+    def test_too_many_balls_is_an_error(self):
+        with self.assertRaises(ValueError):
+            tilt_multi.MultiBall(60)
+
+    def test_bench_reports_every_count(self):
+        self.addCleanup(clock.use, clock.use(standins.VirtualClock(follow_host=True)))
+        results = tilt_multi.bench((1, 4), frames=20)
+        self.assertEqual([n for n, _us in results], [1, 4])
+
+
+class MultiRunTest(unittest.TestCase):
+
+    def test_run_returns_exit_when_signalled(self):
+        kx = MagicMock()
+        kx.read_xy_raw.return_value = (4096, 0)
+        calls = [0]
+
+        def should_exit():
+            calls[0] += 1
+            return calls[0] > 30
+
+        self.addCleanup(clock.use, clock.use(clock.VirtualClock()))
+        with patch.object(tilt_multi, "sound", MagicMock()):
+            result = tilt_multi.run(MagicMock(), standins.PicoGraphics(), kx,
+                                    should_exit=should_exit, balls=4)
+        self.assertEqual(result, tilt_multi.EXIT)
+
+    def test_run_sleeps_when_everything_settles(self):
+        kx = MagicMock()
+        kx.read_xy_raw.return_value = (0, 0)
+        self.addCleanup(clock.use, clock.use(clock.VirtualClock()))
+        with patch.object(tilt, "STILL_SLEEP_MS", 300):
+            result = tilt_multi.run(MagicMock(), standins.PicoGraphics(), kx, balls=2)
+        self.assertEqual(result, tilt_multi.SLEEP)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+"""
+Tests for accelerometer traces (lib/trace.py) and their desktop replay
+(tools/replay_trace.py).
+
+The recorder must pass readings through untouched and keep the most recent
+ones in its flash ring; a replay must drive the unmodified games faster than
+real time and report what their physics did.
+
+Runs on desktop CPython — no Raspberry Pi required.
+Run from the project root:  python3 -m unittest tests.test_trace
+"""
+
+import json
+import math
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from tests import standins
+
+sys.modules.setdefault("machine", standins._machine_module(standins.Bus()))
+
+from lib import clock, trace  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+REPLAY = os.path.join(ROOT, "tools", "replay_trace.py")
+G = 4096   # counts per g
+
+
+class _CountingKX:
+    """Reads (i, -i, 4096 + i) on the i-th call."""
+
+    def __init__(self):
+        self.i = 0
+
+    def read_xyz_raw(self):
+        self.i += 1
+        return self.i, -self.i, G + self.i
+
+
+class _BufferedKX(_CountingKX):
+    """Buffers three samples, (i, -i, 4096 + i) each, between buffer reads."""
+
+    def enable_buffer(self):
+        self.enabled = True
+
+    def disable_buffer(self):
+        self.enabled = False
+
+    def buffered(self):
+        return 3
+
+    def read_buffer(self, buf):
+        for k in range(3):
+            struct.pack_into("<hhh", buf, 6 * k, *self.read_xyz_raw())
+        return 3
+
+
+class RecorderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, "trace.kxt")
+        self.clock = clock.VirtualClock()
+        self.addCleanup(clock.use, clock.use(self.clock))
+
+    def _record(self, reads, capacity=100, block=8):
+        rec = trace.Recorder(_CountingKX(), self.path, capacity, block)
+        for _ in range(reads):
+            rec.read_xyz_raw()
+            self.clock.advance_ms(33)
+        rec.close()
+        return trace.load(self.path)
+
+    def test_readings_pass_through_unchanged(self):
+        rec = trace.Recorder(_CountingKX(), self.path, 10, 4)
+        self.assertEqual(rec.read_xyz_raw(), (1, -1, G + 1))
+        self.assertEqual(rec.read_xy_raw(), (2, -2))
+        self.assertEqual(rec.read_xyz(), (3 / G, -3 / G, (G + 3) / G))
+        self.assertEqual(rec.read_xy(), (4 / G, -4 / G))
+        rec.close()
+
+    def test_round_trip(self):
+        samples = self._record(20)
+        self.assertEqual(samples, [(33 * (i - 1), i, -i, G + i) for i in range(1, 21)])
+
+    def test_ring_keeps_the_most_recent_readings(self):
+        samples = self._record(53, capacity=10, block=4)
+        self.assertEqual([s[1] for s in samples], list(range(44, 54)))
+
+    def test_file_is_preallocated_and_never_grows(self):
+        self._record(5, capacity=50)
+        size = os.path.getsize(self.path)
+        self.assertEqual(size, trace.HEADER_SIZE + 50 * trace.RECORD_SIZE)
+        self._record(500, capacity=50)
+        self.assertEqual(os.path.getsize(self.path), size)
+
+    def test_a_new_recording_replaces_the_old_one(self):
+        self._record(30)
+        self.assertEqual(len(self._record(3)), 3)
+
+    def test_buffered_samples_are_recorded_at_their_read(self):
+        kx = _BufferedKX()
+        rec = trace.Recorder(kx, self.path, 100, 8)
+        rec.enable_buffer()
+        self.assertTrue(kx.enabled)
+        buf = bytearray(6 * 4)
+        for _ in range(2):
+            self.assertEqual(rec.buffered(), 3)
+            self.assertEqual(rec.read_buffer(buf), 3)
+            self.clock.advance_ms(33)
+        self.assertEqual(struct.unpack_from("<hhh", buf, 12), (6, -6, G + 6))
+        rec.disable_buffer()
+        self.assertFalse(kx.enabled)
+        rec.close()
+        self.assertEqual(trace.load(self.path),
+                         [(33 * ((i - 1) // 3), i, -i, G + i) for i in range(1, 7)])
+
+    def test_save_and_load_agree(self):
+        samples = [(0, 1, 2, 3), (33, -4, 5, -6)]
+        trace.save(self.path, samples)
+        self.assertEqual(trace.load(self.path), samples)
+
+
+def _samples(seconds, reading):
+    """A trace at 30 Hz; reading(i) gives sample i's (x, y, z) counts."""
+    return [(i * 33, *reading(i)) for i in range(int(seconds * 1000) // 33)]
+
+
+def _fifo_samples(seconds, reading):
+    """A trace of the 400 Hz sample buffer, read every 33 ms frame."""
+    return [(i * 5 // 2 // 33 * 33, *reading(i)) for i in range(int(seconds * 400))]
+
+
+class ReplayTest(unittest.TestCase):
+    """Replays run in their own process: the stand-ins replace time and machine."""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def _replay(self, game, samples, *settings):
+        path = os.path.join(self.dir, "t.kxt")
+        out = os.path.join(self.dir, "out.json")
+        trace.save(path, samples)
+        args = [sys.executable, REPLAY, game, path, "--json", out]
+        for s in settings:
+            args += ["--set", s]
+        proc = subprocess.run(args, cwd=ROOT, capture_output=True, text=True, timeout=120)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        with open(out) as f:
+            return json.load(f)["outcomes"][0]
+
+    def test_tilting_back_and_forth_bounces_the_ball(self):
+        slosh = _samples(6, lambda i: ((G * 8 // 10) * (1 if (i // 45) % 2 else -1), 0, G))
+        outcome = self._replay("tilt", slosh)
+        self.assertEqual(outcome["result"], "exit")
+        self.assertGreater(outcome["bounces"], 2)
+        self.assertGreater(outcome["speedup"], 1)
+        self.assertAlmostEqual(outcome["sim_s"], 6, delta=0.2)
+
+    def test_level_toy_leaves_the_ball_still(self):
+        outcome = self._replay("tilt", _samples(2, lambda i: (0, 0, G)))
+        self.assertEqual(outcome["bounces"], 0)
+        self.assertEqual(outcome["distance"], 0)
+
+    def test_shaking_launches_the_rocket(self):
+        shake = _samples(8, lambda i: (0, 0, 3 * G * (1 if i % 2 else -1)))
+        outcome = self._replay("rocket", shake)
+        self.assertGreaterEqual(outcome["launches"], 1)
+        self.assertGreaterEqual(outcome["whooshes"], 1)
+
+    def test_a_buffered_shake_replays_through_the_shake_meter(self):
+        shake = _fifo_samples(8, lambda i: (0, 0, int(G * (1 + 2 * math.sin(i * math.pi / 40)))))
+        outcome = self._replay("rocket", shake)
+        self.assertGreaterEqual(outcome["launches"], 1)
+        self.assertGreater(outcome["buffered_samples"], len(shake) * 0.9)
+        calm = _fifo_samples(4, lambda i: (0, 0, G))
+        self.assertEqual(self._replay("rocket", calm)["max_height"], 7.0)
+
+    def test_settings_change_the_outcome(self):
+        shake = _samples(8, lambda i: (0, 0, 3 * G * (1 if i % 2 else -1)))
+        outcome = self._replay("rocket", shake, "THRUST_SCALE=0.0")
+        self.assertEqual(outcome["launches"], 0)
+        self.assertEqual(outcome["max_height"], 7.0)
+
+    def test_tilt_settings_reach_the_fixed_point_physics(self):
+        slosh = _samples(3, lambda i: (G // 2, 0, G))
+        fast = self._replay("tilt", slosh, "ACCEL_SCALE=0.3")
+        slow = self._replay("tilt", slosh, "ACCEL_SCALE=0.05")
+        self.assertGreater(fast["max_speed"], slow["max_speed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
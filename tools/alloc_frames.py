@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Heap allocated per frame by every animation and game, measured with
+tracemalloc against the hardware stand-ins.
+
+Each animation's frames() is played to its end (or --frames frames) and
+each game is played with a moving KX134 — the Tilt Games tipped in circles,
+Rocket Blast-off shaken hard enough to launch — for --game-frames frames.
+Every step of the generator is measured:
+
+  temp  the most in use at once during the frame, above where it started
+        (the garbage it makes, which MicroPython has to collect)
+  kept  how much more is in use after the last frame than after the first,
+        per frame (anything but 0 is a leak, or a cache filling up)
+
+The first frame, which sets the animation up, is reported on its own (its
+setup is what it leaves allocated); the table is over the frames after it.
+Frames are drawn on a dualcore.Surface, whose pens are plain ints as on the
+toy, so the stand-in display itself allocates nothing that lasts. CPython boxes floats and ints above 256
+where MicroPython often doesn't, so read absolute numbers as an upper bound
+and look at which frames allocate at all; on the toy, lib/memory counts the
+real thing (memory.report() from the REPL).
+
+Run from project root:  python3 tools/alloc_frames.py [NAME ...] [--frames N]
+                        [--game-frames N] [--json FILE]
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import tracemalloc
+from array import array
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from tests import standins  # noqa: E402
+
+GAMES = ("tilt", "tilt_multi", "rocket_blast")
+G = 4096   # KX134 counts per g
+
+
+def animation_names():
+    """Every module in animations/ with a frames() generator, boot first."""
+    names = sorted(f[:-3] for f in os.listdir(os.path.join(ROOT, "animations"))
+                   if f.endswith(".py") and f != "__init__.py")
+    names.remove("boot")
+    return ["boot"] + names
+
+
+def measure(gen, clock, limit, before_frame=None, overhead=0):
+    """
+    Step ``gen`` up to ``limit`` times; returns what was in use before the
+    first frame and [(in use after, temp)] per frame, temp less ``overhead``
+    (what measuring itself shows; see calibrate()). Virtual time moves on by
+    what each frame asks for.
+    """
+    # Preallocated, so keeping the readings allocates nothing per frame.
+    used = array('q', [0] * limit)
+    temps = array('q', [0] * limit)
+    n = 0
+    before = tracemalloc.get_traced_memory()[0]
+    try:
+        while n < limit:
+            if before_frame is not None:
+                before_frame(n)
+            start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            ms = next(gen)
+            used[n], peak = tracemalloc.get_traced_memory()
+            temps[n] = peak - start - overhead
+            n += 1
+            clock.advance_ms(abs(ms))
+    except StopIteration:
+        pass
+    finally:
+        gen.close()
+    return before, [(used[i], max(0, temps[i])) for i in range(n)]
+
+
+def calibrate(clock):
+    """The temp measure() sees in a frame that allocates nothing."""
+    def nothing():
+        while True:
+            yield 0
+    temps = sorted(temp for _, temp in measure(nothing(), clock, 101)[1])
+    return temps[len(temps) // 2]
+
+
+def _tipping(fake_kx):
+    def tip(n):   # around the rim once every 4 s, at 0.6 g
+        a = n * 2 * math.pi / 120
+        fake_kx.set_counts(int(0.6 * G * math.cos(a)), int(0.6 * G * math.sin(a)))
+    return tip
+
+
+def _shaking(fake_kx):
+    def shake(n):   # 5 Hz, +-2.2 g; three buffered samples a frame
+        for k in range(3):
+            t = (n * 3 + k) / 90
+            fake_kx.set_counts(0, 0, int(G * (1 + 2.2 * math.sin(2 * math.pi * 5 * t))))
+    return shake
+
+
+def summarise(frames, before):
+    """
+    The first frame (``before`` is what was in use before it), then what the
+    rest kept per frame on average and their temp's mean and max.
+    """
+    if not frames:
+        return {"frames": 0}
+    setup = frames[0][0] - before
+    rest = frames[1:] or frames
+    temps = [temp for _, temp in rest]
+    kept = (frames[-1][0] - frames[0][0]) / max(len(frames) - 1, 1)
+    return {
+        "frames": len(frames), "setup": setup, "setup_temp": frames[0][1],
+        "kept": kept, "temp_mean": sum(temps) / len(temps), "temp_max": max(temps),
+        "allocating": sum(1 for t in temps if t > 0) / len(temps),
+    }
+
+
+def run(names=None, frames=2000, game_frames=600):
+    """Measure each name (animations and games); returns {name: summary}."""
+    stand = standins.install()
+    os.chdir(ROOT)   # the sounds are loaded by relative path
+    import animations
+    from lib import dualcore, sound
+    from lib.kx134 import KX134
+    from games import tilt, tilt_multi, rocket_blast
+
+    names = names or animation_names() + list(GAMES)
+    results = {}
+    tracemalloc.start()
+    try:
+        overhead = calibrate(stand.clock)
+        for name in names:
+            su = standins.StellarUnicorn()
+            graphics = dualcore.Surface()
+            graphics.buf = array('I', [0] * dualcore.CELLS)
+            sound.disarm_gate()
+            try:
+                if name in GAMES:
+                    game = {"tilt": tilt, "tilt_multi": tilt_multi,
+                            "rocket_blast": rocket_blast}[name]
+                    kx = KX134(stand.bus)
+                    drive = _shaking(stand.kx) if name == "rocket_blast" else _tipping(stand.kx)
+                    gen, limit = game.frames(su, graphics, kx), game_frames
+                else:
+                    drive = None
+                    gen, limit = animations._load(name).frames(su, graphics, None), frames
+                before, measured = measure(gen, stand.clock, limit, drive, overhead)
+            except Exception as e:   # e.g. a sound file the animation needs is missing
+                results[name] = {"frames": 0, "error": "%s: %s" % (type(e).__name__, e)}
+                continue
+            results[name] = summarise(measured, before)
+    finally:
+        tracemalloc.stop()
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('names', nargs='*', help="animations and games (default: all)")
+    ap.add_argument('--frames', type=int, default=2000, help="most frames per animation")
+    ap.add_argument('--game-frames', type=int, default=600, help="frames per game")
+    ap.add_argument('--json', metavar='FILE')
+    args = ap.parse_args(argv)
+
+    results = run(args.names, args.frames, args.game_frames)
+    print("%-14s %6s %8s %9s %8s %8s %8s %6s" % (
+        "name", "frames", "setup", "setup tmp", "kept/f", "temp/f", "temp max", "alloc"))
+    for name, r in results.items():
+        if not r["frames"]:
+            print("%-14s %6d  %s" % (name, 0, r.get("error", "")))
+            continue
+        print("%-14s %6d %8d %9d %8.1f %8.1f %8d %5.0f%%" % (
+            name, r["frames"], r["setup"], r["setup_temp"], r["kept"],
+            r["temp_mean"], r["temp_max"], 100 * r["allocating"]))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=1)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+What the debug logging costs the input task, at each log level and stripped.
+
+Boots main.py against the hardware stand-ins, holds an Animation Button down
+and times main.poll_input() — which logs the raw port byte on every poll a
+button is held — with:
+
+  console  debug messages printed (to /dev/null here; USB serial on the toy)
+  ring     debug messages kept in the ring only (log.level(log.DEBUG))
+  default  INFO and up: each log.debug call returns after one comparison
+  stripped lib/buttons.py as tools/build_mpy.py --strip-debug leaves it
+
+Host CPython is far faster than the Pico; read the table for the ratios.
+
+Run from project root:  python3 tools/bench_logging.py [--polls N] [--button NAME]
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from tests import standins  # noqa: E402
+
+import build_mpy  # noqa: E402
+
+
+def _time_polls(poll, polls, repeat=5):
+    """Best of ``repeat`` runs, in µs per poll."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(polls):
+            poll()
+        us = (time.perf_counter() - start) * 1e6 / polls
+        best = us if best is None else min(best, us)
+    return best
+
+
+def bench(polls=20000, button='star'):
+    """Returns [(configuration, µs per poll)] in the order of the table above."""
+    stand = standins.install(follow_host=True)
+    import main
+    from lib import buttons, log
+
+    main.SAVE_BOOT_PROFILE = False
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        su, graphics, kx = main.boot()
+    app = main.App(su, graphics, kx)
+    stand.mcp.press(buttons.BUTTON_BITS[button])
+
+    def poll():
+        main.poll_input(app)
+
+    results = []
+    levels = log.set_levels()
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for name, console, ring in (('console', log.DEBUG, log.OFF),
+                                        ('ring', log.INFO, log.DEBUG),
+                                        ('default', log.INFO, log.INFO)):
+                log.set_levels(console=console, ring=ring)
+                results.append((name, _time_polls(poll, polls)))
+
+            log.set_levels(console=log.INFO, ring=log.INFO)
+            with open(buttons.__file__) as f:
+                stripped = build_mpy.strip_debug(f.read())
+            exec(compile(stripped, buttons.__file__, 'exec'), buttons.__dict__)
+            buttons.init()
+            results.append(('stripped', _time_polls(poll, polls)))
+    finally:
+        log.set_levels(*levels)
+        log.clear()
+        stand.mcp.release_all()
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('--polls', type=int, default=20000)
+    ap.add_argument('--button', default='star')
+    args = ap.parse_args(argv)
+
+    results = bench(args.polls, args.button)
+    base = dict(results)['stripped'] or 1
+    print('%-9s %10s %8s' % ('logging', 'µs/poll', 'x strip'))
+    for name, us in results:
+        print('%-9s %10.2f %8.2f' % (name, us, us / base))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Per-frame physics cost of the multi-ball Tilt Game as the ball count grows.
+
+Runs games.tilt_multi.bench() on the desktop against the hardware stand-ins.
+Host CPython is far faster than the Pico, so read the table for how the cost
+scales with the ball count; for absolute numbers run the same benchmark on
+the toy itself:
+
+  mpremote exec "import games.tilt_multi as m; m.bench()"
+
+Run from project root:  python3 tools/bench_tilt_multi.py [--frames N] [COUNT ...]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from tests import standins  # noqa: E402
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('counts', nargs='*', type=int, default=[1, 2, 4, 8, 12, 16, 24])
+    ap.add_argument('--frames', type=int, default=1000)
+    args = ap.parse_args(argv)
+
+    standins.install(follow_host=True)
+    from games import tilt_multi
+    results = tilt_multi.bench(args.counts, args.frames)
+    base = results[0][1] or 1
+    print('relative cost: ' + ', '.join(
+        '%d balls %.1fx' % (n, us / base) for n, us in results))
+
+
+if __name__ == '__main__':
+    main()
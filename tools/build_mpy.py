@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Build a deployable bundle with every module precompiled to .mpy.
+
+The Pico otherwise compiles each .py under lib/, animations/ and games/ at
+import, which costs boot time and heap. This script:
+
+  1. copies the sources to build/src/, optionally stripping debug output
+     (--strip-debug: log.debug(...) calls and tagged prints such as
+     "[BTN DEBUG] ..." are replaced by `pass`, keeping line numbers;
+     log.enabled(log.DEBUG) and module-level DEBUG = True become False);
+  2. cross-compiles them with mpy-cross into build/bundle/, next to main.py
+     (kept as source — MicroPython only runs main.py) and the sounds/ and
+     sprites/ assets;
+  3. prints a per-module size report (source, stripped, .mpy bytes);
+  4. optionally writes a frozen-module manifest for a custom firmware build
+     (--manifest), pointing at the stripped sources;
+  5. optionally checks that the stripped bundle still imports cleanly against
+     the desktop stand-ins in tests/standins.py (--check).
+
+  python3 tools/build_mpy.py --strip-debug --check
+  mpremote cp -r build/bundle/ :
+
+Run from project root. Needs mpy-cross on PATH (pip install mpy-cross) unless
+--no-mpy is given, in which case the bundle holds the stripped .py files.
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+PACKAGES = ('lib', 'animations', 'games')   # compiled to .mpy
+SCRIPTS = ('main.py',)                      # copied as source
+ASSETS = ('sounds', 'sprites')              # copied as-is
+
+# A print whose message starts with one of these tags is debug output.
+DEBUG_TAG = re.compile(r'\[[A-Z0-9 ]*DEBUG\]')
+
+MPY_MAGIC = ord('M')
+MARCH = 'armv7emsp'   # RP2350 (Pico 2 W); use armv6m for an RP2040 board
+
+
+# ── Debug stripping ───────────────────────────────────────────────────────────
+
+def _is_log_debug(node):
+    """The ``log.debug`` in a log.debug(...) call."""
+    return (isinstance(node, ast.Attribute) and node.attr == 'debug'
+            and isinstance(node.value, ast.Name) and node.value.id == 'log')
+
+
+def _is_debug_enabled(node):
+    """A ``log.enabled(log.DEBUG)`` call."""
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+            and node.func.attr == 'enabled' and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == 'log' and len(node.args) == 1
+            and isinstance(node.args[0], ast.Attribute) and node.args[0].attr == 'DEBUG'
+            and isinstance(node.args[0].value, ast.Name) and node.args[0].value.id == 'log')
+
+
+def _is_debug_print(node):
+    if not (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)):
+        return False
+    call = node.value
+    if _is_log_debug(call.func):
+        return True
+    if not (isinstance(call.func, ast.Name) and call.func.id == 'print' and call.args):
+        return False
+    first = call.args[0]
+    if isinstance(first, ast.JoinedStr):
+        first = first.values[0] if first.values else None
+    return (isinstance(first, ast.Constant) and isinstance(first.value, str)
+            and DEBUG_TAG.match(first.value) is not None)
+
+
+def _removable(node):
+    """Debug prints, and ifs that hold nothing but debug prints."""
+    if _is_debug_print(node):
+        return True
+    return (isinstance(node, ast.If) and not node.orelse
+            and all(_removable(n) for n in node.body))
+
+
+def _debug_statements(tree):
+    """
+    Outermost removable statements, in source order, and the
+    log.enabled(log.DEBUG) calls outside them.
+    """
+    found = []
+    checks = []
+
+    def visit(body):
+        for node in body:
+            if _removable(node):
+                found.append(node)
+                continue
+            for field in ('body', 'orelse', 'finalbody', 'handlers'):
+                visit(getattr(node, field, []) or [])
+            for field in ('test', 'value'):
+                expr = getattr(node, field, None)
+                if isinstance(expr, ast.AST):
+                    checks.extend(n for n in ast.walk(expr) if _is_debug_enabled(n))
+
+    visit(tree.body)
+    return found, checks
+
+
+def strip_debug(source):
+    """
+    Return ``source`` without its debug output. Line numbers are unchanged, so
+    tracebacks from a stripped build still point at the right lines.
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+    statements, checks = _debug_statements(tree)
+    edits = [(n.lineno, n.col_offset, n.end_lineno, n.end_col_offset, 'pass')
+             for n in statements]
+    edits += [(n.lineno, n.col_offset, n.end_lineno, n.end_col_offset, 'False')
+              for n in checks]
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id == 'DEBUG'
+                and isinstance(node.value, ast.Constant) and node.value.value is True):
+            v = node.value
+            edits.append((v.lineno, v.col_offset, v.end_lineno, v.end_col_offset, 'False'))
+
+    for start, col, end, end_col, text in sorted(edits, reverse=True):
+        # Offsets are in UTF-8 bytes; splice on the encoded lines.
+        first = lines[start - 1].encode()
+        last = lines[end - 1].encode()
+        joined = (first[:col] + text.encode() + last[end_col:]).decode()
+        if end > start and not joined.endswith('\n'):
+            joined += '\n'
+        lines[start - 1:end] = [joined] + ['\n'] * (end - start)
+    stripped = ''.join(lines)
+    compile(stripped, '<stripped>', 'exec')
+    return stripped
+
+
+# ── Build ─────────────────────────────────────────────────────────────────────
+
+def _sources():
+    """Project-relative paths of every module to compile."""
+    paths = []
+    for pkg in PACKAGES:
+        for name in sorted(os.listdir(os.path.join(ROOT, pkg))):
+            if name.endswith('.py'):
+                paths.append(os.path.join(pkg, name))
+    return paths
+
+
+def find_mpy_cross(explicit=None):
+    path = explicit or shutil.which('mpy-cross')
+    if not path:
+        raise SystemExit('mpy-cross not found: pip install mpy-cross, '
+                         'pass --mpy-cross PATH, or build with --no-mpy')
+    return path
+
+
+def _copy_source(rel, src_dir, strip):
+    with open(os.path.join(ROOT, rel), encoding='utf-8') as f:
+        text = f.read()
+    if strip:
+        text = strip_debug(text)
+    out = os.path.join(src_dir, rel)
+    os.makedirs(os.path.dirname(out) or src_dir, exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return out
+
+
+def _compile(mpy_cross, src, out, march, opt):
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    cmd = [mpy_cross, '-march=' + march, '-O%d' % opt, '-o', out, src]
+    subprocess.run(cmd, check=True)
+    with open(out, 'rb') as f:
+        if f.read(1) != bytes([MPY_MAGIC]):
+            raise ValueError('%s: not an .mpy file' % out)
+
+
+def build(out_dir, strip=False, mpy_cross=None, march=MARCH, opt=0):
+    """
+    Build out_dir/src (stripped sources) and out_dir/bundle (deployable).
+
+    Returns the size report: one dict per module with 'module', 'source',
+    'stripped', 'mpy' and 'bundle' byte counts ('mpy' is None for modules
+    shipped as source).
+    """
+    src_dir = os.path.join(out_dir, 'src')
+    bundle = os.path.join(out_dir, 'bundle')
+    for d in (src_dir, bundle):
+        shutil.rmtree(d, ignore_errors=True)
+        os.makedirs(d)
+
+    report = []
+    for rel in _sources() + list(SCRIPTS):
+        src = _copy_source(rel, src_dir, strip)
+        row = {'module': rel, 'source': os.path.getsize(os.path.join(ROOT, rel)),
+               'stripped': os.path.getsize(src), 'mpy': None}
+        if rel in SCRIPTS or mpy_cross is None:
+            out = os.path.join(bundle, rel)
+            os.makedirs(os.path.dirname(out), exist_ok=True)
+            shutil.copy(src, out)
+        else:
+            out = os.path.join(bundle, rel[:-3] + '.mpy')
+            _compile(mpy_cross, src, out, march, opt)
+            row['mpy'] = os.path.getsize(out)
+        row['bundle'] = os.path.getsize(out)
+        report.append(row)
+
+    for asset in ASSETS:
+        shutil.copytree(os.path.join(ROOT, asset), os.path.join(bundle, asset))
+    return report
+
+
+def format_report(report):
+    """The size report as a table; 'bundle' is what actually ships (.mpy or .py)."""
+    fmt = '{:<28} {:>8} {:>9} {:>7} {:>7}'
+    lines = [fmt.format('module', 'source', 'stripped', 'mpy', 'bundle')]
+    for row in report:
+        mpy = '-' if row['mpy'] is None else row['mpy']
+        lines.append(fmt.format(row['module'], row['source'], row['stripped'],
+                                mpy, row['bundle']))
+    lines.append(fmt.format('total', sum(r['source'] for r in report),
+                            sum(r['stripped'] for r in report), '',
+                            sum(r['bundle'] for r in report)))
+    return '\n'.join(lines)
+
+
+def write_manifest(out_dir, include='$(PORT_DIR)/boards/manifest.py'):
+    """Write a frozen-module manifest that freezes the stripped sources."""
+    src_dir = os.path.abspath(os.path.join(out_dir, 'src'))
+    path = os.path.join(out_dir, 'manifest.py')
+    with open(path, 'w') as f:
+        f.write('# Frozen modules for the toy; build firmware with\n'
+                '#   make BOARD=... FROZEN_MANIFEST=%s\n' % os.path.abspath(path))
+        f.write('include(%r)\n' % include)
+        for pkg in PACKAGES:
+            f.write('package(%r, base_path=%r)\n' % (pkg, src_dir))
+    return path
+
+
+def check_imports(out_dir):
+    """
+    Import every bundled module under CPython with the hardware stand-ins.
+
+    Uses the stripped sources (CPython can't load .mpy) in a fresh process, so
+    the stand-in time/machine modules don't leak. Returns (ok, output).
+    """
+    src_dir = os.path.abspath(os.path.join(out_dir, 'src'))
+    modules = [rel[:-3].replace(os.sep, '.').replace('.__init__', '')
+               for rel in _sources() + list(SCRIPTS)]
+    code = ('import sys; sys.path[:0] = [%r]; sys.path.append(%r)\n'
+            'from tests import standins; standins.install()\n'
+            'import importlib\n'
+            'for m in %r:\n'
+            '    importlib.import_module(m)\n'
+            '    assert sys.modules[m].__file__.startswith(%r), m\n'
+            'print("imported", len(%r), "modules")\n'
+            % (src_dir, ROOT, modules, src_dir, modules))
+    proc = subprocess.run([sys.executable, '-c', code], cwd=out_dir,
+                          capture_output=True, text=True)
+    return proc.returncode == 0, proc.stdout + proc.stderr
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('-o', '--out', default=os.path.join(ROOT, 'build'),
+                    help='build directory (default: build/)')
+    ap.add_argument('--strip-debug', action='store_true',
+                    help='remove log.debug calls and [... DEBUG] prints, turn DEBUG checks off')
+    ap.add_argument('--no-mpy', action='store_true',
+                    help='skip mpy-cross; bundle the stripped .py files')
+    ap.add_argument('--mpy-cross', help='path to the mpy-cross binary')
+    ap.add_argument('--march', default=MARCH, help='mpy-cross -march (default: %(default)s)')
+    ap.add_argument('-O', dest='opt', type=int, default=0, help='mpy-cross optimisation level')
+    ap.add_argument('--manifest', action='store_true', help='also write build/manifest.py')
+    ap.add_argument('--report', metavar='FILE', help='write the size report as JSON')
+    ap.add_argument('--check', action='store_true',
+                    help='import the bundle against the desktop stand-ins')
+    args = ap.parse_args(argv)
+
+    mpy_cross = None if args.no_mpy else find_mpy_cross(args.mpy_cross)
+    report = build(args.out, args.strip_debug, mpy_cross, args.march, args.opt)
+    print(format_report(report))
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.manifest:
+        print('Wrote', write_manifest(args.out))
+    if args.check:
+        ok, output = check_imports(args.out)
+        print(output.rstrip())
+        if not ok:
+            sys.exit('import check FAILED')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Decode a toy's metrics dump (lib/metrics.py) into a readable report.
+
+The toy prints its metrics as one '[METRICS] <base64>' line. Either capture
+the serial output to a file and pass it here (the last such line is used),
+pipe it in on stdin, or let this script ask the toy over USB itself:
+
+  python3 tools/collect_metrics.py serial.log
+  python3 tools/collect_metrics.py --mpremote [--port /dev/ttyACM0]
+
+Counters are shown with their rate over the toy's uptime; histograms with
+their count, median, 90th and 99th percentile and maximum. Percentiles come
+from power-of-two buckets, so they are upper bounds within a factor of two.
+--json writes the decoded dump.
+
+Run from project root:  python3 tools/collect_metrics.py [FILE | - | --mpremote]
+                        [--port PORT] [--json FILE]
+"""
+
+import argparse
+import base64
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from lib import metrics  # noqa: E402
+
+PREFIX = '[METRICS] '
+DUMP_CODE = 'from lib import metrics; metrics.dump()'
+
+
+def find_dump(text):
+    """The decoded snapshot from the last dump line in ``text``."""
+    lines = [line.strip() for line in text.splitlines() if PREFIX in line]
+    if not lines:
+        raise ValueError("No %r line found" % PREFIX.strip())
+    encoded = lines[-1].split(PREFIX, 1)[1]
+    return metrics.decode(base64.b64decode(encoded))
+
+
+def fetch(port=None):
+    """Ask the toy for a dump over USB with mpremote; returns its output."""
+    cmd = ['mpremote']
+    if port:
+        cmd += ['connect', port]
+    cmd += ['exec', DUMP_CODE]
+    return subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+
+
+def bucket_upper(b):
+    """The largest value bucket ``b`` holds (the last one is open-ended)."""
+    return 0 if b == 0 else (1 << b) - 1
+
+
+def percentile(histogram, fraction):
+    """
+    An upper bound on the ``fraction`` point of a (count, max, buckets)
+    histogram: its bucket's largest value, or the maximum if that is lower
+    or the point is in the open-ended last bucket. None if it is empty.
+    """
+    count, top, buckets = histogram
+    if not count:
+        return None
+    rank = fraction * count
+    seen = 0
+    for b, n in enumerate(buckets):
+        seen += n
+        if seen >= rank:
+            break
+    if b == len(buckets) - 1:
+        return top
+    return min(bucket_upper(b), top)
+
+
+def report(dump):
+    """The report as a list of lines."""
+    seconds = dump['uptime_ms'] / 1000
+    lines = ["uptime %.1f s" % seconds, "", "%-18s %10s %10s" % ("counter", "total", "/min")]
+    for name, value in dump['counters'].items():
+        rate = value * 60 / seconds if seconds else 0.0
+        lines.append("%-18s %10d %10.1f" % (name, value, rate))
+    lines += ["", "%-18s %8s %8s %8s %8s %8s" % ("histogram", "count", "p50", "p90", "p99", "max")]
+    for name, histogram in dump['histograms'].items():
+        count, top, _ = histogram
+        if not count:
+            lines.append("%-18s %8d" % (name, 0))
+            continue
+        cells = tuple(percentile(histogram, f) for f in (0.5, 0.9, 0.99))
+        lines.append("%-18s %8d %8d %8d %8d %8d" % ((name, count) + cells + (top,)))
+    return lines
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('source', nargs='?', default='-',
+                    help="captured serial output ('-' for stdin)")
+    ap.add_argument('--mpremote', action='store_true', help="ask the toy over USB")
+    ap.add_argument('--port', help="mpremote's device (default: the first it finds)")
+    ap.add_argument('--json', metavar='FILE', help="also write the decoded dump here")
+    args = ap.parse_args(argv)
+
+    if args.mpremote:
+        text = fetch(args.port)
+    elif args.source == '-':
+        text = sys.stdin.read()
+    else:
+        with open(args.source) as f:
+            text = f.read()
+    try:
+        dump = find_dump(text)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print('\n'.join(report(dump)))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(dump, f, indent=1)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Fire random input at main.py's mode task on the hardware stand-ins and check
+the toy never leaves its mode table (lib/modes.py).
+
+main.main() runs unmodified — boot, then the input, audio, renderer and mode
+tasks — on the stand-ins (tests/standins.py) and a virtual clock whose ticks
+wrap as on the toy. A seeded player does one random thing after another: taps
+or mashes Animation Buttons, holds a game's combo, tilts or shakes the toy,
+or leaves it alone until a game settles or the toy falls asleep. Those two
+timeouts are cut to --timeout-s so a short run reaches every mode.
+
+Every event a mode handler fires is checked against modes.TRANSITIONS: it
+must come from the handler of the mode it leaves, be one the table accepts in
+that mode (a handler never fires an event its mode ignores) and land where
+the table says. At the end every table entry must have been taken, the
+counters must add up and history() must match the last moves. Prints how
+many actions and transitions a second of wall time that came to.
+
+It replaces the process's time module, so it runs in its own process.
+
+Run from project root:  python3 tools/fuzz_modes.py [--actions N] [--seed N]
+                        [--timeout-s S]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from tests import standins  # noqa: E402
+
+G = 4096   # KX134 counts per g
+
+
+class _Finished(Exception):
+    """Raised by the player to end main.main() after its last action."""
+
+
+class _Quiet:
+    """stdout for the toy: the fuzzer reports only what it checked."""
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def _player(asyncio, stand, rnd, actions, timeout_ms):
+    """``actions`` random things a child might do, then _Finished."""
+    from lib import buttons
+    bits = buttons.BUTTON_BITS
+    names = sorted(bits)
+
+    async def hold(names, seconds):
+        stand.mcp.press(*(bits[n] for n in names))
+        await asyncio.sleep_ms(int(seconds * 1000))
+        stand.mcp.release_all()
+
+    async def play():
+        for _ in range(actions):
+            await asyncio.sleep_ms(int(rnd.expovariate(1.0) * 1000))
+            r = rnd.random()
+            if r < 0.45:
+                await hold((rnd.choice(names),), rnd.uniform(0.05, 0.6))
+            elif r < 0.55:
+                await hold(rnd.sample(names, 2), rnd.uniform(0.1, 2))    # mashing
+            elif r < 0.75:
+                combo = buttons.TILT_TOGGLE_BUTTONS if r < 0.65 else buttons.ROCKET_TOGGLE_BUTTONS
+                await hold(combo, rnd.uniform(5.2, 6))
+                if rnd.random() < 0.5:   # and back out before it settles
+                    await asyncio.sleep_ms(rnd.randrange(timeout_ms // 2))
+                    await hold(combo, rnd.uniform(5.2, 6))
+            elif r < 0.85:
+                stand.kx.set_counts(rnd.randint(-G, G), rnd.randint(-G, G),
+                                    rnd.randint(-2 * G, 3 * G))          # tilt or shake
+                await asyncio.sleep_ms(rnd.randrange(100, 3000))
+                stand.kx.set_counts(0, 0)
+            else:
+                await asyncio.sleep_ms(timeout_ms + rnd.randrange(2000))   # walks away
+        raise _Finished
+    return play()
+
+
+def fuzz(actions, seed=1, timeout_ms=10000):
+    """
+    Run main.main() for ``actions`` random player actions; returns a dict of
+    what was seen. Raises AssertionError on the first broken invariant.
+    """
+    rnd = random.Random(seed)
+    stand = standins.install(start_us=rnd.randrange(standins.TICKS_PERIOD) * 1000, wrap=True)
+    os.chdir(ROOT)   # the sounds and sprites are loaded by relative path
+    with contextlib.redirect_stdout(_Quiet()):
+        import main
+        import uasyncio as asyncio
+        from games import rocket_blast, tilt
+        from lib import modes, sleep
+
+    main.SAVE_BOOT_PROFILE = False
+    sleep.SLEEP_TIMEOUT_MS = tilt.STILL_SLEEP_MS = rocket_blast.STILL_SLEEP_MS = timeout_ms
+    running = [None]   # the mode whose handler the mode task is in
+    taken = set()
+    recent = []
+
+    def checked_handler(mode, handler):
+        async def checked(app):
+            assert app.mode == mode, (modes.NAMES[app.mode], handler.__name__)
+            running[0] = mode
+            try:
+                await handler(app)
+            finally:
+                running[0] = None
+        return checked
+
+    for mode, handler in list(main._MODE_HANDLERS.items()):
+        main._MODE_HANDLERS[mode] = checked_handler(mode, handler)
+
+    def check_fires(machine):
+        fire = machine.fire
+
+        def checked_fire(event, now, cause=None):
+            old = machine.state
+            assert running[0] == old, (modes.EVENT_NAMES[event], modes.NAMES[old],
+                                       "fired outside its handler")
+            expected = modes.TRANSITIONS.get((old, event))
+            assert expected is not None, (modes.NAMES[old], modes.EVENT_NAMES[event],
+                                          "fired but ignored")
+            to = fire(event, now, cause)
+            assert to == expected, (modes.NAMES[old], modes.EVENT_NAMES[event], to)
+            assert machine.state == to and machine.since == now
+            taken.add((old, event))
+            recent.append((now, old, to, event))
+            return to
+
+        machine.fire = checked_fire
+
+    run = main.run
+
+    async def fuzz_run(app):
+        check_fires(app.modes)
+        asyncio.create_task(_player(asyncio, stand, rnd, actions, timeout_ms))
+        await run(app)
+
+    main.run = fuzz_run
+    wall = time.perf_counter()
+    with contextlib.redirect_stdout(_Quiet()):
+        try:
+            main.main()
+        except _Finished:
+            pass
+    elapsed = time.perf_counter() - wall
+
+    machine = main.app.modes
+    missing = set(modes.TRANSITIONS) - taken
+    assert not missing, sorted((modes.NAMES[s], modes.EVENT_NAMES[e]) for s, e in missing)
+    assert machine.rejected == 0
+    assert sum(machine.counts) == machine.transitions == len(recent)
+    assert machine.history() == recent[-len(machine.history()):]
+    return {"actions": actions, "transitions": machine.transitions,
+            "simulated_s": stand.clock.now_us() / 1e6, "wall_s": elapsed,
+            "frames": main.app.su.frames, "machine": machine}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('--actions', type=int, default=500)
+    ap.add_argument('--seed', type=int, default=1)
+    ap.add_argument('--timeout-s', type=float, default=10,
+                    help="sleep timeout and games' still timeout (2 min on the toy)")
+    args = ap.parse_args(argv)
+
+    result = fuzz(args.actions, args.seed, int(args.timeout_s * 1000))
+    print("%d actions, %d transitions, %d frames over %.0f s simulated in %.2f s: "
+          "%d actions/s, invariants hold" % (
+              result["actions"], result["transitions"], result["frames"],
+              result["simulated_s"], result["wall_s"],
+              result["actions"] / result["wall_s"]))
+    result["machine"].report()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Replay recorded accelerometer traces through the Tilt Game or Rocket
+Blast-off and report what the physics did.
+
+Record a trace on the toy by setting RECORD_TRACE = True in main.py and
+playing; copy trace.kxt off the device (mpremote cp :trace.kxt .). Each trace
+is fed to the unmodified game's run() through a fake KX134 against the
+hardware stand-ins. Time is virtual, so a five-minute session replays in a
+second or two, and the reading the game sees at any moment is the one that
+was recorded at that moment of play. Rocket Blast-off traces hold every
+400 Hz sample its ShakeMeter read, and replay through the same ShakeMeter.
+
+--set overrides tuning constants before the replay (tilt: ACCEL_SCALE,
+FRICTION, ...; rocket: THRUST_SCALE, GRAVITY, ...), so comparing settings
+over a library of recorded sessions is a batch job:
+
+  for s in 0.12 0.15 0.18; do
+      python3 tools/replay_trace.py tilt traces/*.kxt --set ACCEL_SCALE=$s
+  done
+
+Run from project root:  python3 tools/replay_trace.py {tilt,rocket} TRACE [TRACE ...]
+                        [--set NAME=VALUE ...] [--json FILE]
+"""
+
+import argparse
+import ast
+import json
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from tests import standins  # noqa: E402
+
+GAMES = ("tilt", "rocket")
+
+
+class TraceKX:
+    """
+    A KX134 that plays back a trace by the clock: each read returns the last
+    sample recorded at or before the current replay time, and the sample
+    buffer hands over every sample recorded since the last read_buffer(),
+    so Rocket Blast-off's ShakeMeter sees what it saw on the toy. ``finished``
+    turns True once the replay runs past the final sample.
+    """
+
+    def __init__(self, samples, clock):
+        self._samples = samples
+        self._clock = clock
+        self._start_ms = clock.now_us() // 1000 - (samples[0][0] if samples else 0)
+        self._i = 0
+        self._next = 0      # the next sample for read_buffer()
+        self.reads = 0
+        self.buffered_samples = 0
+
+    def _now(self):
+        return self._clock.now_us() // 1000 - self._start_ms
+
+    @property
+    def finished(self):
+        if not self._samples:
+            return True
+        return self._now() > self._samples[-1][0]
+
+    def read_xyz_raw(self):
+        now = self._now()
+        samples = self._samples
+        while self._i + 1 < len(samples) and samples[self._i + 1][0] <= now:
+            self._i += 1
+        self.reads += 1
+        _, x, y, z = samples[self._i]
+        return x, y, z
+
+    def read_xy_raw(self):
+        x, y, _ = self.read_xyz_raw()
+        return x, y
+
+    def read_xyz(self):
+        from lib.kx134 import COUNTS_PER_G
+        x, y, z = self.read_xyz_raw()
+        return x / COUNTS_PER_G, y / COUNTS_PER_G, z / COUNTS_PER_G
+
+    def read_xy(self):
+        x, y, _ = self.read_xyz()
+        return x, y
+
+    def enable_buffer(self):
+        """Buffer from now on: samples recorded before now are dropped, as on the toy."""
+        now = self._now()
+        samples = self._samples
+        self._next = 0
+        while self._next < len(samples) and samples[self._next][0] < now:
+            self._next += 1
+
+    def disable_buffer(self):
+        pass
+
+    def buffered(self):
+        now = self._now()
+        samples = self._samples
+        n = self._next
+        while n < len(samples) and samples[n][0] <= now:
+            n += 1
+        return n - self._next
+
+    def read_buffer(self, buf):
+        from lib.kx134 import SAMPLE_SIZE
+        n = min(self.buffered(), len(buf) // SAMPLE_SIZE)
+        for i in range(n):
+            _, x, y, z = self._samples[self._next + i]
+            struct.pack_into('<hhh', buf, i * SAMPLE_SIZE, x, y, z)
+        self._next += n
+        self.reads += 1
+        self.buffered_samples += n
+        return n
+
+
+class _Sounds:
+    """Counts sound.play() calls by file instead of playing them."""
+
+    def __init__(self):
+        self.played = {}
+
+    def play(self, su, filename):
+        self.played[filename] = self.played.get(filename, 0) + 1
+
+    def stop(self, su):
+        pass
+
+
+def _parse_settings(pairs):
+    settings = {}
+    for pair in pairs:
+        name, _, value = pair.partition('=')
+        if not value:
+            raise SystemExit("--set wants NAME=VALUE, got %r" % pair)
+        settings[name] = ast.literal_eval(value)
+    return settings
+
+
+def _apply(module, settings):
+    """Set tuning constants on a game module (re-deriving any fixed point)."""
+    if hasattr(module, 'tune'):
+        module.tune(**settings)
+        return
+    for name, value in settings.items():
+        if not name.isupper() or not hasattr(module, name):
+            raise AttributeError("not a tuning constant: %s" % name)
+        setattr(module, name, value)
+
+
+def _replay_tilt(tilt, su, graphics, kx, sounds):
+    stats = {"frames": 0, "bounces": 0, "max_speed": 0.0,
+             "distance": 0.0, "moving_frames": 0}
+
+    class Ball(tilt.FixedTiltBall):
+        def step(self, ax, ay):
+            bounced = super().step(ax, ay)
+            vx, vy = self.vx / tilt.ONE, self.vy / tilt.ONE
+            speed = (vx * vx + vy * vy) ** 0.5
+            stats["frames"] += 1
+            stats["bounces"] += bool(bounced)
+            stats["distance"] += speed
+            stats["max_speed"] = max(stats["max_speed"], speed)
+            stats["moving_frames"] += self.is_moving()
+            return bounced
+
+    real = tilt.FixedTiltBall
+    tilt.FixedTiltBall = Ball
+    try:
+        result = tilt.run(su, graphics, kx, should_exit=lambda: kx.finished)
+    finally:
+        tilt.FixedTiltBall = real
+    stats["distance"] = round(stats["distance"], 1)
+    stats["max_speed"] = round(stats["max_speed"], 3)
+    return result, stats
+
+
+def _replay_rocket(rocket_blast, su, graphics, kx, sounds):
+    from lib import log
+    stats = {"frames": 0, "launches": 0, "max_height": rocket_blast.GROUND_RX,
+             "airborne_frames": 0}
+
+    class Rocket(rocket_blast.Rocket):
+        def step(self, shake):
+            launched = super().step(shake)
+            stats["frames"] += 1
+            stats["launches"] += launched
+            stats["max_height"] = max(stats["max_height"], self.rx)
+            stats["airborne_frames"] += self.rx > rocket_blast.GROUND_RX
+            return launched
+
+    real = rocket_blast.Rocket
+    rocket_blast.Rocket = Rocket
+    levels = log.set_levels(console=log.INFO)   # telemetry prints are what this replaces
+    try:
+        result = rocket_blast.run(su, graphics, kx, should_exit=lambda: kx.finished)
+    finally:
+        rocket_blast.Rocket = real
+        log.set_levels(*levels)
+    stats["max_height"] = round(stats["max_height"], 2)
+    stats["whooshes"] = sounds.played.get(rocket_blast.LAUNCH_SOUND, 0)
+    return result, stats
+
+
+def replay(game, samples, settings=None, stand=None):
+    """
+    Replay one trace's samples through a game; returns a dict of outcomes.
+    ``stand`` is the StandIns from standins.install() (installed if None).
+    """
+    import time as host_time
+    stand = stand or standins.install()
+    from games import rocket_blast, tilt
+    module = tilt if game == "tilt" else rocket_blast
+    _apply(module, settings or {})
+
+    sounds = _Sounds()
+    real_sound = module.sound
+    module.sound = sounds
+    su = standins.StellarUnicorn()
+    graphics = standins.PicoGraphics()
+    kx = TraceKX(samples, stand.clock)
+    sim_start = stand.clock.now_us()
+    wall_start = host_time.perf_counter()
+    try:
+        if game == "tilt":
+            result, stats = _replay_tilt(tilt, su, graphics, kx, sounds)
+        else:
+            result, stats = _replay_rocket(rocket_blast, su, graphics, kx, sounds)
+    finally:
+        module.sound = real_sound
+    wall_s = host_time.perf_counter() - wall_start
+    sim_s = (stand.clock.now_us() - sim_start) / 1e6
+
+    outcome = {"game": game, "result": result, "samples": len(samples),
+               "buffered_samples": kx.buffered_samples,
+               "sim_s": round(sim_s, 2), "wall_s": round(wall_s, 3),
+               "speedup": round(sim_s / wall_s, 1) if wall_s else None}
+    outcome.update(stats)
+    return outcome
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('game', choices=GAMES)
+    ap.add_argument('traces', nargs='+')
+    ap.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                    help='override a tuning constant (repeatable)')
+    ap.add_argument('--json', metavar='FILE', help='write the outcomes here')
+    args = ap.parse_args(argv)
+
+    stand = standins.install()
+    from lib import trace
+    settings = _parse_settings(args.set)
+    outcomes = []
+    for path in args.traces:
+        stand.clock.reset()
+        outcome = replay(args.game, trace.load(path), settings, stand)
+        outcome["trace"] = path
+        outcomes.append(outcome)
+        print("[REPLAY] {}: {}".format(path, ", ".join(
+            "%s=%s" % (k, v) for k, v in outcome.items() if k not in ("trace", "game"))))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"settings": settings, "outcomes": outcomes}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Soak test: main.main() on the hardware stand-ins for simulated hours or days.
+
+A seeded player plays with the toy the way a child does, over and over: taps
+Animation Buttons (often interrupting the one playing), mashes two at once,
+holds a game's combo and tilts or shakes the toy while it runs, leaves a game
+to settle, and walks away long enough for the toy to fall asleep. The
+accelerometer always carries a little noise. The clock is virtual and jumps
+ahead whenever every task waits. Its ticks wrap at 2**30 as on the toy —
+ticks_us every ~18 minutes, and ticks_ms --wrap-in minutes into the run
+rather than after 12 days.
+
+Reported per seed:
+
+  heap    tracemalloc's high-water mark, and what was in use at the end of
+          each simulated hour (growth is the last hour's less the first's)
+  frames  frames drawn, and per animation, game or sleep the mean drawing
+          time in the first and last hour it played (its drift)
+  error   the first exception to escape any task, with the simulated time
+          it happened and the last lines the toy printed
+
+The clock is purely virtual, so a seed replays exactly, exception and all.
+Drawing times are measured on the host's clock around each frame (with
+tracemalloc's overhead, the same all run), so read drift as a ratio. Seeds
+run in parallel processes (--jobs): each installs its own stand-ins and its
+own virtual clock as lib/clock's one backend, which every module shares.
+
+How fast a seed runs depends on how busy its player keeps the toy. A
+simulated hour has taken 35-65 s here, so a day takes 15-30 minutes.
+tracemalloc costs most of that: with --no-heap the same hours took 7-12 s,
+so a day takes 3-5 minutes.
+
+Run from project root:  python3 tools/soak.py [--hours N] [--seeds N | --seed N ...]
+                        [--jobs N] [--wrap-in MIN] [--no-heap] [--json FILE]
+"""
+
+import argparse
+import collections
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+import traceback
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from tests import standins  # noqa: E402
+
+HOUR_MS = 3600 * 1000
+G = 4096          # KX134 counts per g
+NOISE = 40        # accelerometer noise, counts (~0.01 g)
+TAIL_LINES = 30   # printed lines kept for an error report
+
+
+class _Finished(Exception):
+    """Raised by the clock task to end main.main() when the time is up."""
+
+
+class _Tail:
+    """stdout for the toy: keeps the last TAIL_LINES lines and counts them."""
+
+    def __init__(self):
+        self.lines = collections.deque(maxlen=TAIL_LINES)
+        self.count = 0
+        self._partial = ''
+
+    def write(self, text):
+        *done, self._partial = (self._partial + text).split('\n')
+        self.lines.extend(done)
+        self.count += len(done)
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def _player(asyncio, stand, su, rnd, motion):
+    """The child: a coroutine pressing buttons and moving the toy, forever."""
+    from lib import buttons
+    bits = buttons.BUTTON_BITS
+    names = sorted(bits)
+
+    async def hold(names, seconds):
+        stand.mcp.press(*(bits[n] for n in names))
+        await asyncio.sleep_ms(int(seconds * 1000))
+        stand.mcp.release_all()
+
+    async def game(combo, kind):
+        await hold(combo, rnd.uniform(5.2, 6.5))
+        motion[0] = kind
+        await asyncio.sleep_ms(int(rnd.uniform(10, 600) * 1000))
+        motion[0] = "still"
+        if rnd.random() < 0.7:
+            await hold(combo, rnd.uniform(5.2, 6.5))     # toggle back out
+        else:
+            await asyncio.sleep_ms(int(rnd.uniform(100, 200) * 1000))   # settles, sleeps
+
+    async def play():
+        while True:
+            if rnd.random() < 0.15:
+                await asyncio.sleep_ms(rnd.randrange(3, 90) * 60000)    # walks away
+            else:
+                await asyncio.sleep_ms(int(rnd.expovariate(1 / 20.0) * 1000))
+            r = rnd.random()
+            if r < 0.55:
+                for _ in range(rnd.randint(1, 6)):
+                    await hold((rnd.choice(names),), rnd.uniform(0.05, 0.6))
+                    await asyncio.sleep_ms(int(rnd.uniform(0.1, 12) * 1000))
+            elif r < 0.65:
+                await hold(rnd.sample(names, 2), rnd.uniform(0.1, 3))   # mashing
+            elif r < 0.8:
+                await game(buttons.TILT_TOGGLE_BUTTONS, "tilt")
+            elif r < 0.95:
+                await game(buttons.ROCKET_TOGGLE_BUTTONS, "shake")
+            else:
+                switch = rnd.choice((su.SWITCH_BRIGHTNESS_UP, su.SWITCH_BRIGHTNESS_DOWN))
+                su.pressed.add(switch)
+                await asyncio.sleep_ms(int(rnd.uniform(0.1, 2) * 1000))
+                su.pressed.discard(switch)
+    return play()
+
+
+def _accelerometer(asyncio, fake_kx, rnd, motion):
+    """Noise always; a circling tilt or a hard shake when the player says."""
+    async def move():
+        n = 0
+        speed = 1.0
+        while True:
+            kind = motion[0]
+            x, y, z = (int(rnd.gauss(0, NOISE)) for _ in range(3))
+            if kind == "still":
+                fake_kx.set_counts(x, y, G + z)
+                await asyncio.sleep_ms(100)
+                continue
+            n += 1
+            if n % 150 == 0:
+                speed = rnd.uniform(0.3, 2.0)
+            if kind == "tilt":
+                a = n * speed * 2 * math.pi / 200
+                fake_kx.set_counts(x + int(0.6 * G * math.cos(a)),
+                                   y + int(0.6 * G * math.sin(a)), G + z)
+            else:
+                t = n / 50
+                fake_kx.set_counts(x, y, z + int(G * (1 + 2.2 * speed * math.sin(
+                    2 * math.pi * 5 * t))))
+            await asyncio.sleep_ms(20)
+    return move()
+
+
+def soak(seed=1, hours=24.0, wrap_in_min=30, heap=True):
+    """
+    Run main.main() for ``hours`` of simulated time with player ``seed``;
+    returns a dict of what was seen (see the module docstring).
+    """
+    start_us = standins.TICKS_PERIOD * 1000 - int(wrap_in_min * 60 * 1000 * 1000)
+    stand = standins.install(start_us=start_us, wrap=True)
+    os.chdir(ROOT)   # the sounds and sprites are loaded by relative path
+    if heap:
+        tracemalloc.start()
+    out = _Tail()
+    wall = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        import main
+        import uasyncio as asyncio
+        from lib import memory
+
+    main.SAVE_BOOT_PROFILE = False
+    clock = stand.clock
+    rnd = random.Random(seed)
+    motion = ["still"]
+    total_ms = int(hours * HOUR_MS)
+    hourly = []                 # (hour, heap in use, frames so far)
+    frames = {}                 # name -> {hour: [frames, us, max us]}
+    playing = ["boot"]
+    hour = [0]
+
+    track = memory.track
+
+    def tracked(name):
+        playing[0] = name
+        track(name)
+
+    def timed(gen):
+        """``gen``, timing each frame it draws on the host's clock."""
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    ms = next(gen)
+                except StopIteration as e:
+                    return e.value
+                us = int((time.perf_counter() - start) * 1e6)
+                entry = frames.setdefault(playing[0], {}).setdefault(hour[0], [0, 0, 0])
+                entry[0] += 1
+                entry[1] += us
+                if us > entry[2]:
+                    entry[2] = us
+                yield ms
+        finally:
+            gen.close()
+
+    play = main.Renderer.play
+
+    async def timed_play(renderer, gen):
+        return await play(renderer, timed(gen))
+
+    memory.track = tracked
+    main.Renderer.play = timed_play
+
+    async def keep_time():
+        done = 0
+        while done < total_ms:
+            step = min(HOUR_MS, total_ms - done)
+            await asyncio.sleep_ms(step)
+            done += step
+            hourly.append((hour[0], tracemalloc.get_traced_memory()[0] if heap else None,
+                           main.app.su.frames))
+            hour[0] += 1
+        raise _Finished
+
+    run = main.run
+
+    async def soak_run(app):
+        asyncio.create_task(_player(asyncio, stand, app.su, rnd, motion))
+        asyncio.create_task(_accelerometer(asyncio, stand.kx, rnd, motion))
+        asyncio.create_task(keep_time())
+        await run(app)
+
+    main.run = soak_run
+    error = None
+    with contextlib.redirect_stdout(out):
+        try:
+            main.main()
+        except _Finished:
+            pass
+        except Exception as e:
+            error = {"at_h": clock.now_us() / 3.6e9, "type": type(e).__name__,
+                     "message": str(e), "traceback": traceback.format_exc(),
+                     "output": list(out.lines)}
+    peak = tracemalloc.get_traced_memory()[1] if heap else None
+    if heap:
+        tracemalloc.stop()
+    return {
+        "seed": seed, "hours": clock.now_us() / 3.6e9,
+        "ms_wraps": (start_us + clock.now_us()) // 1000 // standins.TICKS_PERIOD,
+        "wall_s": time.perf_counter() - wall, "lines": out.count,
+        "frames": main.app.su.frames if main.app else 0,
+        "heap_peak": peak, "hourly": hourly,
+        "drift": _drift(frames), "modes": main.app.modes.stats() if main.app else {},
+        "error": error,
+    }
+
+
+def _drift(frames):
+    """name -> (first hour's mean us, last hour's, frames in all)."""
+    drift = {}
+    for name, hours in frames.items():
+        first, last = hours[min(hours)], hours[max(hours)]
+        drift[name] = (first[1] // first[0], last[1] // last[0],
+                       sum(h[0] for h in hours.values()))
+    return drift
+
+
+def _worker(args):
+    return soak(*args)
+
+
+def report(r):
+    """One seed's result as a list of lines."""
+    lines = ["seed %d: %.1f h simulated in %.1f s (%dx), %d frames, %d lines printed, "
+             "ticks_ms wrapped %d times" % (
+                 r["seed"], r["hours"], r["wall_s"], r["hours"] * 3600 / max(r["wall_s"], 1e-9),
+                 r["frames"], r["lines"], r["ms_wraps"])]
+    hourly = [used for _, used, _ in r["hourly"] if used is not None]
+    if r["heap_peak"] is not None:
+        if len(hourly) > 1:
+            growth = "%+d B from the first hour to the last" % (hourly[-1] - hourly[0])
+        else:
+            growth = "%d B in use at the end" % hourly[-1]
+        lines.append("  heap    high-water %d B, %s" % (r["heap_peak"], growth))
+    for name, (first, last, count) in sorted(r["drift"].items()):
+        lines.append("  %-12s %8d frames, %6d us -> %6d us (%.2fx)" % (
+            name, count, first, last, last / first if first else 1.0))
+    error = r["error"]
+    if error is None:
+        lines.append("  no exceptions")
+    else:
+        lines.append("  %s at %.2f h: %s" % (error["type"], error["at_h"], error["message"]))
+        lines += ["    " + line for line in error["traceback"].rstrip().splitlines()]
+        lines += ["  last printed:"] + ["    " + line for line in error["output"]]
+    return lines
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('--hours', type=float, default=24.0, help="simulated hours per seed")
+    ap.add_argument('--seeds', type=int, default=1, help="run seeds 1..N")
+    ap.add_argument('--seed', type=int, action='append', help="run this seed (repeatable)")
+    ap.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                    help="parallel processes")
+    ap.add_argument('--wrap-in', type=float, default=30, metavar='MIN',
+                    help="simulated minutes until ticks_ms wraps")
+    ap.add_argument('--no-heap', action='store_true', help="skip tracemalloc (about 5x faster)")
+    ap.add_argument('--json', metavar='FILE')
+    args = ap.parse_args(argv)
+
+    seeds = args.seed or list(range(1, args.seeds + 1))
+    jobs = [(seed, args.hours, args.wrap_in, not args.no_heap) for seed in seeds]
+    results = []
+    # A fresh process per seed: each installs its own stand-ins.
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(min(args.jobs, len(jobs)), maxtasksperchild=1) as pool:
+        for r in pool.imap_unordered(_worker, jobs):
+            print('\n'.join(report(r)), flush=True)
+            results.append(r)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(sorted(results, key=lambda r: r["seed"]), f, indent=1)
+    return 1 if any(r["error"] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Sweep Rocket Blast-off's physics constants over shake traces and report how
+each combination feels: time to launch, launch rate and false launches.
+
+Every trace is read a frame at a time through the game's own ShakeMeter,
+as run() reads the KX134's 400 Hz sample buffer, and every combination in
+the grid is flown through the resulting shakes with Rocket.step, pausing for
+the star shower after each launch as run() does. "Shake" traces are meant to
+launch the rocket; "calm" traces (a still, carried or knocked toy) must not.
+Use recorded traces (tools/replay_trace.py explains how to get one) with
+--shake and --calm, or the built-in synthetic set.
+
+--calibrate prints the SHAKE_GAIN that makes ShakeMeter read the shake
+traces, on average, as hard as one shake_amount() reading a frame did — the
+estimator the other constants were first tuned against.
+
+The grid is split across a process pool. With NumPy installed each worker
+steps all of its combinations at once as arrays; without it, each combination
+runs the game's own Rocket.step. Both give the same numbers.
+
+  python3 tools/sweep_rocket.py --grid THRUST_SCALE=0.2:0.4:0.05 --grid DRAG=0.85,0.87,0.9
+
+Run from project root:  python3 tools/sweep_rocket.py [--grid NAME=VALUES ...]
+                        [--shake TRACE ...] [--calm TRACE ...] [--jobs N] [--json FILE]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import struct
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from tests import standins  # noqa: E402
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PARAMS = ("SHAKE_DEADZONE", "THRUST_SCALE", "MAX_SHAKE", "GRAVITY", "DRAG")
+DEFAULT_GRID = {
+    "SHAKE_DEADZONE": (0.2, 0.28, 0.36),
+    "THRUST_SCALE": (0.2, 0.25, 0.3, 0.35, 0.4),
+    "MAX_SHAKE": (1.5, 2.0, 2.5),
+    "GRAVITY": (0.18, 0.22, 0.26),
+    "DRAG": (0.84, 0.87, 0.9),
+}
+G = 4096          # KX134 counts per g
+SYNTH_S = 20      # length of each synthetic trace
+SAMPLE_HZ = 400   # the KX134 sample buffer's rate
+FRAME_MS = 33     # games.rocket_blast.FRAME_MS
+SHOWER_FRAMES = 160   # games.rocket_blast._LAUNCH_FLASH_FRAMES
+
+
+# ── Traces ────────────────────────────────────────────────────────────────────
+
+def _synthetic(kind, seconds=SYNTH_S, seed=1):
+    """A built-in SAMPLE_HZ trace of (t_ms, x, y, z) counts."""
+    rnd = random.Random(seed)
+    samples = []
+    knock = FRAME_MS * SAMPLE_HZ // 1000      # samples in a knock's spike
+    for i in range(seconds * SAMPLE_HZ):
+        t = i / SAMPLE_HZ
+        noise = [rnd.gauss(0, 0.03) for _ in range(3)]
+        if kind == "still":
+            g = (0.0, 0.0, 1.0)
+        elif kind == "tilt":      # slowly turned over: gravity moves, magnitude doesn't
+            a = t * 0.6
+            g = (math.sin(a), 0.0, math.cos(a))
+        elif kind == "carried":   # walking with it: a gentle 2 Hz bob
+            g = (0.0, 0.0, 1.0 + 0.2 * math.sin(2 * math.pi * 2 * t))
+        elif kind == "knocked":   # put down hard every 4 s: frame-long spikes
+            g = (0.0, 0.0, 2.4 if 2 * SAMPLE_HZ <= i % (4 * SAMPLE_HZ) < 2 * SAMPLE_HZ + knock
+                 else 1.0)
+        elif kind == "gentle":    # a small child's 3 Hz shake
+            g = (0.0, 0.0, 1.0 + 0.9 * math.sin(2 * math.pi * 3 * t))
+        elif kind == "vigorous":  # 5 Hz, hard
+            g = (0.0, 0.0, 1.0 + 2.2 * math.sin(2 * math.pi * 5 * t))
+        else:
+            raise ValueError(kind)
+        samples.append((i * 1000 // SAMPLE_HZ,) + tuple(
+            max(-32768, min(32767, int((v + n) * G))) for v, n in zip(g, noise)))
+    return samples
+
+
+SYNTHETIC_SHAKE = ("gentle", "vigorous")
+SYNTHETIC_CALM = ("still", "tilt", "carried", "knocked")
+
+
+class _FrameKX:
+    """The sample buffer for ShakeMeter: ``frame`` holds this frame's samples."""
+
+    frame = ()
+
+    def enable_buffer(self):
+        pass
+
+    def disable_buffer(self):
+        pass
+
+    def read_buffer(self, buf):
+        frame = self.frame[-(len(buf) // 6):]    # a full buffer keeps the newest
+        for i, sample in enumerate(frame):
+            struct.pack_into('<hhh', buf, 6 * i, *sample)
+        return len(frame)
+
+
+def _metered(samples):
+    """
+    Per FRAME_MS frame: (ShakeMeter's held peak over the samples read that
+    frame, the frame's last sample in g — what one read_xyz() saw).
+    """
+    from games import rocket_blast
+    kx = _FrameKX()
+    meter = rocket_blast.ShakeMeter(kx)
+    frames = []
+    i = 0
+    t = samples[0][0]
+    end = samples[-1][0]
+    while t <= end:
+        first = i
+        while i < len(samples) and samples[i][0] <= t:
+            i += 1
+        kx.frame = [s[1:] for s in samples[first:i]]
+        meter.update()
+        _, x, y, z = samples[i - 1]
+        frames.append((meter.held, (x / G, y / G, z / G)))
+        t += FRAME_MS
+    return frames
+
+
+def _shakes(samples):
+    """Each frame's shake as run() sees it, before SHAKE_DEADZONE is applied."""
+    from games import rocket_blast
+    return [held * rocket_blast.SHAKE_GAIN for held, _ in _metered(samples)]
+
+
+def calibrate(shake_traces):
+    """SHAKE_GAIN matching ShakeMeter's mean reading to shake_amount()'s, over the traces."""
+    metered = read = 0.0
+    for samples in shake_traces:
+        for held, (x, y, z) in _metered(samples):
+            metered += held
+            read += abs((x * x + y * y + z * z) ** 0.5 - 1.0)
+    return read / metered
+
+
+# ── Simulation ────────────────────────────────────────────────────────────────
+
+def _fly(rocket_blast, shakes):
+    """Frame numbers at which the game's Rocket launches over these shakes."""
+    launches = []
+    rocket = rocket_blast.Rocket()
+    deadzone = rocket_blast.SHAKE_DEADZONE
+    n = 0
+    while n < len(shakes):
+        shake = shakes[n]
+        if rocket.step(shake if shake >= deadzone else 0.0):
+            launches.append(n)
+            rocket = rocket_blast.Rocket()
+            n += SHOWER_FRAMES
+        n += 1
+    return launches
+
+
+def _simulate_python(combos, traces):
+    from games import rocket_blast
+    saved = {name: getattr(rocket_blast, name) for name in PARAMS}
+    try:
+        results = []
+        for combo in combos:
+            for name, value in zip(PARAMS, combo):
+                setattr(rocket_blast, name, value)
+            results.append([_fly(rocket_blast, shakes) for shakes in traces])
+        return results
+    finally:
+        for name, value in saved.items():
+            setattr(rocket_blast, name, value)
+
+
+def _simulate_numpy(combos, traces):
+    """Rocket.step for every combination at once, one frame at a time."""
+    from games import rocket_blast
+    np = numpy
+    p = np.array(combos, dtype=float).T
+    deadzone, thrust_scale, max_shake, gravity, drag = p
+    ground, launch = rocket_blast.GROUND_RX, rocket_blast.LAUNCH_RX
+    results = [[] for _ in combos]
+    for shakes in traces:
+        dev = np.array(shakes, dtype=float)
+        rx = np.full(len(combos), ground)
+        vy = np.zeros(len(combos))
+        resume = np.zeros(len(combos), dtype=int)   # frame each rocket flies again
+        launches = [[] for _ in combos]
+        for n in range(len(shakes)):
+            live = resume <= n
+            shake = np.where(dev[n] >= deadzone, dev[n], 0.0)
+            new_vy = (vy + np.minimum(shake, max_shake) * thrust_scale - gravity) * drag
+            new_rx = rx + new_vy
+            landed = new_rx <= ground
+            new_rx = np.where(landed, ground, new_rx)
+            new_vy = np.where(landed & (new_vy < 0.0), 0.0, new_vy)
+            rx = np.where(live, new_rx, rx)
+            vy = np.where(live, new_vy, vy)
+            for k in np.nonzero(live & (rx >= launch))[0]:
+                launches[k].append(n)
+                resume[k] = n + SHOWER_FRAMES + 1
+                rx[k] = ground
+                vy[k] = 0.0
+        for k in range(len(combos)):
+            results[k].append(launches[k])
+    return results
+
+
+def simulate(combos, traces, use_numpy=None):
+    """
+    Launch frames for each combination (a tuple in PARAMS order) on each
+    trace (a list of per-frame shakes, from _shakes()): results[combo][trace].
+    """
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    return (_simulate_numpy if use_numpy else _simulate_python)(combos, traces)
+
+
+def _worker_init():
+    if "games.rocket_blast" not in sys.modules:
+        standins.install()
+
+
+def score(launches, shake_count, frame_counts):
+    """Summarise one combination's launch frames into the reported metrics."""
+    shake = launches[:shake_count]
+    calm = launches[shake_count:]
+    firsts = [l[0] * FRAME_MS / 1000 for l in shake if l]
+    minutes = sum(frame_counts[:shake_count]) * FRAME_MS / 60000
+    return {
+        "time_to_launch": round(sum(firsts) / len(firsts), 2) if firsts else None,
+        "launched": "%d/%d" % (len(firsts), shake_count),
+        "launch_rate": round(sum(len(l) for l in shake) / minutes, 1) if minutes else 0.0,
+        "false_launches": sum(len(l) for l in calm),
+    }
+
+
+def sweep(grid, shake_traces, calm_traces, jobs=None, use_numpy=None):
+    """Score every combination in the grid; returns rows sorted best first."""
+    combos = [()]
+    for name in PARAMS:
+        combos = [c + (v,) for c in combos for v in grid[name]]
+    traces = [_shakes(t) for t in shake_traces + calm_traces]
+    frame_counts = [len(t) for t in traces]
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        results = simulate(combos, traces, use_numpy)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        size = -(-len(combos) // jobs)
+        chunks = [combos[i:i + size] for i in range(0, len(combos), size)]
+        with ProcessPoolExecutor(jobs, initializer=_worker_init) as pool:
+            parts = pool.map(simulate, chunks, [traces] * len(chunks),
+                             [use_numpy] * len(chunks))
+            results = [r for part in parts for r in part]
+
+    rows = []
+    for combo, launches in zip(combos, results):
+        row = dict(zip(PARAMS, combo))
+        row.update(score(launches, len(shake_traces), frame_counts))
+        rows.append(row)
+    rows.sort(key=lambda r: (r["false_launches"],
+                             -int(r["launched"].split("/")[0]),
+                             r["time_to_launch"] if r["time_to_launch"] is not None else 1e9))
+    return rows
+
+
+def _parse_values(text):
+    if ":" in text:
+        start, stop, step = (float(v) for v in text.split(":"))
+        count = int(round((stop - start) / step)) + 1
+        return tuple(round(start + i * step, 6) for i in range(count))
+    return tuple(float(v) for v in text.split(","))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    ap.add_argument('--grid', action='append', default=[], metavar='NAME=VALUES',
+                    help='values for a constant: a,b,c or start:stop:step (repeatable)')
+    ap.add_argument('--shake', nargs='+', default=[], metavar='TRACE',
+                    help='recorded traces that should launch the rocket')
+    ap.add_argument('--calm', nargs='+', default=[], metavar='TRACE',
+                    help='recorded traces that must not launch it')
+    ap.add_argument('--jobs', type=int, default=None, help='worker processes (default: all CPUs)')
+    ap.add_argument('--no-numpy', action='store_true', help='step Rocket.step in plain Python')
+    ap.add_argument('--top', type=int, default=15)
+    ap.add_argument('--calibrate', action='store_true',
+                    help='print the SHAKE_GAIN the shake traces call for, and stop')
+    ap.add_argument('--json', metavar='FILE', help='write every row here')
+    args = ap.parse_args(argv)
+
+    standins.install()
+    from games import rocket_blast
+    from lib import trace
+
+    grid = {name: (getattr(rocket_blast, name),) for name in PARAMS}
+    if not args.grid:
+        grid.update(DEFAULT_GRID)
+    for spec in args.grid:
+        name, _, values = spec.partition('=')
+        if name not in PARAMS:
+            ap.error("unknown constant %s (one of %s)" % (name, ", ".join(PARAMS)))
+        grid[name] = _parse_values(values)
+
+    if args.shake or args.calm:
+        shake = [trace.load(p) for p in args.shake]
+        calm = [trace.load(p) for p in args.calm]
+        labels = args.shake + args.calm
+    else:
+        shake = [_synthetic(k) for k in SYNTHETIC_SHAKE]
+        calm = [_synthetic(k) for k in SYNTHETIC_CALM]
+        labels = list(SYNTHETIC_SHAKE + SYNTHETIC_CALM)
+
+    if args.calibrate:
+        print("SHAKE_GAIN %.2f over %s (now %.2f)" % (
+            calibrate(shake), ", ".join(labels[:len(shake)]), rocket_blast.SHAKE_GAIN))
+        return
+
+    use_numpy = numpy is not None and not args.no_numpy
+    rows = sweep(grid, shake, calm, args.jobs, use_numpy)
+
+    count = len(rows)
+    print("%d combinations x %d traces (%s), %s" % (
+        count, len(labels), ", ".join(labels), "numpy" if use_numpy else "pure Python"))
+    header = ["deadzone", "thrust", "max", "gravity", "drag", "launch s", "launched",
+              "per min", "false"]
+    print("".join("%10s" % h for h in header))
+    current = tuple(getattr(rocket_blast, n) for n in PARAMS)
+    for rank, row in enumerate(rows, 1):
+        is_current = tuple(row[n] for n in PARAMS) == current
+        if rank > args.top and not is_current:
+            continue
+        ttl = row["time_to_launch"]
+        print("".join("%10s" % v for v in (
+            *(row[n] for n in PARAMS), "-" if ttl is None else ttl, row["launched"],
+            row["launch_rate"], row["false_launches"]))
+            + ("  <- current (#%d)" % rank if is_current else ""))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"traces": labels, "rows": rows}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()